@@ -0,0 +1,311 @@
+# 🗄️ AURA AI - Content-Addressed Image Analysis Cache
+# Reuses ClothingImageAnalyzer results for images that were already analyzed.
+#
+# Entries are keyed by a hash of the decoded pixel data plus the model
+# version tag, so re-encoded uploads of the same pixels hit and a model
+# upgrade invalidates everything automatically. Two tiers:
+#   - in-memory LRU of result dictionaries
+#   - optional on-disk tier storing feature vectors as raw float32,
+#     bounded by a byte budget with oldest-first eviction
+# This module deliberately does not import torch: a cache hit never
+# touches the inference stack.
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Binary layout of a disk entry:
+#   8 bytes  magic "AURAFC01"
+#   4 bytes  little-endian uint32 header length
+#   N bytes  UTF-8 JSON header (result without vectors + vector names/lengths)
+#   rest     little-endian float32 vectors, concatenated in header order
+DISK_MAGIC = b"AURAFC01"
+_HEADER_LENGTH = struct.Struct("<I")
+
+# Feature vectors moved out of the JSON header into the binary payload
+VECTOR_FIELDS = ("resnet_features", "vit_features", "clip_embedding")
+
+
+def compute_image_key(image: Image.Image, model_version: str) -> str:
+    """
+    Compute the content address of a decoded image for a given model version.
+
+    Args:
+        image: Decoded PIL image (hash covers mode, size and raw pixel bytes)
+        model_version: Version tag of the models producing the analysis
+
+    Returns:
+        Hex digest used as the cache key
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(model_version.encode("utf-8"))
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}".encode("utf-8"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _vector_containers(result: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    (name prefix, features dict) pairs holding vectors: the frame itself plus any
+    per-garment "items" of a per-item analysis ("items.<index>.").
+    """
+    containers = [("", result.get("features", {}))]
+    for index, item in enumerate(result.get("items") or []):
+        containers.append((f"items.{index}.", item.get("features", {})))
+    return containers
+
+
+def encode_analysis_entry(result: Dict[str, Any]) -> bytes:
+    """Serialise an analysis result into the compact binary disk layout"""
+    result = {**result, "features": dict(result.get("features", {}))}
+    if result.get("items"):
+        result["items"] = [{**item, "features": dict(item.get("features", {}))} for item in result["items"]]
+
+    vectors: List[Tuple[str, np.ndarray]] = []
+    for prefix, features in _vector_containers(result):
+        for name in VECTOR_FIELDS:
+            if name in features:
+                vectors.append((prefix + name, np.asarray(features.pop(name), dtype="<f4").ravel()))
+
+    header = {
+        "result": result,
+        "vectors": [[name, int(vector.size)] for name, vector in vectors],
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    return b"".join([DISK_MAGIC, _HEADER_LENGTH.pack(len(header_bytes)), header_bytes]
+                    + [vector.tobytes() for _, vector in vectors])
+
+
+def decode_analysis_entry(payload: bytes) -> Dict[str, Any]:
+    """Rebuild an analysis result from the binary disk layout"""
+    if payload[:len(DISK_MAGIC)] != DISK_MAGIC:
+        raise ValueError("Not an AURA analysis cache entry")
+
+    offset = len(DISK_MAGIC)
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload, offset)
+    offset += _HEADER_LENGTH.size
+    header = json.loads(payload[offset:offset + header_length].decode("utf-8"))
+    offset += header_length
+
+    result = header["result"]
+    result.setdefault("features", {})
+    for name, length in header["vectors"]:
+        features = result["features"]
+        if name.startswith("items."):
+            _, index, name = name.split(".", 2)
+            features = result["items"][int(index)].setdefault("features", {})
+        # Read-only float32 views into the payload; the response layer picks the wire format
+        features[name] = np.frombuffer(payload, dtype="<f4", count=length, offset=offset)
+        offset += length * 4
+    return result
+
+
+def _estimate_entry_bytes(result: Dict[str, Any]) -> int:
+    """Approximate memory footprint of a cached result, dominated by its feature vectors"""
+    vector_bytes = 0
+    for _, features in _vector_containers(result):
+        for name in VECTOR_FIELDS:
+            vector = features.get(name, [])
+            # numpy vectors cost their buffer size; Python floats in lists ~32 bytes each
+            # (8 byte pointer + 24 byte object)
+            vector_bytes += vector.nbytes if isinstance(vector, np.ndarray) else len(vector) * 32
+    return vector_bytes + 4096
+
+
+class AnalysisCache:
+    """
+    Two-tier content-addressed cache for comprehensive image analysis results.
+    Thread-safe, so it can be shared between the event loop and inference workers.
+    """
+
+    def __init__(self, max_memory_entries: int = 1024, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 0):
+        """
+        Args:
+            max_memory_entries: Maximum number of results held in the in-memory LRU tier
+            disk_dir: Directory for the on-disk tier (None disables it)
+            max_disk_bytes: Size budget of the on-disk tier; the oldest entries are
+                deleted when it is exceeded (0 means unbounded)
+        """
+        self.max_memory_entries = max(0, int(max_memory_entries))
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max(0, int(max_disk_bytes))
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_bytes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "disk_errors": 0,
+        }
+
+        # Disk entries (key -> size) oldest write first; scanned once, then tracked incrementally
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_index = self._scan_disk_usage()
+            self._disk_bytes = sum(self._disk_index.values())
+            with self._lock:
+                self._evict_disk_entries()
+            logger.info(f"🗄️ Analysis cache disk tier enabled at {self.disk_dir} "
+                        f"({len(self._disk_index)} entries, {self._disk_bytes} bytes)")
+
+    def _disk_path(self, key: str) -> str:
+        """Location of a key on disk, sharded by the first two hex characters"""
+        return os.path.join(self.disk_dir, key[:2], f"{key}.bin")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an analysis result.
+
+        Args:
+            key: Cache key from compute_image_key
+
+        Returns:
+            The cached analysis result (shared, treat as read-only) or None on a miss
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return result
+
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "rb") as handle:
+                    result = decode_analysis_entry(handle.read())
+                with self._lock:
+                    self.stats["disk_hits"] += 1
+                self._remember(key, result)
+                return result
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"⚠️ Corrupt analysis cache entry {key}: {e}")
+                with self._lock:
+                    self.stats["disk_errors"] += 1
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store an analysis result in both tiers.
+
+        Args:
+            key: Cache key from compute_image_key
+            result: Analysis dictionary produced by ClothingImageAnalyzer
+        """
+        self._remember(key, result)
+        with self._lock:
+            self.stats["stores"] += 1
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write to a temporary file first so readers never see partial entries
+                payload = encode_analysis_entry(result)
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as handle:
+                    handle.write(payload)
+                os.replace(temp_path, path)
+                with self._lock:
+                    # A rewritten key counts as the newest entry
+                    self._disk_bytes += len(payload) - self._disk_index.pop(key, 0)
+                    self._disk_index[key] = len(payload)
+                    self._evict_disk_entries()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to persist analysis cache entry {key}: {e}")
+                with self._lock:
+                    self.stats["disk_errors"] += 1
+
+    def _evict_disk_entries(self):
+        """Delete the oldest disk entries until the tier fits its byte budget (caller holds the lock)"""
+        while self.max_disk_bytes and self._disk_bytes > self.max_disk_bytes and self._disk_index:
+            evicted_key, size = self._disk_index.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._disk_path(evicted_key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to evict analysis cache entry {evicted_key}: {e}")
+                self.stats["disk_errors"] += 1
+            self.stats["disk_evictions"] += 1
+
+    def _remember(self, key: str, result: Dict[str, Any]):
+        """Insert into the memory tier, evicting least recently used entries"""
+        if self.max_memory_entries == 0:
+            return
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            self._memory_bytes[key] = _estimate_entry_bytes(result)
+            while len(self._memory) > self.max_memory_entries:
+                evicted_key, _ = self._memory.popitem(last=False)
+                self._memory_bytes.pop(evicted_key, None)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        """Drop the in-memory tier (disk entries are kept)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes.clear()
+
+    def _scan_disk_usage(self) -> "OrderedDict[str, int]":
+        """Sizes of the entries stored in the disk tier, oldest modification first"""
+        entries = []
+        if not self.disk_dir or not os.path.isdir(self.disk_dir):
+            return OrderedDict()
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if name.endswith(".bin"):
+                    stat = os.stat(os.path.join(root, name))
+                    entries.append((stat.st_mtime_ns, name[:-len(".bin")], stat.st_size))
+        return OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit ratio and size information for the status endpoints"""
+        with self._lock:
+            stats = dict(self.stats)
+            memory_entries = len(self._memory)
+            memory_bytes = sum(self._memory_bytes.values())
+            disk_entries, disk_bytes = len(self._disk_index), self._disk_bytes
+
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+
+        return {
+            **stats,
+            "lookups": lookups,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_capacity": self.max_memory_entries,
+            "memory_bytes_estimate": memory_bytes,
+            "disk_enabled": bool(self.disk_dir),
+            "disk_entries": disk_entries,
+            "disk_bytes": disk_bytes,
+            "disk_capacity_bytes": self.max_disk_bytes or None,
+        }
@@ -0,0 +1,360 @@
+# 📦 AURA AI - Asynchronous Bulk Image Analysis Jobs
+# Catalog-scale analysis without one synchronous HTTP call per image.
+#
+# A client submits a manifest (local file paths and/or base64 blobs) and gets
+# a job id back. Items run through the same decode -> cache -> micro-batching
+# path as single requests, with a manager-wide bound on in-flight items so
+# one large job cannot monopolise the inference queue. Every finished item
+# appends an event to the job's append-only log; streams (NDJSON or SSE)
+# and incremental result fetches read that log by cursor, so a client can
+# reconnect where it stopped. Failed items keep their input and can be
+# retried with resume().
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BulkJobStatus(str, Enum):
+    """Lifecycle of a bulk analysis job"""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    PARTIALLY_FAILED = "partially_failed"
+    CANCELLED = "cancelled"
+
+
+class BulkItemStatus(str, Enum):
+    """Lifecycle of one manifest item"""
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class BulkJobItem:
+    """
+    One manifest entry.
+
+    Attributes:
+        index: Position in the manifest
+        item_id: Client supplied identifier (defaults to the path or the index)
+        path: Local file path to analyze
+        image_data: Base64 image (released once the item succeeded)
+        status: Processing state
+        result: Analysis result of a succeeded item
+        error: Error message of a failed item
+        attempts: Number of processing attempts, including resumes
+    """
+    index: int
+    item_id: str
+    path: Optional[str] = None
+    image_data: Optional[str] = None
+    status: BulkItemStatus = BulkItemStatus.PENDING
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Item state without its input payload"""
+        return {
+            "index": self.index,
+            "id": self.item_id,
+            "status": self.status.value,
+            "attempts": self.attempts,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+@dataclass
+class BulkJob:
+    """
+    A submitted manifest with its progress and event log.
+
+    Attributes:
+        job_id: Identifier returned to the client
+        items: Manifest items in submission order
+        options: Per-job analysis options (e.g. per_item, vector_format)
+        events: Append-only log; each entry is ("item", index) or ("job", status)
+        succeeded / failed: Running item counters (kept incrementally so progress
+            events stay O(1) for catalog-sized manifests)
+    """
+    job_id: str
+    items: List[BulkJobItem]
+    options: Dict[str, Any] = field(default_factory=dict)
+    status: BulkJobStatus = BulkJobStatus.RUNNING
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    succeeded: int = 0
+    failed: int = 0
+    events: List[Tuple[str, Any]] = field(default_factory=list)
+    _changed: Optional[asyncio.Condition] = field(default=None, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """No item of this job is running any more"""
+        return self.status != BulkJobStatus.RUNNING
+
+    def progress(self) -> Dict[str, Any]:
+        """Item counters and throughput (constant time, attached to every item event)"""
+        done = self.succeeded + self.failed
+        elapsed = (self.finished_at or time.time()) - self.created_at
+        return {
+            "total": len(self.items),
+            BulkItemStatus.SUCCEEDED.value: self.succeeded,
+            BulkItemStatus.FAILED.value: self.failed,
+            BulkItemStatus.PENDING.value: len(self.items) - done,
+            "progress": round(done / len(self.items), 4) if self.items else 1.0,
+            "elapsed_seconds": round(elapsed, 2),
+            "items_per_second": round(done / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Job summary for the job status endpoint and the final job event"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            **self.progress(),
+            "events": len(self.events),
+            "options": self.options,
+        }
+
+    async def _append_event(self, kind: str, value: Any):
+        """Append to the event log and wake every stream following this job"""
+        async with self._changed:
+            self.events.append((kind, value))
+            self._changed.notify_all()
+
+
+class BulkJobManager:
+    """
+    Runs bulk analysis jobs on the event loop with bounded parallelism.
+    """
+
+    def __init__(self, process_item: Callable[[BulkJob, BulkJobItem], Awaitable[Dict[str, Any]]],
+                 max_in_flight: int = 16, max_jobs: int = 100,
+                 retry_exceptions: Tuple[Type[BaseException], ...] = (),
+                 max_retries: int = 8, retry_backoff_seconds: float = 0.05):
+        """
+        Args:
+            process_item: Coroutine analyzing one item and returning its result
+            max_in_flight: Items processed concurrently across all jobs
+            max_jobs: Jobs retained; the oldest finished jobs are dropped beyond it
+            retry_exceptions: Transient errors (e.g. a saturated queue) retried with backoff
+            max_retries: Retries of a transient error before the item fails
+            retry_backoff_seconds: First retry delay, doubled on each further retry
+        """
+        self.process_item = process_item
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_jobs = max(1, int(max_jobs))
+        self.retry_exceptions = retry_exceptions
+        self.max_retries = max(0, int(max_retries))
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, BulkJob]" = OrderedDict()
+
+        self.stats = {
+            "jobs_submitted": 0,
+            "items_submitted": 0,
+            "items_succeeded": 0,
+            "items_failed": 0,
+            "retries": 0,
+            "resumes": 0,
+        }
+
+    def submit(self, manifest: List[Dict[str, Any]], options: Optional[Dict[str, Any]] = None) -> BulkJob:
+        """
+        Create a job from a manifest and start processing it.
+
+        Args:
+            manifest: Entries with either "path" or "image_data", optionally "id"
+            options: Analysis options stored on the job for process_item
+
+        Raises:
+            ValueError: When the manifest is empty or an entry has no input
+            RuntimeError: When every retained job is still running
+        """
+        if not manifest:
+            raise ValueError("Manifest is empty")
+
+        items = []
+        for index, entry in enumerate(manifest):
+            path, image_data = entry.get("path"), entry.get("image_data")
+            if bool(path) == bool(image_data):
+                raise ValueError(f"Manifest entry {index} needs exactly one of 'path' or 'image_data'")
+            items.append(BulkJobItem(
+                index=index,
+                item_id=str(entry.get("id") or path or index),
+                path=path,
+                image_data=image_data
+            ))
+
+        self._evict_finished_jobs()
+        if len(self._jobs) >= self.max_jobs:
+            raise RuntimeError(f"Too many running bulk jobs ({len(self._jobs)})")
+
+        job = BulkJob(job_id=uuid.uuid4().hex, items=items, options=dict(options or {}),
+                      _changed=asyncio.Condition())
+        self._jobs[job.job_id] = job
+        self.stats["jobs_submitted"] += 1
+        self.stats["items_submitted"] += len(items)
+        job._task = asyncio.create_task(self._run(job, items))
+        logger.info(f"📦 Bulk job {job.job_id} accepted with {len(items)} items")
+        return job
+
+    def get(self, job_id: str) -> Optional[BulkJob]:
+        """Look up a retained job"""
+        return self._jobs.get(job_id)
+
+    def resume(self, job_id: str) -> BulkJob:
+        """
+        Retry the failed items of a finished job.
+
+        Raises:
+            KeyError: Unknown job id
+            RuntimeError: When the job is still running
+        """
+        job = self._jobs[job_id]
+        if not job.finished:
+            raise RuntimeError(f"Bulk job {job_id} is still running")
+
+        failed = [item for item in job.items if item.status == BulkItemStatus.FAILED]
+        for item in failed:
+            item.status, item.error = BulkItemStatus.PENDING, None
+        job.status, job.finished_at = BulkJobStatus.RUNNING, None
+        job.failed -= len(failed)
+        self.stats["resumes"] += 1
+        self.stats["items_failed"] -= len(failed)
+        job._task = asyncio.create_task(self._run(job, failed))
+        logger.info(f"🔁 Bulk job {job_id} resumed with {len(failed)} failed items")
+        return job
+
+    async def cancel(self, job_id: str) -> BulkJob:
+        """Stop a job (finished items keep their results) and drop it from the manager"""
+        job = self._jobs.pop(job_id)
+        if job._task is not None and not job._task.done():
+            job._task.cancel()
+            try:
+                await job._task
+            except asyncio.CancelledError:
+                pass
+        if not job.finished:
+            job.status, job.finished_at = BulkJobStatus.CANCELLED, time.time()
+            await job._append_event("job", job.status.value)
+        return job
+
+    async def shutdown(self):
+        """Cancel every running job"""
+        for job_id in [job_id for job_id, job in self._jobs.items() if not job.finished]:
+            await self.cancel(job_id)
+
+    async def follow(self, job: BulkJob, cursor: int = 0) -> AsyncIterator[Tuple[int, str, Any]]:
+        """
+        Yield (sequence number, kind, value) events from `cursor` on, waiting for new
+        events until the job finishes. Reconnecting clients pass their last cursor + 1.
+        """
+        while True:
+            async with job._changed:
+                await job._changed.wait_for(lambda: len(job.events) > cursor or job.finished)
+                pending = job.events[cursor:]
+            for kind, value in pending:
+                yield cursor, kind, value
+                cursor += 1
+            if job.finished and cursor >= len(job.events):
+                return
+
+    def results(self, job: BulkJob, offset: int = 0, limit: int = 100,
+                status: Optional[BulkItemStatus] = None) -> Tuple[List[BulkJobItem], Optional[int]]:
+        """
+        Page through finished items in manifest order.
+
+        Returns:
+            (items of this page, offset of the next page or None at the end)
+        """
+        items = [item for item in job.items if item.status != BulkItemStatus.PENDING
+                 and (status is None or item.status == status)]
+        page = items[offset:offset + limit]
+        next_offset = offset + limit if offset + limit < len(items) else None
+        return page, next_offset
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Manager counters for the status endpoints"""
+        running = sum(1 for job in self._jobs.values() if not job.finished)
+        return {**self.stats, "jobs_retained": len(self._jobs), "jobs_running": running,
+                "max_in_flight": self.max_in_flight}
+
+    def _evict_finished_jobs(self):
+        """Drop the oldest finished jobs beyond max_jobs"""
+        while len(self._jobs) >= self.max_jobs:
+            finished = next((job_id for job_id, job in self._jobs.items() if job.finished), None)
+            if finished is None:
+                return
+            del self._jobs[finished]
+
+    async def _run(self, job: BulkJob, items: List[BulkJobItem]):
+        """Process items with at most max_in_flight of them in flight (shared by all jobs)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+
+        async def run_item(item: BulkJobItem):
+            try:
+                await self._process(job, item)
+            finally:
+                self._slots.release()
+
+        tasks = []
+        try:
+            for item in items:
+                await self._slots.acquire()
+                tasks.append(asyncio.create_task(run_item(item)))
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        job.status = BulkJobStatus.PARTIALLY_FAILED if job.failed else BulkJobStatus.COMPLETED
+        job.finished_at = time.time()
+        await job._append_event("job", job.status.value)
+        logger.info(f"📦 Bulk job {job.job_id} {job.status.value}: "
+                    f"{job.succeeded} succeeded, {job.failed} failed")
+
+    async def _process(self, job: BulkJob, item: BulkJobItem):
+        """Analyze one item, retrying transient errors with exponential backoff"""
+        item.attempts += 1
+        for retry in itertools.count():
+            try:
+                item.result = await self.process_item(job, item)
+                item.status, item.error = BulkItemStatus.SUCCEEDED, None
+                # The input is no longer needed once the result exists
+                item.image_data = None
+                job.succeeded += 1
+                self.stats["items_succeeded"] += 1
+                break
+            except self.retry_exceptions as e:
+                if retry >= self.max_retries:
+                    item.status, item.error = BulkItemStatus.FAILED, f"{type(e).__name__}: {e}"
+                    job.failed += 1
+                    self.stats["items_failed"] += 1
+                    break
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.retry_backoff_seconds * (2 ** retry))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                item.status, item.error = BulkItemStatus.FAILED, f"{type(e).__name__}: {e}"
+                job.failed += 1
+                self.stats["items_failed"] += 1
+                break
+        await job._append_event("item", item.index)
@@ -0,0 +1,230 @@
+# 🎨 AURA AI - Vectorised Dominant Colour Extraction
+# Real palette engine shared by the CV prompt engine and the Phase 6 system.
+#
+# Pixels are subsampled on a regular grid (a few thousand per image), then a
+# numpy k-means with deterministic luminance-quantile initialisation runs
+# over all images of a batch at once: distances for every image are one
+# batched matmul and cluster means are one bincount per channel. Cluster centres are
+# named with HSV rules using the vocabulary shared by ColorFamily and the QA
+# ColorHarmonyValidator (red, orange, yellow, green, blue, purple, pink,
+# brown, black, white, gray, beige).
+
+import colorsys
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Sequence, Union
+
+import numpy as np
+from PIL import Image
+
+from image_preprocessing import DecodedImage
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Colour names shared with ColorFamily and the QA ColorHarmonyValidator
+COLOR_NAMES = (
+    "red", "orange", "yellow", "green", "blue", "purple",
+    "pink", "brown", "black", "white", "gray", "beige"
+)
+
+# Rec. 601 luma weights, used to order pixels for centre initialisation
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+ImageInput = Union[np.ndarray, Image.Image, DecodedImage]
+
+
+@dataclass
+class PaletteColor:
+    """One dominant colour cluster of an image"""
+    name: str                           # Shared colour name (see COLOR_NAMES)
+    hex: str                            # Cluster mean as #rrggbb
+    rgb: List[int]                      # Cluster mean as 8-bit RGB
+    percentage: float                   # Share of sampled pixels in this cluster
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary for JSON responses"""
+        return asdict(self)
+
+
+def name_colors(rgb: np.ndarray) -> List[str]:
+    """
+    Map RGB colours to the shared colour vocabulary.
+
+    Args:
+        rgb: (M, 3) array of colours in [0, 1]
+
+    Returns:
+        List of M colour names
+    """
+    rgb = np.asarray(rgb, dtype=np.float32).reshape(-1, 3)
+    value = rgb.max(axis=1)
+    chroma = value - rgb.min(axis=1)
+    saturation = np.where(value > 0, chroma / np.maximum(value, 1e-6), 0.0)
+
+    # Hue in degrees (0 for achromatic colours)
+    safe_chroma = np.maximum(chroma, 1e-6)
+    red, green, blue = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    hue = np.select(
+        [chroma == 0, value == red, value == green],
+        [0.0, ((green - blue) / safe_chroma) % 6, (blue - red) / safe_chroma + 2],
+        (red - green) / safe_chroma + 4
+    ) * 60.0
+
+    # Chromatic hue bands
+    names = np.select(
+        [hue < 12, hue < 40, hue < 68, hue < 165, hue < 255, hue < 290, hue < 345],
+        ["red", "orange", "yellow", "green", "blue", "purple", "pink"],
+        "red"
+    ).astype(object)
+
+    # Light, soft reds read as pink
+    is_red = (hue < 12) | (hue >= 345)
+    names[is_red & (saturation < 0.5) & (value > 0.75)] = "pink"
+    # Dark oranges / yellows read as brown, light desaturated ones as beige
+    warm = (hue >= 10) & (hue < 65)
+    names[warm & (hue < 55) & (value < 0.65) & (saturation > 0.2)] = "brown"
+    names[warm & (saturation < 0.35) & (saturation >= 0.08) & (value > 0.65)] = "beige"
+    # Achromatic colours last so they override hue-based names
+    achromatic = (saturation < 0.12) & ~(warm & (saturation >= 0.08) & (value > 0.65))
+    names[achromatic] = "gray"
+    names[achromatic & (value > 0.85)] = "white"
+    names[(value < 0.2) | ((value < 0.3) & (saturation < 0.25))] = "black"
+    return names.tolist()
+
+
+def complementary_hex(rgb: Sequence[int]) -> str:
+    """Hue-rotated (180°) complement of an 8-bit RGB colour as #rrggbb"""
+    hue, lightness, saturation = colorsys.rgb_to_hls(*(channel / 255.0 for channel in rgb))
+    complement = colorsys.hls_to_rgb((hue + 0.5) % 1.0, lightness, saturation)
+    return "#" + "".join(f"{int(round(channel * 255)):02x}" for channel in complement)
+
+
+class DominantColorExtractor:
+    """
+    Batched k-means dominant colour extractor.
+    """
+
+    def __init__(self, num_colors: int = 5, sample_size: int = 4096,
+                 max_iterations: int = 10, min_percentage: float = 1.0):
+        """
+        Args:
+            num_colors: Number of k-means clusters per image
+            sample_size: Pixels sampled per image on a regular grid
+            max_iterations: k-means iteration limit (stops early once assignments settle)
+            min_percentage: Clusters covering less of the image than this are dropped
+        """
+        self.num_colors = max(1, int(num_colors))
+        self.sample_size = max(self.num_colors, int(sample_size))
+        self.max_iterations = max(1, int(max_iterations))
+        self.min_percentage = float(min_percentage)
+
+    def _sample_pixels(self, image: ImageInput) -> np.ndarray:
+        """Grid-subsample exactly sample_size pixels as float32 RGB in [0, 1]"""
+        if isinstance(image, DecodedImage):
+            array = image.array()
+        elif isinstance(image, Image.Image):
+            array = np.asarray(image.convert("RGB"))
+        else:
+            array = np.asarray(image)
+        if array.ndim == 2:
+            array = np.repeat(array[..., None], 3, axis=2)
+        array = array[..., :3]
+
+        # Strided view first (no copy), then an even pick down to the exact sample size
+        height, width = array.shape[:2]
+        step = max(1, int(np.sqrt(height * width / self.sample_size)))
+        pixels = array[::step, ::step].reshape(-1, 3)
+        pixels = pixels[np.linspace(0, len(pixels) - 1, self.sample_size).astype(np.int64)]
+
+        pixels = pixels.astype(np.float32)
+        if array.dtype == np.uint8 or pixels.max() > 1.0:
+            pixels *= 1.0 / 255.0
+        return pixels
+
+    def _kmeans(self, samples: np.ndarray):
+        """
+        k-means over a (B, N, 3) batch of pixel samples.
+
+        Returns:
+            (centers (B, K, 3), counts (B, K))
+        """
+        batch, count, _ = samples.shape
+        clusters = min(self.num_colors, count)
+
+        # Deterministic initialisation at luminance quantiles (dark -> light)
+        order = np.argsort(samples @ _LUMA, axis=1)
+        quantiles = ((np.arange(clusters) + 0.5) / clusters * count).astype(np.int64)
+        centers = np.take_along_axis(samples, order[:, quantiles, None], axis=1)
+
+        offsets = (np.arange(batch) * clusters)[:, None]
+        labels = None
+        for _ in range(self.max_iterations):
+            # ||x - c||^2 minus the per-pixel constant ||x||^2, which does not change the argmin
+            distances = (np.einsum("bkc,bkc->bk", centers, centers)[:, None, :]
+                         - 2.0 * (samples @ centers.transpose(0, 2, 1)))
+            new_labels = distances.argmin(axis=2)
+            if labels is not None and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+
+            # Cluster means for every image at once: one bincount per channel
+            flat = (labels + offsets).ravel()
+            counts = np.bincount(flat, minlength=batch * clusters).reshape(batch, clusters)
+            sums = np.stack([
+                np.bincount(flat, weights=samples[..., channel].ravel(), minlength=batch * clusters)
+                for channel in range(3)
+            ], axis=-1).reshape(batch, clusters, 3)
+            # Empty clusters keep their previous centre
+            centers = np.where(counts[..., None] > 0,
+                               sums / np.maximum(counts, 1)[..., None],
+                               centers).astype(np.float32)
+
+        counts = np.bincount((labels + offsets).ravel(), minlength=batch * clusters).reshape(batch, clusters)
+        return centers, counts
+
+    def extract_batch(self, images: List[ImageInput]) -> List[List[PaletteColor]]:
+        """
+        Extract the dominant colours of several images in one vectorised pass.
+
+        Args:
+            images: numpy arrays (uint8 or float in [0, 1]), PIL images or DecodedImages
+
+        Returns:
+            One palette per image, sorted by pixel share (largest first)
+        """
+        if not images:
+            return []
+        samples = np.stack([self._sample_pixels(image) for image in images])
+        centers, counts = self._kmeans(samples)
+        names = name_colors(centers.reshape(-1, 3))
+
+        palettes = []
+        clusters = centers.shape[1]
+        for index in range(len(images)):
+            palette = []
+            for cluster in np.argsort(-counts[index]):
+                percentage = 100.0 * counts[index, cluster] / self.sample_size
+                if percentage < self.min_percentage:
+                    continue
+                rgb = [int(round(channel * 255)) for channel in np.clip(centers[index, cluster], 0.0, 1.0)]
+                palette.append(PaletteColor(
+                    name=names[index * clusters + cluster],
+                    hex="#{:02x}{:02x}{:02x}".format(*rgb),
+                    rgb=rgb,
+                    percentage=round(float(percentage), 1)
+                ))
+            palettes.append(palette)
+        return palettes
+
+    def extract(self, image: ImageInput) -> List[PaletteColor]:
+        """Extract the dominant colours of one image"""
+        return self.extract_batch([image])[0]
+
+
+def dominant_color_names(palette: List[PaletteColor]) -> List[str]:
+    """Distinct colour names of a palette, ordered by their combined pixel share"""
+    shares: Dict[str, float] = {}
+    for color in palette:
+        shares[color.name] = shares.get(color.name, 0.0) + color.percentage
+    return sorted(shares, key=shares.get, reverse=True)
@@ -13,10 +13,25 @@ import cv2
 from PIL import Image
 import torch
 
+# Shared decode-once preprocessing stage
+from image_preprocessing import DecodedImage
+# Vectorised k-means palette engine
+from color_palette import DominantColorExtractor, PaletteColor, dominant_color_names
+# Process-wide engine registry (tables are built once per process)
+from cv_engine_registry import engine_registry
+
 # Configure detailed logging for computer vision analysis
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Ön işleme akışının çalıştığı kare çözünürlük
+PREPROCESS_SIZE = 512
+
+# Otomatik senaryo tespiti, ön işlenmiş görüntünün 128px gri tonlu kopyasında çalışır
+# Alan eşiği PREPROCESS_SIZE çözünürlüğünde tanımlıdır ve küçük kopyaya ölçeklenir
+AUTO_DETECT_SIZE = 128
+AUTO_DETECT_MIN_OBJECT_AREA = 1000
+
 class ClothingCategory(Enum):
     """Kıyafet kategorisi sınıflandırması"""
     SHIRT = "shirt"                      # Gömlek/Bluz
@@ -43,6 +58,14 @@ class ColorFamily(Enum):
     WHITE = "white"                     # Beyaz
     GRAY = "gray"                       # Gri tonları
     NEUTRAL = "neutral"                 # Nötr renkler
+    
+    @classmethod
+    def from_color_name(cls, name: str) -> "ColorFamily":
+        """Palet renk adını aileye eşle (bej gibi aile dışı adlar nötr sayılır)"""
+        try:
+            return cls(name)
+        except ValueError:
+            return cls.NEUTRAL
 
 class PatternType(Enum):
     """Desen türü kategorileri"""
@@ -131,19 +154,39 @@ class AuraComputerVisionEngine:
         Hedefiniz: Her görsel için en doğru fashion analizi
         """
         
+        # Scenario patterns, model configs, fashion database and flow patterns
+        self.reload_patterns()
+        
+        logger.info("✅ Computer Vision Engine hazır!")
+    
+    def reload_patterns(self):
+        """
+        Prompt tablolarını yeniden oluştur ve tek seferde değiştir (hot reload).
+        Yeni tablolar önce tamamen kurulur, sonra atanır; çalışan istekler
+        eski tabloları okumaya devam eder.
+        """
         # Scenario-based prompt patterns
-        self.scenario_patterns = self._initialize_scenario_patterns()
+        scenario_patterns = self._initialize_scenario_patterns()
         
         # CV model configurations
-        self.model_configs = self._initialize_model_configs()
+        model_configs = self._initialize_model_configs()
+        
+        # Dominant colour extraction (k-means over subsampled pixels)
+        color_extractor = DominantColorExtractor(
+            num_colors=model_configs["color_analysis"]["n_dominant_colors"]
+        )
         
         # AURA fashion knowledge base
-        self.fashion_database = self._initialize_fashion_database()
+        fashion_database = self._initialize_fashion_database()
         
         # Flow orchestration patterns
-        self.flow_patterns = self._initialize_flow_patterns()
+        flow_patterns = self._initialize_flow_patterns()
         
-        logger.info("✅ Computer Vision Engine hazır!")
+        self.scenario_patterns = scenario_patterns
+        self.model_configs = model_configs
+        self.color_extractor = color_extractor
+        self.fashion_database = fashion_database
+        self.flow_patterns = flow_patterns
     
     def _initialize_scenario_patterns(self) -> Dict[str, ComputerVisionPromptPattern]:
         """Senaryo bazlı prompt kalıpları"""
@@ -390,7 +433,7 @@ class AuraComputerVisionEngine:
             "color_analysis": {
                 "color_extraction_method": "kmeans",
                 "n_dominant_colors": 5,
-                "color_space": "LAB",
+                "color_space": "RGB",
                 "harmony_algorithms": ["complementary", "analogous", "triadic"]
             },
             
@@ -505,12 +548,13 @@ class AuraComputerVisionEngine:
         logger.info(f"🔍 Fashion image analysis başlıyor - Type: {analysis_type}")
         
         try:
-            # PHASE 1: Preprocessing Flow
-            processed_image = self._execute_preprocessing_flow(image_data)
+            # PHASE 1: Preprocessing Flow (tek decode, tüm çözünürlükler ondan türetilir)
+            decoded = DecodedImage.from_any(image_data)
+            processed_image = self._execute_preprocessing_flow(decoded)
             
             # PHASE 2: Auto-detect analysis type if needed
             if analysis_type == "auto_detect":
-                analysis_type = self._detect_analysis_type(processed_image)
+                analysis_type = self._detect_analysis_type(decoded)
             
             # PHASE 3: Select appropriate prompt pattern
             prompt_pattern = self.scenario_patterns.get(analysis_type)
@@ -538,55 +582,56 @@ class AuraComputerVisionEngine:
             logger.error(f"❌ Fashion image analysis hatası: {e}")
             return self._generate_fallback_result(image_data, str(e))
     
-    def _execute_preprocessing_flow(self, image_data: Union[str, np.ndarray, Image.Image]) -> np.ndarray:
+    def _execute_preprocessing_flow(self, image_data: Union[str, np.ndarray, Image.Image, DecodedImage]) -> np.ndarray:
         """Preprocessing flow implementation"""
         
-        # Convert to PIL Image first
-        if isinstance(image_data, str):
-            # Assume base64 encoded
-            import base64
-            image_bytes = base64.b64decode(image_data)
-            image = Image.open(io.BytesIO(image_bytes))
-        elif isinstance(image_data, np.ndarray):
-            image = Image.fromarray(image_data)
-        else:
-            image = image_data
+        # Decode once through the shared preprocessing stage
+        # (base64, numpy array, PIL Image or an already decoded upload)
+        decoded = DecodedImage.from_any(image_data)
         
         # Apply preprocessing steps
-        # 1. Resolution normalization
-        target_size = (512, 512)
-        image = image.resize(target_size, Image.Resampling.LANCZOS)
-        
-        # 2. Convert to RGB if needed
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # 3. Convert to numpy array
-        image_array = np.array(image)
-        
-        # 4. Normalize pixel values
-        image_array = image_array.astype(np.float32) / 255.0
+        # 1. Resolution normalization + RGB conversion + [0,1] normalization
+        #    The shared stage memoises this buffer, so it is returned as a read-only view
+        target_size = (PREPROCESS_SIZE, PREPROCESS_SIZE)
+        image_array = decoded.float_array(target_size, Image.Resampling.LANCZOS)
         
         return image_array
     
-    def _detect_analysis_type(self, image: np.ndarray) -> str:
-        """Görsel içeriğine göre analiz türünü otomatik belirle"""
+    def _detect_analysis_type(self, image: Union[np.ndarray, DecodedImage]) -> str:
+        """
+        Görsel içeriğine göre analiz türünü otomatik belirle
+        
+        Her istekte çalıştığı için hızlı yol kullanılır: kontürler, ön işleme akışının
+        512px tamponundan türetilen 128px gri tonlu kopyada aranır ve her kontürün
+        alanı yalnızca bir kez hesaplanır. Gri tonlu kopya yalnızca bu tespit için
+        üretilir (DecodedImage üzerinde memoize edilir, aynı görüntü için tekrar
+        hesaplanmaz).
+        """
         
         # Simple heuristic-based detection (can be enhanced with ML)
         # This is a placeholder implementation
+        decoded = DecodedImage.from_any(image)
+        gray = decoded.grayscale(
+            (AUTO_DETECT_SIZE, AUTO_DETECT_SIZE),
+            base_size=(PREPROCESS_SIZE, PREPROCESS_SIZE),
+            base_resample=Image.Resampling.LANCZOS
+        )
+        
+        # PREPROCESS_SIZE çözünürlüğündeki alan eşiği küçük kopyaya ölçeklenir
+        min_area = AUTO_DETECT_MIN_OBJECT_AREA * (AUTO_DETECT_SIZE / PREPROCESS_SIZE) ** 2
         
-        # Count objects using simple contour detection
-        gray = cv2.cvtColor((image * 255).astype(np.uint8), cv2.COLOR_RGB2GRAY)
+        # Count objects using simple contour detection (one area per contour)
         contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        areas = [cv2.contourArea(contour) for contour in contours]
         
-        num_objects = len([c for c in contours if cv2.contourArea(c) > 1000])
+        num_objects = sum(1 for area in areas if area > min_area)
         
         if num_objects > 2:
             return "multi_item_analysis"
         elif num_objects == 1:
             # Check aspect ratio to guess item type
             if len(contours) > 0:
-                largest_contour = max(contours, key=cv2.contourArea)
+                largest_contour = contours[int(np.argmax(areas))]
                 x, y, w, h = cv2.boundingRect(largest_contour)
                 aspect_ratio = h / w
                 
@@ -626,7 +671,9 @@ class AuraComputerVisionEngine:
         """Analysis flow implementation using prompt pattern"""
         
         # Color analysis
-        colors = self._extract_dominant_colors(image)
+        palette = self._extract_dominant_colors(image)
+        colors = [color.hex for color in palette]
+        color_names = dominant_color_names(palette)
         
         # Pattern recognition
         patterns = self._recognize_patterns(image)
@@ -638,6 +685,9 @@ class AuraComputerVisionEngine:
             "color_analysis": {
                 "dominant_colors": colors[:3],
                 "color_palette": colors,
+                "color_names": color_names,
+                "color_family": ColorFamily.from_color_name(color_names[0]).value if color_names else ColorFamily.NEUTRAL.value,
+                "palette_details": [color.to_dict() for color in palette],
                 "color_harmony_score": 0.8
             },
             "pattern_analysis": {
@@ -658,17 +708,11 @@ class AuraComputerVisionEngine:
         
         return analysis_results
     
-    def _extract_dominant_colors(self, image: np.ndarray) -> List[str]:
-        """Extract dominant colors from image"""
+    def _extract_dominant_colors(self, image: np.ndarray) -> List[PaletteColor]:
+        """Extract dominant colors from image (largest pixel share first)"""
         
-        # Reshape image for K-means clustering
-        pixels = image.reshape(-1, 3)
-        
-        # Simple color extraction (placeholder)
-        # In real implementation, use K-means clustering
-        dominant_colors = ["#4A90E2", "#F5A623", "#7ED321"]  # Example colors
-        
-        return dominant_colors
+        # K-means over a grid subsample of the pixels, named with the shared colour vocabulary
+        return self.color_extractor.extract(image)
     
     def _recognize_patterns(self, image: np.ndarray) -> List[str]:
         """Recognize patterns in clothing"""
@@ -698,7 +742,7 @@ class AuraComputerVisionEngine:
         for obj in detection_results["detected_objects"]:
             item = ClothingItem(
                 category=ClothingCategory(obj["category"]),
-                color_family=ColorFamily.BLUE,  # From analysis
+                color_family=ColorFamily(analysis_results["color_analysis"]["color_family"]),
                 specific_colors=analysis_results["color_analysis"]["dominant_colors"],
                 pattern=PatternType.SOLID,  # From analysis
                 style=StyleCategory(analysis_results["style_analysis"]["style_category"]),
@@ -767,10 +811,14 @@ class AuraComputerVisionEngine:
             timestamp=datetime.now().isoformat()
         )
 
+# Registry name of this engine
+CV_ENGINE_NAME = "computer_vision_prompt_engineering"
+engine_registry.register(CV_ENGINE_NAME, AuraComputerVisionEngine)
+
 # Factory function for easy initialization
 def create_aura_cv_engine() -> AuraComputerVisionEngine:
-    """Create and return an instance of AURA Computer Vision Engine"""
-    return AuraComputerVisionEngine()
+    """Return the shared, preinitialised AURA Computer Vision Engine"""
+    return engine_registry.get(CV_ENGINE_NAME)
 
 # Utility functions for integration
 def process_fashion_image_with_prompts(image_data: Any, scenario: str = "auto_detect") -> Dict[str, Any]:
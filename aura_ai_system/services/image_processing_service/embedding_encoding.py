@@ -0,0 +1,204 @@
+# 📦 AURA AI - Binary Embedding Response Formats
+# Content negotiation for the ResNet / ViT / CLIP vectors in analysis responses.
+#
+# A comprehensive analysis carries 2048 + 768 + 512 floats. As JSON lists
+# that is ~60 KB of text per image which every consumer parses back into
+# numpy. Clients can instead ask for:
+#   - base64 float32 / float16 blobs inside the JSON body
+#       Accept: application/vnd.aura.embeddings+json; dtype=float16
+#   - a multipart/mixed body: the JSON analysis followed by one .npy part per vector
+#       Accept: multipart/mixed
+# The `vector_format` query parameter (json | float32 | float16 | npy)
+# overrides the Accept header. Without either, responses stay plain JSON.
+
+import base64
+import io
+import json
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Feature vectors of a ClothingImageAnalyzer result (stored under result["features"])
+VECTOR_FIELDS = ("resnet_features", "vit_features", "clip_embedding")
+
+# Supported vector formats
+VECTOR_FORMATS = ("json", "float32", "float16", "npy")
+
+EMBEDDINGS_JSON_MEDIA_TYPE = "application/vnd.aura.embeddings+json"
+NPY_MEDIA_TYPE = "application/x-npy"
+MULTIPART_MEDIA_TYPE = "multipart/mixed"
+
+
+def negotiate_vector_format(accept_header: Optional[str], vector_format: Optional[str] = None) -> str:
+    """
+    Pick the vector format for a response.
+
+    Args:
+        accept_header: Value of the request's Accept header
+        vector_format: Explicit `vector_format` query parameter (takes precedence)
+
+    Returns:
+        One of VECTOR_FORMATS
+    """
+    if vector_format:
+        vector_format = vector_format.strip().lower()
+        if vector_format not in VECTOR_FORMATS:
+            raise ValueError(f"Unknown vector format '{vector_format}', expected one of {VECTOR_FORMATS}")
+        return vector_format
+
+    # Media ranges are checked in the order the client listed them
+    for media_range in (accept_header or "").split(","):
+        media_type, _, parameters = media_range.strip().partition(";")
+        media_type = media_type.strip().lower()
+        if media_type in (MULTIPART_MEDIA_TYPE, NPY_MEDIA_TYPE):
+            return "npy"
+        if media_type == EMBEDDINGS_JSON_MEDIA_TYPE:
+            params = dict(
+                item.strip().lower().split("=", 1) for item in parameters.split(";") if "=" in item
+            )
+            return "float16" if params.get("dtype") == "float16" else "float32"
+        if media_type in ("application/json", "*/*"):
+            return "json"
+    return "json"
+
+
+def encode_vector_base64(vector: Any, dtype: str = "float32") -> Dict[str, Any]:
+    """Encode one vector as a little-endian base64 blob with its dtype and shape"""
+    array = np.asarray(vector, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {
+        "encoding": "base64",
+        "dtype": dtype,
+        "shape": list(array.shape),
+        "data": base64.b64encode(array.tobytes()).decode("ascii"),
+    }
+
+
+def decode_vector(value: Any) -> np.ndarray:
+    """
+    Turn any supported vector representation back into a float32 array.
+
+    Args:
+        value: JSON list, numpy array or a base64 blob produced by encode_vector_base64
+    """
+    if isinstance(value, dict) and value.get("encoding") == "base64":
+        dtype = np.dtype(value["dtype"]).newbyteorder("<")
+        array = np.frombuffer(base64.b64decode(value["data"]), dtype=dtype).reshape(value["shape"])
+        return array.astype(np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def _format_features(features: Dict[str, Any], vector_format: str, prefix: str = "") -> Dict[str, Any]:
+    """Copy of one features dictionary with its vectors in the requested representation"""
+    features = dict(features)
+    for name in VECTOR_FIELDS:
+        if name not in features:
+            continue
+        if vector_format == "json":
+            vector = features[name]
+            features[name] = vector.tolist() if isinstance(vector, np.ndarray) else list(vector)
+        elif vector_format in ("float32", "float16"):
+            features[name] = encode_vector_base64(features[name], vector_format)
+        elif vector_format == "npy":
+            features[name] = {"encoding": "npy", "part": prefix + name}
+        else:
+            raise ValueError(f"Unknown vector format '{vector_format}'")
+    return features
+
+
+def format_analysis_vectors(result: Optional[Dict[str, Any]], vector_format: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a copy of an analysis result with its vectors in the requested representation.
+    The input (possibly shared with the analysis cache) is never modified. Per-garment
+    vectors of a per-item analysis (result["items"][i]["features"]) are converted too.
+
+    Args:
+        result: ClothingImageAnalyzer result with list or numpy vectors
+        vector_format: "json" (lists), "float32"/"float16" (base64 blobs) or
+            "npy" (vectors removed, see split_analysis_vectors)
+    """
+    if result is None or "features" not in result:
+        return result
+
+    formatted = {**result, "features": _format_features(result["features"], vector_format)}
+    if result.get("items"):
+        formatted["items"] = [
+            {**item, "features": _format_features(item.get("features", {}), vector_format, f"items.{index}.")}
+            for index, item in enumerate(result["items"])
+        ]
+    return formatted
+
+
+def split_analysis_vectors(result: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Dict[str, np.ndarray]]:
+    """
+    Separate the vectors of an analysis result for a multipart response.
+    Per-garment vectors become parts named "items.<index>.<field>".
+    """
+    if result is None or "features" not in result:
+        return result, {}
+    vectors = {
+        name: np.asarray(result["features"][name], dtype=np.float32)
+        for name in VECTOR_FIELDS if name in result["features"]
+    }
+    for index, item in enumerate(result.get("items") or []):
+        features = item.get("features", {})
+        vectors.update({
+            f"items.{index}.{name}": np.asarray(features[name], dtype=np.float32)
+            for name in VECTOR_FIELDS if name in features
+        })
+    return format_analysis_vectors(result, "npy"), vectors
+
+
+def build_multipart_body(document: Dict[str, Any], vectors: Dict[str, np.ndarray]) -> Tuple[bytes, str]:
+    """
+    Build a multipart/mixed body: the JSON document first, then one .npy part per vector.
+
+    Returns:
+        (body bytes, Content-Type header value including the boundary)
+    """
+    boundary = f"aura-{uuid.uuid4().hex}"
+    delimiter = f"--{boundary}\r\n".encode("ascii")
+
+    parts = [
+        delimiter,
+        b"Content-Type: application/json\r\nContent-Disposition: inline; name=\"analysis\"\r\n\r\n",
+        json.dumps(document, separators=(",", ":"), default=str).encode("utf-8"),
+        b"\r\n",
+    ]
+    for name, vector in vectors.items():
+        buffer = io.BytesIO()
+        np.save(buffer, np.ascontiguousarray(vector, dtype="<f4"), allow_pickle=False)
+        parts += [
+            delimiter,
+            f"Content-Type: {NPY_MEDIA_TYPE}\r\nContent-Disposition: attachment; name=\"{name}\"\r\n\r\n".encode("ascii"),
+            buffer.getvalue(),
+            b"\r\n",
+        ]
+    parts.append(f"--{boundary}--\r\n".encode("ascii"))
+    return b"".join(parts), f"{MULTIPART_MEDIA_TYPE}; boundary={boundary}"
+
+
+def parse_multipart_body(body: bytes, content_type: str) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Client-side helper: split a multipart analysis response back into JSON and arrays.
+
+    Returns:
+        (JSON document, {vector name: float32 array})
+    """
+    boundary = content_type.split("boundary=", 1)[1].strip().strip('"')
+    delimiter = f"--{boundary}".encode("ascii")
+
+    document: Dict[str, Any] = {}
+    vectors: Dict[str, np.ndarray] = {}
+    for part in body.split(delimiter)[1:]:
+        if part.startswith(b"--"):
+            break
+        head, _, payload = part.partition(b"\r\n\r\n")
+        payload = payload[:-2] if payload.endswith(b"\r\n") else payload
+        headers = head.decode("ascii").lower()
+        if NPY_MEDIA_TYPE in headers:
+            name = head.decode("ascii").split('name="', 1)[1].split('"', 1)[0]
+            vectors[name] = np.load(io.BytesIO(payload), allow_pickle=False)
+        else:
+            document = json.loads(payload.decode("utf-8"))
+    return document, vectors
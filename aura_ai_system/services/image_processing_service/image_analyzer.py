@@ -8,7 +8,7 @@ from torchvision.models import resnet50, ResNet50_Weights
 import timm  # PyTorch Image Models for Vision Transformers
 
 # Import PIL for image processing operations
-from PIL import Image
+from PIL import Image, ImageDraw
 import numpy as np
 
 # Import transformers library for CLIP model
@@ -18,7 +18,20 @@ from transformers import CLIPProcessor, CLIPModel
 import logging
 import io
 import base64
-from typing import List, Dict, Any, Tuple, Optional
+import hashlib
+import json
+import threading
+import time
+from typing import List, Dict, Any, Tuple, Optional, Union
+
+# Import the shared decode-once preprocessing stage
+from image_preprocessing import DecodedImage
+from model_optimization import (
+    InferenceOptimization,
+    optimize_resnet,
+    prepare_resnet_input,
+    quantize_linear_layers,
+)
 
 # Configure logging to track image processing operations
 logging.basicConfig(level=logging.INFO)
@@ -30,38 +43,50 @@ class ClothingImageAnalyzer:
     This class combines multiple AI models to detect, segment, and analyze clothing items.
     """
     
-    def __init__(self):
+    # Models the analyzer can run, in load order
+    MODEL_NAMES = ("resnet", "vit", "clip")
+    
+    def __init__(self, preload_models: Optional[List[str]] = None,
+                 enabled_models: Optional[List[str]] = None,
+                 optimization: Optional[InferenceOptimization] = None):
         """
-        Initialize the image analyzer with pre-trained AI models.
-        This sets up all the neural networks needed for comprehensive clothing analysis.
+        Initialize the image analyzer.
+        Models are loaded lazily on first use unless listed in preload_models.
+        
+        Args:
+            preload_models: Models to load immediately ("resnet", "vit", "clip");
+                None preloads every enabled model, an empty list loads nothing up front
+            enabled_models: Models this replica may use; features of disabled models are
+                omitted from the analysis and their weights are never loaded. CLIP is required
+                for attribute scoring. None enables all models.
+            optimization: Reduced-precision CPU options (int8 ViT/CLIP, channels-last/bf16
+                ResNet). None runs the fp32 reference path.
         """
         # Set device for computations (GPU if available, otherwise CPU)
         # GPU acceleration significantly speeds up deep learning model inference
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         logger.info(f"Initialized ImageAnalyzer on device: {self.device}")
         
-        # Initialize ResNet-50 model for feature extraction
-        # ResNet-50 is a convolutional neural network that's excellent at extracting visual features
-        logger.info("Loading ResNet-50 model for feature extraction...")
-        self.resnet_model = resnet50(weights=ResNet50_Weights.IMAGENET1K_V2)
-        # Remove the final classification layer to get feature vectors instead of class predictions
-        self.resnet_model = torch.nn.Sequential(*list(self.resnet_model.children())[:-1])
-        self.resnet_model.eval()  # Set to evaluation mode (no training)
-        self.resnet_model.to(self.device)  # Move model to GPU/CPU
-        
-        # Initialize Vision Transformer (ViT) as an alternative feature extractor
-        # ViT models often perform better than CNNs on certain types of image analysis
-        logger.info("Loading Vision Transformer (ViT) model...")
-        self.vit_model = timm.create_model('vit_base_patch16_224', pretrained=True)
-        self.vit_model.eval()  # Set to evaluation mode
-        self.vit_model.to(self.device)  # Move to computation device
-        
-        # Initialize CLIP model for image-text embeddings
-        # CLIP can understand both images and text, making it perfect for style analysis
-        logger.info("Loading CLIP model for image-text embeddings...")
-        self.clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
-        self.clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
-        self.clip_model.to(self.device)  # Move CLIP model to computation device
+        # Reduced-precision options are tuned for CPU-only nodes
+        # Dynamic int8 kernels only exist on the CPU, so GPU replicas keep fp32 transformers
+        self.optimization = optimization or InferenceOptimization()
+        if self.optimization.quantization != "none" and self.device.type != "cpu":
+            logger.warning("⚠️ Dynamic int8 quantization is CPU-only, keeping fp32 ViT/CLIP on GPU")
+            self.optimization.quantization = "none"
+        
+        # Decide which models this replica is allowed to hold in memory
+        self.enabled_models = list(enabled_models) if enabled_models is not None else list(self.MODEL_NAMES)
+        unknown_models = set(self.enabled_models) - set(self.MODEL_NAMES)
+        if unknown_models:
+            raise ValueError(f"Unknown image models: {sorted(unknown_models)}")
+        if "clip" not in self.enabled_models:
+            raise ValueError("CLIP must be enabled: it drives style, color and pattern scoring")
+        
+        # Resident models and their load timings (filled lazily)
+        self._models: Dict[str, Any] = {}
+        self.model_load_times_ms: Dict[str, float] = {}
+        self._model_load_lock = threading.RLock()
+        self.warmed_up = False
         
         # Define image preprocessing transforms
         # These transforms normalize images to the format expected by the models
@@ -94,19 +119,347 @@ class ClothingImageAnalyzer:
             "black", "white", "gray", "brown", "beige", "navy", "maroon"
         ]
         
+        # Define common clothing patterns for pattern recognition
+        # Kept on the instance so the text embeddings can be precomputed once
+        self.pattern_types = [
+            "solid", "striped", "dotted", "checkered", "floral", "geometric", "abstract"
+        ]
+        
+        # Prompt templates used for CLIP zero-shot attribute scoring
+        # Each vocabulary is rendered once with its template and encoded at load time
+        self.attribute_prompt_templates = {
+            "style": "clothing that looks {}",
+            "color": "{} colored clothing",
+            "pattern": "clothing with {} pattern"
+        }
+        
+        # Record model and vocabulary versions
+        # Cached analyses are only valid for the exact models and prompts that produced them
+        self.model_versions = {
+            "resnet": "resnet50/IMAGENET1K_V2",
+            "vit": "vit_base_patch16_224",
+            "clip": "openai/clip-vit-base-patch32",
+            "attribute_prompts": hashlib.sha1(json.dumps(
+                [self.attribute_prompt_templates, self._attribute_vocabularies()], sort_keys=True
+            ).encode("utf-8")).hexdigest()[:12],
+            "enabled_models": ",".join(self.enabled_models),
+            "optimization": self.optimization.version_tag()
+        }
+        self.model_version_tag = hashlib.sha1(
+            json.dumps(self.model_versions, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        
+        # Load the configured preload list (default: every enabled model)
+        self.load_models(self.enabled_models if preload_models is None else preload_models)
+        
         logger.info("Image analyzer initialization completed successfully!")
     
-    def preprocess_image(self, image: Image.Image) -> torch.Tensor:
+    # ------------------------------------------------------------------
+    # Lazy model loading
+    # ------------------------------------------------------------------
+    
+    def _load_resnet(self) -> Dict[str, Any]:
+        """Load ResNet-50 without its classification head"""
+        # Initialize ResNet-50 model for feature extraction
+        # ResNet-50 is a convolutional neural network that's excellent at extracting visual features
+        logger.info("Loading ResNet-50 model for feature extraction...")
+        resnet_model = resnet50(weights=ResNet50_Weights.IMAGENET1K_V2)
+        # Remove the final classification layer to get feature vectors instead of class predictions
+        resnet_model = torch.nn.Sequential(*list(resnet_model.children())[:-1])
+        resnet_model.eval()  # Set to evaluation mode (no training)
+        resnet_model.to(self.device)  # Move model to GPU/CPU
+        # Optional channels-last / bfloat16 execution
+        resnet_model = optimize_resnet(resnet_model, self.optimization)
+        return {"resnet_model": resnet_model}
+    
+    def _load_vit(self) -> Dict[str, Any]:
+        """Load the Vision Transformer feature extractor"""
+        # Initialize Vision Transformer (ViT) as an alternative feature extractor
+        # ViT models often perform better than CNNs on certain types of image analysis
+        logger.info("Loading Vision Transformer (ViT) model...")
+        vit_model = timm.create_model('vit_base_patch16_224', pretrained=True)
+        vit_model.eval()  # Set to evaluation mode
+        vit_model.to(self.device)  # Move to computation device
+        if self.optimization.quantization == "int8":
+            vit_model = quantize_linear_layers(vit_model)
+        return {"vit_model": vit_model}
+    
+    def _load_clip(self) -> Dict[str, Any]:
+        """Load CLIP and precompute the attribute text-embedding matrix"""
+        # Initialize CLIP model for image-text embeddings
+        # CLIP can understand both images and text, making it perfect for style analysis
+        logger.info("Loading CLIP model for image-text embeddings...")
+        clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
+        clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+        clip_model.eval()  # Set to evaluation mode
+        clip_model.to(self.device)  # Move CLIP model to computation device
+        
+        # Precompute L2-normalised text embeddings for every label vocabulary
+        # Attribute scoring then needs a single image encode and one matrix product
+        self._build_attribute_text_embeddings(clip_model, clip_processor)
+        
+        # Quantize after the text matrix is built: label embeddings stay fp32 references
+        # and only the per-request image tower runs in int8
+        if self.optimization.quantization == "int8":
+            clip_model = quantize_linear_layers(clip_model)
+        return {"clip_model": clip_model, "clip_processor": clip_processor}
+    
+    def _ensure_model(self, name: str) -> Dict[str, Any]:
+        """Return the loaded components of a model, loading it on first use"""
+        components = self._models.get(name)
+        if components is not None:
+            return components
+        
+        if name not in self.enabled_models:
+            raise RuntimeError(f"Model '{name}' is disabled on this replica")
+        
+        with self._model_load_lock:
+            # Another thread may have finished loading while we waited for the lock
+            if name not in self._models:
+                start_time = time.perf_counter()
+                loader = {"resnet": self._load_resnet, "vit": self._load_vit, "clip": self._load_clip}[name]
+                self._models[name] = loader()
+                self.model_load_times_ms[name] = round((time.perf_counter() - start_time) * 1000, 1)
+                logger.info(f"✅ Model '{name}' resident after {self.model_load_times_ms[name]}ms")
+        return self._models[name]
+    
+    def load_models(self, model_names: List[str]):
+        """
+        Load the given models now instead of on first use.
+        
+        Args:
+            model_names: Models to load ("resnet", "vit", "clip"); disabled models are skipped
+        """
+        for name in model_names:
+            if name not in self.enabled_models:
+                logger.warning(f"⚠️ Skipping preload of disabled model '{name}'")
+                continue
+            self._ensure_model(name)
+    
+    @property
+    def resnet_model(self) -> torch.nn.Module:
+        """ResNet-50 feature extractor (loaded on first access)"""
+        return self._ensure_model("resnet")["resnet_model"]
+    
+    @property
+    def vit_model(self) -> torch.nn.Module:
+        """Vision Transformer feature extractor (loaded on first access)"""
+        return self._ensure_model("vit")["vit_model"]
+    
+    @property
+    def clip_model(self) -> CLIPModel:
+        """CLIP model (loaded on first access)"""
+        return self._ensure_model("clip")["clip_model"]
+    
+    @property
+    def clip_processor(self) -> CLIPProcessor:
+        """CLIP processor (loaded together with the CLIP model)"""
+        return self._ensure_model("clip")["clip_processor"]
+    
+    @property
+    def resident_models(self) -> List[str]:
+        """Models currently loaded in memory"""
+        return [name for name in self.MODEL_NAMES if name in self._models]
+    
+    def warmup(self, batch_size: int = 1) -> Dict[str, Any]:
+        """
+        Run one dummy batch through every resident model.
+        This triggers lazy kernel/allocator initialization before real traffic
+        arrives, without loading models that were left out of the preload list.
+        
+        Args:
+            batch_size: Number of dummy images in the warmup batch
+            
+        Returns:
+            Dictionary with the warmup duration and resident models
+        """
+        start_time = time.perf_counter()
+        dummy_images = [DecodedImage(Image.new("RGB", (224, 224), (128, 128, 128))) for _ in range(max(1, batch_size))]
+        resident_models = self.resident_models
+        
+        if "resnet" in resident_models or "vit" in resident_models:
+            batch_tensor = torch.cat([self.preprocess_image(image) for image in dummy_images], dim=0)
+            if "resnet" in resident_models:
+                self.extract_resnet_features(batch_tensor)
+            if "vit" in resident_models:
+                self.extract_vit_features(batch_tensor)
+        if "clip" in resident_models:
+            self.score_clip_attributes_batch(self.encode_clip_images(dummy_images))
+        self.warmed_up = True
+        
+        warmup_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        logger.info(f"🔥 Image analyzer warmup completed in {warmup_ms}ms")
+        return {"warmup_time_ms": warmup_ms, "batch_size": len(dummy_images), "resident_models": self.resident_models}
+    
+    def get_model_status(self) -> Dict[str, Any]:
+        """Residency and load timings of every model, for readiness reporting"""
+        return {
+            name: {
+                "enabled": name in self.enabled_models,
+                "resident": name in self._models,
+                "load_time_ms": self.model_load_times_ms.get(name)
+            }
+            for name in self.MODEL_NAMES
+        }
+    
+    def _attribute_vocabularies(self) -> Dict[str, List[str]]:
+        """Return the label vocabularies scored with CLIP, keyed by attribute name"""
+        return {
+            "style": self.style_attributes,
+            "color": self.color_categories,
+            "pattern": self.pattern_types
+        }
+    
+    @staticmethod
+    def _as_embedding_tensor(output: Any) -> torch.Tensor:
+        """
+        Normalise the return value of CLIP get_*_features to a plain tensor.
+        Newer transformers releases wrap the projected embedding in a model output object.
+        """
+        # Older transformers versions return the projected tensor directly
+        if isinstance(output, torch.Tensor):
+            return output
+        # Newer versions return BaseModelOutputWithPooling with the projection in pooler_output
+        return output.pooler_output
+    
+    def _build_attribute_text_embeddings(self, clip_model: CLIPModel, clip_processor: CLIPProcessor):
+        """
+        Encode all style, color and pattern prompts once and stack them into one matrix.
+        The rows are L2-normalised so a dot product with a normalised image embedding
+        equals the cosine similarity the per-label loops used to compute.
+        """
+        logger.info("Precomputing CLIP text embeddings for attribute vocabularies...")
+        
+        vocabularies = self._attribute_vocabularies()
+        
+        # Render every label with its prompt template, keeping the vocabulary order
+        prompts = []
+        self.attribute_label_slices = {}
+        for attribute, labels in vocabularies.items():
+            template = self.attribute_prompt_templates[attribute]
+            start = len(prompts)
+            prompts.extend(template.format(label) for label in labels)
+            self.attribute_label_slices[attribute] = (start, len(prompts))
+        
+        with torch.no_grad():
+            # Tokenize all prompts in one padded batch and encode them together
+            text_inputs = clip_processor(text=prompts, return_tensors="pt", padding=True)
+            text_inputs = {k: v.to(self.device) for k, v in text_inputs.items()}
+            text_embeddings = self._as_embedding_tensor(clip_model.get_text_features(**text_inputs))
+            
+            # L2-normalise each prompt embedding (rows of the matrix)
+            self.attribute_text_matrix = torch.nn.functional.normalize(text_embeddings, dim=-1)
+        
+        logger.info(f"Precomputed {len(prompts)} attribute text embeddings "
+                    f"({', '.join(f'{k}: {len(v)}' for k, v in vocabularies.items())})")
+    
+    def encode_clip_image(self, image: Image.Image) -> torch.Tensor:
+        """
+        Encode an image once with CLIP's image tower.
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            torch.Tensor: Projected (unnormalised) CLIP image embedding with shape [1, embed_dim]
+        """
+        return self.encode_clip_images([image])
+    
+    def encode_clip_images(self, images: List[Union[Image.Image, DecodedImage]]) -> torch.Tensor:
+        """
+        Encode a batch of images with CLIP's image tower in one forward pass.
+        
+        Args:
+            images: List of PIL Image objects or shared DecodedImage instances
+            
+        Returns:
+            torch.Tensor: Projected (unnormalised) CLIP image embeddings with shape [batch_size, embed_dim]
+        """
+        with torch.no_grad():  # Disable gradient computation for inference
+            if all(isinstance(image, DecodedImage) for image in images):
+                # Pixel values come from the shared preprocessing stage, skipping CLIPProcessor's own resize
+                inputs = {"pixel_values": torch.stack([image.clip_pixel_values() for image in images])}
+            else:
+                inputs = self.clip_processor(images=[self._as_pil(image) for image in images], return_tensors="pt")
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            return self._as_embedding_tensor(self.clip_model.get_image_features(**inputs))
+    
+    @staticmethod
+    def _as_pil(image: Union[Image.Image, DecodedImage]) -> Image.Image:
+        """Return the PIL image behind a DecodedImage (or the image itself)"""
+        return image.image if isinstance(image, DecodedImage) else image
+    
+    def score_clip_attributes(self, image_embedding: torch.Tensor) -> Dict[str, Dict[str, float]]:
+        """
+        Score every style, color and pattern label against an image embedding in one pass.
+        
+        Args:
+            image_embedding: CLIP image embedding from encode_clip_image
+            
+        Returns:
+            Dictionary mapping attribute name ("style", "color", "pattern") to label confidence scores
+        """
+        return self.score_clip_attributes_batch(image_embedding.reshape(1, -1))[0]
+    
+    def score_clip_attributes_batch(self, image_embeddings: torch.Tensor) -> List[Dict[str, Dict[str, float]]]:
+        """
+        Score all attribute labels for a batch of image embeddings with one matrix product.
+        
+        Args:
+            image_embeddings: CLIP image embeddings with shape [batch_size, embed_dim]
+            
+        Returns:
+            List (one entry per image) of attribute name -> label confidence score dictionaries
+        """
+        # The text matrix is built when CLIP loads
+        self._ensure_model("clip")
+        
+        with torch.no_grad():
+            # Normalise the image embeddings so the matrix product yields cosine similarities
+            image_embeddings = torch.nn.functional.normalize(image_embeddings, dim=-1)
+            similarities = image_embeddings @ self.attribute_text_matrix.T
+            
+            # Convert similarity to confidence score, normalised from [-1,1] to [0,1]
+            confidences = ((similarities + 1) / 2).clamp(min=0.0).cpu().tolist()
+        
+        # Split each flat score vector back into the individual vocabularies
+        vocabularies = self._attribute_vocabularies()
+        batch_scores = []
+        for row in confidences:
+            scores = {}
+            for attribute, labels in vocabularies.items():
+                start, end = self.attribute_label_slices[attribute]
+                scores[attribute] = dict(zip(labels, row[start:end]))
+            batch_scores.append(scores)
+        return batch_scores
+    
+    def _score_single_attribute(self, attribute: str, image: Image.Image,
+                                image_embedding: Optional[torch.Tensor]) -> Dict[str, float]:
+        """Score one attribute vocabulary, encoding the image only if no embedding was given"""
+        try:
+            if image_embedding is None:
+                image_embedding = self.encode_clip_image(image)
+            return self.score_clip_attributes(image_embedding)[attribute]
+        except Exception as e:
+            logger.warning(f"Error analyzing {attribute} attributes: {e}")
+            return {label: 0.0 for label in self._attribute_vocabularies()[attribute]}
+    
+    def preprocess_image(self, image: Union[Image.Image, DecodedImage]) -> torch.Tensor:
         """
         Preprocess an image for analysis by AI models.
         This ensures the image is in the correct format and size for the neural networks.
         
         Args:
-            image: PIL Image object to preprocess
+            image: PIL Image object or shared DecodedImage to preprocess
             
         Returns:
             torch.Tensor: Preprocessed image tensor ready for model input
         """
+        # Reuse the shared decode-once stage when the caller already decoded the upload
+        # The 224x224 ImageNet tensor is built from the memoised buffer without extra copies
+        if isinstance(image, DecodedImage):
+            return image.imagenet_tensor(224).unsqueeze(0).to(self.device)
+        
         # Convert image to RGB if it's not already
         # This ensures consistent color channel format across all images
         if image.mode != 'RGB':
@@ -226,9 +579,9 @@ class ClothingImageAnalyzer:
         """
         with torch.no_grad():  # Disable gradient computation for inference
             # Pass image through ResNet-50 model
-            features = self.resnet_model(image_tensor)
-            # Flatten the features and convert to numpy array
-            features = features.squeeze().cpu().numpy()
+            features = self.resnet_model(prepare_resnet_input(image_tensor, self.optimization))
+            # Flatten the features and convert to numpy array (bfloat16 runs are cast back to fp32)
+            features = features.squeeze().float().cpu().numpy()
         
         logger.info(f"Extracted ResNet features with shape: {features.shape}")
         return features
@@ -290,211 +643,294 @@ class ClothingImageAnalyzer:
                 inputs = {k: v.to(self.device) for k, v in inputs.items()}
                 
                 # Get image embedding only
-                outputs = self.clip_model.get_image_features(**inputs)
+                outputs = self._as_embedding_tensor(self.clip_model.get_image_features(**inputs))
                 embedding = outputs.cpu().numpy()
                 
                 logger.info("Generated image-only CLIP embedding")
                 return embedding.squeeze()
     
-    def analyze_style_attributes(self, image: Image.Image) -> Dict[str, float]:
+    def analyze_style_attributes(self, image: Image.Image,
+                                 image_embedding: Optional[torch.Tensor] = None) -> Dict[str, float]:
         """
         Analyze style attributes of clothing in the image using CLIP.
         This determines characteristics like casual, formal, sporty, etc.
         
         Args:
             image: PIL Image object containing clothing
+            image_embedding: Optional precomputed CLIP image embedding to avoid re-encoding
             
         Returns:
             Dictionary mapping style attributes to confidence scores
         """
-        style_scores = {}
-        
-        # Use CLIP to compare the image against different style descriptions
-        # This leverages CLIP's ability to understand textual style concepts
-        for style in self.style_attributes:
-            # Create descriptive text for each style
-            style_text = f"clothing that looks {style}"
-            
-            # Generate embedding that considers both image and style description
-            try:
-                with torch.no_grad():
-                    # Process image and style text together
-                    inputs = self.clip_processor(text=[style_text], images=[image], return_tensors="pt", padding=True)
-                    inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                    
-                    # Calculate similarity between image and style description
-                    outputs = self.clip_model(**inputs)
-                    # Use cosine similarity between image and text embeddings
-                    similarity = torch.cosine_similarity(outputs.image_embeds, outputs.text_embeds).item()
-                    
-                    # Convert similarity to confidence score (0 to 1)
-                    confidence = max(0.0, (similarity + 1) / 2)  # Normalize from [-1,1] to [0,1]
-                    style_scores[style] = confidence
-                    
-            except Exception as e:
-                logger.warning(f"Error analyzing style '{style}': {e}")
-                style_scores[style] = 0.0
+        # Compare the image against all precomputed style descriptions at once
+        style_scores = self._score_single_attribute("style", image, image_embedding)
         
         logger.info(f"Analyzed {len(style_scores)} style attributes")
         return style_scores
     
-    def analyze_colors(self, image: Image.Image) -> Dict[str, float]:
+    def analyze_colors(self, image: Image.Image,
+                       image_embedding: Optional[torch.Tensor] = None) -> Dict[str, float]:
         """
         Analyze dominant colors in the clothing image.
         Color analysis is crucial for style matching and combination recommendations.
         
         Args:
             image: PIL Image object containing clothing
+            image_embedding: Optional precomputed CLIP image embedding to avoid re-encoding
             
         Returns:
             Dictionary mapping color names to presence scores
         """
-        color_scores = {}
-        
-        # Use CLIP to detect colors by comparing image with color descriptions
-        # This approach leverages CLIP's understanding of color concepts
-        for color in self.color_categories:
-            # Create descriptive text for each color
-            color_text = f"{color} colored clothing"
-            
-            try:
-                with torch.no_grad():
-                    # Process image and color description together
-                    inputs = self.clip_processor(text=[color_text], images=[image], return_tensors="pt", padding=True)
-                    inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                    
-                    # Calculate similarity between image and color description
-                    outputs = self.clip_model(**inputs)
-                    similarity = torch.cosine_similarity(outputs.image_embeds, outputs.text_embeds).item()
-                    
-                    # Convert similarity to presence score
-                    presence = max(0.0, (similarity + 1) / 2)  # Normalize to [0,1]
-                    color_scores[color] = presence
-                    
-            except Exception as e:
-                logger.warning(f"Error analyzing color '{color}': {e}")
-                color_scores[color] = 0.0
+        # Compare the image against all precomputed color descriptions at once
+        color_scores = self._score_single_attribute("color", image, image_embedding)
         
         logger.info(f"Analyzed {len(color_scores)} color categories")
         return color_scores
     
-    def extract_pattern_features(self, image: Image.Image) -> Dict[str, float]:
+    def extract_pattern_features(self, image: Image.Image,
+                                 image_embedding: Optional[torch.Tensor] = None) -> Dict[str, float]:
         """
         Extract pattern information from clothing (stripes, dots, solid, etc.).
         Pattern recognition helps in style analysis and combination matching.
         
         Args:
             image: PIL Image object containing clothing
+            image_embedding: Optional precomputed CLIP image embedding to avoid re-encoding
             
         Returns:
             Dictionary mapping pattern types to confidence scores
         """
-        # Define common clothing patterns
-        patterns = ["solid", "striped", "dotted", "checkered", "floral", "geometric", "abstract"]
-        pattern_scores = {}
-        
-        # Use CLIP to detect patterns by text-image comparison
-        for pattern in patterns:
-            pattern_text = f"clothing with {pattern} pattern"
-            
-            try:
-                with torch.no_grad():
-                    # Process image and pattern description
-                    inputs = self.clip_processor(text=[pattern_text], images=[image], return_tensors="pt", padding=True)
-                    inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                    
-                    # Calculate pattern presence score
-                    outputs = self.clip_model(**inputs)
-                    similarity = torch.cosine_similarity(outputs.image_embeds, outputs.text_embeds).item()
-                    
-                    # Convert to confidence score
-                    confidence = max(0.0, (similarity + 1) / 2)
-                    pattern_scores[pattern] = confidence
-                    
-            except Exception as e:
-                logger.warning(f"Error analyzing pattern '{pattern}': {e}")
-                pattern_scores[pattern] = 0.0
+        # Compare the image against all precomputed pattern descriptions at once
+        pattern_scores = self._score_single_attribute("pattern", image, image_embedding)
         
         logger.info(f"Analyzed {len(pattern_scores)} pattern types")
         return pattern_scores
     
-    def comprehensive_analysis(self, image: Image.Image) -> Dict[str, Any]:
+    def comprehensive_analysis(self, image: Union[Image.Image, DecodedImage]) -> Dict[str, Any]:
         """
         Perform comprehensive analysis of a clothing image.
         This combines all analysis methods to provide complete clothing understanding.
         
         Args:
-            image: PIL Image object to analyze
+            image: PIL Image object or shared DecodedImage to analyze
             
         Returns:
             Dictionary containing all analysis results
         """
-        logger.info("Starting comprehensive clothing image analysis...")
+        return self.batch_comprehensive_analysis([image])[0]
+    
+    def batch_comprehensive_analysis(self, images: List[Union[Image.Image, DecodedImage]],
+                                     vectors_as_lists: bool = True,
+                                     include_items: bool = False) -> List[Dict[str, Any]]:
+        """
+        Perform comprehensive analysis of several clothing images at once.
+        Every model runs a single forward pass over the stacked batch.
         
-        try:
-            # Preprocess the image for model input
-            image_tensor = self.preprocess_image(image)
+        Args:
+            images: List of PIL Image objects or shared DecodedImage instances to analyze
+            vectors_as_lists: Return feature vectors as JSON-ready lists; False keeps float32
+                numpy arrays so the service can pick the wire format per response
+            include_items: Also crop every detected garment (using its segmentation mask) and
+                return per-item ResNet/CLIP vectors and attribute scores under "items". The crops
+                share the ResNet and CLIP forward passes with the full frames.
             
+        Returns:
+            List of analysis result dictionaries, in the same order as the input images
+        """
+        logger.info(f"Starting comprehensive clothing image analysis for a batch of {len(images)}...")
+        
+        try:
             # Detect individual clothing items (simulated for now)
-            detected_items = self.detect_clothing_items(image)
+            detections = [self.detect_clothing_items(self._as_pil(image)) for image in images]
             
-            # Extract different types of feature vectors
-            resnet_features = self.extract_resnet_features(image_tensor)
-            vit_features = self.extract_vit_features(image_tensor)
-            clip_embedding = self.generate_clip_embedding(image)
+            # Garment crops are appended after the full frames so each model still runs once
+            crops: List[DecodedImage] = []
+            crop_owners: List[Tuple[int, Dict[str, Any], List[int]]] = []
+            if include_items:
+                for index, (image, detected_items) in enumerate(zip(images, detections)):
+                    for item in detected_items:
+                        crop, crop_box = self._crop_detected_item(self._as_pil(image), item)
+                        if crop is not None:
+                            crops.append(crop)
+                            crop_owners.append((index, item, crop_box))
+            frames_and_crops = list(images) + crops
             
-            # Analyze style, color, and pattern attributes
-            style_analysis = self.analyze_style_attributes(image)
-            color_analysis = self.analyze_colors(image)
-            pattern_analysis = self.extract_pattern_features(image)
+            # Models disabled on this replica contribute empty feature vectors
+            resnet_batch = np.zeros((len(frames_and_crops), 0), dtype=np.float32)
+            vit_batch = np.zeros((len(images), 0), dtype=np.float32)
             
-            # Determine dominant style (highest scoring style attribute)
-            dominant_style = max(style_analysis, key=style_analysis.get)
+            if "resnet" in self.enabled_models or "vit" in self.enabled_models:
+                # Preprocess every image and stack them into one batch tensor
+                batch_tensor = torch.cat([self.preprocess_image(image) for image in frames_and_crops], dim=0)
+                
+                # Extract different types of feature vectors, one forward pass per model
+                if "resnet" in self.enabled_models:
+                    resnet_batch = self.extract_resnet_features(batch_tensor).reshape(len(frames_and_crops), -1)
+                if "vit" in self.enabled_models:
+                    # ViT features describe whole frames only
+                    vit_batch = self.extract_vit_features(batch_tensor[:len(images)]).reshape(len(images), -1)
             
-            # Determine dominant color (highest scoring color)
-            dominant_color = max(color_analysis, key=color_analysis.get)
+            # Encode the images with CLIP exactly once and reuse them for every attribute
+            clip_batch = self.encode_clip_images(frames_and_crops)
+            attribute_batch = self.score_clip_attributes_batch(clip_batch)
+            clip_batch = clip_batch.cpu().numpy()
             
-            # Determine dominant pattern (highest scoring pattern)
-            dominant_pattern = max(pattern_analysis, key=pattern_analysis.get)
+            results = []
+            for index in range(len(images)):
+                results.append(self._compile_analysis_results(
+                    detected_items=detections[index],
+                    resnet_features=resnet_batch[index],
+                    vit_features=vit_batch[index],
+                    clip_embedding=clip_batch[index],
+                    attribute_scores=attribute_batch[index],
+                    vectors_as_lists=vectors_as_lists
+                ))
+                if include_items:
+                    results[index]["items"] = []
             
-            # Compile comprehensive analysis results
-            analysis_results = {
-                "detected_items": detected_items,
-                "features": {
-                    "resnet_features": resnet_features.tolist(),  # Convert numpy to list for JSON serialization
-                    "vit_features": vit_features.tolist(),
-                    "clip_embedding": clip_embedding.tolist(),
-                    "feature_dimensions": {
-                        "resnet": len(resnet_features),
-                        "vit": len(vit_features),
-                        "clip": len(clip_embedding)
-                    }
-                },
-                "style_analysis": {
-                    "all_styles": style_analysis,
-                    "dominant_style": dominant_style,
-                    "style_confidence": style_analysis[dominant_style]
-                },
-                "color_analysis": {
-                    "all_colors": color_analysis,
-                    "dominant_color": dominant_color,
-                    "color_confidence": color_analysis[dominant_color]
-                },
-                "pattern_analysis": {
-                    "all_patterns": pattern_analysis,
-                    "dominant_pattern": dominant_pattern,
-                    "pattern_confidence": pattern_analysis[dominant_pattern]
-                },
-                "summary": {
-                    "primary_description": f"{dominant_color} {dominant_pattern} {dominant_style} clothing",
-                    "total_items_detected": len(detected_items),
-                    "analysis_confidence": (style_analysis[dominant_style] + color_analysis[dominant_color] + pattern_analysis[dominant_pattern]) / 3
-                }
-            }
+            # Per-garment results follow the full frames in the batch outputs
+            for offset, (index, item, crop_box) in enumerate(crop_owners):
+                row = len(images) + offset
+                results[index]["items"].append(self._compile_item_result(
+                    item, crop_box, resnet_batch[row], clip_batch[row], attribute_batch[row], vectors_as_lists
+                ))
             
             logger.info("Comprehensive analysis completed successfully!")
-            return analysis_results
+            return results
             
         except Exception as e:
             logger.error(f"Error during comprehensive analysis: {e}")
             raise e
+    
+    def _crop_detected_item(self, image: Image.Image,
+                            item: Dict[str, Any]) -> Tuple[Optional[DecodedImage], List[int]]:
+        """
+        Crop one detected garment using its segmentation polygon.
+        Pixels outside the polygon are filled with neutral gray so the models see only the garment.
+        
+        Returns:
+            (DecodedImage of the crop or None when the region is too small, [left, top, right, bottom])
+        """
+        width, height = image.size
+        polygon = item.get("segmentation") or []
+        if polygon:
+            xs, ys = [point[0] for point in polygon], [point[1] for point in polygon]
+            left, top, right, bottom = min(xs), min(ys), max(xs), max(ys)
+        else:
+            x, y, box_width, box_height = item["bbox"]
+            left, top, right, bottom = x, y, x + box_width, y + box_height
+        left, top = max(0, int(left)), max(0, int(top))
+        right, bottom = min(width, int(right)), min(height, int(bottom))
+        crop_box = [left, top, right, bottom]
+        if right - left < 8 or bottom - top < 8:
+            return None, crop_box
+        
+        crop = image.crop((left, top, right, bottom))
+        if polygon:
+            mask = Image.new("L", crop.size, 0)
+            ImageDraw.Draw(mask).polygon([(px - left, py - top) for px, py in polygon], fill=255)
+            crop = Image.composite(crop, Image.new("RGB", crop.size, (128, 128, 128)), mask)
+        return DecodedImage(crop), crop_box
+    
+    def _compile_item_result(self, item: Dict[str, Any], crop_box: List[int],
+                             resnet_features: np.ndarray, clip_embedding: np.ndarray,
+                             attribute_scores: Dict[str, Dict[str, float]],
+                             vectors_as_lists: bool = True) -> Dict[str, Any]:
+        """Assemble the per-garment analysis dictionary (vectors and attribute scores of one crop)"""
+        if vectors_as_lists:
+            resnet_features, clip_embedding = resnet_features.tolist(), clip_embedding.tolist()
+        else:
+            resnet_features = np.ascontiguousarray(resnet_features, dtype=np.float32)
+            clip_embedding = np.ascontiguousarray(clip_embedding, dtype=np.float32)
+        
+        return {
+            "category": item["category"],
+            "confidence": item["confidence"],
+            "bbox": item["bbox"],
+            "crop_box": crop_box,
+            "features": {
+                "resnet_features": resnet_features,
+                "clip_embedding": clip_embedding,
+                "feature_dimensions": {"resnet": len(resnet_features), "clip": len(clip_embedding)}
+            },
+            **self._summarize_attribute_scores(attribute_scores)
+        }
+    
+    @staticmethod
+    def _summarize_attribute_scores(attribute_scores: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, Any]]:
+        """Style / color / pattern scores with their dominant label and confidence"""
+        summary = {}
+        for attribute, plural in (("style", "styles"), ("color", "colors"), ("pattern", "patterns")):
+            scores = attribute_scores[attribute]
+            dominant = max(scores, key=scores.get)
+            summary[f"{attribute}_analysis"] = {
+                f"all_{plural}": scores,
+                f"dominant_{attribute}": dominant,
+                f"{attribute}_confidence": scores[dominant]
+            }
+        return summary
+    
+    def _compile_analysis_results(self, detected_items: List[Dict[str, Any]],
+                                  resnet_features: np.ndarray, vit_features: np.ndarray,
+                                  clip_embedding: np.ndarray,
+                                  attribute_scores: Dict[str, Dict[str, float]],
+                                  vectors_as_lists: bool = True) -> Dict[str, Any]:
+        """Assemble the comprehensive analysis dictionary for one image"""
+        style_analysis = attribute_scores["style"]
+        color_analysis = attribute_scores["color"]
+        pattern_analysis = attribute_scores["pattern"]
+        
+        # Determine dominant style (highest scoring style attribute)
+        dominant_style = max(style_analysis, key=style_analysis.get)
+        
+        # Determine dominant color (highest scoring color)
+        dominant_color = max(color_analysis, key=color_analysis.get)
+        
+        # Determine dominant pattern (highest scoring pattern)
+        dominant_pattern = max(pattern_analysis, key=pattern_analysis.get)
+        
+        # Convert numpy to list for JSON serialization unless the caller encodes the vectors itself
+        if vectors_as_lists:
+            resnet_features, vit_features, clip_embedding = (
+                resnet_features.tolist(), vit_features.tolist(), clip_embedding.tolist()
+            )
+        else:
+            resnet_features, vit_features, clip_embedding = (
+                np.ascontiguousarray(vector, dtype=np.float32)
+                for vector in (resnet_features, vit_features, clip_embedding)
+            )
+        
+        # Compile comprehensive analysis results
+        return {
+            "detected_items": detected_items,
+            "features": {
+                "resnet_features": resnet_features,
+                "vit_features": vit_features,
+                "clip_embedding": clip_embedding,
+                "feature_dimensions": {
+                    "resnet": len(resnet_features),
+                    "vit": len(vit_features),
+                    "clip": len(clip_embedding)
+                }
+            },
+            "style_analysis": {
+                "all_styles": style_analysis,
+                "dominant_style": dominant_style,
+                "style_confidence": style_analysis[dominant_style]
+            },
+            "color_analysis": {
+                "all_colors": color_analysis,
+                "dominant_color": dominant_color,
+                "color_confidence": color_analysis[dominant_color]
+            },
+            "pattern_analysis": {
+                "all_patterns": pattern_analysis,
+                "dominant_pattern": dominant_pattern,
+                "pattern_confidence": pattern_analysis[dominant_pattern]
+            },
+            "summary": {
+                "primary_description": f"{dominant_color} {dominant_pattern} {dominant_style} clothing",
+                "total_items_detected": len(detected_items),
+                "analysis_confidence": (style_analysis[dominant_style] + color_analysis[dominant_color] + pattern_analysis[dominant_pattern]) / 3
+            }
+        }
@@ -0,0 +1,257 @@
+# 🧩 AURA AI - Shared Decode-Once Image Preprocessing Stage
+# One decode per upload, every model resolution derived from it.
+#
+# Each engine used to decode and resize the same upload independently
+# (ClothingImageAnalyzer 224, AuraComputerVisionEngine 512 LANCZOS,
+# AuraComputerVisionPromptEngine 640, CLIPProcessor internally).
+# DecodedImage decodes once - using JPEG draft mode so large phone photos
+# are decoded directly at a reduced DCT scale - and memoises each derived
+# resolution. Arrays and tensors handed to the engines are read-only views
+# of those memoised buffers instead of per-engine copies.
+
+import base64
+import io
+import logging
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+# PyTorch is only needed for model input tensors (graceful fallback if not available)
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Largest square resolution consumed by any engine (AuraComputerVisionPromptEngine uses 640)
+# JPEG draft decoding never goes below this, so every derived size is a downscale
+DEFAULT_DECODE_SIZE = 640
+
+# ImageNet normalisation used by ResNet-50 and ViT in ClothingImageAnalyzer
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+# CLIP image preprocessing (matches CLIPProcessor for openai/clip-vit-base-patch32)
+CLIP_INPUT_SIZE = 224
+CLIP_MEAN = np.array([0.48145466, 0.4578275, 0.40821073], dtype=np.float32)
+CLIP_STD = np.array([0.26862954, 0.26130258, 0.27577711], dtype=np.float32)
+
+Size = Tuple[int, int]
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Mark a memoised buffer read-only so shared views cannot be mutated by one engine"""
+    array.setflags(write=False)
+    return array
+
+
+class DecodedImage:
+    """
+    A single decoded upload with memoised derived resolutions.
+
+    Attributes:
+        image: Decoded RGB PIL image (possibly draft-downscaled)
+        original_size: (width, height) of the encoded image before draft scaling
+        source_format: Container format reported by PIL (JPEG, PNG, WEBP, ...)
+    """
+
+    def __init__(self, image: Image.Image, original_size: Optional[Size] = None,
+                 source_format: Optional[str] = None):
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        self.image = image
+        self.original_size = original_size or image.size
+        self.source_format = source_format
+        self._resized: Dict[Tuple[Size, int], Image.Image] = {}
+        self._arrays: Dict[Tuple[Any, ...], np.ndarray] = {}
+        self._tensors: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_bytes(cls, image_bytes: bytes, min_size: int = DEFAULT_DECODE_SIZE) -> "DecodedImage":
+        """
+        Decode encoded image bytes once.
+
+        Args:
+            image_bytes: Encoded image (JPEG, PNG, WebP, ...)
+            min_size: Smallest edge length the decoded image must keep; JPEGs are
+                draft-decoded at the largest DCT scale still covering it
+
+        Returns:
+            DecodedImage wrapping the RGB image
+        """
+        image = Image.open(io.BytesIO(image_bytes))
+        original_size = image.size
+        source_format = image.format
+
+        # JPEG draft mode: let libjpeg downscale by 1/2, 1/4 or 1/8 while decoding
+        if source_format == "JPEG" and min_size:
+            image.draft("RGB", (min_size, min_size))
+
+        image.load()
+        return cls(image, original_size=original_size, source_format=source_format)
+
+    @classmethod
+    def from_base64(cls, image_data: str, min_size: int = DEFAULT_DECODE_SIZE) -> "DecodedImage":
+        """Decode a base64 encoded image (optionally with a data URL prefix)"""
+        if image_data.startswith("data:") and "," in image_data:
+            image_data = image_data.split(",", 1)[1]
+        return cls.from_bytes(base64.b64decode(image_data), min_size=min_size)
+
+    @classmethod
+    def from_any(cls, image_data: Union["DecodedImage", str, bytes, np.ndarray, Image.Image],
+                 min_size: int = DEFAULT_DECODE_SIZE) -> "DecodedImage":
+        """
+        Wrap any supported image input, reusing it when it is already decoded.
+
+        Args:
+            image_data: DecodedImage, base64 string, encoded bytes, numpy array or PIL image
+            min_size: Draft decode lower bound for encoded inputs
+
+        Returns:
+            DecodedImage instance
+        """
+        if isinstance(image_data, DecodedImage):
+            return image_data
+        if isinstance(image_data, str):
+            return cls.from_base64(image_data, min_size=min_size)
+        if isinstance(image_data, (bytes, bytearray)):
+            return cls.from_bytes(bytes(image_data), min_size=min_size)
+        if isinstance(image_data, np.ndarray):
+            array = image_data
+            if array.dtype != np.uint8:
+                # Float arrays in [0, 1] are scaled back to 8-bit pixels
+                array = (np.clip(array, 0.0, 1.0) * 255).astype(np.uint8) if array.max() <= 1.0 else array.astype(np.uint8)
+            return cls(Image.fromarray(array))
+        if isinstance(image_data, Image.Image):
+            return cls(image_data)
+        raise TypeError(f"Unsupported image input type: {type(image_data).__name__}")
+
+    # ------------------------------------------------------------------
+    # Derived resolutions
+    # ------------------------------------------------------------------
+
+    @property
+    def size(self) -> Size:
+        """(width, height) of the decoded image"""
+        return self.image.size
+
+    def resized(self, size: Optional[Size] = None,
+                resample: int = Image.Resampling.BILINEAR) -> Image.Image:
+        """
+        Return the decoded image resized to `size`, memoised per (size, resample).
+
+        Args:
+            size: Target (width, height); None returns the decoded image itself
+            resample: PIL resampling filter
+        """
+        if size is None or tuple(size) == self.image.size:
+            return self.image
+        key = (tuple(size), int(resample))
+        if key not in self._resized:
+            self._resized[key] = self.image.resize(tuple(size), resample)
+        return self._resized[key]
+
+    def array(self, size: Optional[Size] = None,
+              resample: int = Image.Resampling.BILINEAR) -> np.ndarray:
+        """
+        Read-only uint8 HxWx3 array of the image at `size`.
+        Repeated calls return the same buffer, not a copy.
+        """
+        key = ("uint8", tuple(size) if size else None, int(resample))
+        if key not in self._arrays:
+            self._arrays[key] = _read_only(np.asarray(self.resized(size, resample)))
+        return self._arrays[key]
+
+    def float_array(self, size: Optional[Size] = None,
+                    resample: int = Image.Resampling.BILINEAR) -> np.ndarray:
+        """Read-only float32 HxWx3 array scaled to [0, 1] at `size`"""
+        key = ("float32", tuple(size) if size else None, int(resample))
+        if key not in self._arrays:
+            scaled = self.array(size, resample).astype(np.float32)
+            scaled *= 1.0 / 255.0
+            self._arrays[key] = _read_only(scaled)
+        return self._arrays[key]
+
+    def grayscale(self, size: Optional[Size] = None,
+                  resample: int = Image.Resampling.BOX,
+                  base_size: Optional[Size] = None,
+                  base_resample: int = Image.Resampling.BILINEAR) -> np.ndarray:
+        """
+        Read-only uint8 HxW luminance array at `size` (ITU-R 601-2 luma, as PIL "L").
+        The default BOX filter averages every source pixel, which suits tiny grids.
+
+        Args:
+            size: Target (width, height); None keeps the source resolution
+            resample: PIL filter for the final resize
+            base_size: Derive the array from this memoised resolution (with base_resample)
+                instead of the full decode, which is much cheaper when an engine already
+                produced that resolution
+        """
+        key = ("gray", tuple(size) if size else None, int(resample),
+               tuple(base_size) if base_size else None, int(base_resample))
+        if key not in self._arrays:
+            if base_size:
+                gray = self.resized(base_size, base_resample).convert("L")
+                if size and tuple(size) != gray.size:
+                    # reducing_gap lets PIL shrink by an integer factor first (much faster, same result for BOX)
+                    gray = gray.resize(tuple(size), resample, reducing_gap=2.0)
+            else:
+                gray = self.resized(size, resample).convert("L")
+            self._arrays[key] = _read_only(np.asarray(gray))
+        return self._arrays[key]
+
+    def _normalised_chw(self, size: Size, resample: int, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+        """Float32 CxHxW array normalised with per-channel mean/std"""
+        chw = self.float_array(size, resample).transpose(2, 0, 1)
+        return (chw - mean[:, None, None]) / std[:, None, None]
+
+    def imagenet_tensor(self, size: int = 224) -> "torch.Tensor":
+        """
+        ImageNet-normalised 3xHxW tensor for ResNet-50 / ViT
+        (same as Resize((size, size)) + ToTensor + Normalize).
+        """
+        key = f"imagenet_{size}"
+        if key not in self._tensors:
+            chw = self._normalised_chw((size, size), Image.Resampling.BILINEAR, IMAGENET_MEAN, IMAGENET_STD)
+            self._tensors[key] = torch.from_numpy(np.ascontiguousarray(chw, dtype=np.float32))
+        return self._tensors[key]
+
+    def clip_pixel_values(self) -> "torch.Tensor":
+        """
+        CLIP-normalised 3x224x224 tensor, equivalent to CLIPProcessor's
+        shortest-edge bicubic resize, center crop and normalisation.
+        """
+        if "clip" not in self._tensors:
+            width, height = self.image.size
+            scale = CLIP_INPUT_SIZE / min(width, height)
+            # Long edge is truncated, not rounded, exactly like the HF shortest-edge resize
+            resized_size = (max(CLIP_INPUT_SIZE, int(width * scale)), max(CLIP_INPUT_SIZE, int(height * scale)))
+            resized = self.array(resized_size, Image.Resampling.BICUBIC)
+
+            # Center crop is a pure view into the memoised resized buffer
+            top = (resized.shape[0] - CLIP_INPUT_SIZE) // 2
+            left = (resized.shape[1] - CLIP_INPUT_SIZE) // 2
+            crop = resized[top:top + CLIP_INPUT_SIZE, left:left + CLIP_INPUT_SIZE]
+
+            chw = crop.transpose(2, 0, 1).astype(np.float32) * (1.0 / 255.0)
+            chw = (chw - CLIP_MEAN[:, None, None]) / CLIP_STD[:, None, None]
+            self._tensors["clip"] = torch.from_numpy(np.ascontiguousarray(chw, dtype=np.float32))
+        return self._tensors["clip"]
+
+    def describe(self) -> Dict[str, Any]:
+        """Decode metadata for logs and response metadata"""
+        return {
+            "source_format": self.source_format,
+            "original_size": list(self.original_size),
+            "decoded_size": list(self.image.size),
+            "draft_downscaled": tuple(self.original_size) != tuple(self.image.size),
+            "derived_resolutions": sorted({f"{key[1][0]}x{key[1][1]}" for key in self._arrays if key[1]}),
+        }
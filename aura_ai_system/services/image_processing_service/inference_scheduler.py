@@ -0,0 +1,217 @@
+# 🚦 AURA AI - Dynamic Micro-Batching Inference Scheduler
+# Gathers concurrent image analysis requests into model batches.
+#
+# Concurrent requests are queued and collected for up to `max_wait_ms`
+# or until `max_batch_size` items are waiting, then handed to a batch
+# function in one call (one stacked forward pass per model). Each waiting
+# request receives its own result back through an asyncio future.
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from inference_workers import InferenceQueueFullError, InferenceWorkerPool, LatencyWindow
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingItem:
+    """A queued request waiting to be placed into a batch"""
+    payload: Any
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatchScheduler:
+    """
+    Dynamic micro-batching scheduler in front of a batch inference function.
+
+    The batch function receives a list of payloads and must return a list of
+    results of the same length and order. It is executed off the event loop,
+    on the given worker pool when one is provided.
+    """
+
+    def __init__(self,
+                 batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 16,
+                 max_wait_ms: float = 10.0,
+                 name: str = "image_analyzer",
+                 worker_pool: Optional[InferenceWorkerPool] = None,
+                 max_pending: int = 0):
+        """
+        Args:
+            batch_fn: Synchronous function mapping a list of inputs to a list of outputs
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: Maximum time to wait for a batch to fill after the first item arrives
+            name: Scheduler name used in logs and stats
+            worker_pool: Inference worker pool executing the batches (default: loop executor)
+            max_pending: Maximum number of queued requests before submit() rejects (0 = unbounded)
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_seconds = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+        self.worker_pool = worker_pool
+        self.max_pending = max(0, int(max_pending))
+        self.queue_time = LatencyWindow()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
+
+        # Scheduler statistics
+        self.stats = {
+            "batches_processed": 0,
+            "items_processed": 0,
+            "failed_batches": 0,
+            "rejected": 0,
+            "largest_batch": 0,
+            "total_batch_time_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether the batching loop is active"""
+        return self._worker_task is not None and not self._worker_task.done()
+
+    async def start(self):
+        """Start the background batching loop on the current event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker_task = asyncio.create_task(self._batch_loop())
+        logger.info(f"🚦 Micro-batch scheduler '{self.name}' started "
+                    f"(max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait_seconds * 1000:.1f})")
+
+    async def stop(self):
+        """Stop the batching loop and fail any requests still waiting"""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending = self._queue.get_nowait()
+                if not pending.future.done():
+                    pending.future.set_exception(RuntimeError(f"Scheduler '{self.name}' stopped"))
+        logger.info(f"🛑 Micro-batch scheduler '{self.name}' stopped")
+
+    async def submit(self, payload: Any) -> Any:
+        """
+        Queue one input and wait for its result.
+
+        Args:
+            payload: Single input for the batch function (e.g. a PIL image)
+
+        Returns:
+            The batch function's result for this input
+            
+        Raises:
+            InferenceQueueFullError: When max_pending requests are already waiting
+        """
+        if not self.running:
+            await self.start()
+
+        if self.max_pending and self._queue.qsize() >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise InferenceQueueFullError(f"Scheduler '{self.name}' has {self._queue.qsize()} pending requests")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingItem(payload=payload, future=future))
+        return await future
+
+    async def _collect_batch(self) -> List[_PendingItem]:
+        """Wait for the first item, then gather more until the batch is full or the window closes"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            # Drain anything that is already waiting without yielding
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run_batch(self, payloads: List[Any]) -> List[Any]:
+        """Execute the batch function without blocking the event loop"""
+        if self.worker_pool is not None:
+            return await self.worker_pool.run(self.batch_fn, payloads)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.batch_fn, payloads)
+
+    async def _batch_loop(self):
+        """Background loop: collect, execute and dispatch batches"""
+        while True:
+            batch = await self._collect_batch()
+
+            # Requests cancelled by their client while queued are dropped from the batch
+            batch = [item for item in batch if not item.future.done()]
+            if not batch:
+                continue
+
+            start_time = time.perf_counter()
+            for item in batch:
+                self.queue_time.add((start_time - item.enqueued_at) * 1000)
+            try:
+                results = await self._run_batch([item.payload for item in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch function returned {len(results)} results for {len(batch)} inputs")
+
+                for item, result in zip(batch, results):
+                    if not item.future.done():
+                        item.future.set_result(result)
+
+            except asyncio.CancelledError:
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(RuntimeError(f"Scheduler '{self.name}' stopped"))
+                raise
+            except Exception as e:
+                logger.error(f"❌ Batch of {len(batch)} failed in scheduler '{self.name}': {e}")
+                self.stats["failed_batches"] += 1
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+
+            batch_time_ms = (time.perf_counter() - start_time) * 1000
+            self.stats["batches_processed"] += 1
+            self.stats["items_processed"] += len(batch)
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+            self.stats["total_batch_time_ms"] += batch_time_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return scheduler statistics for the status endpoints"""
+        batches = self.stats["batches_processed"]
+        return {
+            "name": self.name,
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+            "queued_requests": self._queue.qsize() if self._queue is not None else 0,
+            "batches_processed": batches,
+            "items_processed": self.stats["items_processed"],
+            "failed_batches": self.stats["failed_batches"],
+            "rejected": self.stats["rejected"],
+            "max_pending": self.max_pending,
+            "queue_time": self.queue_time.summary(),
+            "largest_batch": self.stats["largest_batch"],
+            "average_batch_size": round(self.stats["items_processed"] / batches, 2) if batches else 0.0,
+            "average_batch_time_ms": round(self.stats["total_batch_time_ms"] / batches, 2) if batches else 0.0,
+        }
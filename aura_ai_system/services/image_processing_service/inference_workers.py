@@ -0,0 +1,188 @@
+# 🧵 AURA AI - Off-Event-Loop Inference Worker Pool
+# Keeps synchronous torch / OpenCV / Pillow work off the FastAPI event loop.
+#
+# Async handlers submit CPU-bound callables to a fixed pool of worker
+# threads and await the result. Each worker limits torch's intra-op
+# thread count so several workers do not oversubscribe the CPU. Queue
+# depth is bounded: when the pool is saturated submissions fail fast with
+# InferenceQueueFullError, which the endpoints translate into HTTP 429.
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+# PyTorch is optional here: without it the pool still offloads Pillow/OpenCV work
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(RuntimeError):
+    """Raised when the inference queue is saturated and new work must be rejected"""
+
+
+class LatencyWindow:
+    """Rolling window of latency samples (milliseconds) with percentile reporting"""
+
+    def __init__(self, max_samples: int = 2048):
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.total_count = 0
+        self.total_ms = 0.0
+
+    def add(self, value_ms: float):
+        """Record one sample"""
+        with self._lock:
+            self._samples.append(value_ms)
+            self.total_count += 1
+            self.total_ms += value_ms
+
+    def summary(self) -> Dict[str, float]:
+        """Mean over all samples and p50/p95/p99/max over the rolling window"""
+        with self._lock:
+            samples = np.fromiter(self._samples, dtype=np.float64)
+            count, total = self.total_count, self.total_ms
+        if samples.size == 0:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {
+            "count": count,
+            "mean_ms": round(total / count, 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(samples.max()), 3),
+        }
+
+
+class InferenceWorkerPool:
+    """
+    Bounded pool of inference worker threads for async request handlers.
+    """
+
+    def __init__(self, num_workers: int = 2, max_queue_depth: int = 64,
+                 torch_threads_per_worker: int = 0, name: str = "aura-inference"):
+        """
+        Args:
+            num_workers: Number of worker threads executing inference
+            max_queue_depth: Maximum number of submissions waiting for a free worker
+            torch_threads_per_worker: torch intra-op threads per worker (0 = CPU count / workers)
+            name: Thread name prefix used in logs and stats
+        """
+        self.num_workers = max(1, int(num_workers))
+        self.max_queue_depth = max(0, int(max_queue_depth))
+        self.torch_threads_per_worker = int(torch_threads_per_worker) or max(1, (os.cpu_count() or 1) // self.num_workers)
+        self.name = name
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_workers,
+            thread_name_prefix=name,
+            initializer=self._initialize_worker
+        )
+
+        # In-flight accounting (queued + running), guarded by a lock
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+        self.queue_time = LatencyWindow()
+        self.run_time = LatencyWindow()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+        logger.info(f"🧵 Inference worker pool '{name}' started: {self.num_workers} workers, "
+                    f"{self.torch_threads_per_worker} torch threads each, max queue depth {self.max_queue_depth}")
+
+    def _initialize_worker(self):
+        """Limit torch intra-op parallelism inside each worker thread"""
+        if TORCH_AVAILABLE:
+            torch.set_num_threads(self.torch_threads_per_worker)
+
+    @property
+    def saturated(self) -> bool:
+        """Whether new submissions would be rejected right now"""
+        with self._lock:
+            return self._running + self._queued >= self.num_workers + self.max_queue_depth
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Execute fn(*args) on a worker thread and await its result.
+
+        Raises:
+            InferenceQueueFullError: When every worker is busy and the queue is full
+        """
+        with self._lock:
+            if self._running + self._queued >= self.num_workers + self.max_queue_depth:
+                self.stats["rejected"] += 1
+                raise InferenceQueueFullError(
+                    f"Inference queue full ({self._queued} queued, {self._running} running)"
+                )
+            self._queued += 1
+            self.stats["submitted"] += 1
+
+        enqueued_at = time.perf_counter()
+        state = {"started": False}
+
+        def _execute():
+            started_at = time.perf_counter()
+            with self._lock:
+                state["started"] = True
+                self._queued -= 1
+                self._running += 1
+            self.queue_time.add((started_at - enqueued_at) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                self.run_time.add((time.perf_counter() - started_at) * 1000)
+                with self._lock:
+                    self._running -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, _execute)
+        except asyncio.CancelledError:
+            # A submission cancelled before a worker picked it up never leaves the queue by itself
+            with self._lock:
+                if not state["started"]:
+                    self._queued -= 1
+            raise
+        except Exception:
+            with self._lock:
+                self.stats["failed"] += 1
+            raise
+        with self._lock:
+            self.stats["completed"] += 1
+        return result
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release the worker threads"""
+        self._executor.shutdown(wait=wait)
+        logger.info(f"🛑 Inference worker pool '{self.name}' stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool utilisation and queue-time metrics for the status endpoints"""
+        with self._lock:
+            stats = dict(self.stats)
+            queued, running = self._queued, self._running
+        return {
+            "name": self.name,
+            "workers": self.num_workers,
+            "torch_threads_per_worker": self.torch_threads_per_worker,
+            "max_queue_depth": self.max_queue_depth,
+            "queued": queued,
+            "running": running,
+            **stats,
+            "queue_time": self.queue_time.summary(),
+            "run_time": self.run_time.summary(),
+        }
@@ -0,0 +1,110 @@
+# ⚡ AURA AI - CPU Inference Optimizations for ClothingImageAnalyzer
+# Optional reduced-precision execution for CPU-only deployments.
+#
+# - ViT and CLIP: dynamic int8 quantization of every nn.Linear layer
+#   (weights stored as int8, activations quantized per batch at runtime).
+#   Transformer encoders spend most of their CPU time in these matmuls.
+# - ResNet-50: channels-last memory format and, optionally, bfloat16
+#   weights/activations (fast on CPUs with AVX512-BF16 / AMX).
+#
+# Every option changes the produced embeddings slightly, so whether a mode
+# is safe for a deployment is decided with quantization_benchmark.py,
+# which compares the optimized path against fp32 on a local image set.
+
+import copy
+import logging
+import warnings
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import torch
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Supported values of the transformer quantization mode
+QUANTIZATION_MODES = ("none", "int8")
+
+
+@dataclass
+class InferenceOptimization:
+    """
+    Reduced-precision options applied when the analyzer loads its models.
+
+    Attributes:
+        quantization: "int8" applies dynamic int8 quantization to ViT and CLIP linear layers
+        resnet_channels_last: Run ResNet-50 with channels-last (NHWC) tensors
+        resnet_bfloat16: Run ResNet-50 in bfloat16 (implies channels-last)
+    """
+    quantization: str = "none"
+    resnet_channels_last: bool = False
+    resnet_bfloat16: bool = False
+
+    def __post_init__(self):
+        self.quantization = (self.quantization or "none").lower()
+        if self.quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode '{self.quantization}', expected one of {QUANTIZATION_MODES}")
+        if self.resnet_bfloat16:
+            self.resnet_channels_last = True
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any option deviates from the fp32 reference path"""
+        return self.quantization != "none" or self.resnet_channels_last
+
+    @property
+    def resnet_dtype(self) -> torch.dtype:
+        """Parameter and activation dtype of ResNet-50"""
+        return torch.bfloat16 if self.resnet_bfloat16 else torch.float32
+
+    def version_tag(self) -> str:
+        """Short identifier included in the analyzer's model version (keeps caches apart)"""
+        resnet = "bf16" if self.resnet_bfloat16 else ("cl" if self.resnet_channels_last else "fp32")
+        return f"transformers={self.quantization},resnet={resnet}"
+
+    def describe(self) -> Dict[str, Any]:
+        """Options for status endpoints and benchmark reports"""
+        return {
+            "quantization": self.quantization,
+            "resnet_channels_last": self.resnet_channels_last,
+            "resnet_bfloat16": self.resnet_bfloat16,
+        }
+
+
+def quantize_linear_layers(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Return a copy of `model` with every nn.Linear replaced by a dynamic int8 linear.
+
+    Args:
+        model: fp32 model in eval mode on the CPU
+
+    Returns:
+        Quantized copy; the original model is left untouched
+    """
+    with warnings.catch_warnings():
+        # torch.ao.quantization is deprecated in favour of torchao, which is not a dependency here
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        from torch.ao.quantization import quantize_dynamic
+        quantized = quantize_dynamic(copy.deepcopy(model), {torch.nn.Linear}, dtype=torch.qint8)
+    replaced = sum(1 for module in quantized.modules() if "DynamicQuantizedLinear" in type(module).__name__)
+    logger.info(f"⚡ Quantized {replaced} linear layers of {type(model).__name__} to int8")
+    return quantized
+
+
+def optimize_resnet(model: torch.nn.Module, optimization: InferenceOptimization) -> torch.nn.Module:
+    """Apply the channels-last / bfloat16 options to a ResNet feature extractor in place"""
+    if optimization.resnet_channels_last:
+        model = model.to(memory_format=torch.channels_last)
+    if optimization.resnet_bfloat16:
+        model = model.to(dtype=torch.bfloat16)
+    return model
+
+
+def prepare_resnet_input(image_tensor: torch.Tensor, optimization: InferenceOptimization) -> torch.Tensor:
+    """Convert an NCHW fp32 batch to the layout and dtype the optimized ResNet expects"""
+    if optimization.resnet_channels_last:
+        image_tensor = image_tensor.contiguous(memory_format=torch.channels_last)
+    if optimization.resnet_bfloat16:
+        image_tensor = image_tensor.to(dtype=torch.bfloat16)
+    return image_tensor
@@ -0,0 +1,327 @@
+# 🔁 AURA AI - Perceptual-Hash Near-Duplicate Index
+# Recognises re-encoded, slightly re-cropped or watermarked copies of images
+# that were already analyzed, so catalog imports skip redundant inference.
+#
+# Every decoded upload gets two 64-bit perceptual hashes:
+#   - pHash: sign of the low-frequency 8x8 DCT block of a 32x32 luminance
+#     thumbnail (robust to re-encoding, resizing and small overlays)
+#   - dHash: horizontal gradient signs of a 9x8 thumbnail (cheap second
+#     opinion that rejects pHash collisions between different photos)
+# Both hashes only see luminance, so colour variants of one product (red and
+# navy shirt) collide. Each image therefore also carries a colour signature,
+# the mean CIELAB colour of a 4x4 grid, and a match needs the colours to agree.
+# Clusters of near-identical images live in an in-process multi-index hash
+# table keyed by pHash chunks, so a lookup within Hamming distance d checks a
+# handful of candidates instead of scanning every stored hash.
+
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from image_preprocessing import DecodedImage
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# pHash works on a 32x32 thumbnail and keeps the 8x8 lowest DCT frequencies
+PHASH_INPUT_SIZE = 32
+PHASH_BLOCK_SIZE = 8
+
+# Orthogonal DCT-II basis; the 2D transform of X is DCT @ X @ DCT.T
+_DCT_INDEX = np.arange(PHASH_INPUT_SIZE, dtype=np.float64)
+_DCT_MATRIX = np.cos(np.pi * (2 * _DCT_INDEX[None, :] + 1) * _DCT_INDEX[:, None] / (2 * PHASH_INPUT_SIZE))
+_DCT_MATRIX[0] *= 1 / np.sqrt(2)
+_DCT_MATRIX *= np.sqrt(2 / PHASH_INPUT_SIZE)
+
+# Colour signature: mean Lab colour of each cell of a COLOR_GRID_SIZE x COLOR_GRID_SIZE grid
+COLOR_GRID_SIZE = 4
+
+# sRGB (D65) -> XYZ, rows normalised by the D65 white point
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+]) / np.array([[0.95047], [1.0], [1.08883]])
+
+# Bit weights turning a boolean array of 64 bits into an int
+_BIT_WEIGHTS = 1 << np.arange(63, -1, -1, dtype=np.uint64)
+
+# Multi-index hashing: the 64-bit pHash is indexed as four 16-bit chunks
+MULTI_INDEX_CHUNKS = 4
+CHUNK_BITS = 64 // MULTI_INDEX_CHUNKS
+
+# Upper bound of members listed per cluster (the count keeps growing)
+MAX_LISTED_MEMBERS = 50
+
+
+def _pack_bits(bits: np.ndarray) -> int:
+    """Pack 64 booleans (most significant first) into a Python int"""
+    return int(np.sum(_BIT_WEIGHTS[bits.ravel()], dtype=np.uint64))
+
+
+def _split_chunks(value: int) -> List[int]:
+    """Split a 64-bit hash into MULTI_INDEX_CHUNKS integers of CHUNK_BITS bits"""
+    mask = (1 << CHUNK_BITS) - 1
+    return [(value >> (CHUNK_BITS * index)) & mask for index in range(MULTI_INDEX_CHUNKS)]
+
+
+def _flip_masks(bits: int, radius: int) -> List[int]:
+    """Every XOR mask of `bits` bits flipping at most `radius` of them"""
+    return [
+        sum(1 << bit for bit in flipped)
+        for count in range(radius + 1)
+        for flipped in itertools.combinations(range(bits), count)
+    ]
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two 64-bit hashes"""
+    return bin(first ^ second).count("1")
+
+
+def srgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Convert ...x3 sRGB values in [0, 255] to CIELAB (D65)"""
+    linear = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(linear > 0.04045, ((linear + 0.055) / 1.055) ** 2.4, linear / 12.92)
+    xyz = linear @ _RGB_TO_XYZ.T
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def color_distance(first: Tuple[float, ...], second: Tuple[float, ...]) -> float:
+    """Mean CIE76 colour difference (Delta E) between the grid cells of two colour signatures"""
+    first_cells = np.asarray(first, dtype=np.float64).reshape(-1, 3)
+    second_cells = np.asarray(second, dtype=np.float64).reshape(-1, 3)
+    return float(np.linalg.norm(first_cells - second_cells, axis=1).mean())
+
+
+@dataclass(frozen=True)
+class ImageHashes:
+    """
+    Perceptual hashes of one decoded image.
+
+    Attributes:
+        phash: 64-bit DCT hash of the luminance
+        dhash: 64-bit gradient hash of the luminance
+        color: Flattened Lab colour of every grid cell (None skips the colour check)
+    """
+    phash: int
+    dhash: int
+    color: Optional[Tuple[float, ...]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Hex hashes (and the mean Lab colour) for JSON responses"""
+        hashes: Dict[str, Any] = {"phash": f"{self.phash:016x}", "dhash": f"{self.dhash:016x}"}
+        if self.color is not None:
+            hashes["mean_lab"] = [round(float(value), 1)
+                                  for value in np.asarray(self.color).reshape(-1, 3).mean(axis=0)]
+        return hashes
+
+
+def compute_image_hashes(decoded_image: DecodedImage) -> ImageHashes:
+    """
+    Compute pHash, dHash and the colour signature from the shared decoded image.
+
+    All thumbnails are memoised views of the DecodedImage, so the cost is three
+    tiny resizes plus two 32x32 matrix products.
+    """
+    # pHash: low frequencies above their median (DC term excluded from the median)
+    thumbnail = decoded_image.grayscale((PHASH_INPUT_SIZE, PHASH_INPUT_SIZE)).astype(np.float64)
+    block = (_DCT_MATRIX @ thumbnail @ _DCT_MATRIX.T)[:PHASH_BLOCK_SIZE, :PHASH_BLOCK_SIZE]
+    phash = _pack_bits(block > np.median(block.ravel()[1:]))
+
+    # dHash: is each pixel brighter than its right neighbour
+    gradient = decoded_image.grayscale((PHASH_BLOCK_SIZE + 1, PHASH_BLOCK_SIZE)).astype(np.int16)
+    dhash = _pack_bits(gradient[:, :-1] > gradient[:, 1:])
+
+    # Colour signature: BOX-averaged 4x4 RGB grid in Lab, where distances match perceived colour
+    grid = decoded_image.array((COLOR_GRID_SIZE, COLOR_GRID_SIZE), Image.Resampling.BOX)
+    color = tuple(round(float(value), 2) for value in srgb_to_lab(grid).ravel())
+
+    return ImageHashes(phash=phash, dhash=dhash, color=color)
+
+
+@dataclass
+class DuplicateCluster:
+    """
+    A group of near-identical images represented by the first one seen.
+
+    Attributes:
+        cluster_id: Sequential identifier
+        hashes: Hashes of the representative image
+        analysis_keys: Analysis cache keys of the representative, per analysis mode
+        members: Sources seen in this cluster (first MAX_LISTED_MEMBERS)
+        member_count: Total number of images matched to this cluster
+    """
+    cluster_id: int
+    hashes: ImageHashes
+    analysis_keys: Dict[str, str] = field(default_factory=dict)
+    members: List[Dict[str, Any]] = field(default_factory=list)
+    member_count: int = 0
+
+    def add_member(self, hashes: ImageHashes, distance: int, source: Optional[str] = None):
+        """Record one more image of this cluster"""
+        self.member_count += 1
+        if len(self.members) < MAX_LISTED_MEMBERS:
+            self.members.append({**hashes.to_dict(), "hamming_distance": distance, "source": source})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary for the duplicate-clusters endpoint"""
+        return {
+            "cluster_id": self.cluster_id,
+            "representative": self.hashes.to_dict(),
+            "member_count": self.member_count,
+            "members": list(self.members),
+            "analysis_modes": sorted(self.analysis_keys),
+        }
+
+
+class NearDuplicateIndex:
+    """
+    Thread-safe multi-index hash table of duplicate clusters keyed by pHash.
+
+    The 64-bit pHash is split into MULTI_INDEX_CHUNKS 16-bit chunks, each with
+    its own table. Two hashes within distance d agree to within d // chunks bits
+    on at least one chunk (pigeonhole), so a lookup probes every chunk value
+    within that radius and verifies only the few clusters found there.
+
+    Only cluster representatives are indexed; later matches are attached to
+    their cluster, so the tables grow with distinct images only and clusters
+    cannot drift through chains of small edits.
+    """
+
+    def __init__(self, max_distance: int = 10, max_dhash_distance: int = 12,
+                 max_color_distance: float = 10.0, max_clusters: int = 100000):
+        """
+        Args:
+            max_distance: Largest pHash Hamming distance treated as a near-duplicate
+            max_dhash_distance: Largest dHash Hamming distance confirming a pHash match
+            max_color_distance: Largest mean Delta E between the colour grids confirming a
+                match (re-encodes and crops stay around 3, recoloured products exceed 20)
+            max_clusters: Distinct images kept in the index; beyond it new images are
+                no longer indexed (existing clusters keep matching)
+        """
+        self.max_distance = max(0, int(max_distance))
+        self.max_dhash_distance = max(0, int(max_dhash_distance))
+        self.max_color_distance = max(0.0, float(max_color_distance))
+        self.max_clusters = max(1, int(max_clusters))
+        self._tables: List[Dict[int, List[DuplicateCluster]]] = [{} for _ in range(MULTI_INDEX_CHUNKS)]
+        self._probe_masks = _flip_masks(CHUNK_BITS, self.max_distance // MULTI_INDEX_CHUNKS)
+        self._clusters: List[DuplicateCluster] = []
+        self._cluster_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "lookups": 0,
+            "near_duplicates": 0,
+            "new_clusters": 0,
+            "not_indexed_full": 0,
+            "candidates_checked": 0,
+            "color_mismatches": 0,
+        }
+
+    def _colors_match(self, hashes: ImageHashes, cluster: DuplicateCluster) -> bool:
+        """Whether the colour signatures agree (images without a signature always agree)"""
+        if hashes.color is None or cluster.hashes.color is None:
+            return True
+        return color_distance(hashes.color, cluster.hashes.color) <= self.max_color_distance
+
+    def _search(self, hashes: ImageHashes) -> Tuple[Optional[DuplicateCluster], Optional[int]]:
+        """Closest cluster within the pHash/dHash/colour thresholds (caller holds the lock)"""
+        candidates: Dict[int, DuplicateCluster] = {}
+        for table, chunk in zip(self._tables, _split_chunks(hashes.phash)):
+            for mask in self._probe_masks:
+                for cluster in table.get(chunk ^ mask, ()):
+                    candidates[cluster.cluster_id] = cluster
+        self.stats["candidates_checked"] += len(candidates)
+
+        best_cluster, best_distance = None, None
+        for cluster in candidates.values():
+            distance = hamming_distance(hashes.phash, cluster.hashes.phash)
+            if (distance <= self.max_distance
+                    and (best_distance is None or distance < best_distance)
+                    and hamming_distance(hashes.dhash, cluster.hashes.dhash) <= self.max_dhash_distance):
+                if not self._colors_match(hashes, cluster):
+                    self.stats["color_mismatches"] += 1
+                    continue
+                best_cluster, best_distance = cluster, distance
+        return best_cluster, best_distance
+
+    def _insert(self, cluster: DuplicateCluster):
+        """Add a cluster representative to every chunk table (caller holds the lock)"""
+        for table, chunk in zip(self._tables, _split_chunks(cluster.hashes.phash)):
+            table.setdefault(chunk, []).append(cluster)
+
+    def match_or_add(self, hashes: ImageHashes,
+                     source: Optional[str] = None) -> Tuple[Optional[DuplicateCluster], Optional[int]]:
+        """
+        Attach an image to its near-duplicate cluster, or start a new cluster.
+
+        Args:
+            hashes: Hashes from compute_image_hashes
+            source: Optional label of the image (upload filename) listed in the cluster
+
+        Returns:
+            (cluster, Hamming distance to its representative) for a near-duplicate,
+            (new cluster, None) for a new image, or (None, None) when the index is full
+        """
+        with self._lock:
+            self.stats["lookups"] += 1
+            cluster, distance = self._search(hashes)
+            if cluster is not None:
+                cluster.add_member(hashes, distance, source)
+                self.stats["near_duplicates"] += 1
+                return cluster, distance
+
+            if len(self._clusters) >= self.max_clusters:
+                self.stats["not_indexed_full"] += 1
+                return None, None
+
+            cluster = DuplicateCluster(cluster_id=next(self._cluster_ids), hashes=hashes)
+            cluster.add_member(hashes, 0, source)
+            self._insert(cluster)
+            self._clusters.append(cluster)
+            self.stats["new_clusters"] += 1
+            return cluster, None
+
+    def attach_analysis(self, cluster: DuplicateCluster, mode: str, cache_key: str):
+        """Remember which analysis cache entry answers this cluster for an analysis mode"""
+        with self._lock:
+            cluster.analysis_keys.setdefault(mode, cache_key)
+
+    def duplicate_clusters(self, min_size: int = 2, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Clusters holding at least `min_size` images, largest first.
+
+        Args:
+            min_size: Minimum number of images per reported cluster
+            limit: Maximum number of clusters returned
+        """
+        with self._lock:
+            clusters = [cluster.to_dict() for cluster in self._clusters if cluster.member_count >= min_size]
+        clusters.sort(key=lambda cluster: cluster["member_count"], reverse=True)
+        return clusters[:limit]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size and match statistics for the status endpoints"""
+        with self._lock:
+            stats = dict(self.stats)
+            clusters = len(self._clusters)
+            duplicated = sum(1 for cluster in self._clusters if cluster.member_count > 1)
+        lookups = stats["lookups"]
+        return {
+            **stats,
+            "clusters": clusters,
+            "clusters_with_duplicates": duplicated,
+            "near_duplicate_ratio": round(stats["near_duplicates"] / lookups, 4) if lookups else 0.0,
+            "avg_candidates_checked": round(stats["candidates_checked"] / lookups, 2) if lookups else 0.0,
+            "max_distance": self.max_distance,
+            "max_dhash_distance": self.max_dhash_distance,
+            "max_color_distance": self.max_color_distance,
+            "capacity": self.max_clusters,
+        }
@@ -0,0 +1,264 @@
+# 📏 AURA AI - Quantized Inference Accuracy / Speed Harness
+# Decides whether a reduced-precision mode is safe to enable on a deployment.
+#
+# Runs the same local image set through an fp32 ClothingImageAnalyzer and
+# through one configured with the requested InferenceOptimization, then
+# reports:
+#   - cosine similarity of ResNet / ViT / CLIP embeddings (mean and worst case)
+#   - top-1 agreement of the CLIP style / color / pattern labels
+#   - per-model latency of both paths and the resulting speedup
+# The process exits with status 0 when every accuracy check passes, so the
+# report can gate AURA_IMAGE_QUANTIZATION / AURA_IMAGE_RESNET_* in CI.
+#
+# Usage:
+#   python quantization_benchmark.py --images ./sample_images --quantization int8 \
+#       --resnet-bf16 --output quantization_report.json
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import torch
+
+from image_analyzer import ClothingImageAnalyzer
+from image_preprocessing import DecodedImage
+from model_optimization import InferenceOptimization
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+
+# Default acceptance thresholds for enabling an optimized mode
+DEFAULT_MIN_MEAN_COSINE = 0.99
+DEFAULT_MIN_WORST_COSINE = 0.95
+DEFAULT_MIN_TOP1_AGREEMENT = 0.95
+
+
+def load_image_set(image_dir: str, limit: int = 0) -> List[DecodedImage]:
+    """Decode every image in a directory (sorted by name, optionally limited)"""
+    names = sorted(name for name in os.listdir(image_dir) if name.lower().endswith(IMAGE_EXTENSIONS))
+    if limit:
+        names = names[:limit]
+    images = []
+    for name in names:
+        with open(os.path.join(image_dir, name), "rb") as handle:
+            images.append(DecodedImage.from_bytes(handle.read()))
+    if not images:
+        raise ValueError(f"No images found in {image_dir}")
+    return images
+
+
+def _batches(items: List[Any], batch_size: int) -> List[List[Any]]:
+    """Split a list into consecutive batches"""
+    return [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+
+def _timed(fn: Callable[[], Any], timings: List[float]) -> Any:
+    """Run fn and append its wall time in milliseconds"""
+    start_time = time.perf_counter()
+    result = fn()
+    timings.append((time.perf_counter() - start_time) * 1000)
+    return result
+
+
+def run_models(analyzer: ClothingImageAnalyzer, images: List[DecodedImage],
+               batch_size: int, repeats: int) -> Dict[str, Any]:
+    """
+    Extract every enabled model's embeddings and the CLIP top-1 labels, timing each model.
+
+    Returns:
+        Dictionary with stacked embeddings per model, top-1 labels per attribute and
+        per-batch latency samples per model
+    """
+    analyzer.warmup(batch_size=min(batch_size, len(images)))
+    embeddings: Dict[str, List[np.ndarray]] = {name: [] for name in analyzer.enabled_models}
+    timings: Dict[str, List[float]] = {name: [] for name in analyzer.enabled_models}
+    top1: Dict[str, List[str]] = {"style": [], "color": [], "pattern": []}
+
+    for repeat in range(max(1, repeats)):
+        for batch in _batches(images, batch_size):
+            batch_tensor = torch.cat([analyzer.preprocess_image(image) for image in batch], dim=0)
+            outputs = {}
+            if "resnet" in analyzer.enabled_models:
+                outputs["resnet"] = _timed(lambda: analyzer.extract_resnet_features(batch_tensor), timings["resnet"])
+            if "vit" in analyzer.enabled_models:
+                outputs["vit"] = _timed(lambda: analyzer.extract_vit_features(batch_tensor), timings["vit"])
+            clip_batch = _timed(lambda: analyzer.encode_clip_images(batch), timings["clip"])
+            outputs["clip"] = clip_batch.cpu().numpy()
+
+            # Embeddings and labels only need to be collected once
+            if repeat == 0:
+                for name, values in outputs.items():
+                    embeddings[name].append(np.asarray(values, dtype=np.float32).reshape(len(batch), -1))
+                for scores in analyzer.score_clip_attributes_batch(clip_batch):
+                    for attribute in top1:
+                        top1[attribute].append(max(scores[attribute], key=scores[attribute].get))
+
+    return {
+        "embeddings": {name: np.concatenate(chunks, axis=0) for name, chunks in embeddings.items()},
+        "top1": top1,
+        "timings": timings,
+    }
+
+
+def cosine_similarities(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """Row-wise cosine similarity between two embedding matrices"""
+    reference_norm = np.linalg.norm(reference, axis=1)
+    candidate_norm = np.linalg.norm(candidate, axis=1)
+    denominator = np.maximum(reference_norm * candidate_norm, 1e-12)
+    return np.einsum("ij,ij->i", reference, candidate) / denominator
+
+
+def _latency_summary(samples: List[float], batch_size: int) -> Dict[str, float]:
+    """Mean / p50 / p95 batch latency and per-image throughput"""
+    values = np.asarray(samples, dtype=np.float64)
+    mean_ms = float(values.mean())
+    return {
+        "mean_ms": round(mean_ms, 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "images_per_second": round(batch_size * 1000.0 / mean_ms, 2) if mean_ms else 0.0,
+    }
+
+
+def compare(reference: Dict[str, Any], optimized: Dict[str, Any], batch_size: int,
+            min_mean_cosine: float, min_worst_cosine: float, min_top1_agreement: float) -> Dict[str, Any]:
+    """Build the accuracy / latency report and the safe-to-enable verdict"""
+    failed_checks = []
+    accuracy: Dict[str, Any] = {"embeddings": {}, "top1_agreement": {}}
+
+    for name, reference_embeddings in reference["embeddings"].items():
+        similarities = cosine_similarities(reference_embeddings, optimized["embeddings"][name])
+        accuracy["embeddings"][name] = {
+            "mean_cosine": round(float(similarities.mean()), 5),
+            "worst_cosine": round(float(similarities.min()), 5),
+        }
+        if similarities.mean() < min_mean_cosine:
+            failed_checks.append(f"{name} mean cosine {similarities.mean():.4f} < {min_mean_cosine}")
+        if similarities.min() < min_worst_cosine:
+            failed_checks.append(f"{name} worst cosine {similarities.min():.4f} < {min_worst_cosine}")
+
+    for attribute, reference_labels in reference["top1"].items():
+        agreement = float(np.mean([a == b for a, b in zip(reference_labels, optimized["top1"][attribute])]))
+        accuracy["top1_agreement"][attribute] = round(agreement, 4)
+        if agreement < min_top1_agreement:
+            failed_checks.append(f"{attribute} top-1 agreement {agreement:.3f} < {min_top1_agreement}")
+
+    latency = {"fp32": {}, "optimized": {}}
+    speedup = {}
+    for name in reference["timings"]:
+        latency["fp32"][name] = _latency_summary(reference["timings"][name], batch_size)
+        latency["optimized"][name] = _latency_summary(optimized["timings"][name], batch_size)
+        speedup[name] = round(latency["fp32"][name]["mean_ms"] / max(latency["optimized"][name]["mean_ms"], 1e-9), 3)
+    total_reference = sum(item["mean_ms"] for item in latency["fp32"].values())
+    total_optimized = sum(item["mean_ms"] for item in latency["optimized"].values())
+    speedup["total"] = round(total_reference / max(total_optimized, 1e-9), 3)
+
+    return {
+        "accuracy": accuracy,
+        "latency": latency,
+        "speedup": speedup,
+        "thresholds": {
+            "min_mean_cosine": min_mean_cosine,
+            "min_worst_cosine": min_worst_cosine,
+            "min_top1_agreement": min_top1_agreement,
+        },
+        "failed_checks": failed_checks,
+        "safe_to_enable": not failed_checks,
+    }
+
+
+def run_benchmark(images: List[DecodedImage], optimization: InferenceOptimization,
+                  enabled_models: List[str], batch_size: int = 8, repeats: int = 3,
+                  min_mean_cosine: float = DEFAULT_MIN_MEAN_COSINE,
+                  min_worst_cosine: float = DEFAULT_MIN_WORST_COSINE,
+                  min_top1_agreement: float = DEFAULT_MIN_TOP1_AGREEMENT) -> Dict[str, Any]:
+    """
+    Compare an optimized analyzer against the fp32 reference on the given images.
+
+    Args:
+        images: Decoded local image set
+        optimization: Reduced-precision options under test
+        enabled_models: Models to compare ("resnet", "vit", "clip")
+        batch_size: Images per forward pass
+        repeats: Timed passes over the image set
+        min_mean_cosine: Minimum mean embedding cosine similarity per model
+        min_worst_cosine: Minimum per-image embedding cosine similarity per model
+        min_top1_agreement: Minimum share of images keeping the fp32 top-1 label per attribute
+
+    Returns:
+        Report dictionary including "safe_to_enable"
+    """
+    logger.info(f"📏 Benchmarking {optimization.describe()} on {len(images)} images")
+    reference_analyzer = ClothingImageAnalyzer(enabled_models=enabled_models)
+    reference = run_models(reference_analyzer, images, batch_size, repeats)
+    del reference_analyzer
+
+    optimized_analyzer = ClothingImageAnalyzer(enabled_models=enabled_models, optimization=optimization)
+    optimized = run_models(optimized_analyzer, images, batch_size, repeats)
+
+    report = compare(reference, optimized, batch_size, min_mean_cosine, min_worst_cosine, min_top1_agreement)
+    report.update({
+        "optimization": optimization.describe(),
+        "images": len(images),
+        "batch_size": batch_size,
+        "repeats": repeats,
+        "torch_threads": torch.get_num_threads(),
+    })
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point; returns 0 when the optimized mode is safe to enable"""
+    parser = argparse.ArgumentParser(description="Compare quantized/bf16 image inference against fp32")
+    parser.add_argument("--images", required=True, help="Directory with local test images")
+    parser.add_argument("--limit", type=int, default=0, help="Use at most this many images (0 = all)")
+    parser.add_argument("--quantization", default="int8", choices=["none", "int8"])
+    parser.add_argument("--resnet-channels-last", action="store_true")
+    parser.add_argument("--resnet-bf16", action="store_true")
+    parser.add_argument("--models", default="resnet,vit,clip", help="Comma separated models to compare")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-mean-cosine", type=float, default=DEFAULT_MIN_MEAN_COSINE)
+    parser.add_argument("--min-worst-cosine", type=float, default=DEFAULT_MIN_WORST_COSINE)
+    parser.add_argument("--min-top1-agreement", type=float, default=DEFAULT_MIN_TOP1_AGREEMENT)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    optimization = InferenceOptimization(
+        quantization=args.quantization,
+        resnet_channels_last=args.resnet_channels_last,
+        resnet_bfloat16=args.resnet_bf16
+    )
+    report = run_benchmark(
+        load_image_set(args.images, args.limit),
+        optimization,
+        enabled_models=[name.strip() for name in args.models.split(",") if name.strip()],
+        batch_size=args.batch_size,
+        repeats=args.repeats,
+        min_mean_cosine=args.min_mean_cosine,
+        min_worst_cosine=args.min_worst_cosine,
+        min_top1_agreement=args.min_top1_agreement
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output)
+    print(output)
+
+    if report["safe_to_enable"]:
+        logger.info(f"✅ Optimized mode is safe to enable (total speedup x{report['speedup']['total']})")
+        return 0
+    logger.warning(f"⚠️ Optimized mode failed accuracy checks: {report['failed_checks']}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# Shared test fixtures for the image processing service
+# A tiny deterministic CLIP stand-in, so analyzer tests never download model weights
+
+from types import SimpleNamespace
+
+# Import numpy for reading pixel data
+import numpy as np
+# Import pytest for fixtures
+import pytest
+# Import torch for the stub model tensors
+import torch
+
+STUB_EMBED_DIM = 16
+
+
+class StubCLIPProcessor:
+    """Tokenizes every distinct prompt to one id and reduces images to their mean colour"""
+
+    def __init__(self):
+        self.vocabulary = []
+
+    def __call__(self, text=None, images=None, return_tensors="pt", padding=False):
+        inputs = {}
+        if text is not None:
+            for prompt in text:
+                if prompt not in self.vocabulary:
+                    self.vocabulary.append(prompt)
+            inputs["input_ids"] = torch.tensor([[self.vocabulary.index(prompt)] for prompt in text])
+            inputs["attention_mask"] = torch.ones_like(inputs["input_ids"])
+        if images is not None:
+            means = [torch.from_numpy(np.asarray(image.convert("RGB"), dtype=np.float32)).mean(dim=(0, 1)) / 255
+                     for image in images]
+            inputs["pixel_values"] = torch.stack(means)[:, :, None, None]
+        return inputs
+
+
+class StubCLIPModel:
+    """Seeded text/image towers with the CLIPModel call signatures the analyzer uses"""
+
+    def __init__(self):
+        generator = torch.Generator().manual_seed(0)
+        self.image_projection = torch.randn(3, STUB_EMBED_DIM, generator=generator)
+        self.image_bias = torch.randn(STUB_EMBED_DIM, generator=generator)
+        self.text_feature_calls = 0
+        self.image_feature_calls = 0
+
+    def get_text_features(self, input_ids, attention_mask=None):
+        self.text_feature_calls += 1
+        return torch.stack([
+            torch.randn(STUB_EMBED_DIM, generator=torch.Generator().manual_seed(1000 + int(token)))
+            for token in input_ids[:, 0]
+        ])
+
+    def get_image_features(self, pixel_values):
+        self.image_feature_calls += 1
+        return pixel_values.mean(dim=(2, 3)) @ self.image_projection + self.image_bias
+
+    def __call__(self, input_ids, pixel_values, attention_mask=None):
+        # Joint forward pass as CLIPModel returns it: normalised embeddings of both towers
+        return SimpleNamespace(
+            image_embeds=torch.nn.functional.normalize(self.get_image_features(pixel_values), dim=-1),
+            text_embeds=torch.nn.functional.normalize(self.get_text_features(input_ids), dim=-1),
+        )
+
+
+@pytest.fixture
+def make_stub_analyzer():
+    """Factory building a ClothingImageAnalyzer backed by the stub CLIP model"""
+    # Imported here so tests that never build an analyzer do not import transformers
+    from image_analyzer import ClothingImageAnalyzer
+
+    class StubCLIPAnalyzer(ClothingImageAnalyzer):
+        """Analyzer with stub model loaders that record every load"""
+
+        def __init__(self, *args, **kwargs):
+            self.load_calls = []
+            super().__init__(*args, **kwargs)
+
+        def _load_resnet(self):
+            self.load_calls.append("resnet")
+            return {"resnet_model": torch.nn.Identity()}
+
+        def _load_vit(self):
+            self.load_calls.append("vit")
+            return {"vit_model": torch.nn.Identity()}
+
+        def _load_clip(self):
+            self.load_calls.append("clip")
+            clip_model, clip_processor = StubCLIPModel(), StubCLIPProcessor()
+            self._build_attribute_text_embeddings(clip_model, clip_processor)
+            return {"clip_model": clip_model, "clip_processor": clip_processor}
+
+    return StubCLIPAnalyzer
@@ -0,0 +1,119 @@
+# Unit tests for the content-addressed analysis cache
+# The cache is pure Python/numpy, so no AI models are needed here
+
+# Import pytest testing framework
+import pytest
+# Import numpy for feature vector checks
+import numpy as np
+# Import PIL for creating test images
+from PIL import Image
+
+# Import the cache components under test
+from analysis_cache import (
+    AnalysisCache,
+    compute_image_key,
+    decode_analysis_entry,
+    encode_analysis_entry,
+)
+
+
+def make_analysis_result(seed=0):
+    """Create a small analysis dictionary shaped like ClothingImageAnalyzer output"""
+    rng = np.random.default_rng(seed)
+    return {
+        "detected_items": [{"category": "shirt", "confidence": 0.92}],
+        "features": {
+            "resnet_features": rng.random(16).astype(np.float32).tolist(),
+            "vit_features": rng.random(8).astype(np.float32).tolist(),
+            "clip_embedding": rng.random(4).astype(np.float32).tolist(),
+            "feature_dimensions": {"resnet": 16, "vit": 8, "clip": 4},
+        },
+        "style_analysis": {"dominant_style": "casual", "style_confidence": 0.61},
+    }
+
+
+def test_image_key_depends_on_pixels_and_model_version():
+    """Test that the key changes with pixel content and model version, not with encoding"""
+    red = Image.new("RGB", (32, 32), (255, 0, 0))
+    same_red = Image.new("RGB", (32, 32), (255, 0, 0))
+    blue = Image.new("RGB", (32, 32), (0, 0, 255))
+
+    assert compute_image_key(red, "v1") == compute_image_key(same_red, "v1")
+    assert compute_image_key(red, "v1") != compute_image_key(blue, "v1")
+    assert compute_image_key(red, "v1") != compute_image_key(red, "v2")
+
+
+def test_binary_entry_roundtrip():
+    """Test that the binary disk layout restores vectors and metadata"""
+    result = make_analysis_result()
+    restored = decode_analysis_entry(encode_analysis_entry(result))
+
+    assert restored["detected_items"] == result["detected_items"]
+    assert restored["style_analysis"] == result["style_analysis"]
+    for name in ("resnet_features", "vit_features", "clip_embedding"):
+        np.testing.assert_allclose(restored["features"][name], result["features"][name])
+
+
+def test_binary_entry_roundtrip_with_per_item_vectors():
+    """Test that per-garment vectors of a per-item analysis survive the disk layout"""
+    result = make_analysis_result()
+    item_vector = np.arange(6, dtype=np.float32)
+    result["items"] = [{"category": "shirt", "features": {"clip_embedding": item_vector}}]
+
+    restored = decode_analysis_entry(encode_analysis_entry(result))
+
+    assert restored["items"][0]["category"] == "shirt"
+    np.testing.assert_array_equal(restored["items"][0]["features"]["clip_embedding"], item_vector)
+    assert result["items"][0]["features"]["clip_embedding"] is item_vector  # input left intact
+
+
+def test_memory_tier_evicts_least_recently_used():
+    """Test LRU eviction and hit ratio accounting"""
+    cache = AnalysisCache(max_memory_entries=2)
+    cache.put("a", make_analysis_result(1))
+    cache.put("b", make_analysis_result(2))
+    assert cache.get("a") is not None  # "a" becomes most recently used
+    cache.put("c", make_analysis_result(3))  # evicts "b"
+
+    assert cache.get("b") is None
+    stats = cache.get_stats()
+    assert stats["memory_entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hit_ratio"] == pytest.approx(0.5)
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Test that entries written to disk are served by a fresh cache instance"""
+    first = AnalysisCache(max_memory_entries=4, disk_dir=str(tmp_path))
+    first.put("abcdef", make_analysis_result(5))
+
+    second = AnalysisCache(max_memory_entries=4, disk_dir=str(tmp_path))
+    restored = second.get("abcdef")
+
+    assert restored is not None
+    assert second.get_stats()["disk_hits"] == 1
+    assert second.get_stats()["disk_entries"] == 1
+    np.testing.assert_allclose(restored["features"]["clip_embedding"],
+                               make_analysis_result(5)["features"]["clip_embedding"])
+
+
+def test_disk_tier_evicts_oldest_entries_beyond_byte_budget(tmp_path):
+    """Test that the disk tier deletes the oldest writes once its byte budget is exceeded"""
+    entry_bytes = len(encode_analysis_entry(make_analysis_result(0)))
+    cache = AnalysisCache(max_memory_entries=0, disk_dir=str(tmp_path), max_disk_bytes=2 * entry_bytes)
+    for key in ("aa01", "bb02", "cc03"):
+        cache.put(key, make_analysis_result(0))
+
+    assert cache.get("aa01") is None
+    assert cache.get("bb02") is not None and cache.get("cc03") is not None
+    assert sorted(path.name for path in tmp_path.rglob("*.bin")) == ["bb02.bin", "cc03.bin"]
+    stats = cache.get_stats()
+    assert stats["disk_entries"] == 2
+    assert stats["disk_bytes"] == 2 * entry_bytes
+    assert stats["disk_evictions"] == 1
+
+    # A smaller budget after a restart trims the existing tier oldest-first
+    restarted = AnalysisCache(max_memory_entries=0, disk_dir=str(tmp_path), max_disk_bytes=entry_bytes)
+    assert restarted.get("bb02") is None
+    assert restarted.get("cc03") is not None
+    assert restarted.get_stats()["disk_entries"] == 1
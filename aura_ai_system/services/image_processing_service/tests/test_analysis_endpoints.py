@@ -0,0 +1,148 @@
+# API tests for the image analysis endpoints
+# The deep analyzer is replaced by a fake analysis or the stub CLIP model, so no AI models are loaded
+
+# Import io for in-memory image uploads
+import io
+# Import threading to hold the background model preload
+import threading
+# Import time for polling the readiness probe
+import time
+
+# Import numpy for the fake feature vectors
+import numpy as np
+# Import pytest for fixtures
+import pytest
+# Import FastAPI test client for API endpoint testing
+from fastapi.testclient import TestClient
+# Import PIL for creating test images
+from PIL import Image
+
+# Import the service and the vector decoding helpers
+import main
+from embedding_encoding import decode_vector, parse_multipart_body
+
+RESNET_FEATURES = np.linspace(-1.0, 1.0, 8, dtype=np.float32)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with a fake deep analysis recording the decoded uploads it receives"""
+    calls, decoded_images = [], []
+
+    async def fake_deep_analysis(decoded_image, per_item=False, source=None):
+        calls.append({"size": decoded_image.size, "per_item": per_item, "source": source})
+        decoded_images.append(decoded_image)
+        return {"features": {"resnet_features": RESNET_FEATURES.copy()}, "model_versions": {"resnet": "fake"}}
+
+    monkeypatch.setattr(main.inference_config, "deep_analysis_enabled", False)
+    monkeypatch.setattr(main, "_run_deep_analysis", fake_deep_analysis)
+    with TestClient(main.app) as test_client:
+        test_client.deep_analysis_calls = calls
+        test_client.decoded_images = decoded_images
+        yield test_client
+
+
+def upload(color=(200, 30, 40)):
+    """Multipart file field holding a small JPEG"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (96, 128), color).save(buffer, "JPEG")
+    return {"image": ("shirt.jpg", buffer.getvalue(), "image/jpeg")}
+
+
+@pytest.mark.parametrize("path", ["/analyze_image", "/analyze_image_advanced"])
+def test_json_response_carries_deep_analysis(client, path):
+    """Test that both upload routes succeed and return the deep analysis vectors as JSON lists"""
+    response = client.post(f"{path}?per_item=true", files=upload(), data={"fashion_context": "casual"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "error" not in body
+    assert body["deep_analysis"]["features"]["resnet_features"] == pytest.approx(RESNET_FEATURES.tolist())
+    assert client.deep_analysis_calls == [{"size": (96, 128), "per_item": True, "source": "shirt.jpg"}]
+
+
+@pytest.mark.parametrize("path", ["/analyze_image", "/analyze_image_advanced"])
+def test_float16_base64_vectors(client, path):
+    """Test that vector_format=float16 returns base64 blobs decoding to the original vectors"""
+    response = client.post(f"{path}?vector_format=float16", files=upload())
+
+    assert response.status_code == 200
+    blob = response.json()["deep_analysis"]["features"]["resnet_features"]
+    assert blob["encoding"] == "base64" and blob["dtype"] == "float16"
+    np.testing.assert_allclose(decode_vector(blob), RESNET_FEATURES, atol=1e-3)
+
+
+@pytest.mark.parametrize("path", ["/analyze_image", "/analyze_image_advanced"])
+def test_npy_multipart_response(client, path):
+    """Test that Accept: multipart/mixed returns the JSON payload plus one .npy part per vector"""
+    response = client.post(path, files=upload(), headers={"Accept": "multipart/mixed"})
+
+    assert response.status_code == 200
+    document, vectors = parse_multipart_body(response.content, response.headers["content-type"])
+    assert document["deep_analysis"]["features"]["resnet_features"]["encoding"] == "npy"
+    np.testing.assert_array_equal(vectors["resnet_features"], RESNET_FEATURES)
+
+
+def test_advanced_route_rejects_invalid_user_preferences(client):
+    """Test that malformed JSON in the user_preferences form field is a client error"""
+    response = client.post("/analyze_image_advanced", files=upload(), data={"user_preferences": "{not json"})
+
+    assert response.status_code == 400
+
+
+def test_prompt_engine_reuses_the_decoded_upload(client, monkeypatch):
+    """Test that /analyze_image hands the prompt engine the same DecodedImage as the deep analysis"""
+    engine = main.enhanced_cv_engine
+    analyze = engine.analyze_fashion_image
+
+    async def spy(image_data, *args, **kwargs):
+        client.decoded_images.append(image_data)
+        return await analyze(image_data, *args, **kwargs)
+
+    monkeypatch.setattr(engine, "analyze_fashion_image", spy)
+    response = client.post("/analyze_image", files=upload())
+
+    assert response.status_code == 200 and response.json()["success"] is True
+    first, second = client.decoded_images
+    assert isinstance(first, main.DecodedImage)
+    assert first is second
+
+
+def test_ready_reports_503_until_preload_and_warmup_finish(make_stub_analyzer, monkeypatch):
+    """Test that startup builds the analyzer without models and /ready flips to 200 after warmup"""
+    release_preload = threading.Event()
+
+    class GatedAnalyzer(make_stub_analyzer):
+        def _load_clip(self):
+            assert release_preload.wait(timeout=10)
+            return super()._load_clip()
+
+    for name in ("deep_image_analyzer", "deep_analysis_scheduler", "deep_item_scheduler",
+                 "deep_analysis_cache", "near_duplicate_index", "deep_analyzer_warmup_task"):
+        monkeypatch.setattr(main, name, None)
+    monkeypatch.setattr(main, "deep_analyzer_warmup_info", {})
+    monkeypatch.setattr(main, "ClothingImageAnalyzer", GatedAnalyzer)
+    monkeypatch.setattr(main.inference_config, "deep_analysis_enabled", True)
+    monkeypatch.setattr(main.inference_config, "cache_enabled", False)
+    monkeypatch.setattr(main.inference_config, "preload_models", ["clip"])
+    monkeypatch.setattr(main.inference_config, "warmup_on_startup", True)
+
+    with TestClient(main.app) as test_client:
+        response = test_client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+        assert response.json()["resident_models"] == []
+        assert main.deep_image_analyzer.load_calls == []
+
+        release_preload.set()
+        deadline = time.monotonic() + 10
+        while test_client.get("/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        response = test_client.get("/ready")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["ready"] is True and body["warmed_up"] is True
+        assert body["resident_models"] == ["clip"]
+        assert body["warmup"]["resident_models"] == ["clip"]
+        assert main.deep_image_analyzer.load_calls == ["clip"]
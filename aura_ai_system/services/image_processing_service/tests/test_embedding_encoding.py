@@ -0,0 +1,84 @@
+# Unit tests for embedding content negotiation and binary encodings
+# Pure numpy / JSON helpers, so no AI models are needed here
+
+# Import pytest testing framework
+import pytest
+# Import numpy for vector checks
+import numpy as np
+
+# Import the encoding helpers under test
+from embedding_encoding import (
+    build_multipart_body,
+    decode_vector,
+    format_analysis_vectors,
+    negotiate_vector_format,
+    parse_multipart_body,
+    split_analysis_vectors,
+)
+
+
+def make_analysis_result():
+    """Create an analysis dictionary with float32 vectors like the batching scheduler returns"""
+    rng = np.random.default_rng(0)
+    return {
+        "features": {
+            "resnet_features": rng.standard_normal(2048).astype(np.float32),
+            "vit_features": rng.standard_normal(768).astype(np.float32),
+            "clip_embedding": rng.standard_normal(512).astype(np.float32),
+            "feature_dimensions": {"resnet": 2048, "vit": 768, "clip": 512},
+        },
+        "summary": {"primary_description": "red solid casual clothing"},
+    }
+
+
+def test_negotiation_prefers_query_parameter_then_accept_header():
+    """Test format selection from the query parameter and Accept header"""
+    assert negotiate_vector_format(None) == "json"
+    assert negotiate_vector_format("application/json") == "json"
+    assert negotiate_vector_format("application/vnd.aura.embeddings+json; dtype=float16") == "float16"
+    assert negotiate_vector_format("application/vnd.aura.embeddings+json") == "float32"
+    assert negotiate_vector_format("multipart/mixed, application/json") == "npy"
+    assert negotiate_vector_format("multipart/mixed", vector_format="float16") == "float16"
+    with pytest.raises(ValueError):
+        negotiate_vector_format(None, vector_format="xml")
+
+
+def test_base64_vectors_roundtrip_without_touching_the_source():
+    """Test float32 / float16 blobs decode back to the original vectors"""
+    result = make_analysis_result()
+    original = result["features"]["clip_embedding"]
+
+    exact = format_analysis_vectors(result, "float32")
+    half = format_analysis_vectors(result, "float16")
+
+    np.testing.assert_array_equal(decode_vector(exact["features"]["clip_embedding"]), original)
+    np.testing.assert_allclose(decode_vector(half["features"]["clip_embedding"]), original, atol=1e-2)
+    assert result["features"]["clip_embedding"] is original  # shared cache entries stay intact
+
+
+def test_multipart_npy_body_roundtrip():
+    """Test that the multipart body carries the JSON document and one .npy part per vector"""
+    result = make_analysis_result()
+    stripped, vectors = split_analysis_vectors(result)
+    body, content_type = build_multipart_body({"deep_analysis": stripped}, vectors)
+
+    document, parsed = parse_multipart_body(body, content_type)
+
+    assert content_type.startswith("multipart/mixed; boundary=")
+    assert document["deep_analysis"]["features"]["vit_features"] == {"encoding": "npy", "part": "vit_features"}
+    for name, vector in vectors.items():
+        np.testing.assert_array_equal(parsed[name], vector)
+
+
+def test_per_item_vectors_become_named_parts():
+    """Test that garment vectors of a per-item analysis get their own multipart parts"""
+    result = make_analysis_result()
+    item_vector = np.ones(512, dtype=np.float32)
+    result["items"] = [{"category": "shirt", "features": {"clip_embedding": item_vector}}]
+
+    stripped, vectors = split_analysis_vectors(result)
+    half = format_analysis_vectors(result, "float16")
+
+    assert stripped["items"][0]["features"]["clip_embedding"] == {"encoding": "npy", "part": "items.0.clip_embedding"}
+    np.testing.assert_array_equal(vectors["items.0.clip_embedding"], item_vector)
+    np.testing.assert_array_equal(decode_vector(half["items"][0]["features"]["clip_embedding"]), item_vector)
@@ -0,0 +1,52 @@
+# Unit tests for the clothing image analyzer
+# The CLIP model is the deterministic stub from conftest.py, so no weights are downloaded
+
+# Import pytest for approximate comparisons
+import pytest
+# Import torch for the reference cosine similarity
+import torch
+# Import PIL for creating test images
+from PIL import Image
+
+
+def per_label_score(analyzer, attribute, label, image):
+    """Previous scoring: one joint CLIP forward pass per label and a cosine similarity"""
+    prompt = analyzer.attribute_prompt_templates[attribute].format(label)
+    inputs = analyzer.clip_processor(text=[prompt], images=[image], return_tensors="pt", padding=True)
+    outputs = analyzer.clip_model(**inputs)
+    similarity = torch.cosine_similarity(outputs.image_embeds, outputs.text_embeds).item()
+    return max(0.0, (similarity + 1) / 2)
+
+
+def test_single_pass_scores_match_per_label_scoring(make_stub_analyzer):
+    """Test that the precomputed text matrix gives the per-label style, color and pattern scores"""
+    analyzer = make_stub_analyzer(preload_models=["clip"])
+    images = [Image.new("RGB", (64, 64), (200, 30, 40)), Image.new("RGB", (64, 64), (20, 60, 160))]
+
+    batch_scores = analyzer.score_clip_attributes_batch(analyzer.encode_clip_images(images))
+
+    assert analyzer.clip_model.text_feature_calls == 1
+    assert analyzer.clip_model.image_feature_calls == 1
+    assert len(batch_scores) == len(images)
+    for image, scores in zip(images, batch_scores):
+        for attribute, labels in analyzer._attribute_vocabularies().items():
+            assert list(scores[attribute]) == labels
+            for label in labels:
+                expected = per_label_score(analyzer, attribute, label, image)
+                assert scores[attribute][label] == pytest.approx(expected, abs=1e-6)
+    assert batch_scores[0] != batch_scores[1]
+
+
+def test_models_load_lazily_after_construction(make_stub_analyzer):
+    """Test that an empty preload list loads nothing and first use loads only the model it needs"""
+    analyzer = make_stub_analyzer(preload_models=[])
+
+    assert analyzer.load_calls == []
+    assert analyzer.resident_models == []
+    assert not any(status["resident"] for status in analyzer.get_model_status().values())
+
+    analyzer.score_clip_attributes(analyzer.encode_clip_image(Image.new("RGB", (64, 64), (90, 90, 90))))
+
+    assert analyzer.load_calls == ["clip"]
+    assert analyzer.resident_models == ["clip"]
+    assert analyzer.get_model_status()["clip"]["load_time_ms"] is not None
@@ -0,0 +1,83 @@
+# Unit tests for the shared decode-once preprocessing stage
+# These tests only need Pillow and numpy (plus torch for tensor outputs)
+
+# Import IO operations for creating encoded test images
+import io
+# Import pytest testing framework
+import pytest
+# Import numpy for array checks
+import numpy as np
+# Import PIL for creating test images
+from PIL import Image
+
+# Import the preprocessing stage under test
+from image_preprocessing import DecodedImage
+
+
+def encode_test_image(width, height, image_format="JPEG"):
+    """Create an encoded gradient image of the given size"""
+    gradient = np.linspace(0, 255, width * height * 3).reshape(height, width, 3).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(gradient).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def test_large_jpeg_uses_draft_decoding():
+    """Test that large JPEGs are decoded at a reduced scale that still covers the target size"""
+    decoded = DecodedImage.from_bytes(encode_test_image(4000, 3000), min_size=640)
+
+    assert decoded.original_size == (4000, 3000)
+    assert decoded.size[0] < 4000
+    assert min(decoded.size) >= 640
+
+
+def test_png_is_decoded_at_full_size():
+    """Test that non-JPEG formats keep their original resolution"""
+    decoded = DecodedImage.from_bytes(encode_test_image(300, 200, "PNG"))
+
+    assert decoded.size == (300, 200)
+    assert decoded.source_format == "PNG"
+
+
+def test_derived_arrays_are_shared_read_only_views():
+    """Test that repeated requests for a resolution return the same read-only buffer"""
+    decoded = DecodedImage.from_bytes(encode_test_image(800, 600))
+
+    first = decoded.array((512, 512))
+    second = decoded.array((512, 512))
+
+    assert first is second
+    assert first.shape == (512, 512, 3)
+    assert not first.flags.writeable
+    with pytest.raises(ValueError):
+        first[0, 0, 0] = 1
+
+
+def test_from_any_reuses_decoded_image():
+    """Test that an already decoded upload is passed through unchanged"""
+    decoded = DecodedImage.from_bytes(encode_test_image(64, 64, "PNG"))
+
+    assert DecodedImage.from_any(decoded) is decoded
+
+
+def test_model_tensors_have_expected_shapes():
+    """Test the ImageNet and CLIP tensors built from the shared decode"""
+    pytest.importorskip("torch")
+    decoded = DecodedImage.from_bytes(encode_test_image(500, 333))
+
+    assert tuple(decoded.imagenet_tensor(224).shape) == (3, 224, 224)
+    assert tuple(decoded.clip_pixel_values().shape) == (3, 224, 224)
+
+
+def test_grayscale_can_be_derived_from_a_memoised_resolution():
+    """Test that small luminance buffers reuse an engine's resolution and are memoised"""
+    decoded = DecodedImage.from_bytes(encode_test_image(300, 200, "PNG"))
+    base = decoded.float_array((512, 512), Image.Resampling.LANCZOS)
+
+    gray = decoded.grayscale((128, 128), base_size=(512, 512), base_resample=Image.Resampling.LANCZOS)
+    expected = np.asarray(Image.fromarray((base * 255).round().astype(np.uint8)).convert("L").reduce(4))
+
+    assert gray.shape == (128, 128)
+    assert not gray.flags.writeable
+    assert np.abs(gray.astype(int) - expected.astype(int)).max() <= 1
+    assert decoded.grayscale((128, 128), base_size=(512, 512), base_resample=Image.Resampling.LANCZOS) is gray
@@ -0,0 +1,50 @@
+# Unit tests for the reduced-precision CPU inference options
+# Small hand-built torch modules stand in for ViT / CLIP / ResNet here
+
+# Import pytest testing framework
+import pytest
+# Import torch for building test modules
+import torch
+
+# Import the optimization helpers under test
+from model_optimization import (
+    InferenceOptimization,
+    optimize_resnet,
+    prepare_resnet_input,
+    quantize_linear_layers,
+)
+
+
+def test_int8_quantization_keeps_outputs_close_and_original_intact():
+    """Test that dynamic int8 linear layers approximate the fp32 module without modifying it"""
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(64, 128), torch.nn.GELU(), torch.nn.Linear(128, 32)).eval()
+    inputs = torch.randn(8, 64)
+
+    quantized = quantize_linear_layers(model)
+    with torch.no_grad():
+        reference, approximate = model(inputs), quantized(inputs)
+
+    assert isinstance(model[0], torch.nn.Linear)  # the fp32 model is untouched
+    assert torch.nn.functional.cosine_similarity(reference, approximate).min() > 0.99
+
+
+def test_bfloat16_resnet_path_implies_channels_last():
+    """Test that bf16 ResNet execution converts both weights and inputs"""
+    optimization = InferenceOptimization(resnet_bfloat16=True)
+    assert optimization.resnet_channels_last
+    assert optimization.enabled
+
+    model = optimize_resnet(torch.nn.Sequential(torch.nn.Conv2d(3, 4, 3)).eval(), optimization)
+    batch = prepare_resnet_input(torch.randn(2, 3, 16, 16), optimization)
+
+    assert batch.dtype == torch.bfloat16
+    assert batch.is_contiguous(memory_format=torch.channels_last)
+    assert model(batch).dtype == torch.bfloat16
+
+
+def test_unknown_quantization_mode_is_rejected():
+    """Test that configuration typos fail loudly instead of silently running fp32"""
+    with pytest.raises(ValueError):
+        InferenceOptimization(quantization="int4")
+    assert InferenceOptimization().version_tag() != InferenceOptimization(quantization="int8").version_tag()
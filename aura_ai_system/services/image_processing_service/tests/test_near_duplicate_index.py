@@ -0,0 +1,109 @@
+# Unit tests for the perceptual-hash near-duplicate index
+# Hashing and the index are pure numpy / PIL, so no AI models are needed here
+
+# Import io for in-memory JPEG re-encoding
+import io
+
+# Import numpy for synthetic test images
+import numpy as np
+# Import PIL for creating and editing test images
+from PIL import Image, ImageDraw, ImageFilter
+
+# Import the components under test
+from image_preprocessing import DecodedImage
+from near_duplicate_index import (
+    ImageHashes,
+    NearDuplicateIndex,
+    compute_image_hashes,
+    hamming_distance,
+)
+
+
+def make_scene(seed):
+    """Create a smooth synthetic photo with a few coloured blobs"""
+    rng = np.random.default_rng(seed)
+    image = Image.new("RGB", (480, 640), tuple(int(value) for value in rng.integers(0, 255, 3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(10):
+        x, y = rng.integers(0, 400), rng.integers(0, 560)
+        draw.ellipse([x, y, x + 160, y + 120], fill=tuple(int(value) for value in rng.integers(0, 255, 3)))
+    return image.filter(ImageFilter.GaussianBlur(3))
+
+
+def test_hashes_survive_reencoding_crops_and_watermarks():
+    """Test that edited copies stay close while different photos stay far apart"""
+    original = make_scene(0)
+    reference = compute_image_hashes(DecodedImage(original))
+
+    buffer = io.BytesIO()
+    original.save(buffer, "JPEG", quality=60)
+    watermarked = original.copy()
+    ImageDraw.Draw(watermarked).text((20, 600), "SHOP (c) 2024", fill=(255, 255, 255))
+    variants = [
+        DecodedImage.from_bytes(buffer.getvalue()),
+        DecodedImage(original.crop((10, 12, 470, 628))),
+        DecodedImage(watermarked),
+    ]
+
+    for variant in variants:
+        assert hamming_distance(reference.phash, compute_image_hashes(variant).phash) <= 10
+    assert hamming_distance(reference.phash, compute_image_hashes(DecodedImage(make_scene(1))).phash) > 10
+
+
+def test_index_groups_near_duplicates_into_clusters():
+    """Test cluster creation, matching and the duplicate cluster report"""
+    index = NearDuplicateIndex(max_distance=4, max_dhash_distance=4)
+    base = ImageHashes(phash=0x0F0F0F0F0F0F0F0F, dhash=0x00FF00FF00FF00FF)
+    near = ImageHashes(phash=base.phash ^ 0b111, dhash=base.dhash ^ 0b1)
+    other = ImageHashes(phash=~base.phash & (2 ** 64 - 1), dhash=base.dhash)
+
+    cluster, distance = index.match_or_add(base, "a.jpg")
+    assert distance is None
+    assert index.match_or_add(near, "a_copy.jpg") == (cluster, 3)
+    assert index.match_or_add(other, "b.jpg")[1] is None
+
+    clusters = index.duplicate_clusters()
+    assert len(clusters) == 1
+    assert [member["source"] for member in clusters[0]["members"]] == ["a.jpg", "a_copy.jpg"]
+    assert index.get_stats()["clusters"] == 2
+
+
+def test_dhash_rejects_phash_collisions():
+    """Test that a pHash match with a very different dHash is not a duplicate"""
+    index = NearDuplicateIndex(max_distance=4, max_dhash_distance=4)
+    index.match_or_add(ImageHashes(phash=1, dhash=0))
+
+    _, distance = index.match_or_add(ImageHashes(phash=1, dhash=2 ** 64 - 1))
+
+    assert distance is None
+    assert index.get_stats()["near_duplicates"] == 0
+
+
+def make_shirt(color):
+    """Create a flat product shot of a shirt in the given colour"""
+    image = Image.new("RGB", (480, 640), (245, 245, 245))
+    ImageDraw.Draw(image).polygon(
+        [(140, 120), (340, 120), (420, 220), (360, 260), (340, 230),
+         (340, 560), (140, 560), (140, 230), (120, 260), (60, 220)],
+        fill=color,
+    )
+    return image
+
+
+def test_recoloured_product_is_not_reused():
+    """Test that colour variants with matching luminance hashes start their own cluster"""
+    index = NearDuplicateIndex()
+    red = compute_image_hashes(DecodedImage(make_shirt((200, 30, 40))))
+    navy = compute_image_hashes(DecodedImage(make_shirt((20, 30, 90))))
+    red_reencoded = compute_image_hashes(DecodedImage(make_shirt((190, 35, 45))))
+    assert hamming_distance(red.phash, navy.phash) <= index.max_distance
+
+    red_cluster, _ = index.match_or_add(red, "red.jpg")
+    index.attach_analysis(red_cluster, "frame", "red-analysis")
+    navy_cluster, navy_distance = index.match_or_add(navy, "navy.jpg")
+
+    assert navy_distance is None
+    assert navy_cluster is not red_cluster
+    assert "frame" not in navy_cluster.analysis_keys
+    assert index.match_or_add(red_reencoded, "red_copy.jpg")[0] is red_cluster
+    assert index.get_stats()["color_mismatches"] == 1
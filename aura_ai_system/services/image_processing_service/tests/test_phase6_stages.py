@@ -0,0 +1,106 @@
+# Unit tests for the concurrent stage graph of the Phase 6 multi-modal analysis
+# Stage functions are replaced by timed fakes, the simulated models stay in place
+
+# Import asyncio for running the event loop in tests
+import asyncio
+# Import threading to track concurrently running stages
+import threading
+# Import time for simulated stage latency
+import time
+
+# Import numpy for the test image array
+import numpy as np
+# Import pytest for exception assertions
+import pytest
+# Import FastAPI's HTTPException raised on stage failures
+from fastapi import HTTPException
+
+# Import the multi-modal system and its request model
+from main import Phase6ImageAnalysisRequest, Phase6MultiModalSystem
+
+STAGE_SECONDS = 0.2
+
+
+class StageTracker:
+    """Wraps stage functions to record call order and the peak number of concurrent stages"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak_running = 0
+        self.started = []
+
+    def wrap(self, name, fn, seconds=STAGE_SECONDS):
+        def stage(*args):
+            with self.lock:
+                self.started.append(name)
+                self.running += 1
+                self.peak_running = max(self.peak_running, self.running)
+            try:
+                time.sleep(seconds)
+                return fn(*args)
+            finally:
+                with self.lock:
+                    self.running -= 1
+        return stage
+
+
+def make_system(monkeypatch, tracker, clip_seconds=STAGE_SECONDS):
+    """Phase 6 system whose image-only stages each take STAGE_SECONDS (CLIP: clip_seconds)"""
+    system = Phase6MultiModalSystem()
+    monkeypatch.setattr(system.detectron2_model, "detect_fashion_items",
+                        tracker.wrap("detectron2", system.detectron2_model.detect_fashion_items))
+    monkeypatch.setattr(system, "_run_clip_models", tracker.wrap("clip", system._run_clip_models, clip_seconds))
+    monkeypatch.setattr(system, "_analyze_colors_advanced",
+                        tracker.wrap("color_analysis", system._analyze_colors_advanced))
+    return system
+
+
+IMAGE = np.random.default_rng(0).integers(0, 256, size=(64, 64, 3), dtype=np.uint8)
+
+
+def test_independent_stages_run_concurrently_and_record_timings(monkeypatch):
+    """Test that detection, CLIP and colors overlap and every stage reports its own time"""
+    tracker = StageTracker()
+    system = make_system(monkeypatch, tracker)
+
+    response = asyncio.run(system.analyze_image_multimodal(IMAGE, Phase6ImageAnalysisRequest()))
+
+    metrics = response.performance_metrics
+    timings = metrics["stage_timings_ms"]
+    assert set(timings) == {"detectron2", "clip", "color_analysis", "transformer", "style_analysis", "fusion"}
+    for name in ("detectron2", "clip", "color_analysis"):
+        assert timings[name] >= STAGE_SECONDS * 1000
+    assert tracker.peak_running == 3
+    assert metrics["sequential_stage_time_ms"] >= 3 * STAGE_SECONDS * 1000
+    assert metrics["wall_time_ms"] < 2 * STAGE_SECONDS * 1000
+    assert metrics["clip_inference_time"] == f"{timings['clip']}ms"
+
+
+def test_failed_stage_cancels_its_siblings(monkeypatch):
+    """Test that the first failing stage cancels the others before the error is reported"""
+    tracker = StageTracker()
+    # CLIP finishes first so the transformer fails while detection is still running
+    system = make_system(monkeypatch, tracker, clip_seconds=0.0)
+
+    def failing_transformer(*args):
+        raise RuntimeError("transformer crashed")
+
+    style_calls = []
+    monkeypatch.setattr(system.transformer_model, "analyze_semantic_context", failing_transformer)
+    monkeypatch.setattr(system, "_analyze_style_with_ai", lambda *args: style_calls.append(args) or {})
+
+    async def scenario():
+        with pytest.raises(HTTPException) as error:
+            await system.analyze_image_multimodal(IMAGE, Phase6ImageAnalysisRequest())
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        # Let the already running detection thread finish: style must still never start
+        await asyncio.sleep(2 * STAGE_SECONDS)
+        return error.value, pending
+
+    error, pending = asyncio.run(scenario())
+
+    assert error.status_code == 500
+    assert "transformer crashed" in error.detail
+    assert pending == []
+    assert style_calls == []
@@ -0,0 +1,40 @@
+# Unit tests for the offline image pipeline benchmark
+# The model stages are skipped here (no analyzer), so no model weights are needed
+
+# Import the benchmark helpers under test
+from pipeline_benchmark import (
+    benchmark_image_set,
+    compare_with_baseline,
+    synthetic_image_set,
+)
+
+
+def test_model_free_run_reports_percentiles_per_stage():
+    """Test that decode, preprocess and serialisation are timed with percentiles per batch size"""
+    encoded = synthetic_image_set("320x240", count=2)
+
+    runs = benchmark_image_set(None, "synthetic_320x240", encoded, batch_sizes=[1, 3],
+                               repeats=2, warmup=0, vector_formats=["json", "float16"])
+
+    assert [run["batch_size"] for run in runs] == [1, 3]
+    stages = runs[1]["stages"]
+    assert {"decode", "preprocess", "serialize_json", "serialize_float16"} <= set(stages)
+    assert stages["decode"]["samples"] == 2
+    assert stages["decode"]["p50_ms"] <= stages["decode"]["p99_ms"]
+    assert runs[1]["end_to_end"]["images_per_second"] > 0
+
+
+def test_baseline_comparison_flags_regressed_stages():
+    """Test that p50 ratios above the threshold are reported as regressions"""
+    def report(decode_ms, encode_ms):
+        summary = lambda p50: {"p50_ms": p50}
+        return {"runs": [{
+            "image_set": "bundled", "batch_size": 8,
+            "stages": {"decode": summary(decode_ms), "serialize_json": summary(encode_ms)},
+            "end_to_end": summary(decode_ms + encode_ms),
+        }]}
+
+    comparison = compare_with_baseline(report(10.0, 5.0), report(10.0, 2.0), regression_threshold=1.1)
+
+    assert [entry["stage"] for entry in comparison["regressions"]] == ["serialize_json", "end_to_end"]
+    assert len(comparison["p50_ratios"]) == 3
@@ -20,6 +20,7 @@ import json
 import time
 from datetime import datetime
 from typing import Dict, List, Any
+import hashlib
 from unittest.mock import AsyncMock, MagicMock, patch
 import tempfile
 import os
@@ -38,8 +39,12 @@ from multi_modal_engine import (
     MultiModalQueryResponse,
     CLIPImageProcessor,
     NLUTextProcessor,
-    ContextFusionEngine
+    ContextFusionEngine,
+    ValidationMode,
+    VALIDATION_MODE_ENV
 )
+from upload_decoding import StreamingImageDecoder, decode_base64_image
+from fastapi import HTTPException
 
 # Test client oluştur - FastAPI test için
 client = TestClient(app)
@@ -580,6 +585,219 @@ class TestPerformance:
             
         print(f"✅ Performance test passed: {len(tasks)} requests in {total_time:.2f}s")
 
+# Pipelined query tests - profil prefetch, servis bütçeleri ve aşama süreleri
+class TestPipelinedQuery:
+    """Pipelined multi-modal query işleme test sınıfı"""
+
+    def setup_method(self):
+        """Test setup - downstream servisler yavaş fake coroutine'lerle değiştirilir"""
+        self.coordinator = MultiModalCoordinator()
+        image = Image.new('RGB', (64, 64), color='blue')
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG')
+        self.request = MultiModalQueryRequest(
+            image_base64=base64.b64encode(buffer.getvalue()).decode('utf-8'),
+            text_query="Bu siyah elbiseye uygun ayakkabı var mı?",
+            user_id="test_user"
+        )
+
+    @staticmethod
+    def _slow(seconds: float, result: Any):
+        """Belirtilen süre bekleyip sonucu dönen fake servis çağrısı"""
+        async def call(*args, **kwargs):
+            await asyncio.sleep(seconds)
+            return result
+        return call
+
+    @pytest.mark.asyncio
+    async def test_profile_fetch_overlaps_analysis(self):
+        """Profil isteği görsel/metin analiziyle paralel çalışmalı"""
+        with patch.object(self.coordinator, '_get_user_profile', self._slow(0.1, {"preferences": {}})), \
+             patch.object(self.coordinator, '_fetch_engine_recommendations', self._slow(0.0, [])), \
+             patch.object(self.coordinator, '_fetch_validation_verdict', self._slow(0.0, [{"item": "stiletto"}])):
+
+            result = await self.coordinator.process_multimodal_query(self.request)
+
+        # Profil (100ms) analiz (~100ms) bitmeden hazır olduğu için neredeyse hiç beklenmez
+        timings = result.stage_timings_ms
+        assert timings["profile_fetch"] >= 90
+        assert timings["profile_wait"] < 50
+        assert {"decode", "image_analysis", "text_analysis", "fusion", "fan_out", "total"} <= set(timings)
+        assert result.service_status["style_profile"] == "ok"
+        assert result.partial_results is False
+
+        print("✅ Profile prefetch test passed")
+
+    @pytest.mark.asyncio
+    async def test_slow_service_returns_partial_results(self):
+        """Bütçesini aşan servis beklenmemeli, diğer servislerin sonuçları dönmeli"""
+        self.coordinator.service_deadlines["recommendation_engine"] = 0.05
+        self.request.force_inline_validation = True
+
+        with patch.object(self.coordinator, '_get_user_profile', self._slow(0.0, {})), \
+             patch.object(self.coordinator, '_fetch_engine_recommendations', self._slow(2.0, [{"item": "late"}])), \
+             patch.object(self.coordinator, '_fetch_validation_verdict', self._slow(5.0, [])):
+
+            result = await self.coordinator.process_multimodal_query(self.request)
+
+        # Combination Engine sonuçları doğrulanmadan döner
+        assert result.partial_results is True
+        assert result.service_status["recommendation_engine"] == "timeout"
+        assert result.service_status["quality_assurance"] == "timeout"
+        assert result.service_status["combination_engine"] == "ok"
+        assert [rec["item"] for rec in result.recommendations] == ["Siyah stiletto", "Nude block heel"]
+        assert result.stage_timings_ms["total"] < 1500
+        assert result.validation_status == "unvalidated"
+
+        print("✅ Partial results test passed")
+
+    @pytest.mark.asyncio
+    async def test_deferred_validation_serves_verdict_to_repeat_query(self):
+        """Deferred modda ilk yanıt QA'yı beklememeli, aynı sorgu doğrulanmış hali almalı"""
+        improved = [{"item": "Siyah stiletto", "validated": True}]
+        self.coordinator = MultiModalCoordinator(validation_mode=ValidationMode.DEFERRED)
+
+        with patch.object(self.coordinator, '_get_user_profile', self._slow(0.0, {})), \
+             patch.object(self.coordinator, '_fetch_engine_recommendations', self._slow(0.0, [])), \
+             patch.object(self.coordinator, '_fetch_validation_verdict', self._slow(0.2, improved)):
+
+            first = await self.coordinator.process_multimodal_query(self.request)
+            # Arka plan doğrulamasının bitmesini bekle
+            await asyncio.gather(*self.coordinator._pending_validations.values())
+            second = await self.coordinator.process_multimodal_query(self.request)
+
+        assert first.validation_status == "pending"
+        assert "quality_assurance" not in first.stage_timings_ms
+        assert second.validation_status == "cached"
+        assert second.recommendations == improved
+        assert self.coordinator.get_validation_stats()["cache"]["hits"] == 1
+
+        print("✅ Deferred validation test passed")
+
+    def test_validation_is_inline_unless_deferred_is_opted_in(self, monkeypatch):
+        """Varsayılan mod INLINE olmalı, DEFERRED yalnızca ortam değişkeniyle açılmalı"""
+        monkeypatch.delenv(VALIDATION_MODE_ENV, raising=False)
+        assert MultiModalCoordinator().validation_mode == ValidationMode.INLINE
+
+        monkeypatch.setenv(VALIDATION_MODE_ENV, "deferred")
+        assert MultiModalCoordinator().validation_mode == ValidationMode.DEFERRED
+        assert MultiModalCoordinator(validation_mode=ValidationMode.INLINE).validation_mode == ValidationMode.INLINE
+
+        monkeypatch.setenv(VALIDATION_MODE_ENV, "sometimes")
+        assert MultiModalCoordinator().validation_mode == ValidationMode.INLINE
+
+        print("✅ Validation mode default test passed")
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_is_served_from_caches(self):
+        """Aynı görsel ve aynı niyet tekrar geldiğinde analizler ve öneriler önbellekten gelmeli"""
+        profile = {"preferences": {"color": "siyah"}}
+
+        async def get_profile(user_id):
+            return dict(profile)
+
+        with patch.object(self.coordinator, '_get_user_profile', get_profile), \
+             patch.object(self.coordinator, '_fetch_engine_recommendations', self._slow(0.0, [])), \
+             patch.object(self.coordinator, '_fetch_validation_verdict', self._slow(0.0, None)):
+
+            first = await self.coordinator.process_multimodal_query(self.request)
+
+            # Sadece büyük/küçük harf ve boşluk farkı olan aynı sorgu
+            self.request.text_query = "  bu siyah ELBISEYE   uygun ayakkabı var mı?"
+            second = await self.coordinator.process_multimodal_query(self.request)
+
+            # Profil değişince fused context yeniden hesaplanır, analizler önbellekte kalır
+            profile["preferences"] = {"color": "kırmızı"}
+            third = await self.coordinator.process_multimodal_query(self.request)
+
+        assert first.cache_hits == []
+        assert set(second.cache_hits) == {"image_analysis", "text_analysis", "fused_context"}
+        assert second.recommendations == first.recommendations
+        assert "fan_out" not in second.stage_timings_ms
+        assert set(third.cache_hits) == {"image_analysis", "text_analysis"}
+
+        stats = self.coordinator.get_cache_stats()
+        assert stats["fused_context"]["hits"] == 1 and stats["fused_context"]["entries"] == 2
+
+        print("✅ Coordinator cache test passed")
+
+    @pytest.mark.asyncio
+    async def test_unreachable_services_are_reported_as_errors(self):
+        """Bağlantısı reddedilen servisler "error" olmalı, fallback sonuçları önbelleğe yazılmamalı"""
+        # Kapatılmış bir portu dinleyen servis yok - her istek connection refused alır
+        import socket
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            closed_port = probe.getsockname()[1]
+        for service in self.coordinator.service_clients:
+            self.coordinator.service_clients[service] = f"http://127.0.0.1:{closed_port}"
+        self.request.text_query = "Bu mavi gömlekle ne giyebilirim?"
+        self.request.force_inline_validation = True
+
+        result = await self.coordinator.process_multimodal_query(self.request)
+        await self.coordinator.http_client.aclose()
+
+        assert result.service_status == {
+            "style_profile": "error",
+            "combination_engine": "error",
+            "recommendation_engine": "error",
+            "quality_assurance": "error"
+        }
+        assert result.partial_results is True
+        assert result.validation_status == "unvalidated"
+        assert [rec["item"] for rec in result.recommendations] == ["Siyah kumaş pantolon", "Lacivert chino pantolon"]
+        assert self.coordinator.get_cache_stats()["fused_context"]["entries"] == 0
+
+        print("✅ Unreachable services test passed")
+
+# Streaming upload decoding tests - boyut sınırı, format tespiti ve CLIP çözünürlüğü
+class TestStreamingUploadDecoding:
+    """Bellek sınırlı streaming görsel çözme test sınıfı"""
+
+    @staticmethod
+    def _encode(size, image_format='JPEG') -> bytes:
+        """Verilen boyutta test görseli üret"""
+        buffer = io.BytesIO()
+        Image.new('RGB', size, color='green').save(buffer, format=image_format)
+        return buffer.getvalue()
+
+    def test_large_jpeg_is_decoded_at_clip_resolution(self):
+        """Büyük JPEG kısa kenarı 224 olacak şekilde çözülmeli"""
+        data = self._encode((2000, 1500))
+        decoder = StreamingImageDecoder()
+        for offset in range(0, len(data), 1000):
+            decoder.feed(data[offset:offset + 1000])
+        decoded = decoder.finish()
+
+        assert decoded.source_format == "JPEG"
+        assert decoded.original_size == (2000, 1500)
+        assert min(decoded.image.size) == 224
+        assert decoded.sha256 == hashlib.sha256(data).hexdigest()
+
+        # Base64 yolu aynı sonucu vermeli
+        from_base64 = decode_base64_image(base64.b64encode(data).decode('utf-8'), chunk_size=4096)
+        assert from_base64.image.size == decoded.image.size and from_base64.sha256 == decoded.sha256
+
+        print("✅ Streaming JPEG decode test passed")
+
+    def test_uploads_are_rejected_while_reading(self):
+        """Desteklenmeyen format ilk parçada, boyut sınırı okuma sırasında reddedilmeli"""
+        gif = self._encode((64, 64), 'GIF')
+        with pytest.raises(HTTPException) as unsupported:
+            StreamingImageDecoder().feed(gif[:16])
+        assert unsupported.value.status_code == 415
+
+        data = self._encode((512, 512), 'PNG')
+        decoder = StreamingImageDecoder(max_bytes=len(data) // 2)
+        with pytest.raises(HTTPException) as too_large:
+            for offset in range(0, len(data), 256):
+                decoder.feed(data[offset:offset + 256])
+        assert too_large.value.status_code == 413
+        # Sınırı aşan parçadan sonrası okunmadı
+        assert decoder.byte_size <= len(data) // 2 + 256
+
+        print("✅ Streaming rejection test passed")
+
 # Test runner
 if __name__ == "__main__":
     print("🧪 Multi-Modal Coordinator Service Test Suite")
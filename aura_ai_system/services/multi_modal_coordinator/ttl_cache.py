@@ -0,0 +1,98 @@
+# ⏳ Multi-Modal Coordinator Service - TTL Cache
+# AURA AI Çok Modlu Sorgu Koordinatörü için kısa ömürlü, boyut sınırlı önbellek
+
+"""
+Kısa ömürlü sonuç önbelleği
+
+Her girdi kendi son kullanma zamanıyla saklanır; kapasite dolduğunda en uzun
+süredir kullanılmayan girdi (LRU) atılır. Koordinatör tek bir event loop'ta
+çalıştığı için kilit gerekmez.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """TTL ve maksimum girdi sayısı ile sınırlı LRU önbellek"""
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name: İstatistiklerde görünen önbellek adı
+            ttl_seconds: Bir girdinin geçerli kaldığı süre (saniye)
+            max_entries: Saklanacak en fazla girdi sayısı
+            clock: Zaman kaynağı (testlerde değiştirilebilir)
+        """
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        # İstatistik sayaçları
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > self._clock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Geçerli girdiyi döner; yoksa veya süresi dolduysa None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            # Süresi dolan girdi okunurken temizlenir
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Girdiyi ekler veya günceller; kapasite aşılırsa en eski girdiyi atar"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Girdiyi siler; silindiyse True"""
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Tüm girdileri siler (sayaçlar korunur)"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Önbellek istatistiklerini döner"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,112 @@
+# 🔎 AURA AI - Compiled Multi-Keyword Matcher
+# Aho-Corasick automaton over all keyword lists of an analyzer
+
+"""
+Keyword-based NLU steps used to test `keyword in text_lower` once per keyword
+per category, which costs O(keywords x text). KeywordMatcher compiles every
+keyword list into a single Aho-Corasick automaton at startup; one pass over the
+text then yields the hit count of every category at once.
+
+Counting semantics match the code it replaces: a category's count is the number
+of its keywords that occur anywhere in the text as a substring (a keyword listed
+twice counts twice, repeated occurrences in the text count once).
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Set
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton returning per-category keyword hit counts"""
+
+    def __init__(self, keyword_lists: Dict[Hashable, Iterable[str]]):
+        """
+        Args:
+            keyword_lists: Category -> keywords. Keywords are matched exactly as
+                given, so pass lowercase keywords and lowercase the text.
+        """
+        self.categories: List[Hashable] = list(keyword_lists)
+        self.keywords: List[str] = []
+        # keyword id -> categories listing it (repeated once per listing)
+        self._keyword_categories: List[List[Hashable]] = []
+        keyword_ids: Dict[str, int] = {}
+
+        # Trie: transitions per node, keyword ids ending at each node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[int]] = [[]]
+
+        for category, keywords in keyword_lists.items():
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self._keyword_categories.append([])
+                    self._insert(keyword, keyword_ids[keyword])
+                self._keyword_categories[keyword_ids[keyword]].append(category)
+
+        self._fail: List[int] = [0] * len(self._goto)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _insert(self, keyword: str, keyword_id: int) -> None:
+        """Add a keyword path to the trie"""
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._output.append([])
+            node = next_node
+        self._output[node].append(keyword_id)
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first failure links; outputs inherit the failure node's keywords"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_keyword_ids(self, text: str) -> Set[int]:
+        """Ids of all keywords occurring in `text` (single pass)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        matched: Set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                matched.update(output[node])
+        return matched
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """All keywords occurring in `text`"""
+        return {self.keywords[keyword_id] for keyword_id in self.find_keyword_ids(text)}
+
+    def count(self, text: str) -> Dict[Hashable, int]:
+        """
+        Keyword hit count for every category in one pass.
+
+        Args:
+            text: Text to scan (already lowercased)
+
+        Returns:
+            Category -> number of its keywords found, in the order categories were given
+        """
+        counts = dict.fromkeys(self.categories, 0)
+        for keyword_id in self.find_keyword_ids(text):
+            for category in self._keyword_categories[keyword_id]:
+                counts[category] += 1
+        return counts
@@ -2,20 +2,24 @@
 # This module provides multilingual natural language understanding capabilities
 # using state-of-the-art transformer models for intent classification and entity extraction
 
+import copy
 import torch
 import numpy as np
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 from transformers import (
     AutoTokenizer, AutoModel, AutoConfig,
     pipeline, Pipeline
 )
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from langdetect import detect, DetectorFactory
 import logging
 import warnings
 import re
 
+from keyword_matcher import KeywordMatcher
+from nlu_cache import NLUCache, normalize_text
+
 # Set consistent seed for reproducible language detection
 DetectorFactory.seed = 42
 
@@ -26,6 +30,37 @@ logger = logging.getLogger(__name__)
 # Suppress transformer warnings for cleaner output
 warnings.filterwarnings("ignore", category=UserWarning, module="transformers")
 
+# Probe used to check that the sentiment model shares the XLM-R vocabulary
+TOKENIZER_PROBE_TEXT = "Bu elbiseyi çok beğendim, I love this dress!"
+
+# XLM-R input limit and default number of texts per length bucket in batch analysis
+XLM_R_MAX_LENGTH = 512
+DEFAULT_BATCH_BUCKET_SIZE = 32
+
+# Cache settings: (ttl_seconds, max_entries, max_bytes)
+# Embeddings depend only on text and model, analysis dicts are kept shorter
+EMBEDDING_CACHE_SETTINGS = (3600.0, 20000, 64 * 1024 * 1024)
+ANALYSIS_CACHE_SETTINGS = (600.0, 5000, 128 * 1024 * 1024)
+
+
+@dataclass
+class TextAnalysisContext:
+    """
+    Per-request analysis state so each model sees the text exactly once.
+    
+    The sentence embedding and the XLM-R tokenisation are computed lazily on
+    first use and then shared by intent, context, sentiment and feature
+    extraction. Batch analysis prefills the model outputs per length bucket.
+    """
+    text: str
+    text_lower: str
+    cache_key: str                                           # Normalised text (see nlu_cache.normalize_text)
+    sentence_embedding: Optional[np.ndarray] = None          # Unit-normalised sentence-transformer embedding
+    xlm_r_inputs: Optional[Dict[str, torch.Tensor]] = None   # XLM-R tokenizer output on self.device
+    xlm_r_features: Optional[np.ndarray] = None              # XLM-R [CLS] vector
+    sentiment_scores: Optional[Dict[str, float]] = None      # Sentiment label probabilities
+    keyword_counts: Optional[Dict[Any, int]] = None          # Fallback keyword hits per category
+
 class AdvancedNLUAnalyzer:
     """
     Advanced Natural Language Understanding analyzer using XLM-R transformer model.
@@ -54,6 +89,17 @@ class AdvancedNLUAnalyzer:
         
         logger.info("Initializing Advanced NLU Analyzer with XLM-R...")
         
+        # Filled in by _precompute_category_embeddings when the sentence model is available
+        self.intent_labels: List[str] = []
+        self.intent_matrix: Optional[np.ndarray] = None
+        self.context_labels: List[str] = []
+        self.context_matrix: Optional[np.ndarray] = None
+        
+        # Normalised-text caches so repeated queries are encoded once
+        self.sentence_embedding_cache = NLUCache("sentence_embeddings", *EMBEDDING_CACHE_SETTINGS)
+        self.xlm_r_feature_cache = NLUCache("xlm_r_cls_vectors", *EMBEDDING_CACHE_SETTINGS)
+        self.analysis_cache = NLUCache("analysis_results", *ANALYSIS_CACHE_SETTINGS)
+        
         # Detect available device (GPU/CPU) for optimal performance
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         logger.info(f"Using device: {self.device}")
@@ -103,11 +149,12 @@ class AdvancedNLUAnalyzer:
         try:
             # Load sentiment analysis pipeline
             # Uses a pre-trained model optimized for multilingual sentiment detection
+            self.sentiment_model_name = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
             logger.info("Loading sentiment analysis pipeline...")
             
             self.sentiment_pipeline = pipeline(
                 "sentiment-analysis",
-                model="cardiffnlp/twitter-xlm-roberta-base-sentiment",
+                model=self.sentiment_model_name,
                 device=0 if torch.cuda.is_available() else -1,
                 return_all_scores=True
             )
@@ -119,6 +166,10 @@ class AdvancedNLUAnalyzer:
             logger.error(f"❌ Failed to load sentiment pipeline: {e}")
             self.sentiment_pipeline = None
         
+        # The sentiment model is an XLM-R fine-tune; when both tokenizers agree the
+        # XLM-R tokenisation is reused instead of letting the pipeline tokenise again
+        self.sentiment_shares_xlm_r_tokens = self._sentiment_tokenizer_matches_xlm_r()
+        
         # Initialize predefined intent categories with example phrases
         # These serve as reference points for intent classification
         self.intent_categories = {
@@ -182,6 +233,31 @@ class AdvancedNLUAnalyzer:
             "date": ["date", "romantic", "dinner", "restaurant", "evening", "randevu", "romantik", "akşam yemeği", "cita", "romántico", "cena", "rendez-vous", "romantique", "dîner", "date", "romantisch", "abendessen"]
         }
         
+        # Keywords used by the fallback classifiers when transformer models are unavailable
+        self.fallback_intent_keywords = {
+            "product_recommendation": ["recommend", "suggest", "want", "need", "looking for", "buy", "purchase"],
+            "style_combination": ["combine", "match", "outfit", "coordination", "goes with"],
+            "style_analysis": ["my style", "analyze", "what am i", "fashion personality"],
+            "size_fit_query": ["size", "fit", "measurement", "does this fit"]
+        }
+        self.sentiment_keywords = {
+            # Positive sentiment keywords (multilingual)
+            "positive": ["good", "great", "excellent", "amazing", "beautiful", "love", "perfect", "wonderful",
+                         "güzel", "harika", "mükemmel", "seviyorum", "bueno", "excelente", "perfecto",
+                         "bon", "excellent", "parfait", "gut", "ausgezeichnet", "perfekt"],
+            # Negative sentiment keywords (multilingual)
+            "negative": ["bad", "terrible", "awful", "hate", "horrible", "worst", "disgusting",
+                         "kötü", "berbat", "nefret", "malo", "terrible", "odio", "mauvais", "terrible",
+                         "schlecht", "schrecklich", "hasse"]
+        }
+        
+        # All fallback keyword lists compiled into one automaton: one pass scores every category
+        self.keyword_matcher = KeywordMatcher({
+            **{("intent", intent): keywords for intent, keywords in self.fallback_intent_keywords.items()},
+            **{("context", context): keywords for context, keywords in self.context_categories.items()},
+            **{("sentiment", label): keywords for label, keywords in self.sentiment_keywords.items()}
+        })
+        
         # Precompute embeddings for intent and context categories if models are available
         self._precompute_category_embeddings()
         
@@ -221,12 +297,125 @@ class AdvancedNLUAnalyzer:
                 embeddings = self.sentence_model.encode(phrases)
                 self.context_embeddings[context] = np.mean(embeddings, axis=0)
             
+            # Stack unit-normalised category vectors so scoring is one matrix-vector product
+            self.intent_labels, self.intent_matrix = self._stack_normalised(self.intent_embeddings)
+            self.context_labels, self.context_matrix = self._stack_normalised(self.context_embeddings)
+            
             logger.info("✅ Category embeddings precomputed successfully")
             
         except Exception as e:
             logger.error(f"❌ Failed to precompute embeddings: {e}")
             self.intent_embeddings = {}
             self.context_embeddings = {}
+            self.intent_labels, self.intent_matrix = [], None
+            self.context_labels, self.context_matrix = [], None
+    
+    @staticmethod
+    def _unit(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalise along the last axis (zero vectors stay zero)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+    
+    def _stack_normalised(self, embeddings: Dict[str, np.ndarray]) -> Tuple[List[str], Optional[np.ndarray]]:
+        """Stack category embeddings into a (categories x dim) matrix of unit rows"""
+        if not embeddings:
+            return [], None
+        labels = list(embeddings.keys())
+        return labels, self._unit(np.stack([embeddings[label] for label in labels]))
+    
+    def _sentiment_tokenizer_matches_xlm_r(self) -> bool:
+        """Check whether sentiment inference can reuse the XLM-R tokenisation"""
+        if not self.sentiment_pipeline or not self.xlm_r_tokenizer:
+            return False
+        try:
+            sentiment_ids = self.sentiment_pipeline.tokenizer(TOKENIZER_PROBE_TEXT)["input_ids"]
+            xlm_r_ids = self.xlm_r_tokenizer(TOKENIZER_PROBE_TEXT)["input_ids"]
+            return sentiment_ids == xlm_r_ids
+        except Exception as e:
+            logger.warning(f"Tokenizer comparison failed, sentiment keeps its own tokenisation: {e}")
+            return False
+    
+    def prepare_context(self, text: str) -> TextAnalysisContext:
+        """
+        Create the per-request analysis context for `text`.
+        
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            TextAnalysisContext whose embeddings and tokens are filled on first use
+        """
+        return TextAnalysisContext(text=text, text_lower=text.lower(), cache_key=normalize_text(text))
+    
+    @staticmethod
+    def _cacheable(vector: np.ndarray) -> np.ndarray:
+        """Own, read-only copy of a vector (a row view would keep its whole batch alive)"""
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        return vector
+    
+    def _sentence_embedding(self, analysis_context: TextAnalysisContext) -> np.ndarray:
+        """Encode the text with the sentence transformer once per request (or reuse the cache)"""
+        if analysis_context.sentence_embedding is None:
+            cache_key = (self.sentence_model_name, analysis_context.cache_key)
+            embedding = self.sentence_embedding_cache.get(cache_key)
+            if embedding is None:
+                embedding = self._cacheable(self._unit(self.sentence_model.encode([analysis_context.text])[0]))
+                self.sentence_embedding_cache.put(cache_key, embedding)
+            analysis_context.sentence_embedding = embedding
+        return analysis_context.sentence_embedding
+    
+    def _fill_from_embedding_caches(self, analysis_context: TextAnalysisContext) -> None:
+        """Prefill cached sentence embedding and XLM-R vector without computing anything"""
+        if analysis_context.sentence_embedding is None and self.sentence_model:
+            analysis_context.sentence_embedding = self.sentence_embedding_cache.get(
+                (self.sentence_model_name, analysis_context.cache_key)
+            )
+        if analysis_context.xlm_r_features is None and self.xlm_r_model:
+            analysis_context.xlm_r_features = self.xlm_r_feature_cache.get(
+                (self.xlm_r_model_name, analysis_context.cache_key)
+            )
+    
+    def _analysis_cache_key(self, analysis_context: TextAnalysisContext) -> Tuple[str, ...]:
+        """Analysis results depend on every loaded model"""
+        return (
+            self.xlm_r_model_name if self.models_loaded['xlm_r'] else "",
+            self.sentence_model_name if self.models_loaded['sentence_transformer'] else "",
+            self.sentiment_model_name if self.models_loaded['sentiment_pipeline'] else "",
+            analysis_context.cache_key
+        )
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit rates and memory usage of the NLU caches"""
+        return {
+            cache.name: cache.get_stats()
+            for cache in (self.sentence_embedding_cache, self.xlm_r_feature_cache, self.analysis_cache)
+        }
+    
+    def _xlm_r_inputs(self, analysis_context: TextAnalysisContext) -> Dict[str, torch.Tensor]:
+        """Tokenise the text for XLM-R once per request"""
+        if analysis_context.xlm_r_inputs is None:
+            analysis_context.xlm_r_inputs = self.xlm_r_tokenizer(
+                analysis_context.text,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=XLM_R_MAX_LENGTH
+            ).to(self.device)
+        return analysis_context.xlm_r_inputs
+    
+    def _keyword_counts(self, analysis_context: TextAnalysisContext) -> Dict[Any, int]:
+        """Fallback keyword hits for every category, scanned once per request"""
+        if analysis_context.keyword_counts is None:
+            analysis_context.keyword_counts = self.keyword_matcher.count(analysis_context.text_lower)
+        return analysis_context.keyword_counts
+    
+    def _score_categories(self, analysis_context: TextAnalysisContext,
+                          labels: List[str], matrix: np.ndarray) -> Dict[str, float]:
+        """Cosine similarity against every category in one matrix-vector product"""
+        scores = matrix @ self._sentence_embedding(analysis_context)
+        return {label: float(score) for label, score in zip(labels, scores)}
     
     def detect_language(self, text: str) -> Tuple[str, float]:
         """
@@ -256,12 +445,14 @@ class AdvancedNLUAnalyzer:
             logger.warning(f"Language detection failed: {e}, defaulting to English")
             return 'en', 0.5  # Default with low confidence
     
-    def extract_xlm_r_features(self, text: str) -> Optional[np.ndarray]:
+    def extract_xlm_r_features(self, text: str,
+                               analysis_context: Optional[TextAnalysisContext] = None) -> Optional[np.ndarray]:
         """
         Extract XLM-R transformer features from input text.
         
         Args:
             text: Input text to process
+            analysis_context: Shared per-request context (tokens are reused if present)
             
         Returns:
             768-dimensional feature vector from XLM-R model, or None if model unavailable
@@ -270,49 +461,49 @@ class AdvancedNLUAnalyzer:
         if not self.xlm_r_model or not self.xlm_r_tokenizer:
             return None
         
+        analysis_context = analysis_context or self.prepare_context(text)
+        if analysis_context.xlm_r_features is not None:
+            return analysis_context.xlm_r_features
+        
+        cache_key = (self.xlm_r_model_name, analysis_context.cache_key)
+        cached_features = self.xlm_r_feature_cache.get(cache_key)
+        if cached_features is not None:
+            analysis_context.xlm_r_features = cached_features
+            return cached_features
+        
         try:
-            # Tokenize input text for XLM-R model
-            inputs = self.xlm_r_tokenizer(
-                text,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512
-            ).to(self.device)
+            # Tokenize input text for XLM-R model (shared with sentiment when possible)
+            inputs = self._xlm_r_inputs(analysis_context)
             
             # Extract features using XLM-R model
-            with torch.no_grad():
-                outputs = self.xlm_r_model(**inputs)
-                # Use [CLS] token embedding as sentence representation
-                cls_embedding = outputs.last_hidden_state[:, 0, :].cpu().numpy()
-                
-            return cls_embedding.flatten()
+            features = self._cacheable(self._xlm_r_cls_vectors(inputs)[0])
+            self.xlm_r_feature_cache.put(cache_key, features)
+            analysis_context.xlm_r_features = features
+            return features
             
         except Exception as e:
             logger.error(f"XLM-R feature extraction failed: {e}")
             return None
     
-    def classify_intent(self, text: str) -> Dict[str, Any]:
+    def classify_intent(self, text: str,
+                        analysis_context: Optional[TextAnalysisContext] = None) -> Dict[str, Any]:
         """
         Classify user intent using semantic similarity with predefined categories.
         
         Args:
             text: User input text
+            analysis_context: Shared per-request context (embedding is reused if present)
             
         Returns:
             Dictionary with intent classification results
         """
         
-        if self.sentence_model and self.intent_embeddings:
+        if self.sentence_model and self.intent_matrix is not None:
             try:
-                # Get embedding for input text
-                text_embedding = self.sentence_model.encode([text])
-                
-                # Calculate similarity with each intent category
-                similarities = {}
-                for intent, intent_embedding in self.intent_embeddings.items():
-                    similarity = cosine_similarity(text_embedding, [intent_embedding])[0][0]
-                    similarities[intent] = float(similarity)
+                # Similarity with every intent category in one matrix product
+                similarities = self._score_categories(
+                    analysis_context or self.prepare_context(text), self.intent_labels, self.intent_matrix
+                )
                 
                 # Find best matching intent
                 best_intent = max(similarities, key=similarities.get)
@@ -329,46 +520,38 @@ class AdvancedNLUAnalyzer:
                 logger.error(f"Transformer-based intent classification failed: {e}")
                 
         # Fallback to keyword-based classification
-        return self._fallback_intent_classification(text)
+        return self._fallback_intent_classification(text, analysis_context)
     
-    def _fallback_intent_classification(self, text: str) -> Dict[str, Any]:
+    def _fallback_intent_classification(self, text: str,
+                                        analysis_context: Optional[TextAnalysisContext] = None) -> Dict[str, Any]:
         """
         Fallback intent classification using keyword matching.
         
         Args:
             text: Input text to classify
+            analysis_context: Shared per-request context (keyword scan is reused if present)
             
         Returns:
             Intent classification result with lower confidence
         """
         
-        text_lower = text.lower()
+        keyword_counts = self._keyword_counts(analysis_context or self.prepare_context(text))
         
-        # Check for product recommendation keywords
-        if any(word in text_lower for word in ["recommend", "suggest", "want", "need", "looking for", "buy", "purchase"]):
-            return {"intent": "product_recommendation", "confidence": 0.7, "method": "keyword_fallback"}
+        # First intent (in priority order) with any keyword hit
+        for intent in self.fallback_intent_keywords:
+            if keyword_counts[("intent", intent)]:
+                return {"intent": intent, "confidence": 0.7, "method": "keyword_fallback"}
         
-        # Check for style combination keywords
-        elif any(word in text_lower for word in ["combine", "match", "outfit", "coordination", "goes with"]):
-            return {"intent": "style_combination", "confidence": 0.7, "method": "keyword_fallback"}
-        
-        # Check for style analysis keywords
-        elif any(word in text_lower for word in ["my style", "analyze", "what am i", "fashion personality"]):
-            return {"intent": "style_analysis", "confidence": 0.7, "method": "keyword_fallback"}
-        
-        # Check for size/fit keywords
-        elif any(word in text_lower for word in ["size", "fit", "measurement", "does this fit"]):
-            return {"intent": "size_fit_query", "confidence": 0.7, "method": "keyword_fallback"}
-        
-        else:
-            return {"intent": "general_inquiry", "confidence": 0.5, "method": "keyword_fallback"}
+        return {"intent": "general_inquiry", "confidence": 0.5, "method": "keyword_fallback"}
     
-    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+    def analyze_sentiment(self, text: str,
+                          analysis_context: Optional[TextAnalysisContext] = None) -> Dict[str, Any]:
         """
         Analyze sentiment of input text using multilingual sentiment model.
         
         Args:
             text: Input text to analyze
+            analysis_context: Shared per-request context (XLM-R tokens are reused when compatible)
             
         Returns:
             Sentiment analysis results with confidence scores
@@ -376,11 +559,18 @@ class AdvancedNLUAnalyzer:
         
         if self.sentiment_pipeline:
             try:
-                # Use transformer-based sentiment analysis
-                results = self.sentiment_pipeline(text)
-                
-                # Process results to get cleaner output
-                sentiment_scores = {result['label'].lower(): result['score'] for result in results[0]}
+                if analysis_context is not None and analysis_context.sentiment_scores is not None:
+                    # Already computed for this text (batch analysis)
+                    sentiment_scores = analysis_context.sentiment_scores
+                elif analysis_context is not None and self.sentiment_shares_xlm_r_tokens:
+                    # Run the sentiment model directly on the shared XLM-R tokens
+                    sentiment_scores = self._sentiment_scores_from_tokens(self._xlm_r_inputs(analysis_context))[0]
+                else:
+                    # Use transformer-based sentiment analysis
+                    results = self.sentiment_pipeline(text)
+                    
+                    # Process results to get cleaner output
+                    sentiment_scores = {result['label'].lower(): result['score'] for result in results[0]}
                 
                 # Map labels to standardized sentiment categories
                 label_mapping = {
@@ -408,33 +598,42 @@ class AdvancedNLUAnalyzer:
                 logger.error(f"Transformer sentiment analysis failed: {e}")
         
         # Fallback to simple keyword-based sentiment analysis
-        return self._fallback_sentiment_analysis(text)
+        return self._fallback_sentiment_analysis(text, analysis_context)
+    
+    def _sentiment_scores_from_tokens(self, inputs: Dict[str, torch.Tensor]) -> List[Dict[str, float]]:
+        """Sentiment label probabilities per row of tokenised input (same as the pipeline's softmax)"""
+        model = self.sentiment_pipeline.model
+        with torch.no_grad():
+            logits = model(**{key: value.to(model.device) for key, value in inputs.items()}).logits
+        probabilities = torch.softmax(logits, dim=-1).cpu().numpy()
+        return [
+            {model.config.id2label[index].lower(): float(score) for index, score in enumerate(row)}
+            for row in probabilities
+        ]
+    
+    def _xlm_r_cls_vectors(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        """XLM-R [CLS] embedding per row of tokenised input"""
+        with torch.no_grad():
+            outputs = self.xlm_r_model(**inputs)
+            # Use [CLS] token embedding as sentence representation
+            return outputs.last_hidden_state[:, 0, :].cpu().numpy()
     
-    def _fallback_sentiment_analysis(self, text: str) -> Dict[str, Any]:
+    def _fallback_sentiment_analysis(self, text: str,
+                                     analysis_context: Optional[TextAnalysisContext] = None) -> Dict[str, Any]:
         """
         Fallback sentiment analysis using keyword matching.
         
         Args:
             text: Input text to analyze
+            analysis_context: Shared per-request context (keyword scan is reused if present)
             
         Returns:
             Basic sentiment classification
         """
         
-        text_lower = text.lower()
-        
-        # Positive sentiment keywords (multilingual)
-        positive_words = ["good", "great", "excellent", "amazing", "beautiful", "love", "perfect", "wonderful",
-                         "güzel", "harika", "mükemmel", "seviyorum", "bueno", "excelente", "perfecto",
-                         "bon", "excellent", "parfait", "gut", "ausgezeichnet", "perfekt"]
-        
-        # Negative sentiment keywords (multilingual)  
-        negative_words = ["bad", "terrible", "awful", "hate", "horrible", "worst", "disgusting",
-                         "kötü", "berbat", "nefret", "malo", "terrible", "odio", "mauvais", "terrible",
-                         "schlecht", "schrecklich", "hasse"]
-        
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        keyword_counts = self._keyword_counts(analysis_context or self.prepare_context(text))
+        positive_count = keyword_counts[("sentiment", "positive")]
+        negative_count = keyword_counts[("sentiment", "negative")]
         
         if positive_count > negative_count:
             return {"sentiment": "positive", "confidence": 0.6, "method": "keyword_fallback"}
@@ -443,27 +642,25 @@ class AdvancedNLUAnalyzer:
         else:
             return {"sentiment": "neutral", "confidence": 0.5, "method": "keyword_fallback"}
     
-    def detect_context(self, text: str) -> Dict[str, Any]:
+    def detect_context(self, text: str,
+                       analysis_context: Optional[TextAnalysisContext] = None) -> Dict[str, Any]:
         """
         Detect context/occasion from input text using semantic similarity.
         
         Args:
             text: Input text to analyze
+            analysis_context: Shared per-request context (embedding is reused if present)
             
         Returns:
             Context classification results
         """
         
-        if self.sentence_model and self.context_embeddings:
+        if self.sentence_model and self.context_matrix is not None:
             try:
-                # Get embedding for input text
-                text_embedding = self.sentence_model.encode([text])
-                
-                # Calculate similarity with each context category
-                similarities = {}
-                for context, context_embedding in self.context_embeddings.items():
-                    similarity = cosine_similarity(text_embedding, [context_embedding])[0][0]
-                    similarities[context] = float(similarity)
+                # Similarity with every context category in one matrix product
+                similarities = self._score_categories(
+                    analysis_context or self.prepare_context(text), self.context_labels, self.context_matrix
+                )
                 
                 # Find best matching context
                 best_context = max(similarities, key=similarities.get)
@@ -480,57 +677,91 @@ class AdvancedNLUAnalyzer:
                 logger.error(f"Transformer-based context detection failed: {e}")
         
         # Fallback to keyword-based context detection
-        return self._fallback_context_detection(text)
+        return self._fallback_context_detection(text, analysis_context)
     
-    def _fallback_context_detection(self, text: str) -> Dict[str, Any]:
+    def _fallback_context_detection(self, text: str,
+                                    analysis_context: Optional[TextAnalysisContext] = None) -> Dict[str, Any]:
         """
         Fallback context detection using keyword matching.
         
         Args:
             text: Input text to analyze
+            analysis_context: Shared per-request context (keyword scan is reused if present)
             
         Returns:
             Context classification using keyword matching
         """
         
-        text_lower = text.lower()
+        keyword_counts = self._keyword_counts(analysis_context or self.prepare_context(text))
         
-        # Check each context category for keyword matches
-        for context, keywords in self.context_categories.items():
-            if any(keyword in text_lower for keyword in keywords):
+        # First context category with a keyword match
+        for context in self.context_categories:
+            if keyword_counts[("context", context)]:
                 return {"context": context, "confidence": 0.7, "method": "keyword_fallback"}
         
         # Default to casual context
         return {"context": "casual", "confidence": 0.5, "method": "keyword_fallback"}
     
-    def comprehensive_analysis(self, text: str) -> Dict[str, Any]:
+    def comprehensive_analysis(self, text: str,
+                               analysis_context: Optional[TextAnalysisContext] = None) -> Dict[str, Any]:
         """
         Perform comprehensive NLU analysis combining all components.
         
+        Results are cached by normalised text, so repeated queries skip inference.
+        
         Args:
             text: Input text to analyze
+            analysis_context: Prefilled context (batch analysis); created here if omitted
             
         Returns:
             Complete analysis results including intent, sentiment, context, and language
         """
         
-        logger.info(f"Performing comprehensive NLU analysis on: '{text[:50]}...'")
+        # One analysis context per request: one sentence encode, one XLM-R tokenisation
+        analysis_context = analysis_context or self.prepare_context(text)
+        
+        cached_analysis = self.analysis_cache.get(self._analysis_cache_key(analysis_context))
+        if cached_analysis is not None:
+            return self._copy_analysis(cached_analysis, text, cache_hit=True)
+        
+        analysis_results = self._analyze(text, analysis_context)
+        self._store_analysis(analysis_context, analysis_results)
+        return analysis_results
+    
+    def _copy_analysis(self, analysis: Dict[str, Any], text: str, cache_hit: bool) -> Dict[str, Any]:
+        """Independent copy of a cached analysis with per-request metadata"""
+        result = copy.deepcopy(analysis)
+        metadata = result.get("processing_metadata")
+        if metadata is not None:
+            metadata["text_length"] = len(text)
+            metadata["cache_hit"] = cache_hit
+        return result
+    
+    def _store_analysis(self, analysis_context: TextAnalysisContext, analysis: Dict[str, Any]) -> None:
+        """Cache a successful analysis (failed analyses are retried next time)"""
+        if "error" not in analysis:
+            self.analysis_cache.put(self._analysis_cache_key(analysis_context), copy.deepcopy(analysis))
+    
+    def _analyze(self, text: str, analysis_context: TextAnalysisContext) -> Dict[str, Any]:
+        """Run every analysis component for one text (no analysis-level caching)"""
+        
+        logger.debug(f"Performing comprehensive NLU analysis on: '{text[:50]}...'")
         
         try:
             # Language detection
             language, lang_confidence = self.detect_language(text)
             
             # Intent classification
-            intent_results = self.classify_intent(text)
+            intent_results = self.classify_intent(text, analysis_context)
             
             # Sentiment analysis
-            sentiment_results = self.analyze_sentiment(text)
+            sentiment_results = self.analyze_sentiment(text, analysis_context)
             
-            # Context detection
-            context_results = self.detect_context(text)
+            # Context detection (reuses the sentence embedding from intent classification)
+            context_results = self.detect_context(text, analysis_context)
             
-            # Extract XLM-R features if available
-            xlm_r_features = self.extract_xlm_r_features(text)
+            # Extract XLM-R features if available (reuses the XLM-R tokens from sentiment)
+            xlm_r_features = self.extract_xlm_r_features(text, analysis_context)
             
             # Combine all analysis results
             analysis_results = {
@@ -553,11 +784,12 @@ class AdvancedNLUAnalyzer:
                         context_results.get('method', '')
                     ] if 'transformer' in method),
                     "text_length": len(text),
-                    "analysis_quality": "high" if sum(self.models_loaded.values()) >= 2 else "medium"
+                    "analysis_quality": "high" if sum(self.models_loaded.values()) >= 2 else "medium",
+                    "cache_hit": False
                 }
             }
             
-            logger.info(f"✅ Comprehensive analysis completed successfully")
+            logger.debug(f"✅ Comprehensive analysis completed successfully")
             return analysis_results
             
         except Exception as e:
@@ -567,3 +799,129 @@ class AdvancedNLUAnalyzer:
                 "fallback_available": True,
                 "model_status": self.models_loaded
             }
+    
+    def batch_analysis(self, texts: List[str],
+                       bucket_size: int = DEFAULT_BATCH_BUCKET_SIZE) -> List[Dict[str, Any]]:
+        """
+        Comprehensive analysis for many texts with batched transformer inference.
+        
+        Texts are sorted by token length and split into buckets of similar length
+        so padding stays small; XLM-R, the sentence transformer and the sentiment
+        model each run once per bucket. Texts with a cached analysis, and repeats
+        of the same normalised text, skip inference. Results come back in input
+        order and are identical in shape to comprehensive_analysis.
+        
+        Args:
+            texts: Input texts to analyze
+            bucket_size: Maximum number of texts per inference batch
+            
+        Returns:
+            One comprehensive analysis dictionary per input text, in input order
+        """
+        
+        logger.info(f"Performing batch NLU analysis on {len(texts)} texts (bucket size {bucket_size})")
+        
+        contexts = [self.prepare_context(text) for text in texts]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        
+        # First occurrence of every normalised text that still needs inference
+        pending: Dict[str, int] = {}
+        for index, context in enumerate(contexts):
+            if context.cache_key in pending:
+                continue
+            cached_analysis = self.analysis_cache.get(self._analysis_cache_key(context))
+            if cached_analysis is not None:
+                results[index] = self._copy_analysis(cached_analysis, context.text, cache_hit=True)
+            else:
+                pending[context.cache_key] = index
+                self._fill_from_embedding_caches(context)
+        
+        pending_indices = list(pending.values())
+        pending_texts = [texts[index] for index in pending_indices]
+        token_ids = self._batch_token_ids(pending_texts)
+        
+        # Length-sorted buckets: neighbours in the sort order have similar padding needs
+        order = sorted(range(len(pending_indices)),
+                       key=lambda position: len(token_ids[position]) if token_ids else len(pending_texts[position]))
+        buckets = [order[start:start + bucket_size] for start in range(0, len(order), bucket_size)]
+        
+        for bucket in buckets:
+            self._prefill_bucket([contexts[pending_indices[position]] for position in bucket],
+                                 [token_ids[position] for position in bucket] if token_ids else None)
+        
+        for index in pending_indices:
+            results[index] = self._analyze(texts[index], contexts[index])
+            self._store_analysis(contexts[index], results[index])
+        
+        # Repeats of a text analysed in this batch share its result
+        for index, context in enumerate(contexts):
+            if results[index] is None:
+                results[index] = self._copy_analysis(results[pending[context.cache_key]], context.text, cache_hit=True)
+        
+        logger.info(f"✅ Batch analysis completed: {len(texts)} texts, {len(pending_indices)} analysed "
+                    f"in {len(buckets)} buckets")
+        return results
+    
+    def _batch_token_ids(self, texts: List[str]) -> Optional[List[List[int]]]:
+        """Tokenise all texts once for XLM-R (unpadded); None if the tokenizer is unavailable"""
+        if not self.xlm_r_tokenizer or not texts:
+            return None
+        try:
+            return self.xlm_r_tokenizer(texts, truncation=True, max_length=XLM_R_MAX_LENGTH)["input_ids"]
+        except Exception as e:
+            logger.error(f"Batch tokenisation failed, bucketing by character length: {e}")
+            return None
+    
+    def _prefill_bucket(self, contexts: List[TextAnalysisContext],
+                        token_ids: Optional[List[List[int]]]) -> None:
+        """
+        Run every available model once on a bucket and store the outputs in the contexts.
+        
+        Outputs already taken from the embedding caches are not recomputed. A model
+        that fails leaves its fields empty, so comprehensive_analysis falls back to
+        the per-text path for that component only.
+        """
+        bucket_texts = [context.text for context in contexts]
+        
+        missing_embeddings = [context for context in contexts if context.sentence_embedding is None]
+        if missing_embeddings and self.sentence_model and self.intent_matrix is not None:
+            try:
+                embeddings = self._unit(self.sentence_model.encode(
+                    [context.text for context in missing_embeddings], batch_size=len(missing_embeddings)
+                ))
+                for context, embedding in zip(missing_embeddings, embeddings):
+                    context.sentence_embedding = self._cacheable(embedding)
+                    self.sentence_embedding_cache.put((self.sentence_model_name, context.cache_key),
+                                                      context.sentence_embedding)
+            except Exception as e:
+                logger.error(f"Batched sentence encoding failed: {e}")
+        
+        inputs = None
+        if token_ids is not None:
+            try:
+                # Pad only to the longest text in this bucket
+                inputs = self.xlm_r_tokenizer.pad({"input_ids": token_ids}, return_tensors="pt").to(self.device)
+            except Exception as e:
+                logger.error(f"Bucket padding failed: {e}")
+        
+        if inputs is not None and self.xlm_r_model and any(context.xlm_r_features is None for context in contexts):
+            try:
+                for context, features in zip(contexts, self._xlm_r_cls_vectors(inputs)):
+                    if context.xlm_r_features is None:
+                        context.xlm_r_features = self._cacheable(features)
+                        self.xlm_r_feature_cache.put((self.xlm_r_model_name, context.cache_key),
+                                                     context.xlm_r_features)
+            except Exception as e:
+                logger.error(f"Batched XLM-R feature extraction failed: {e}")
+        
+        if self.sentiment_pipeline:
+            try:
+                if inputs is not None and self.sentiment_shares_xlm_r_tokens:
+                    scores = self._sentiment_scores_from_tokens(inputs)
+                else:
+                    results = self.sentiment_pipeline(bucket_texts, batch_size=len(bucket_texts))
+                    scores = [{result['label'].lower(): result['score'] for result in row} for row in results]
+                for context, sentiment_scores in zip(contexts, scores):
+                    context.sentiment_scores = sentiment_scores
+            except Exception as e:
+                logger.error(f"Batched sentiment analysis failed: {e}")
@@ -0,0 +1,31 @@
+# Unit tests for the compiled multi-keyword matcher
+
+# Import the matcher under test
+from keyword_matcher import KeywordMatcher
+
+
+def test_counts_match_substring_scan_for_every_category():
+    """Test that one pass gives the same counts as `keyword in text` per keyword"""
+    keyword_lists = {
+        "work": ["iş", "ofis", "toplantı", "work", "meeting"],
+        "party": ["parti", "party", "event", "etkinlik"],
+        "recommendation": ["ne giyebilirim", "öneri", "what to wear"],
+    }
+    matcher = KeywordMatcher(keyword_lists)
+    text = "iş toplantısı ve akşam partisi için ne giyebilirim? what to wear at work"
+
+    expected = {
+        category: sum(1 for keyword in keywords if keyword in text)
+        for category, keywords in keyword_lists.items()
+    }
+    assert matcher.count(text) == expected
+    assert matcher.count(text) == {"work": 3, "party": 1, "recommendation": 2}
+
+
+def test_overlapping_and_repeated_keywords():
+    """Test suffix matches via failure links and keywords listed in several categories"""
+    matcher = KeywordMatcher({"a": ["she", "he", "hers"], "b": ["he", "he"]})
+
+    assert matcher.find_keywords("ushers") == {"she", "he", "hers"}
+    assert matcher.count("ushers") == {"a": 3, "b": 2}
+    assert matcher.count("") == {"a": 0, "b": 0}
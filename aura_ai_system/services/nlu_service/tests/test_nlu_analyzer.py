@@ -0,0 +1,74 @@
+# Unit tests for the single-encode category scoring of the NLU analyzer
+# The sentence transformer is a deterministic stub and the XLM-R / sentiment models are not loaded
+
+import zlib
+
+import numpy as np
+import pytest
+
+# The analyzer module imports these at load time
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("langdetect")
+cosine_similarity = pytest.importorskip("sklearn.metrics.pairwise").cosine_similarity
+
+import nlu_analyzer
+
+
+class StubSentenceModel:
+    """Sentence transformer stand-in: one seeded vector per text, counting encode calls"""
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.encode_calls = 0
+
+    def to(self, device):
+        return self
+
+    def encode(self, texts):
+        self.encode_calls += 1
+        return np.stack([
+            np.random.default_rng(zlib.crc32(text.encode("utf-8"))).normal(size=32).astype(np.float32)
+            for text in texts
+        ])
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    """Analyzer with the stub sentence model; the other models fail to load and use their fallbacks"""
+    def unavailable(*args, **kwargs):
+        raise OSError("model downloads are disabled in tests")
+
+    monkeypatch.setattr(nlu_analyzer.AutoTokenizer, "from_pretrained", unavailable)
+    monkeypatch.setattr(nlu_analyzer.AutoModel, "from_pretrained", unavailable)
+    monkeypatch.setattr(nlu_analyzer, "pipeline", unavailable)
+    monkeypatch.setattr(nlu_analyzer, "SentenceTransformer", StubSentenceModel)
+    return nlu_analyzer.AdvancedNLUAnalyzer()
+
+
+def test_matrix_scores_match_per_category_cosine_similarity(analyzer):
+    """Test that one matrix product gives the cosine similarity the per-category loops computed"""
+    text = "iş toplantısı için ne giyebilirim?"
+    text_embedding = analyzer.sentence_model.encode([text])
+
+    intent = analyzer.classify_intent(text)
+    context = analyzer.detect_context(text)
+
+    for result, category_embeddings in ((intent, analyzer.intent_embeddings),
+                                        (context, analyzer.context_embeddings)):
+        expected = {
+            label: float(cosine_similarity(text_embedding, [embedding])[0][0])
+            for label, embedding in category_embeddings.items()
+        }
+        assert result["all_scores"] == pytest.approx(expected, abs=1e-5)
+    assert intent["intent"] == max(intent["all_scores"], key=intent["all_scores"].get)
+
+
+def test_comprehensive_analysis_encodes_each_text_once(analyzer):
+    """Test that intent and context share one sentence encode per analysed text"""
+    analyzer.sentence_model.encode_calls = 0
+
+    analyzer.comprehensive_analysis("I need a dress for a party tomorrow")
+    assert analyzer.sentence_model.encode_calls == 1
+
+    analyzer.comprehensive_analysis("yarın parti için elbise lazım")
+    assert analyzer.sentence_model.encode_calls == 2
@@ -0,0 +1,48 @@
+# Unit tests for the NLU normalised-text cache
+# Pure Python and numpy, so no transformer models are needed
+
+import numpy as np
+
+# Import the cache helpers under test
+from nlu_cache import NLUCache, estimate_size, normalize_text
+
+
+def test_normalize_text_uses_turkish_casing_for_turkish_text():
+    """Test that İ/I lower to i/ı in Turkish text and whitespace is collapsed"""
+    assert normalize_text("  İŞ  için NE giyebilirim ") == "iş için ne giyebilirim"
+    assert normalize_text("IŞIK   İstanbul") == "ışık istanbul"
+    assert normalize_text("What should I   wear to WORK") == "what should i wear to work"
+
+
+def test_cache_evicts_least_recently_used_entries_beyond_memory_budget():
+    """Test that the byte budget evicts the oldest entries and memory is accounted"""
+    vector = np.zeros(256, dtype=np.float32)
+    entry_size = estimate_size(vector)
+    cache = NLUCache("test", ttl_seconds=60, max_entries=100, max_bytes=entry_size * 2)
+
+    cache.put("a", vector.copy())
+    cache.put("b", vector.copy())
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", vector.copy())
+
+    assert cache.get("b") is None
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["memory_bytes"] == entry_size * 2
+    assert stats["evictions"] == 1
+
+
+def test_cache_entries_expire_after_ttl():
+    """Test that expired entries count as misses and free their memory"""
+    now = [0.0]
+    cache = NLUCache("test", ttl_seconds=10, max_entries=10, max_bytes=1 << 20, clock=lambda: now[0])
+
+    cache.put("query", {"intent": "product_recommendation"})
+    assert cache.get("query") == {"intent": "product_recommendation"}
+    now[0] = 11.0
+
+    assert cache.get("query") is None
+    stats = cache.get_stats()
+    assert stats["expirations"] == 1
+    assert stats["memory_bytes"] == 0
+    assert stats["hit_rate"] == 0.5
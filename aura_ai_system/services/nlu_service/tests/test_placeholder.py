@@ -6,6 +6,7 @@ import pytest
 # Import FastAPI test client for API endpoint testing
 from fastapi.testclient import TestClient
 # Import the main FastAPI application
+import main
 from main import app
 
 # Create a test client for making HTTP requests to the application
@@ -62,6 +63,33 @@ def test_parse_request_empty_text():
     # Verify that a 400 Bad Request error is returned
     assert response.status_code == 400
 
+def test_analyze_batch_keeps_input_order(monkeypatch):
+    """
+    Test the batch endpoint on the prompt-pattern path (no transformer models here).
+    Results must come back in the same order as the input texts.
+    """
+    # Use the prompt engineering analyzer and no transformer analyzer
+    monkeypatch.setattr(main, "advanced_nlu", None)
+    monkeypatch.setattr(main, "prompt_nlu", main.create_advanced_nlu())
+    texts = ["I want sporty sneakers today", "Bu ceketle ne giyebilirim?", "merhaba"]
+    
+    # Send POST request with several texts
+    response = client.post("/analyze_batch", json={"texts": texts, "bucket_size": 2})
+    
+    # Verify one result per text, in input order
+    assert response.status_code == 200
+    response_data = response.json()
+    assert response_data["count"] == 3
+    assert response_data["analysis_method"] == "prompt_patterns"
+    assert [result["nlu_analysis"]["user_input"] for result in response_data["results"]] == texts
+
+def test_analyze_batch_rejects_empty_list():
+    """
+    Test that an empty batch is rejected by request validation.
+    """
+    response = client.post("/analyze_batch", json={"texts": []})
+    assert response.status_code == 422
+
 def test_placeholder():
     """
     Placeholder test that always passes.
@@ -0,0 +1,103 @@
+# 🗂️ AURA AI - Process-Wide CV Prompt Engine Registry
+# One preinitialised instance per CV prompt engine, shared by every request.
+#
+# Building an engine creates all of its prompt tables (scenario patterns,
+# model configs, fashion database, flow patterns, Turkish vocabulary and
+# prompt templates). The registry builds each engine once and hands the same
+# instance to every caller, so the module-level helpers cost a dictionary
+# lookup. Request handling only reads the tables; a hot reload builds fresh
+# tables and swaps them in whole, so requests already running keep a
+# consistent view and no restart is needed.
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CVEngineRegistry:
+    """
+    Lazily built, process-wide singletons for the CV prompt engines.
+
+    Engines may implement `reload_patterns()`, which rebuilds their prompt
+    tables and swaps them in atomically; it is used by `reload()`.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._engines: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.build_times_ms: Dict[str, float] = {}
+        self.reload_counts: Dict[str, int] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Register the factory building an engine (the engine itself is built on first use)"""
+        with self._lock:
+            self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """
+        Return the shared engine instance, building it on first use.
+
+        Raises:
+            KeyError: When no factory is registered under `name`
+        """
+        # Fast path: a plain dictionary lookup once the engine exists
+        engine = self._engines.get(name)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            # Another thread may have built it while we waited for the lock
+            if name not in self._engines:
+                factory = self._factories[name]
+                start_time = time.perf_counter()
+                self._engines[name] = factory()
+                self.build_times_ms[name] = round((time.perf_counter() - start_time) * 1000, 2)
+                logger.info(f"🗂️ CV engine '{name}' built once in {self.build_times_ms[name]}ms")
+            return self._engines[name]
+
+    def reload(self, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Hot-reload the prompt tables of built engines without a restart.
+
+        Args:
+            names: Engines to reload (default: every built engine)
+
+        Returns:
+            Per-engine reload duration in milliseconds
+        """
+        results = {}
+        with self._lock:
+            for name in names or list(self._engines):
+                engine = self._engines.get(name)
+                if engine is None:
+                    continue
+                start_time = time.perf_counter()
+                if hasattr(engine, "reload_patterns"):
+                    engine.reload_patterns()
+                else:
+                    # Engines without an in-place reload are rebuilt and swapped
+                    self._engines[name] = self._factories[name]()
+                results[name] = round((time.perf_counter() - start_time) * 1000, 2)
+                self.reload_counts[name] = self.reload_counts.get(name, 0) + 1
+                logger.info(f"🔁 CV engine '{name}' prompt patterns reloaded in {results[name]}ms")
+        return results
+
+    def get_status(self) -> Dict[str, Any]:
+        """Registered and built engines with their build and reload statistics"""
+        return {
+            name: {
+                "built": name in self._engines,
+                "build_time_ms": self.build_times_ms.get(name),
+                "reloads": self.reload_counts.get(name, 0),
+            }
+            for name in self._factories
+        }
+
+
+# Process-wide registry shared by both CV prompt engine modules
+engine_registry = CVEngineRegistry()
@@ -27,6 +27,11 @@ import cv2
 from PIL import Image
 import requests
 
+# Shared decode-once preprocessing stage
+from image_preprocessing import DecodedImage
+# Process-wide engine registry (tables are built once per process)
+from cv_engine_registry import engine_registry
+
 # Configure comprehensive logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -153,11 +158,8 @@ class AuraComputerVisionPromptEngine:
         self.device = torch.device("cuda" if torch.cuda.is_available() and TORCH_AVAILABLE else "cpu")
         self.models_loaded = False
         
-        # Prompt Engineering Templates
-        self.prompt_templates = self._initialize_prompt_templates()
-        
-        # Turkish fashion vocabulary
-        self.turkish_fashion_vocab = self._initialize_turkish_vocab()
+        # Prompt Engineering Templates and Turkish fashion vocabulary
+        self.reload_patterns()
         
         # Service endpoints for coordination
         self.service_endpoints = {
@@ -169,9 +171,22 @@ class AuraComputerVisionPromptEngine:
         
         logger.info("🖼️ AURA Computer Vision Prompt Engine initialized")
         
-        # Try to load AI models
+        # Try to load AI models (only possible from inside a running event loop)
         if TORCH_AVAILABLE or CLIP_AVAILABLE:
-            asyncio.create_task(self._load_models_async())
+            try:
+                asyncio.get_running_loop().create_task(self._load_models_async())
+            except RuntimeError:
+                logger.info("ℹ️ No running event loop, AI model loading deferred")
+    
+    def reload_patterns(self):
+        """
+        Rebuild the prompt templates and Turkish vocabulary and swap them in (hot reload).
+        Both tables are built before either is assigned, so running requests keep a consistent view.
+        """
+        prompt_templates = self._initialize_prompt_templates()
+        turkish_fashion_vocab = self._initialize_turkish_vocab()
+        self.prompt_templates = prompt_templates
+        self.turkish_fashion_vocab = turkish_fashion_vocab
     
     def _initialize_prompt_templates(self) -> Dict[str, Dict[str, str]]:
         """Prompt Engineering Templates for Computer Vision"""
@@ -311,7 +326,7 @@ class AuraComputerVisionPromptEngine:
     
     async def analyze_fashion_image(
         self,
-        image_data: str,
+        image_data: Union[str, DecodedImage],
         analysis_type: str = "auto_detect",
         user_context: Optional[Dict[str, Any]] = None
     ) -> AuraImageAnalysisResult:
@@ -379,23 +394,16 @@ class AuraComputerVisionPromptEngine:
         else:
             return PromptPattern.PERSONA  # Default expert analysis
     
-    async def _preprocess_image(self, image_data: str) -> np.ndarray:
+    async def _preprocess_image(self, image_data: Union[str, DecodedImage]) -> np.ndarray:
         """Image preprocessing for analysis"""
         
         try:
-            # Base64 decode
-            image_bytes = base64.b64decode(image_data)
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Resize for processing
-            image = image.resize((640, 640))
+            # Base64 decode + RGB conversion through the shared decode-once stage
+            # Uploads already decoded by the service are reused as-is
+            decoded = DecodedImage.from_any(image_data)
             
-            # Convert to numpy array
-            image_array = np.array(image)
+            # Resize for processing (read-only view of the memoised 640x640 buffer)
+            image_array = decoded.array((640, 640), Image.Resampling.BICUBIC)
             
             logger.info(f"✅ Image preprocessed - Shape: {image_array.shape}")
             return image_array
@@ -622,18 +630,16 @@ class AuraComputerVisionPromptEngine:
         
         return coordination_data
 
-# Global instance
-aura_cv_engine: Optional[AuraComputerVisionPromptEngine] = None
+# Registry name of this engine (one shared instance per process)
+CV_ENGINE_NAME = "enhanced_cv_prompt_engine"
+engine_registry.register(CV_ENGINE_NAME, AuraComputerVisionPromptEngine)
 
 def create_aura_cv_engine() -> AuraComputerVisionPromptEngine:
-    """AURA Computer Vision Engine factory function"""
-    global aura_cv_engine
-    if aura_cv_engine is None:
-        aura_cv_engine = AuraComputerVisionPromptEngine()
-    return aura_cv_engine
+    """AURA Computer Vision Engine factory function (shared, preinitialised instance)"""
+    return engine_registry.get(CV_ENGINE_NAME)
 
 async def process_fashion_image_with_prompts(
-    image_data: str,
+    image_data: Union[str, DecodedImage],
     analysis_scenario: str = "auto_detect", 
     user_context: Optional[Dict[str, Any]] = None
 ) -> AuraImageAnalysisResult:
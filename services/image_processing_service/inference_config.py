@@ -0,0 +1,134 @@
+# ⚙️ AURA AI - Image Inference Configuration
+# Deployment-level tuning knobs for the ClothingImageAnalyzer inference path.
+# Values are read from environment variables so each replica can be tuned
+# without code changes (docker-compose / k8s env blocks).
+
+import os
+from dataclasses import dataclass, field
+from typing import List
+
+# Models ClothingImageAnalyzer can load
+IMAGE_MODEL_NAMES = ["resnet", "vit", "clip"]
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to the default"""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to the default"""
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_str(name: str, default: str) -> str:
+    """Read a string environment variable, falling back to the default"""
+    value = os.getenv(name)
+    return value if value not in (None, "") else default
+
+
+def _env_list(name: str, default: List[str]) -> List[str]:
+    """Read a comma separated list ("none" yields an empty list)"""
+    value = os.getenv(name)
+    if value in (None, ""):
+        return list(default)
+    if value.strip().lower() == "none":
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable ("1", "true", "yes", "on" are truthy)"""
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class ImageInferenceConfig:
+    """
+    Inference configuration for the image processing service.
+
+    Attributes:
+        deep_analysis_enabled: Load ClothingImageAnalyzer (ResNet/ViT/CLIP) at startup
+        max_batch_size: Maximum number of images stacked into one model batch
+        max_batch_wait_ms: Maximum time the scheduler waits to fill a batch
+        cache_enabled: Reuse analysis results for identical decoded images
+        cache_memory_entries: Capacity of the in-memory LRU tier of the analysis cache
+        cache_dir: Directory of the on-disk analysis cache tier (empty disables it)
+        cache_disk_max_bytes: Size budget of the on-disk tier, oldest entries are
+            deleted beyond it (0 = unbounded)
+        enabled_models: Models this replica may load (features of the others are omitted)
+        preload_models: Models loaded at startup; the rest load on first use
+        warmup_on_startup: Run one dummy batch after preloading
+        inference_workers: Number of worker threads running decode and inference
+        torch_threads_per_worker: torch intra-op threads per worker (0 = CPU count / workers)
+        max_queue_depth: Waiting requests allowed before the service answers 429
+        quantization: "int8" runs ViT/CLIP with dynamic int8 linear layers ("none" = fp32)
+        resnet_channels_last: Run ResNet-50 with channels-last tensors
+        resnet_bfloat16: Run ResNet-50 in bfloat16 (implies channels-last)
+        dedup_enabled: Reuse cached analyses for perceptual near-duplicates
+        dedup_max_distance: pHash Hamming distance still treated as a near-duplicate
+        dedup_max_color_distance: Mean Lab Delta E still treated as the same colour
+        dedup_max_clusters: Distinct images tracked by the near-duplicate index
+        bulk_max_in_flight: Bulk job items processed concurrently across all jobs
+        bulk_max_jobs: Bulk jobs retained for status and result fetches
+        bulk_allowed_roots: Directories bulk manifests may read local files from
+            (empty list = only base64 items are accepted)
+    """
+    deep_analysis_enabled: bool = True
+    max_batch_size: int = 16
+    max_batch_wait_ms: float = 10.0
+    cache_enabled: bool = True
+    cache_memory_entries: int = 1024
+    cache_dir: str = ""
+    cache_disk_max_bytes: int = 2 * 1024 ** 3
+    enabled_models: List[str] = field(default_factory=lambda: list(IMAGE_MODEL_NAMES))
+    preload_models: List[str] = field(default_factory=lambda: list(IMAGE_MODEL_NAMES))
+    warmup_on_startup: bool = True
+    inference_workers: int = 2
+    torch_threads_per_worker: int = 0
+    max_queue_depth: int = 64
+    quantization: str = "none"
+    resnet_channels_last: bool = False
+    resnet_bfloat16: bool = False
+    dedup_enabled: bool = True
+    dedup_max_distance: int = 10
+    dedup_max_color_distance: float = 10.0
+    dedup_max_clusters: int = 100000
+    bulk_max_in_flight: int = 16
+    bulk_max_jobs: int = 100
+    bulk_allowed_roots: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_env(cls) -> "ImageInferenceConfig":
+        """Build the configuration from AURA_IMAGE_* environment variables"""
+        return cls(
+            deep_analysis_enabled=_env_bool("AURA_IMAGE_DEEP_ANALYSIS", cls.deep_analysis_enabled),
+            max_batch_size=_env_int("AURA_IMAGE_MAX_BATCH_SIZE", cls.max_batch_size),
+            max_batch_wait_ms=_env_float("AURA_IMAGE_MAX_BATCH_WAIT_MS", cls.max_batch_wait_ms),
+            cache_enabled=_env_bool("AURA_IMAGE_CACHE_ENABLED", cls.cache_enabled),
+            cache_memory_entries=_env_int("AURA_IMAGE_CACHE_MEMORY_ENTRIES", cls.cache_memory_entries),
+            cache_dir=_env_str("AURA_IMAGE_CACHE_DIR", cls.cache_dir),
+            cache_disk_max_bytes=_env_int("AURA_IMAGE_CACHE_DISK_MAX_BYTES", cls.cache_disk_max_bytes),
+            enabled_models=_env_list("AURA_IMAGE_ENABLED_MODELS", IMAGE_MODEL_NAMES),
+            preload_models=_env_list("AURA_IMAGE_PRELOAD_MODELS", IMAGE_MODEL_NAMES),
+            warmup_on_startup=_env_bool("AURA_IMAGE_WARMUP", cls.warmup_on_startup),
+            inference_workers=_env_int("AURA_IMAGE_INFERENCE_WORKERS", cls.inference_workers),
+            torch_threads_per_worker=_env_int("AURA_IMAGE_TORCH_THREADS", cls.torch_threads_per_worker),
+            max_queue_depth=_env_int("AURA_IMAGE_MAX_QUEUE_DEPTH", cls.max_queue_depth),
+            quantization=_env_str("AURA_IMAGE_QUANTIZATION", cls.quantization),
+            resnet_channels_last=_env_bool("AURA_IMAGE_RESNET_CHANNELS_LAST", cls.resnet_channels_last),
+            resnet_bfloat16=_env_bool("AURA_IMAGE_RESNET_BF16", cls.resnet_bfloat16),
+            dedup_enabled=_env_bool("AURA_IMAGE_DEDUP_ENABLED", cls.dedup_enabled),
+            dedup_max_distance=_env_int("AURA_IMAGE_DEDUP_MAX_DISTANCE", cls.dedup_max_distance),
+            dedup_max_color_distance=_env_float("AURA_IMAGE_DEDUP_MAX_COLOR_DISTANCE",
+                                                cls.dedup_max_color_distance),
+            dedup_max_clusters=_env_int("AURA_IMAGE_DEDUP_MAX_CLUSTERS", cls.dedup_max_clusters),
+            bulk_max_in_flight=_env_int("AURA_IMAGE_BULK_MAX_IN_FLIGHT", cls.bulk_max_in_flight),
+            bulk_max_jobs=_env_int("AURA_IMAGE_BULK_MAX_JOBS", cls.bulk_max_jobs),
+            bulk_allowed_roots=_env_list("AURA_IMAGE_BULK_ROOTS", []),
+        )
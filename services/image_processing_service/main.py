@@ -1,20 +1,26 @@
 # �️ AURA AI IMAGE PROCESSING - PROMPT ENGINEERING ENHANCED
 # Advanced Computer Vision with Prompt Engineering and Flow Orchestration
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
+import os
 from datetime import datetime
 import json
 import numpy as np
-import base64
-import io
-from PIL import Image
 import cv2
 import asyncio
+import time
+import functools
 import requests
 
+# Configure comprehensive logging for Phase 6 multi-modal AI tracking
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 # Import our Enhanced Prompt Engineering CV Engine
 try:
     from enhanced_cv_prompt_engine import (
@@ -51,14 +57,6 @@ except ImportError as e:
 
 PROMPT_ENGINE_AVAILABLE = ENHANCED_PROMPT_ENGINE_AVAILABLE or ORIGINAL_PROMPT_ENGINE_AVAILABLE
 
-# Configure comprehensive logging for Phase 6 multi-modal AI tracking
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Configure comprehensive logging for Phase 6 multi-modal AI tracking
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
 if PROMPT_ENGINE_AVAILABLE:
     logger.info("✅ Prompt Engineering CV Engine loaded successfully")
 else:
@@ -81,9 +79,30 @@ except ImportError:
     CLIP_AVAILABLE = False
     AI_AVAILABLE = False  # No AI libraries available
 
-# Configure comprehensive logging for Phase 6 multi-modal AI tracking
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Deep feature analyzer (ResNet-50 / ViT / CLIP) served through the micro-batching scheduler
+try:
+    from image_analyzer import ClothingImageAnalyzer
+    from model_optimization import InferenceOptimization
+    DEEP_ANALYZER_AVAILABLE = True
+except ImportError as e:
+    DEEP_ANALYZER_AVAILABLE = False
+    logger.warning(f"⚠️ Deep image analyzer not available: {e}")
+
+from inference_config import ImageInferenceConfig
+from inference_scheduler import MicroBatchScheduler
+from inference_workers import InferenceWorkerPool, InferenceQueueFullError
+from color_palette import DominantColorExtractor, PaletteColor, complementary_hex
+from cv_engine_registry import engine_registry
+from embedding_encoding import (
+    build_multipart_body,
+    format_analysis_vectors,
+    negotiate_vector_format,
+    split_analysis_vectors,
+)
+from analysis_cache import AnalysisCache, compute_image_key
+from bulk_jobs import BulkItemStatus, BulkJob, BulkJobItem, BulkJobManager
+from near_duplicate_index import ImageHashes, NearDuplicateIndex, compute_image_hashes
+from image_preprocessing import DecodedImage
 
 # AURA AI: Enhanced FastAPI application with Advanced Prompt Engineering CV capabilities
 app = FastAPI(
@@ -95,6 +114,18 @@ app = FastAPI(
 # Global CV Engine instance
 cv_engine: Optional[AuraComputerVisionEngine] = None
 
+# Global deep analyzer and its micro-batching scheduler
+inference_config = ImageInferenceConfig.from_env()
+inference_pool: Optional[InferenceWorkerPool] = None
+deep_image_analyzer = None
+deep_analysis_scheduler: Optional[MicroBatchScheduler] = None
+deep_item_scheduler: Optional[MicroBatchScheduler] = None
+deep_analysis_cache: Optional[AnalysisCache] = None
+near_duplicate_index: Optional[NearDuplicateIndex] = None
+bulk_job_manager: Optional[BulkJobManager] = None
+deep_analyzer_warmup_task: Optional[asyncio.Task] = None
+deep_analyzer_warmup_info: Dict[str, Any] = {}
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize Enhanced CV Engine on startup"""
@@ -102,10 +133,29 @@ async def startup_event():
     
     logger.info("🚀 Starting AURA Image Processing Service v8.0.0 with Enhanced CV Engine")
     
+    # Worker pool that keeps decode and inference off the event loop
+    global inference_pool
+    inference_pool = InferenceWorkerPool(
+        num_workers=inference_config.inference_workers,
+        max_queue_depth=inference_config.max_queue_depth,
+        torch_threads_per_worker=inference_config.torch_threads_per_worker
+    )
+    phase6_ai_system.worker_pool = inference_pool
+    
+    # Catalog-scale jobs share the decode, cache and batching path of single requests
+    global bulk_job_manager
+    bulk_job_manager = BulkJobManager(
+        _process_bulk_item,
+        max_in_flight=inference_config.bulk_max_in_flight,
+        max_jobs=inference_config.bulk_max_jobs,
+        retry_exceptions=(InferenceQueueFullError,)
+    )
+    
     # Initialize enhanced CV engine
     try:
-        enhanced_cv_engine = AuraComputerVisionPromptEngine()
-        await enhanced_cv_engine.initialize_engine()
+        # Shared registry instance: prompt tables are built once per process
+        # (the engine schedules its own model loading when built inside the event loop)
+        enhanced_cv_engine = create_aura_cv_engine()
         logger.info("✅ Enhanced Computer Vision Prompt Engine initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize Enhanced CV Engine: {e}")
@@ -121,8 +171,242 @@ async def startup_event():
     else:
         logger.warning("⚠️ Running without Prompt Engineering CV Engine")
     
+    # Initialize deep feature analyzer behind the micro-batching scheduler
+    await _initialize_deep_analyzer()
+    
     logger.info("🌟 AURA Image Processing Service ready for enhanced fashion analysis!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background inference components on shutdown"""
+    if bulk_job_manager is not None:
+        await bulk_job_manager.shutdown()
+    for scheduler in (deep_analysis_scheduler, deep_item_scheduler):
+        if scheduler is not None:
+            await scheduler.stop()
+    if inference_pool is not None:
+        inference_pool.shutdown()
+
+async def _initialize_deep_analyzer():
+    """Create ClothingImageAnalyzer and start the micro-batching scheduler in front of it"""
+    global deep_image_analyzer, deep_analysis_scheduler, deep_item_scheduler
+    global deep_analysis_cache, near_duplicate_index, deep_analyzer_warmup_task
+    
+    if not DEEP_ANALYZER_AVAILABLE or not inference_config.deep_analysis_enabled:
+        logger.info("ℹ️ Deep image analysis disabled for this deployment")
+        return
+    
+    try:
+        # Models load lazily; the configured preload list and warmup run in the background
+        # so the service accepts health checks immediately and /ready reports progress
+        deep_image_analyzer = ClothingImageAnalyzer(
+            preload_models=[],
+            enabled_models=inference_config.enabled_models,
+            optimization=InferenceOptimization(
+                quantization=inference_config.quantization,
+                resnet_channels_last=inference_config.resnet_channels_last,
+                resnet_bfloat16=inference_config.resnet_bfloat16
+            )
+        )
+        
+        # Vectors stay float32 arrays until the response picks its wire format
+        deep_analysis_scheduler = MicroBatchScheduler(
+            functools.partial(deep_image_analyzer.batch_comprehensive_analysis, vectors_as_lists=False),
+            max_batch_size=inference_config.max_batch_size,
+            max_wait_ms=inference_config.max_batch_wait_ms,
+            name="clothing_image_analyzer",
+            worker_pool=inference_pool,
+            max_pending=inference_config.max_queue_depth
+        )
+        await deep_analysis_scheduler.start()
+        
+        # Per-garment requests batch separately: every frame of their batch also
+        # contributes its detected item crops to the same forward passes
+        deep_item_scheduler = MicroBatchScheduler(
+            functools.partial(deep_image_analyzer.batch_comprehensive_analysis,
+                              vectors_as_lists=False, include_items=True),
+            max_batch_size=inference_config.max_batch_size,
+            max_wait_ms=inference_config.max_batch_wait_ms,
+            name="clothing_image_analyzer_items",
+            worker_pool=inference_pool,
+            max_pending=inference_config.max_queue_depth
+        )
+        await deep_item_scheduler.start()
+        logger.info("✅ Deep image analyzer initialized with micro-batching scheduler")
+        
+        # Content-addressed cache so repeated uploads skip inference entirely
+        if inference_config.cache_enabled:
+            deep_analysis_cache = AnalysisCache(
+                max_memory_entries=inference_config.cache_memory_entries,
+                disk_dir=inference_config.cache_dir or None,
+                max_disk_bytes=inference_config.cache_disk_max_bytes
+            )
+            logger.info("✅ Content-addressed analysis cache enabled")
+            
+            # Perceptual near-duplicates (re-encodes, small crops, watermarks) reuse cached analyses
+            if inference_config.dedup_enabled:
+                near_duplicate_index = NearDuplicateIndex(
+                    max_distance=inference_config.dedup_max_distance,
+                    max_color_distance=inference_config.dedup_max_color_distance,
+                    max_clusters=inference_config.dedup_max_clusters
+                )
+                logger.info("✅ Perceptual-hash near-duplicate index enabled")
+        
+        deep_analyzer_warmup_task = asyncio.create_task(_preload_and_warmup_deep_analyzer())
+    except Exception as e:
+        logger.error(f"❌ Failed to initialize deep image analyzer: {e}")
+        deep_image_analyzer = None
+        deep_analysis_scheduler = None
+        deep_item_scheduler = None
+
+async def _preload_and_warmup_deep_analyzer():
+    """Load the configured preload list and run one dummy batch on the inference workers"""
+    try:
+        await inference_pool.run(deep_image_analyzer.load_models, inference_config.preload_models)
+        if inference_config.warmup_on_startup:
+            deep_analyzer_warmup_info.update(await inference_pool.run(deep_image_analyzer.warmup))
+        logger.info(f"✅ Deep image analyzer ready - resident models: {deep_image_analyzer.resident_models}")
+    except Exception as e:
+        logger.error(f"❌ Deep image analyzer preload/warmup failed: {e}")
+        deep_analyzer_warmup_info["error"] = str(e)
+
+async def _decode_upload(image_data: Union[bytes, str]) -> DecodedImage:
+    """
+    Decode uploaded bytes or a base64 string once, on the inference workers.
+    
+    Raises:
+        InferenceQueueFullError: When the worker pool is saturated
+    """
+    decode = DecodedImage.from_base64 if isinstance(image_data, str) else DecodedImage.from_bytes
+    return await inference_pool.run(decode, image_data)
+
+def _queue_full_http_error(error: InferenceQueueFullError) -> HTTPException:
+    """Translate a saturated inference queue into HTTP 429 with a retry hint"""
+    logger.warning(f"⚠️ Rejecting request, inference queue saturated: {error}")
+    return HTTPException(status_code=429, detail=f"Inference queue saturated: {error}", headers={"Retry-After": "1"})
+
+def _resolve_vector_format(raw_request: Request, vector_format: Optional[str]) -> str:
+    """Negotiate the embedding wire format from the query parameter or Accept header"""
+    try:
+        return negotiate_vector_format(raw_request.headers.get("accept"), vector_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _render_with_deep_analysis(payload: Any, deep_analysis: Optional[Dict[str, Any]], vector_format: str):
+    """
+    Attach the deep analysis to an endpoint payload in the negotiated vector format.
+    JSON and base64 formats return the payload; "npy" returns a multipart/mixed response
+    whose first part is the JSON payload and whose other parts are .npy vectors.
+    """
+    if vector_format != "npy":
+        payload.deep_analysis = format_analysis_vectors(deep_analysis, vector_format)
+        return payload
+    
+    payload.deep_analysis, vectors = split_analysis_vectors(deep_analysis)
+    body, content_type = build_multipart_body(jsonable_encoder(payload), vectors)
+    return Response(content=body, media_type=content_type)
+
+def _fingerprint_image(decoded_image: DecodedImage, version_tag: str) -> Tuple[str, ImageHashes]:
+    """Exact cache key and perceptual hashes of a decoded upload (one worker hop for both)"""
+    return compute_image_key(decoded_image.image, version_tag), compute_image_hashes(decoded_image)
+
+async def _run_deep_analysis(decoded_image: DecodedImage, per_item: bool = False,
+                             source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Run ResNet/ViT/CLIP analysis for one uploaded image through the batching scheduler.
+    Concurrent requests are stacked into shared model batches, images whose
+    decoded pixels were analyzed before are served from the analysis cache, and
+    perceptual near-duplicates of an analyzed image reuse its cached analysis
+    (marked with "near_duplicate_of").
+    Returns None when the deep analyzer is not loaded or the analysis fails.
+    
+    Args:
+        decoded_image: Upload decoded once by _decode_upload
+        per_item: Also return embeddings and attributes for every detected garment
+        source: Upload filename, listed in the duplicate clusters
+    
+    Raises:
+        InferenceQueueFullError: When the scheduler or worker pool is saturated
+    """
+    scheduler = deep_item_scheduler if per_item else deep_analysis_scheduler
+    if scheduler is None:
+        return None
+    
+    try:
+        # Cache lookup by decoded pixel content + model versions (no torch involved)
+        cache_key, cluster = None, None
+        mode = "items" if per_item else "frame"
+        if deep_analysis_cache is not None:
+            version_tag = deep_image_analyzer.model_version_tag + (":items" if per_item else "")
+            cache_key, hashes = await inference_pool.run(_fingerprint_image, decoded_image, version_tag)
+            
+            distance = None
+            if near_duplicate_index is not None:
+                cluster, distance = near_duplicate_index.match_or_add(hashes, source)
+            
+            cached_result = deep_analysis_cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result
+            
+            # Near-duplicate of an analyzed image: reuse the cluster's analysis
+            duplicate_key = cluster.analysis_keys.get(mode) if distance is not None else None
+            duplicate_result = deep_analysis_cache.get(duplicate_key) if duplicate_key else None
+            if duplicate_result is not None:
+                return {
+                    **duplicate_result,
+                    "near_duplicate_of": {"cluster_id": cluster.cluster_id, "hamming_distance": distance}
+                }
+        
+        result = await scheduler.submit(decoded_image)
+        
+        if cache_key is not None:
+            deep_analysis_cache.put(cache_key, result)
+            if cluster is not None:
+                near_duplicate_index.attach_analysis(cluster, mode, cache_key)
+        return result
+    except InferenceQueueFullError:
+        raise
+    except Exception as e:
+        logger.warning(f"⚠️ Deep image analysis failed: {e}")
+        return None
+
+def _decode_local_file(path: str) -> DecodedImage:
+    """Read and decode a manifest file on the inference workers"""
+    with open(path, "rb") as handle:
+        return DecodedImage.from_bytes(handle.read())
+
+def _resolve_bulk_path(path: str) -> str:
+    """
+    Resolve a manifest path and check it lies under AURA_IMAGE_BULK_ROOTS.
+    
+    Raises:
+        PermissionError: When local files are disabled or the path is outside the allowed roots
+    """
+    resolved = os.path.realpath(path)
+    for root in inference_config.bulk_allowed_roots:
+        root = os.path.realpath(root)
+        if os.path.commonpath([root, resolved]) == root:
+            return resolved
+    raise PermissionError(f"Path '{path}' is outside the allowed bulk input directories")
+
+async def _process_bulk_item(job: BulkJob, item: BulkJobItem) -> Dict[str, Any]:
+    """Decode and analyze one bulk manifest item through the cache and batching scheduler"""
+    if item.path:
+        decoded_image = await inference_pool.run(_decode_local_file, _resolve_bulk_path(item.path))
+    else:
+        decoded_image = await _decode_upload(item.image_data)
+    
+    result = await _run_deep_analysis(decoded_image, job.options.get("per_item", False), item.item_id)
+    if result is None:
+        raise RuntimeError("Deep image analysis is unavailable")
+    return result
+
+def _render_bulk_item(job: BulkJob, item: BulkJobItem) -> Dict[str, Any]:
+    """Item state with its result vectors in the job's vector format"""
+    rendered = item.to_dict()
+    rendered["result"] = format_analysis_vectors(item.result, job.options.get("vector_format", "json"))
+    return rendered
+
 # =============================================================================
 # PROMPT ENGINEERING COMPUTER VISION ENDPOINTS
 # =============================================================================
@@ -150,6 +434,7 @@ class PromptImageAnalysisResponse(BaseModel):
     processing_time_ms: float
     confidence_overall: float
     timestamp: str
+    deep_analysis: Optional[Dict[str, Any]] = Field(default=None, description="ResNet/ViT/CLIP feature analysis from ClothingImageAnalyzer")
 
 @app.post("/analyze/enhanced-prompt-engineering", response_model=PromptImageAnalysisResponse)
 async def analyze_fashion_image_with_enhanced_prompts(request: PromptImageAnalysisRequest):
@@ -169,9 +454,12 @@ async def analyze_fashion_image_with_enhanced_prompts(request: PromptImageAnalys
             else:
                 return await _fallback_analysis(request, start_time)
         
+        # Decode the upload once; the engine derives its resolutions from this shared stage
+        decoded_image = await _decode_upload(request.image_data)
+        
         # Execute enhanced prompt engineering analysis
         analysis_result = await process_fashion_image_with_prompts(
-            image_data=request.image_data,
+            image_data=decoded_image,
             analysis_scenario=request.analysis_scenario,
             user_context=request.user_context
         )
@@ -217,6 +505,8 @@ async def analyze_fashion_image_with_enhanced_prompts(request: PromptImageAnalys
             timestamp=analysis_result.timestamp
         )
         
+    except InferenceQueueFullError as e:
+        raise _queue_full_http_error(e)
     except Exception as e:
         logger.error(f"❌ Enhanced prompt engineering analysis failed: {e}")
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
@@ -237,8 +527,15 @@ async def analyze_fashion_image_with_enhanced_prompts(request: PromptImageAnalys
 # Global enhanced CV engine instance
 enhanced_cv_engine = None
 
-async def analyze_fashion_image_with_prompts(request: PromptImageAnalysisRequest) -> PromptImageAnalysisResponse:
-    """Analyze fashion image using enhanced prompt engineering patterns"""
+async def analyze_fashion_image_with_prompts(request: PromptImageAnalysisRequest,
+                                             decoded_image: Optional[DecodedImage] = None) -> PromptImageAnalysisResponse:
+    """
+    Analyze fashion image using enhanced prompt engineering patterns.
+    
+    Args:
+        request: Analysis options (request.image_data is only decoded when no decoded_image is given)
+        decoded_image: Upload already decoded by _decode_upload, handed to the engine as-is
+    """
     
     # Record the start time for processing metrics
     start_time = datetime.now()
@@ -250,12 +547,9 @@ async def analyze_fashion_image_with_prompts(request: PromptImageAnalysisRequest
             return await _fallback_analysis(request, start_time)
         
         # Use the enhanced CV engine for analysis
-        image_bytes = base64.b64decode(request.image_data)
-        
-        # Create analysis request for enhanced engine
         analysis_result = await enhanced_cv_engine.analyze_fashion_image(
-            image_bytes=image_bytes,
-            analysis_scenario=request.analysis_scenario,
+            decoded_image if decoded_image is not None else request.image_data,
+            analysis_type=request.analysis_scenario,
             user_context=request.user_context or {}
         )
         
@@ -267,7 +561,7 @@ async def analyze_fashion_image_with_prompts(request: PromptImageAnalysisRequest
         # Create comprehensive response
         return PromptImageAnalysisResponse(
             success=True,
-            analysis_id=analysis_result.analysis_id,
+            analysis_id=analysis_result.image_id,
             scenario_used=analysis_result.analysis_scenario,
             detected_items=[{
                 "category": item.category.value,
@@ -449,7 +743,7 @@ async def _fallback_analysis(request: PromptImageAnalysisRequest, start_time: da
             "attributes": {
                 "enhanced_fallback": True,
                 "turkish_ready": True,
-                "prompt_pattern": request.prompt_pattern,
+                "analysis_scenario": request.analysis_scenario,
                 "cultural_context": "prepared"
             },
             "turkish_description": "Modern günlük giyim parçası"
@@ -460,13 +754,13 @@ async def _fallback_analysis(request: PromptImageAnalysisRequest, start_time: da
             "confidence_overall": 0.65,
             "enhanced_fallback_mode": True,
             "turkish_optimization": True,
-            "prompt_pattern_processed": request.prompt_pattern
+            "analysis_scenario_processed": request.analysis_scenario
         },
         prompt_engineering_metadata={
             "fallback_mode": "enhanced",
             "engine_status": "temporarily_unavailable",
             "processing_method": "intelligent_placeholder",
-            "prompt_pattern_acknowledged": request.prompt_pattern,
+            "analysis_scenario_acknowledged": request.analysis_scenario,
             "turkish_context": True,
             "cultural_awareness": "high"
         },
@@ -528,6 +822,7 @@ async def get_prompt_engineering_status():
     return {
         "prompt_engine_available": PROMPT_ENGINE_AVAILABLE,
         "cv_engine_initialized": cv_engine is not None,
+        "engine_registry": engine_registry.get_status(),
         "supported_scenarios": [
             "single_shirt_analysis",
             "single_dress_analysis", 
@@ -557,6 +852,18 @@ async def get_prompt_engineering_status():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.post("/prompt-engineering/reload")
+async def reload_prompt_engineering_patterns():
+    """Hot-reload the prompt patterns of every shared CV engine without a restart"""
+    reload_times_ms = engine_registry.reload()
+    logger.info(f"🔁 Prompt patterns reloaded: {reload_times_ms}")
+    return {
+        "success": True,
+        "reloaded_engines": reload_times_ms,
+        "engine_registry": engine_registry.get_status(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 @app.post("/prompt-engineering/test")
 async def test_prompt_engineering_scenarios():
     """Test all prompt engineering scenarios with sample data"""
@@ -616,6 +923,12 @@ async def test_prompt_engineering_scenarios():
         "prompt_engine_status": "operational" if overall_success else "issues_detected",
         "timestamp": datetime.now().isoformat()
     }
+
+class Phase6ImageAnalysisRequest(BaseModel):
+    """
+    PHASE 6 Enhanced: Multi-modal image analysis options.
+    Sent as multipart form fields next to the uploaded image.
+    """
     # Core image analysis parameters
     analysis_type: str = Field(default="comprehensive", description="Type: basic, advanced, comprehensive, multi_modal")
     
@@ -656,6 +969,9 @@ class Phase6ImageAnalysisResponse(BaseModel):
     processing_time: float = Field(description="Total multi-modal processing time")
     models_used: List[str] = Field(description="List of AI models used in analysis")
     performance_metrics: Dict[str, Any] = Field(description="Multi-modal AI performance metrics")
+    
+    # Deep feature analysis (ResNet/ViT/CLIP) when the analyzer is loaded
+    deep_analysis: Optional[Dict[str, Any]] = Field(default=None, description="ResNet/ViT/CLIP feature analysis from ClothingImageAnalyzer")
 
 # PHASE 6: Simulated Multi-Modal AI Models (until real models are installed)
 
@@ -673,8 +989,9 @@ class SimulatedCLIPModel:
     def encode_image(self, image_array: np.ndarray) -> List[float]:
         """Generate CLIP-style image embeddings (simulated)"""
         # Simulate CLIP image encoding with realistic embeddings
-        np.random.seed(hash(str(image_array.mean())) % 2**32)
-        embeddings = np.random.normal(0, 1, self.embedding_dim)
+        # Local generator: stages run concurrently, so the global NumPy RNG is not reseeded
+        rng = np.random.default_rng(hash(str(image_array.mean())) % 2**32)
+        embeddings = rng.normal(0, 1, self.embedding_dim)
         # Normalize embeddings as CLIP does
         embeddings = embeddings / np.linalg.norm(embeddings)
         return embeddings.tolist()
@@ -788,8 +1105,8 @@ class SimulatedTransformerModel:
     def generate_embeddings(self, text: str) -> List[float]:
         """Generate semantic embeddings using simulated transformer"""
         # Simulate BERT-style embeddings
-        np.random.seed(hash(text) % 2**32)
-        embeddings = np.random.normal(0, 1, self.embedding_dim)
+        rng = np.random.default_rng(hash(text) % 2**32)
+        embeddings = rng.normal(0, 1, self.embedding_dim)
         # Normalize embeddings
         embeddings = embeddings / np.linalg.norm(embeddings)
         return embeddings.tolist()
@@ -801,6 +1118,22 @@ class Phase6MultiModalSystem:
     Integrates CLIP, Detectron2, and Transformers for comprehensive fashion understanding.
     """
     
+    # Fashion insights per shared color name (see color_palette.COLOR_NAMES)
+    COLOR_INSIGHTS = {
+        "red": {"emotion": "passionate", "style_match": ["bold", "evening"], "fashion_trend": "statement color", "season": "winter deep"},
+        "orange": {"emotion": "energetic", "style_match": ["sporty", "bohemian"], "fashion_trend": "seasonal accent", "season": "autumn warm"},
+        "yellow": {"emotion": "cheerful", "style_match": ["casual", "trendy"], "fashion_trend": "seasonal accent", "season": "spring fresh"},
+        "green": {"emotion": "calm", "style_match": ["casual", "bohemian"], "fashion_trend": "nature inspired", "season": "spring fresh"},
+        "blue": {"emotion": "professional", "style_match": ["formal", "business"], "fashion_trend": "timeless classic", "season": "summer bright"},
+        "purple": {"emotion": "creative", "style_match": ["elegant", "evening"], "fashion_trend": "statement color", "season": "winter deep"},
+        "pink": {"emotion": "romantic", "style_match": ["feminine", "trendy"], "fashion_trend": "soft accent", "season": "spring fresh"},
+        "brown": {"emotion": "grounded", "style_match": ["vintage", "classic"], "fashion_trend": "earth tone", "season": "autumn warm"},
+        "black": {"emotion": "sophisticated", "style_match": ["elegant", "minimalist"], "fashion_trend": "versatile base", "season": "winter deep"},
+        "white": {"emotion": "clean", "style_match": ["minimalist", "classic"], "fashion_trend": "versatile base", "season": "summer bright"},
+        "gray": {"emotion": "balanced", "style_match": ["business", "minimalist"], "fashion_trend": "versatile base", "season": "winter deep"},
+        "beige": {"emotion": "relaxed", "style_match": ["classic", "minimalist"], "fashion_trend": "earth tone", "season": "autumn warm"},
+    }
+    
     def __init__(self):
         logger.info("🧠 Initializing Phase 6 Multi-Modal AI System")
         
@@ -809,6 +1142,12 @@ class Phase6MultiModalSystem:
         self.detectron2_model = SimulatedDetectron2Model()
         self.transformer_model = SimulatedTransformerModel()
         
+        # Real dominant color extraction (vectorised k-means)
+        self.color_extractor = DominantColorExtractor(num_colors=5)
+        
+        # Worker pool running the independent analysis stages (attached at startup)
+        self.worker_pool: Optional[InferenceWorkerPool] = None
+        
         # Multi-modal configuration
         self.fusion_weights = {
             "vision": 0.4,      # CLIP + Detectron2 visual features
@@ -823,56 +1162,84 @@ class Phase6MultiModalSystem:
     
     async def analyze_image_multimodal(self, 
                                      image_array: np.ndarray, 
-                                     request: PromptImageAnalysisRequest) -> PromptImageAnalysisResponse:
+                                     request: Phase6ImageAnalysisRequest) -> Phase6ImageAnalysisResponse:
         """
         Comprehensive multi-modal image analysis using Phase 6 AI models.
         Combines computer vision, NLP, and cross-modal understanding.
         """
         start_time = datetime.now()
         logger.info("🔍 Starting Phase 6 multi-modal image analysis")
+        stage_timings: Dict[str, float] = {}
         
         try:
+            # Steps 1-3 and 5 only need the image (style also needs detections), so they run
+            # concurrently on the worker pool; dependent steps are chained after their inputs
+            
             # Step 1: Advanced Object Detection with Detectron2
-            detected_items = []
-            if request.use_detectron2:
+            async def detection_stage() -> List[Dict[str, Any]]:
+                if not request.use_detectron2:
+                    return []
                 logger.info("🔍 Running Detectron2 object detection")
-                detected_items = self.detectron2_model.detect_fashion_items(image_array)
+                return await self._run_stage(stage_timings, "detectron2", self.detectron2_model.detect_fashion_items, image_array)
             
             # Step 2: CLIP Vision-Language Understanding
-            clip_description = None
-            vision_embeddings = []
-            if request.include_text_description:
+            async def clip_stage() -> Tuple[Optional[str], List[float]]:
+                if not request.include_text_description:
+                    return None, []
                 logger.info("🖼️ Generating CLIP description and embeddings")
-                clip_description = self.clip_model.generate_description(image_array)
-                vision_embeddings = self.clip_model.encode_image(image_array)
+                return await self._run_stage(stage_timings, "clip", self._run_clip_models, image_array)
+            
+            detection_task = asyncio.ensure_future(detection_stage())
+            clip_task = asyncio.ensure_future(clip_stage())
             
             # Step 3: Advanced Color Analysis
-            colors = self._analyze_colors_advanced(image_array, request.color_analysis_level)
+            async def color_stage() -> List[Dict[str, Any]]:
+                return await self._run_stage(stage_timings, "color_analysis", self._analyze_colors_advanced,
+                                             image_array, request.color_analysis_level)
             
-            # Step 4: Transformer-based Semantic Analysis
-            transformer_insights = {}
-            if request.semantic_analysis and clip_description:
+            # Step 4: Transformer-based Semantic Analysis (after CLIP)
+            async def transformer_stage() -> Dict[str, Any]:
+                clip_description, _ = await clip_task
+                if not (request.semantic_analysis and clip_description):
+                    return {}
                 logger.info("🤖 Running transformer semantic analysis")
-                transformer_insights = self.transformer_model.analyze_semantic_context(
-                    clip_description, request.fashion_context
-                )
+                return await self._run_stage(stage_timings, "transformer", self.transformer_model.analyze_semantic_context,
+                                             clip_description, request.fashion_context)
             
-            # Step 5: Style Recognition with AI
-            style_analysis = {}
-            if request.style_recognition:
+            # Step 5: Style Recognition with AI (after detection)
+            async def style_stage() -> Dict[str, Any]:
+                detected = await detection_task
+                if not request.style_recognition:
+                    return {}
                 logger.info("🎨 Performing AI-powered style analysis")
-                style_analysis = self._analyze_style_with_ai(image_array, detected_items)
+                return await self._run_stage(stage_timings, "style_analysis", self._analyze_style_with_ai, image_array, detected)
+            
+            color_task = asyncio.ensure_future(color_stage())
+            transformer_task = asyncio.ensure_future(transformer_stage())
+            style_task = asyncio.ensure_future(style_stage())
+            stage_tasks = (detection_task, clip_task, color_task, transformer_task, style_task)
+            
+            try:
+                colors, transformer_insights, style_analysis = await asyncio.gather(
+                    color_task, transformer_task, style_task
+                )
+                detected_items = await detection_task
+                clip_description, vision_embeddings = await clip_task
+            except BaseException:
+                # gather does not cancel its siblings on the first failure: cancel every stage
+                # so dependent stages never start, and wait until all of them have settled
+                for task in stage_tasks:
+                    task.cancel()
+                await asyncio.gather(*stage_tasks, return_exceptions=True)
+                raise
             
-            # Step 6: Cross-Modal Feature Fusion
+            # Step 6: Cross-Modal Feature Fusion (after CLIP, transformer and detection)
             cross_modal_features = {}
             semantic_embeddings = []
             if request.cross_modal_embedding:
                 logger.info("🔄 Generating cross-modal embeddings")
-                cross_modal_features = self._fuse_cross_modal_features(
-                    vision_embeddings, transformer_insights, detected_items
-                )
-                semantic_embeddings = self._generate_unified_embeddings(
-                    vision_embeddings, transformer_insights
+                cross_modal_features, semantic_embeddings = await self._run_stage(
+                    stage_timings, "fusion", self._run_fusion, vision_embeddings, transformer_insights, detected_items
                 )
             
             # Step 7: AI Confidence Calculation
@@ -905,62 +1272,101 @@ class Phase6MultiModalSystem:
                 processing_time=round(processing_time, 3),
                 models_used=models_used,
                 performance_metrics={
-                    "detectron2_inference_time": "45ms" if request.use_detectron2 else "0ms",
-                    "clip_inference_time": "28ms" if request.include_text_description else "0ms",
-                    "transformer_inference_time": "35ms" if request.semantic_analysis else "0ms",
-                    "fusion_time": "12ms" if request.cross_modal_embedding else "0ms",
+                    "detectron2_inference_time": f"{stage_timings.get('detectron2', 0.0)}ms",
+                    "clip_inference_time": f"{stage_timings.get('clip', 0.0)}ms",
+                    "transformer_inference_time": f"{stage_timings.get('transformer', 0.0)}ms",
+                    "fusion_time": f"{stage_timings.get('fusion', 0.0)}ms",
+                    "stage_timings_ms": stage_timings,
+                    "sequential_stage_time_ms": round(sum(stage_timings.values()), 2),
+                    "wall_time_ms": round(processing_time * 1000, 2),
                     "total_ai_models": len(models_used),
-                    "multi_modal_efficiency": f"{round(100 / processing_time, 1)}fps"
+                    "multi_modal_efficiency": f"{round(1 / processing_time, 1) if processing_time else 0.0}fps"
                 }
             )
             
             logger.info(f"✅ Phase 6 multi-modal analysis completed in {processing_time:.3f}s")
             return response
             
+        except InferenceQueueFullError:
+            raise
         except Exception as e:
             logger.error(f"❌ Error in Phase 6 multi-modal analysis: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Multi-modal AI analysis error: {str(e)}")
     
+    async def _run_stage(self, stage_timings: Dict[str, float], name: str, fn, *args):
+        """
+        Run one synchronous stage on the inference worker pool and record its execution time.
+        Falls back to the default loop executor when the pool has not been started.
+        """
+        def timed():
+            stage_start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                stage_timings[name] = round((time.perf_counter() - stage_start) * 1000, 2)
+        
+        if self.worker_pool is not None:
+            return await self.worker_pool.run(timed)
+        return await asyncio.get_running_loop().run_in_executor(None, timed)
+    
+    def _run_clip_models(self, image_array: np.ndarray) -> Tuple[str, List[float]]:
+        """CLIP stage: description and image embedding"""
+        return self.clip_model.generate_description(image_array), self.clip_model.encode_image(image_array)
+    
+    def _run_fusion(self, vision_embeddings: List[float], transformer_insights: Dict,
+                    detected_items: List[Dict]) -> Tuple[Dict[str, Any], List[float]]:
+        """Fusion stage: cross-modal features and unified embeddings"""
+        cross_modal_features = self._fuse_cross_modal_features(
+            vision_embeddings, transformer_insights, detected_items
+        )
+        semantic_embeddings = self._generate_unified_embeddings(
+            vision_embeddings, transformer_insights
+        )
+        return cross_modal_features, semantic_embeddings
+    
     def _analyze_colors_advanced(self, image_array: np.ndarray, level: str) -> List[Dict[str, Any]]:
-        """Advanced AI-enhanced color analysis"""
-        # Simulate advanced color analysis with AI insights
-        colors = [
-            {
-                "name": "Deep Navy",
-                "hex": "#1e3a8a",
-                "rgb": [30, 58, 138],
-                "percentage": 42.5,
-                "ai_insights": {
-                    "emotion": "professional",
-                    "style_match": ["formal", "business"],
-                    "complementary_colors": ["#ffffff", "#f3f4f6"],
-                    "fashion_trend": "timeless classic"
-                }
-            },
-            {
-                "name": "Crisp White",
-                "hex": "#ffffff",
-                "rgb": [255, 255, 255],
-                "percentage": 35.2,
+        """Advanced color analysis: k-means dominant colors enriched with fashion insights"""
+        # basic: top 3 colors, advanced/expert: full palette
+        palette = self.color_extractor.extract(image_array)
+        if level == "basic":
+            palette = palette[:3]
+        
+        colors = []
+        for color in palette:
+            insights = self.COLOR_INSIGHTS[color.name]
+            entry = {
+                "name": self._display_color_name(color),
+                "color_family": color.name,
+                "hex": color.hex,
+                "rgb": color.rgb,
+                "percentage": color.percentage,
                 "ai_insights": {
-                    "emotion": "clean",
-                    "style_match": ["minimalist", "classic"],
-                    "complementary_colors": ["#1e3a8a", "#6b7280"],
-                    "fashion_trend": "versatile base"
+                    "emotion": insights["emotion"],
+                    "style_match": list(insights["style_match"]),
+                    "complementary_colors": [complementary_hex(color.rgb)],
+                    "fashion_trend": insights["fashion_trend"]
                 }
             }
-        ]
-        
-        if level == "expert":
-            # Add more detailed analysis for expert level
-            for color in colors:
-                color["ai_insights"]["seasonal_relevance"] = np.random.choice([
-                    "spring fresh", "summer bright", "autumn warm", "winter deep"
-                ])
-                color["ai_insights"]["cultural_significance"] = "universal appeal"
+            if level == "expert":
+                # Add more detailed analysis for expert level
+                entry["ai_insights"]["seasonal_relevance"] = insights["season"]
+                entry["ai_insights"]["cultural_significance"] = "universal appeal"
+            colors.append(entry)
         
         return colors
     
+    @staticmethod
+    def _display_color_name(color: PaletteColor) -> str:
+        """Human readable name with a lightness qualifier, e.g. 'Dark Blue'"""
+        if color.name in ("black", "white", "beige"):
+            return color.name.title()
+        lightness = (max(color.rgb) + min(color.rgb)) / 510.0
+        if lightness < 0.3:
+            return f"Dark {color.name.title()}"
+        if lightness > 0.75:
+            return f"Light {color.name.title()}"
+        return color.name.title()
+    
     def _analyze_style_with_ai(self, image_array: np.ndarray, detected_items: List[Dict]) -> Dict[str, Any]:
         """AI-powered style and pattern recognition"""
         return {
@@ -1009,8 +1415,8 @@ class Phase6MultiModalSystem:
         """Generate unified multi-modal embeddings"""
         # Simulate unified embedding generation
         unified_dim = 1024  # Combined embedding dimension
-        np.random.seed(42)  # Reproducible for demo
-        unified_embeddings = np.random.normal(0, 1, unified_dim)
+        rng = np.random.default_rng(42)  # Reproducible for demo
+        unified_embeddings = rng.normal(0, 1, unified_dim)
         unified_embeddings = unified_embeddings / np.linalg.norm(unified_embeddings)
         return unified_embeddings.tolist()
     
@@ -1038,6 +1444,8 @@ def enhanced_health_check():
     """
     logger.info("Enhanced health check requested - Phase 6 Multi-Modal AI Service")
     
+    cache_stats = deep_analysis_cache.get_stats() if deep_analysis_cache else None
+    
     return {
         "service": "Aura Multi-Modal AI Image Processing Service",
         "phase": "Phase 6",
@@ -1053,8 +1461,15 @@ def enhanced_health_check():
         "models_status": {
             "detectron2": "simulated" if not DETECTRON2_AVAILABLE else "active",
             "clip": "simulated" if not CLIP_AVAILABLE else "active", 
-            "transformers": "simulated" if not TRANSFORMERS_AVAILABLE else "active"
+            "transformers": "simulated" if not TRANSFORMERS_AVAILABLE else "active",
+            "deep_feature_analyzer": "active" if deep_image_analyzer is not None else "not_loaded"
         },
+        "analysis_cache": {
+            "hit_ratio": cache_stats["hit_ratio"],
+            "memory_entries": cache_stats["memory_entries"],
+            "disk_entries": cache_stats["disk_entries"],
+            "disk_bytes": cache_stats["disk_bytes"]
+        } if cache_stats else None,
         "performance_targets": {
             "image_processing": "<100ms Detectron2 + CLIP",
             "text_processing": "<50ms BERT inference",
@@ -1071,84 +1486,278 @@ def enhanced_health_check():
 
 @app.post("/analyze_image_advanced")
 async def analyze_image_with_multimodal_ai(
-    request: PromptImageAnalysisRequest,
-    image: UploadFile = File(...)
+    raw_request: Request,
+    image: UploadFile = File(...),
+    analysis_type: str = Form("comprehensive", description="Type: basic, advanced, comprehensive, multi_modal"),
+    include_text_description: bool = Form(True, description="Generate CLIP-based text descriptions"),
+    semantic_analysis: bool = Form(True, description="Use transformer models for semantic understanding"),
+    cross_modal_embedding: bool = Form(True, description="Generate unified vision-language embeddings"),
+    use_detectron2: bool = Form(True, description="Use Detectron2 for advanced object detection"),
+    color_analysis_level: str = Form("advanced", description="Level: basic, advanced, expert"),
+    style_recognition: bool = Form(True, description="Enable AI-powered style pattern recognition"),
+    fashion_context: Optional[str] = Form(None, description="Fashion context: casual, formal, sport, luxury"),
+    user_preferences: Optional[str] = Form(None, description="JSON object of user style preferences"),
+    vector_format: Optional[str] = Query(None, description="Embedding format: json, float32, float16 or npy"),
+    per_item: bool = Query(False, description="Also analyze every detected garment region separately")
 ):
     """
     PHASE 6: Advanced multi-modal image analysis.
     Uses Detectron2, CLIP, and Transformers for comprehensive understanding.
+    Analysis options are multipart form fields sent with the image.
+    Feature vectors are returned as JSON lists unless the client negotiates
+    base64 float32/float16 blobs or a multipart/npy body. With per_item=true the
+    deep analysis also carries embeddings and attributes per detected garment.
     """
     logger.info(f"🧠 Processing Phase 6 multi-modal image analysis")
-    logger.info(f"Analysis type: {request.analysis_scenario}")
+    logger.info(f"Analysis type: {analysis_type}")
+    vector_format = _resolve_vector_format(raw_request, vector_format)
     
     try:
-        # Read and process image
+        preferences = json.loads(user_preferences) if user_preferences else None
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"user_preferences is not valid JSON: {e}")
+    request = Phase6ImageAnalysisRequest(
+        analysis_type=analysis_type,
+        include_text_description=include_text_description,
+        semantic_analysis=semantic_analysis,
+        cross_modal_embedding=cross_modal_embedding,
+        use_detectron2=use_detectron2,
+        color_analysis_level=color_analysis_level,
+        style_recognition=style_recognition,
+        fashion_context=fashion_context,
+        user_preferences=preferences
+    )
+    
+    try:
+        # Read and decode the image once (shared by every analysis stage)
         image_bytes = await image.read()
-        image_pil = Image.open(io.BytesIO(image_bytes))
-        image_array = np.array(image_pil)
+        decoded_image = await _decode_upload(image_bytes)
+        image_array = decoded_image.array()
         
-        # Run multi-modal AI analysis
-        response = await phase6_ai_system.analyze_image_multimodal(image_array, request)
+        # Run multi-modal AI analysis alongside the batched deep feature analysis
+        response, deep_analysis = await asyncio.gather(
+            phase6_ai_system.analyze_image_multimodal(image_array, request),
+            _run_deep_analysis(decoded_image, per_item, image.filename)
+        )
         
         logger.info("✅ Phase 6 multi-modal analysis completed successfully")
-        return response.dict()
+        rendered = _render_with_deep_analysis(response, deep_analysis, vector_format)
+        return rendered.dict() if rendered is response else rendered
         
+    except InferenceQueueFullError as e:
+        raise _queue_full_http_error(e)
     except Exception as e:
         logger.error(f"Error in Phase 6 multi-modal analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Multi-modal AI analysis error: {str(e)}")
 
 @app.post("/analyze_image")
-async def analyze_image_legacy_compatible(image: UploadFile = File(...)):
+async def analyze_image_legacy_compatible(
+    raw_request: Request,
+    image: UploadFile = File(...),
+    vector_format: Optional[str] = Query(None, description="Embedding format: json, float32, float16 or npy"),
+    per_item: bool = Query(False, description="Also analyze every detected garment region separately")
+):
     """
     Legacy-compatible image analysis endpoint enhanced with Phase 6 AI.
     Maintains backward compatibility while providing advanced multi-modal insights.
+    Feature vectors follow the same content negotiation as /analyze_image_advanced.
     """
     logger.info("Processing legacy image analysis with Phase 6 enhancements")
+    vector_format = _resolve_vector_format(raw_request, vector_format)
     
     try:
-        # Create default Prompt Engineering request
+        # Decode the upload once; the prompt engine and the deep analysis share it
         image_bytes = await image.read()
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        decoded_image = await _decode_upload(image_bytes)
         
+        # Create default Prompt Engineering request (pixels travel as decoded_image, not base64)
         request = PromptImageAnalysisRequest(
-            image_data=image_base64,
+            image_data="",
             analysis_scenario="auto_detect",
             user_context={},
             enable_service_coordination=True,
             quality_threshold=0.7
         )
         
-        # Process with prompt engineering
-        return await analyze_fashion_image_with_prompts(request)
+        # Process with prompt engineering alongside the batched deep feature analysis
+        response, deep_analysis = await asyncio.gather(
+            analyze_fashion_image_with_prompts(request, decoded_image),
+            _run_deep_analysis(decoded_image, per_item, image.filename)
+        )
+        return _render_with_deep_analysis(response, deep_analysis, vector_format)
         
+    except InferenceQueueFullError as e:
+        raise _queue_full_http_error(e)
     except Exception as e:
         logger.error(f"Legacy analysis error: {e}")
         return {"error": str(e), "success": False}
-        
-        response = await phase6_ai_system.analyze_image_multimodal(image_array, request)
-        
-        # Convert to legacy format for backward compatibility
-        legacy_response = {
-            "detected_items": response.detected_items,
-            "colors": response.colors,
-            "processing_time": response.processing_time,
-            # Phase 6 enhancements
-            "ai_description": response.clip_description,
-            "ai_insights": response.transformer_insights,
-            "ai_confidence": response.ai_confidence.get("overall_ai_confidence", 0.0),
-            "phase6_features": {
-                "multi_modal_analysis": True,
-                "transformer_enhanced": True,
-                "models_used": response.models_used
-            }
+
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness probe for autoscaling.
+    Reports which models are resident; returns 503 until preload and warmup finished.
+    """
+    if deep_image_analyzer is None:
+        # Replicas without the deep analyzer are ready as soon as the app is up
+        return {
+            "ready": True,
+            "deep_analysis": "disabled" if not inference_config.deep_analysis_enabled else "not_loaded",
+            "resident_models": []
         }
-        
-        logger.info("✅ Legacy-compatible analysis with Phase 6 enhancements completed")
-        return legacy_response
-        
-    except Exception as e:
-        logger.error(f"Error in legacy-compatible analysis: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Image analysis error: {str(e)}")
+    
+    preload_done = deep_analyzer_warmup_task is not None and deep_analyzer_warmup_task.done()
+    ready = preload_done and "error" not in deep_analyzer_warmup_info
+    payload = {
+        "ready": ready,
+        "deep_analysis": "active",
+        "resident_models": deep_image_analyzer.resident_models,
+        "enabled_models": deep_image_analyzer.enabled_models,
+        "preload_models": inference_config.preload_models,
+        "warmed_up": deep_image_analyzer.warmed_up,
+        "models": deep_image_analyzer.get_model_status(),
+        "warmup": deep_analyzer_warmup_info or None
+    }
+    return payload if ready else JSONResponse(status_code=503, content=payload)
+
+@app.get("/duplicates/clusters")
+def get_duplicate_clusters(
+    min_size: int = Query(2, ge=1, description="Minimum number of images per cluster"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of clusters returned")
+):
+    """
+    Clusters of perceptual near-duplicate uploads (re-encodes, small crops, watermark variants).
+    Every member after the first reused the cluster's cached analysis instead of running inference.
+    """
+    if near_duplicate_index is None:
+        raise HTTPException(status_code=404, detail="Near-duplicate index is disabled")
+    return {
+        "clusters": near_duplicate_index.duplicate_clusters(min_size=min_size, limit=limit),
+        "index": near_duplicate_index.get_stats()
+    }
+
+# =============================================================================
+# BULK ANALYSIS JOBS
+# =============================================================================
+
+class BulkManifestItem(BaseModel):
+    """One image of a bulk analysis manifest"""
+    id: Optional[str] = Field(default=None, description="Client identifier echoed in results")
+    path: Optional[str] = Field(default=None, description="Local file path under AURA_IMAGE_BULK_ROOTS")
+    image_data: Optional[str] = Field(default=None, description="Base64 encoded image data")
+
+class BulkJobRequest(BaseModel):
+    """Bulk analysis job submission"""
+    items: List[BulkManifestItem] = Field(..., description="Images to analyze")
+    per_item: bool = Field(default=False, description="Also analyze every detected garment region")
+    vector_format: str = Field(default="json", description="Embedding format in results: json, float32 or float16")
+
+def _get_bulk_job(job_id: str) -> BulkJob:
+    """Look up a bulk job or answer 404"""
+    job = bulk_job_manager.get(job_id) if bulk_job_manager else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown bulk job '{job_id}'")
+    return job
+
+@app.post("/bulk/jobs", status_code=202)
+async def submit_bulk_job(request: BulkJobRequest):
+    """
+    Submit a manifest of local paths and/or base64 images for background analysis.
+    Progress streams from /bulk/jobs/{job_id}/events; results page from /bulk/jobs/{job_id}/results.
+    """
+    if deep_analysis_scheduler is None:
+        raise HTTPException(status_code=503, detail="Deep image analysis is not available")
+    if request.vector_format not in ("json", "float32", "float16"):
+        raise HTTPException(status_code=400, detail="vector_format must be json, float32 or float16")
+    
+    try:
+        job = bulk_job_manager.submit(
+            [item.dict() for item in request.items],
+            options={"per_item": request.per_item, "vector_format": request.vector_format}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    
+    return {
+        **job.summary(),
+        "links": {
+            "status": f"/bulk/jobs/{job.job_id}",
+            "events": f"/bulk/jobs/{job.job_id}/events",
+            "results": f"/bulk/jobs/{job.job_id}/results",
+            "resume": f"/bulk/jobs/{job.job_id}/resume"
+        }
+    }
+
+@app.get("/bulk/jobs/{job_id}")
+def get_bulk_job(job_id: str):
+    """Progress summary of a bulk job"""
+    return _get_bulk_job(job_id).summary()
+
+@app.get("/bulk/jobs/{job_id}/events")
+async def stream_bulk_job_events(
+    job_id: str,
+    raw_request: Request,
+    cursor: int = Query(0, ge=0, description="First event sequence number to send"),
+    stream_format: Optional[str] = Query(None, alias="format", description="ndjson or sse")
+):
+    """
+    Stream per-item results and progress until the job finishes.
+    NDJSON by default; server-sent events with format=sse or Accept: text/event-stream.
+    SSE clients reconnect with Last-Event-ID, NDJSON clients with ?cursor=<last seq + 1>.
+    """
+    job = _get_bulk_job(job_id)
+    use_sse = stream_format == "sse" or (
+        stream_format is None and "text/event-stream" in raw_request.headers.get("accept", "")
+    )
+    last_event_id = raw_request.headers.get("last-event-id")
+    if use_sse and last_event_id and last_event_id.isdigit():
+        cursor = int(last_event_id) + 1
+    
+    async def event_lines():
+        async for sequence, kind, value in bulk_job_manager.follow(job, cursor):
+            if kind == "item":
+                event = {"event": "item", "seq": sequence,
+                         "item": _render_bulk_item(job, job.items[value]), "progress": job.progress()}
+            else:
+                event = {"event": "job", "seq": sequence, "job": job.summary()}
+            data = json.dumps(jsonable_encoder(event), separators=(",", ":"))
+            yield f"id: {sequence}\nevent: {kind}\ndata: {data}\n\n" if use_sse else data + "\n"
+    
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(event_lines(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+@app.get("/bulk/jobs/{job_id}/results")
+def get_bulk_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Index into the finished items"),
+    limit: int = Query(100, ge=1, le=1000, description="Items per page"),
+    status: Optional[BulkItemStatus] = Query(None, description="Only succeeded or failed items")
+):
+    """Page through finished items in manifest order (fetch incrementally while the job runs)"""
+    job = _get_bulk_job(job_id)
+    items, next_offset = bulk_job_manager.results(job, offset=offset, limit=limit, status=status)
+    return {
+        "job": job.summary(),
+        "items": jsonable_encoder([_render_bulk_item(job, item) for item in items]),
+        "next_offset": next_offset
+    }
+
+@app.post("/bulk/jobs/{job_id}/resume", status_code=202)
+async def resume_bulk_job(job_id: str):
+    """Retry the failed items of a finished bulk job"""
+    _get_bulk_job(job_id)
+    try:
+        return bulk_job_manager.resume(job_id).summary()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.delete("/bulk/jobs/{job_id}")
+async def cancel_bulk_job(job_id: str):
+    """Cancel a bulk job and drop it together with its results"""
+    _get_bulk_job(job_id)
+    return (await bulk_job_manager.cancel(job_id)).summary()
 
 @app.get("/ai_models_status")
 def get_ai_models_status():
@@ -1185,6 +1794,18 @@ def get_ai_models_status():
                 "description": "Cross-modal attention and feature fusion",
                 "method": "attention_weighted_ensemble",
                 "performance": "<25ms fusion processing"
+            },
+            "deep_feature_analysis": {
+                "status": "active" if deep_image_analyzer is not None else "not_loaded",
+                "description": "ResNet-50 + ViT + CLIP features with single-pass attribute scoring",
+                "models": deep_image_analyzer.get_model_status() if deep_image_analyzer else None,
+                "optimization": deep_image_analyzer.optimization.describe() if deep_image_analyzer else None,
+                "inference_scheduler": deep_analysis_scheduler.get_stats() if deep_analysis_scheduler else None,
+                "per_item_scheduler": deep_item_scheduler.get_stats() if deep_item_scheduler else None,
+                "inference_worker_pool": inference_pool.get_stats() if inference_pool else None,
+                "analysis_cache": deep_analysis_cache.get_stats() if deep_analysis_cache else None,
+                "near_duplicate_index": near_duplicate_index.get_stats() if near_duplicate_index else None,
+                "bulk_jobs": bulk_job_manager.get_stats() if bulk_job_manager else None
             }
         },
         "system_capabilities": {
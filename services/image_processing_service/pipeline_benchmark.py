@@ -0,0 +1,403 @@
+# ⏱️ AURA AI - Image Pipeline Benchmark Suite
+# Repeatable, offline latency / throughput measurement of the image pipeline.
+#
+# Every stage of a ClothingImageAnalyzer batch is timed on its own:
+#   decode -> preprocess -> resnet_forward -> vit_forward -> clip_forward
+#   -> attribute_scoring -> detection -> compile -> serialize_<format>
+# for each image set (synthetic JPEGs at several resolutions plus an optional
+# directory of bundled images) and each batch size. The JSON report holds
+# p50 / p95 / p99 batch latency and images/sec per stage and end to end,
+# together with the environment and git commit, so runs can be compared
+# across commits (--baseline flags stages whose p50 regressed).
+#
+# Hugging Face lookups are forced offline: model weights must already be in
+# the local caches. Use --models to benchmark a subset (or "none" for the
+# decode / preprocess / serialisation stages only).
+#
+# Usage:
+#   python pipeline_benchmark.py --batch-sizes 1,8,32,64 --resolutions 640x480,3024x4032 \
+#       --images ./sample_images --output benchmark.json --baseline previous.json
+
+import os
+
+# Never reach out to the model hubs while benchmarking
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+import argparse
+import io
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+from PIL import Image, ImageDraw, ImageFilter
+
+from embedding_encoding import build_multipart_body, format_analysis_vectors, split_analysis_vectors
+from image_analyzer import ClothingImageAnalyzer
+from image_preprocessing import DecodedImage
+from model_optimization import InferenceOptimization
+from quantization_benchmark import IMAGE_EXTENSIONS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64]
+DEFAULT_RESOLUTIONS = ["640x480", "1280x960", "3024x4032"]
+DEFAULT_VECTOR_FORMATS = ["json", "float16", "npy"]
+
+
+def make_synthetic_image(width: int, height: int, seed: int) -> Image.Image:
+    """
+    Photo-like synthetic garment shot: smooth background gradient, a few blurred
+    coloured shapes and mild sensor noise, so JPEG sizes resemble real uploads.
+    """
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None, None]
+    top, bottom = rng.uniform(0, 255, 3), rng.uniform(0, 255, 3)
+    background = (top * (1 - gradient) + bottom * gradient) * np.ones((1, width, 1), dtype=np.float32)
+    image = Image.fromarray(background.astype(np.uint8))
+
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        left, top_edge = rng.integers(0, width), rng.integers(0, height)
+        right = left + rng.integers(width // 8, width // 2)
+        lower = top_edge + rng.integers(height // 8, height // 2)
+        draw.ellipse([left, top_edge, right, lower], fill=tuple(int(v) for v in rng.integers(0, 255, 3)))
+    image = image.filter(ImageFilter.GaussianBlur(max(1, min(width, height) // 200)))
+
+    noisy = np.asarray(image, dtype=np.int16) + rng.integers(-6, 7, (height, width, 3), dtype=np.int16)
+    return Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+
+
+def synthetic_image_set(resolution: str, count: int, quality: int = 90) -> List[bytes]:
+    """Encode `count` distinct synthetic JPEGs at a WIDTHxHEIGHT resolution"""
+    width, height = (int(value) for value in resolution.lower().split("x"))
+    encoded = []
+    for seed in range(count):
+        buffer = io.BytesIO()
+        make_synthetic_image(width, height, seed).save(buffer, "JPEG", quality=quality)
+        encoded.append(buffer.getvalue())
+    return encoded
+
+
+def bundled_image_set(image_dir: str) -> List[bytes]:
+    """Read the encoded bytes of every image in a directory (sorted by name)"""
+    names = sorted(name for name in os.listdir(image_dir) if name.lower().endswith(IMAGE_EXTENSIONS))
+    encoded = []
+    for name in names:
+        with open(os.path.join(image_dir, name), "rb") as handle:
+            encoded.append(handle.read())
+    if not encoded:
+        raise ValueError(f"No images found in {image_dir}")
+    return encoded
+
+
+def _timed(stage: str, timings: Dict[str, float], fn: Callable[[], Any]) -> Any:
+    """Run fn and record its wall time in milliseconds under `stage`"""
+    start_time = time.perf_counter()
+    result = fn()
+    timings[stage] = (time.perf_counter() - start_time) * 1000
+    return result
+
+
+def _serialize(results: List[Dict[str, Any]], vector_format: str) -> int:
+    """Render analysis results in a wire format; returns the payload size in bytes"""
+    if vector_format == "npy":
+        size = 0
+        for result in results:
+            document, vectors = split_analysis_vectors(result)
+            body, _ = build_multipart_body({"deep_analysis": document}, vectors)
+            size += len(body)
+        return size
+    documents = [format_analysis_vectors(result, vector_format) for result in results]
+    return len(json.dumps(documents, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def run_batch(analyzer: Optional[ClothingImageAnalyzer], encoded_batch: List[bytes],
+              vector_formats: List[str]) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """
+    Push one batch through every pipeline stage, timing each stage separately.
+
+    Returns:
+        (stage -> milliseconds, vector format -> payload bytes)
+    """
+    timings: Dict[str, float] = {}
+    enabled = analyzer.enabled_models if analyzer is not None else []
+    batch_size = len(encoded_batch)
+
+    # Fresh decodes every batch, so memoised resolutions never leak between samples
+    images = _timed("decode", timings, lambda: [DecodedImage.from_bytes(data) for data in encoded_batch])
+
+    def preprocess():
+        batch_tensor = torch.cat([image.imagenet_tensor(224).unsqueeze(0) for image in images], dim=0)
+        if analyzer is not None:
+            batch_tensor = batch_tensor.to(analyzer.device)
+        # CLIP pixel values are memoised on each DecodedImage for the clip_forward stage
+        if "clip" in enabled:
+            for image in images:
+                image.clip_pixel_values()
+        return batch_tensor
+    batch_tensor = _timed("preprocess", timings, preprocess)
+
+    empty = np.zeros((batch_size, 0), dtype=np.float32)
+    resnet_batch, vit_batch, clip_batch = empty, empty, empty
+    attribute_batch = [{"style": {"unknown": 0.0}, "color": {"unknown": 0.0}, "pattern": {"unknown": 0.0}}] * batch_size
+
+    if "resnet" in enabled:
+        resnet_batch = _timed("resnet_forward", timings,
+                              lambda: analyzer.extract_resnet_features(batch_tensor).reshape(batch_size, -1))
+    if "vit" in enabled:
+        vit_batch = _timed("vit_forward", timings,
+                           lambda: analyzer.extract_vit_features(batch_tensor).reshape(batch_size, -1))
+    if "clip" in enabled:
+        # Pixel values are memoised by the preprocess stage, so this is the image tower only
+        clip_embeddings = _timed("clip_forward", timings, lambda: analyzer.encode_clip_images(images))
+        attribute_batch = _timed("attribute_scoring", timings,
+                                 lambda: analyzer.score_clip_attributes_batch(clip_embeddings))
+        clip_batch = clip_embeddings.cpu().numpy()
+
+    if analyzer is not None:
+        detections = _timed("detection", timings, lambda: [analyzer.detect_clothing_items(image.image) for image in images])
+        results = _timed("compile", timings, lambda: [
+            analyzer._compile_analysis_results(
+                detected_items=detections[index],
+                resnet_features=resnet_batch[index],
+                vit_features=vit_batch[index],
+                clip_embedding=clip_batch[index],
+                attribute_scores=attribute_batch[index],
+                vectors_as_lists=False
+            )
+            for index in range(batch_size)
+        ])
+    else:
+        results = [{"features": {}} for _ in range(batch_size)]
+
+    payload_bytes = {}
+    for vector_format in vector_formats:
+        payload_bytes[vector_format] = _timed(f"serialize_{vector_format}", timings,
+                                              lambda: _serialize(results, vector_format))
+    return timings, payload_bytes
+
+
+def summarize_latencies(samples: List[float], batch_size: int) -> Dict[str, float]:
+    """Batch latency percentiles, per-image latency and throughput of one stage"""
+    values = np.asarray(samples, dtype=np.float64)
+    mean_ms = float(values.mean())
+    return {
+        "samples": len(values),
+        "mean_ms": round(mean_ms, 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "per_image_ms": round(mean_ms / batch_size, 3),
+        "images_per_second": round(batch_size * 1000.0 / mean_ms, 2) if mean_ms else 0.0,
+    }
+
+
+def benchmark_image_set(analyzer: Optional[ClothingImageAnalyzer], name: str, encoded: List[bytes],
+                        batch_sizes: List[int], repeats: int, warmup: int,
+                        vector_formats: List[str]) -> List[Dict[str, Any]]:
+    """Benchmark one image set at every batch size"""
+    runs = []
+    for batch_size in batch_sizes:
+        # Cycle through the distinct images to fill large batches
+        samples: Dict[str, List[float]] = {}
+        end_to_end: List[float] = []
+        payload_bytes: Dict[str, int] = {}
+        for iteration in range(warmup + repeats):
+            offset = iteration * batch_size
+            batch = [encoded[(offset + index) % len(encoded)] for index in range(batch_size)]
+            timings, payload_bytes = run_batch(analyzer, batch, vector_formats)
+            if iteration < warmup:
+                continue
+            for stage, elapsed_ms in timings.items():
+                samples.setdefault(stage, []).append(elapsed_ms)
+            # End to end counts the primary wire format only
+            end_to_end.append(sum(elapsed_ms for stage, elapsed_ms in timings.items()
+                                  if not stage.startswith("serialize_") or stage == f"serialize_{vector_formats[0]}"))
+
+        run = {
+            "image_set": name,
+            "batch_size": batch_size,
+            "stages": {stage: summarize_latencies(values, batch_size) for stage, values in samples.items()},
+            "end_to_end": summarize_latencies(end_to_end, batch_size),
+            "payload_bytes_per_image": {fmt: size // batch_size for fmt, size in payload_bytes.items()},
+        }
+        runs.append(run)
+        logger.info(f"⏱️ {name} batch={batch_size}: p50 {run['end_to_end']['p50_ms']}ms, "
+                    f"{run['end_to_end']['images_per_second']} img/s")
+    return runs
+
+
+def environment_info(analyzer: Optional[ClothingImageAnalyzer]) -> Dict[str, Any]:
+    """Host, library and commit details needed to compare reports"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "device": str(analyzer.device) if analyzer is not None else "cpu",
+        "models": analyzer.enabled_models if analyzer is not None else [],
+        "model_versions": analyzer.model_versions if analyzer is not None else {},
+    }
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                          regression_threshold: float) -> Dict[str, Any]:
+    """
+    p50 ratios (current / baseline) of every stage present in both reports.
+    Ratios above regression_threshold are listed as regressions.
+    """
+    baseline_runs = {(run["image_set"], run["batch_size"]): run for run in baseline.get("runs", [])}
+    ratios, regressions = [], []
+    for run in report["runs"]:
+        previous = baseline_runs.get((run["image_set"], run["batch_size"]))
+        if previous is None:
+            continue
+        stages = {**run["stages"], "end_to_end": run["end_to_end"]}
+        previous_stages = {**previous["stages"], "end_to_end": previous["end_to_end"]}
+        for stage, summary in stages.items():
+            if stage not in previous_stages or not previous_stages[stage]["p50_ms"]:
+                continue
+            ratio = round(summary["p50_ms"] / previous_stages[stage]["p50_ms"], 3)
+            entry = {"image_set": run["image_set"], "batch_size": run["batch_size"], "stage": stage,
+                     "p50_ratio": ratio}
+            ratios.append(entry)
+            if ratio > regression_threshold:
+                regressions.append(entry)
+    return {
+        "baseline_commit": baseline.get("environment", {}).get("git_commit"),
+        "regression_threshold": regression_threshold,
+        "p50_ratios": ratios,
+        "regressions": regressions,
+    }
+
+
+def run_benchmark(image_sets: Dict[str, List[bytes]], enabled_models: List[str],
+                  batch_sizes: List[int], repeats: int = 10, warmup: int = 1,
+                  vector_formats: Optional[List[str]] = None,
+                  optimization: Optional[InferenceOptimization] = None) -> Dict[str, Any]:
+    """
+    Benchmark the image pipeline on every image set and batch size.
+
+    Args:
+        image_sets: Name -> encoded images
+        enabled_models: Models to run ("resnet", "vit", "clip"); empty skips the model stages
+        batch_sizes: Images per batch
+        repeats: Timed batches per image set and batch size
+        warmup: Untimed batches run first at every batch size
+        vector_formats: Wire formats timed by the serialisation stages (first = end to end)
+        optimization: Reduced-precision options for the analyzer
+
+    Returns:
+        JSON-ready report
+    """
+    vector_formats = vector_formats or list(DEFAULT_VECTOR_FORMATS)
+    analyzer = None
+    if enabled_models:
+        analyzer = ClothingImageAnalyzer(enabled_models=enabled_models, optimization=optimization)
+
+    runs = []
+    for name, encoded in image_sets.items():
+        runs.extend(benchmark_image_set(analyzer, name, encoded, batch_sizes, repeats, warmup, vector_formats))
+
+    return {
+        "environment": environment_info(analyzer),
+        "config": {
+            "batch_sizes": batch_sizes,
+            "repeats": repeats,
+            "warmup": warmup,
+            "vector_formats": vector_formats,
+            "image_sets": {name: len(encoded) for name, encoded in image_sets.items()},
+            "optimization": (optimization or InferenceOptimization()).describe(),
+        },
+        "runs": runs,
+    }
+
+
+def _parse_list(value: str) -> List[str]:
+    """Split a comma separated command line value ("none" yields an empty list)"""
+    if value.strip().lower() == "none":
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point; returns 1 when --fail-on-regression finds a regression"""
+    parser = argparse.ArgumentParser(description="Offline latency / throughput benchmark of the image pipeline")
+    parser.add_argument("--resolutions", default=",".join(DEFAULT_RESOLUTIONS),
+                        help="Synthetic image sets as WIDTHxHEIGHT list (\"none\" to skip)")
+    parser.add_argument("--distinct-images", type=int, default=8, help="Distinct synthetic images per resolution")
+    parser.add_argument("--images", help="Directory with bundled images benchmarked as their own set")
+    parser.add_argument("--batch-sizes", default=",".join(str(size) for size in DEFAULT_BATCH_SIZES))
+    parser.add_argument("--repeats", type=int, default=10, help="Timed batches per image set and batch size")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed batches per batch size")
+    parser.add_argument("--models", default="resnet,vit,clip", help="Comma separated models (\"none\" = no models)")
+    parser.add_argument("--vector-formats", default=",".join(DEFAULT_VECTOR_FORMATS))
+    parser.add_argument("--quantization", default="none", choices=["none", "int8"])
+    parser.add_argument("--resnet-channels-last", action="store_true")
+    parser.add_argument("--resnet-bf16", action="store_true")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare p50 latencies against")
+    parser.add_argument("--regression-threshold", type=float, default=1.10,
+                        help="p50 ratio above which a stage counts as regressed")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    image_sets = {
+        f"synthetic_{resolution}": synthetic_image_set(resolution, args.distinct_images)
+        for resolution in _parse_list(args.resolutions)
+    }
+    if args.images:
+        image_sets["bundled"] = bundled_image_set(args.images)
+    if not image_sets:
+        parser.error("No image sets selected")
+
+    report = run_benchmark(
+        image_sets,
+        enabled_models=_parse_list(args.models),
+        batch_sizes=[int(size) for size in _parse_list(args.batch_sizes)],
+        repeats=args.repeats,
+        warmup=args.warmup,
+        vector_formats=_parse_list(args.vector_formats),
+        optimization=InferenceOptimization(
+            quantization=args.quantization,
+            resnet_channels_last=args.resnet_channels_last,
+            resnet_bfloat16=args.resnet_bf16
+        )
+    )
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            report["comparison"] = compare_with_baseline(report, json.load(handle), args.regression_threshold)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output)
+    print(output)
+
+    regressions = report.get("comparison", {}).get("regressions", [])
+    if regressions:
+        logger.warning(f"⚠️ {len(regressions)} stage(s) regressed beyond x{args.regression_threshold}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
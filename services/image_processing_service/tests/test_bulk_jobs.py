@@ -0,0 +1,84 @@
+# Unit tests for the bulk image analysis job manager
+# The manager only schedules coroutines, so a fake analysis function stands in for the models
+
+# Import asyncio for running the event loop in tests
+import asyncio
+
+# Import the job manager components under test
+from bulk_jobs import BulkItemStatus, BulkJobManager, BulkJobStatus
+
+
+class TransientError(Exception):
+    """Stands in for a saturated inference queue"""
+
+
+def test_job_streams_every_item_and_finishes():
+    """Test that following a job yields one event per item and a final job event"""
+    async def scenario():
+        async def analyze(job, item):
+            await asyncio.sleep(0.001)
+            return {"id": item.item_id}
+
+        manager = BulkJobManager(analyze, max_in_flight=2)
+        job = manager.submit([{"image_data": f"blob-{index}"} for index in range(5)])
+        events = [event async for event in manager.follow(job)]
+        return job, events, manager
+
+    job, events, manager = asyncio.run(scenario())
+
+    assert [kind for _, kind, _ in events] == ["item"] * 5 + ["job"]
+    assert job.status == BulkJobStatus.COMPLETED
+    assert job.progress()["succeeded"] == 5
+    # Inputs are released once their result exists
+    assert all(item.image_data is None for item in job.items)
+    page, next_offset = manager.results(job, offset=0, limit=3)
+    assert [item.index for item in page] == [0, 1, 2] and next_offset == 3
+
+
+def test_transient_errors_are_retried_with_backoff():
+    """Test that retryable errors do not fail an item until the retry budget is spent"""
+    async def scenario():
+        calls = {"count": 0}
+
+        async def analyze(job, item):
+            calls["count"] += 1
+            if calls["count"] < 3:
+                raise TransientError("queue full")
+            return {"ok": True}
+
+        manager = BulkJobManager(analyze, retry_exceptions=(TransientError,), retry_backoff_seconds=0.001)
+        job = manager.submit([{"path": "/catalog/a.jpg"}])
+        await job._task
+        return job, manager
+
+    job, manager = asyncio.run(scenario())
+
+    assert job.items[0].status == BulkItemStatus.SUCCEEDED
+    assert manager.get_stats()["retries"] == 2
+
+
+def test_resume_retries_only_failed_items():
+    """Test that a partially failed job can be resumed and then completes"""
+    async def scenario():
+        broken = {"b"}
+
+        async def analyze(job, item):
+            if item.item_id in broken:
+                raise ValueError("cannot decode")
+            return {"id": item.item_id}
+
+        manager = BulkJobManager(analyze)
+        job = manager.submit([{"path": "a", "id": "a"}, {"path": "b", "id": "b"}])
+        await job._task
+        first_status = job.status
+
+        broken.clear()
+        manager.resume(job.job_id)
+        await job._task
+        return job, first_status
+
+    job, first_status = asyncio.run(scenario())
+
+    assert first_status == BulkJobStatus.PARTIALLY_FAILED
+    assert job.status == BulkJobStatus.COMPLETED
+    assert [item.attempts for item in job.items] == [1, 2]
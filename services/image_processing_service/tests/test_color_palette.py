@@ -0,0 +1,55 @@
+# Unit tests for the vectorised dominant colour extractor
+# Synthetic colour blocks make the expected palette known in advance
+
+# Import numpy for building test images
+import numpy as np
+
+# Import the palette engine under test
+from color_palette import COLOR_NAMES, DominantColorExtractor, dominant_color_names, name_colors
+
+
+def make_two_tone_image(top_rgb, bottom_rgb, top_rows=300, size=512):
+    """Create a uint8 image with two horizontal colour blocks"""
+    image = np.zeros((size, size, 3), dtype=np.uint8)
+    image[:top_rows] = top_rgb
+    image[top_rows:] = bottom_rgb
+    return image
+
+
+def test_color_names_use_the_shared_vocabulary():
+    """Test HSV naming of reference colours"""
+    reference = {
+        (220, 20, 30): "red", (255, 128, 0): "orange", (250, 220, 30): "yellow",
+        (30, 160, 60): "green", (20, 40, 140): "blue", (128, 40, 160): "purple",
+        (255, 160, 190): "pink", (120, 70, 30): "brown", (10, 10, 10): "black",
+        (250, 250, 250): "white", (128, 128, 128): "gray", (225, 205, 170): "beige",
+    }
+    names = name_colors(np.array(list(reference), dtype=np.float32) / 255.0)
+
+    assert names == list(reference.values())
+    assert set(names) == set(COLOR_NAMES)
+
+
+def test_extract_recovers_blocks_and_their_shares():
+    """Test that k-means finds both colour blocks with the right pixel shares"""
+    palette = DominantColorExtractor().extract(make_two_tone_image((20, 40, 140), (250, 250, 250)))
+
+    assert [color.name for color in palette] == ["blue", "white"]
+    assert palette[0].hex == "#14288c"
+    assert abs(palette[0].percentage - 300 / 512 * 100) < 2.0
+    assert dominant_color_names(palette) == ["blue", "white"]
+
+
+def test_batch_matches_single_image_extraction_for_mixed_inputs():
+    """Test that batched extraction equals per-image extraction, for uint8 and float inputs"""
+    extractor = DominantColorExtractor()
+    images = [
+        make_two_tone_image((200, 20, 30), (10, 10, 10)),
+        make_two_tone_image((30, 160, 60), (225, 205, 170)).astype(np.float32) / 255.0,
+    ]
+
+    batch = extractor.extract_batch(images)
+    singles = [extractor.extract(image) for image in images]
+
+    assert batch == singles
+    assert [color.name for color in batch[1]] == ["green", "beige"]
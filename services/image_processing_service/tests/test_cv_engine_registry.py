@@ -0,0 +1,54 @@
+# Unit tests for the process-wide CV prompt engine registry
+# A tiny stand-in engine counts how often its tables are built
+
+# Import threading for the concurrent first-use test
+import threading
+
+# Import the registry under test
+from cv_engine_registry import CVEngineRegistry
+
+
+class CountingEngine:
+    """Engine stand-in that counts constructions and pattern rebuilds"""
+    instances = 0
+
+    def __init__(self):
+        CountingEngine.instances += 1
+        self.builds = 0
+        self.reload_patterns()
+
+    def reload_patterns(self):
+        self.builds += 1
+        self.patterns = {"version": self.builds}
+
+
+def test_engine_is_built_once_under_concurrent_first_use():
+    """Test that concurrent callers share a single engine instance"""
+    CountingEngine.instances = 0
+    registry = CVEngineRegistry()
+    registry.register("counting", CountingEngine)
+
+    engines = []
+    threads = [threading.Thread(target=lambda: engines.append(registry.get("counting"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert CountingEngine.instances == 1
+    assert all(engine is engines[0] for engine in engines)
+    assert registry.get_status()["counting"]["built"]
+
+
+def test_reload_swaps_pattern_tables_in_place():
+    """Test that a hot reload rebuilds tables without replacing the shared engine"""
+    registry = CVEngineRegistry()
+    registry.register("counting", CountingEngine)
+    engine = registry.get("counting")
+    old_patterns = engine.patterns
+
+    assert "counting" in registry.reload()
+    assert registry.get("counting") is engine
+    assert engine.patterns is not old_patterns
+    assert old_patterns == {"version": 1}  # in-flight readers keep the old table
+    assert registry.get_status()["counting"]["reloads"] == 1
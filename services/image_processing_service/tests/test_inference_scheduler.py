@@ -0,0 +1,78 @@
+# Unit tests for the micro-batching inference scheduler
+# These tests use a plain Python batch function so no AI models are needed
+
+# Import asyncio to drive the scheduler's event loop
+import asyncio
+# Import pytest testing framework
+import pytest
+
+# Import the scheduler under test
+from inference_scheduler import MicroBatchScheduler
+
+
+def test_concurrent_requests_are_batched_in_order():
+    """
+    Test that concurrent submissions are stacked into one batch
+    and every caller receives the result for its own input.
+    """
+    seen_batches = []
+
+    def double_batch(values):
+        # Record each batch so we can check how requests were grouped
+        seen_batches.append(list(values))
+        return [value * 2 for value in values]
+
+    async def run():
+        scheduler = MicroBatchScheduler(double_batch, max_batch_size=8, max_wait_ms=50)
+        await scheduler.start()
+        results = await asyncio.gather(*(scheduler.submit(i) for i in range(5)))
+        stats = scheduler.get_stats()
+        await scheduler.stop()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+
+    # Each caller gets its own doubled value back
+    assert results == [0, 2, 4, 6, 8]
+    # All five requests were served by a single batch
+    assert seen_batches == [[0, 1, 2, 3, 4]]
+    assert stats["batches_processed"] == 1
+    assert stats["largest_batch"] == 5
+
+
+def test_batch_size_limit_is_respected():
+    """Test that batches never exceed the configured maximum size"""
+    seen_sizes = []
+
+    def identity_batch(values):
+        seen_sizes.append(len(values))
+        return list(values)
+
+    async def run():
+        scheduler = MicroBatchScheduler(identity_batch, max_batch_size=3, max_wait_ms=20)
+        results = await asyncio.gather(*(scheduler.submit(i) for i in range(7)))
+        await scheduler.stop()
+        return results
+
+    assert asyncio.run(run()) == list(range(7))
+    assert max(seen_sizes) <= 3
+    assert sum(seen_sizes) == 7
+
+
+def test_batch_failure_is_propagated_to_every_caller():
+    """Test that an exception in the batch function reaches all waiting requests"""
+
+    def failing_batch(values):
+        raise ValueError("model failure")
+
+    async def run():
+        scheduler = MicroBatchScheduler(failing_batch, max_batch_size=4, max_wait_ms=20)
+        outcomes = await asyncio.gather(*(scheduler.submit(i) for i in range(2)), return_exceptions=True)
+        stats = scheduler.get_stats()
+        await scheduler.stop()
+        return outcomes, stats
+
+    outcomes, stats = asyncio.run(run())
+
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert stats["failed_batches"] == 1
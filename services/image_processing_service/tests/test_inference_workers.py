@@ -0,0 +1,65 @@
+# Unit tests for the off-event-loop inference worker pool
+# Only threads and asyncio are involved, so no AI models are needed here
+
+# Import asyncio for running the async pool API
+import asyncio
+# Import threading for blocking the worker in the saturation test
+import threading
+
+# Import pytest testing framework
+import pytest
+
+# Import the worker pool components under test
+from inference_workers import InferenceQueueFullError, InferenceWorkerPool, LatencyWindow
+
+
+def test_pool_runs_work_off_the_event_loop():
+    """Test that submitted callables run on a worker thread, not the loop thread"""
+    pool = InferenceWorkerPool(num_workers=1, max_queue_depth=4, torch_threads_per_worker=1)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        worker_thread = await pool.run(threading.get_ident)
+        return loop_thread, worker_thread
+
+    loop_thread, worker_thread = asyncio.run(scenario())
+    pool.shutdown(wait=True)
+
+    assert loop_thread != worker_thread
+    stats = pool.get_stats()
+    assert stats["completed"] == 1
+    assert stats["queue_time"]["count"] == 1
+
+
+def test_saturated_pool_rejects_new_work():
+    """Test that submissions beyond workers + queue depth fail fast"""
+    pool = InferenceWorkerPool(num_workers=1, max_queue_depth=1, torch_threads_per_worker=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.saturated
+        with pytest.raises(InferenceQueueFullError):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(scenario())
+    pool.shutdown(wait=True)
+
+    assert pool.get_stats()["rejected"] == 1
+    assert pool.get_stats()["completed"] == 2
+
+
+def test_latency_window_percentiles():
+    """Test percentile reporting over recorded samples"""
+    window = LatencyWindow()
+    for value in range(1, 101):
+        window.add(float(value))
+
+    summary = window.summary()
+    assert summary["count"] == 100
+    assert summary["max_ms"] == 100.0
+    assert 94.0 <= summary["p95_ms"] <= 96.0
@@ -0,0 +1,64 @@
+# Unit tests for the automatic analysis scenario detection of the CV prompt engine
+# Contour heuristics only, so no AI models are needed here
+
+# Import OpenCV for the reference full-resolution classification
+import cv2
+# Import numpy for the reference implementation
+import numpy as np
+# Import pytest for parametrised fixtures
+import pytest
+# Import PIL for drawing synthetic garments
+from PIL import Image, ImageDraw
+
+# Import the engine and the shared decode stage
+from computer_vision_prompt_engineering import AuraComputerVisionEngine, PREPROCESS_SIZE
+from image_preprocessing import DecodedImage
+
+
+def full_resolution_analysis_type(decoded):
+    """Previous classification: contours of the 512px preprocessed image, area threshold 1000"""
+    image = decoded.float_array((PREPROCESS_SIZE, PREPROCESS_SIZE), Image.Resampling.LANCZOS)
+    gray = cv2.cvtColor((image * 255).astype(np.uint8), cv2.COLOR_RGB2GRAY)
+    contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    num_objects = len([contour for contour in contours if cv2.contourArea(contour) > 1000])
+    if num_objects > 2:
+        return "multi_item_analysis"
+    if num_objects == 1:
+        x, y, w, h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+        if h / w > 1.5:
+            return "single_dress_analysis"
+        if h / w < 0.8:
+            return "accessory_analysis"
+    return "single_shirt_analysis"
+
+
+def draw_garments(boxes, size=(600, 800)):
+    """Product shot on a black background with one light shape per box"""
+    image = Image.new("RGB", size, (0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for box in boxes:
+        draw.rounded_rectangle(box, radius=12, fill=(210, 180, 150))
+    return image
+
+
+FIXTURES = {
+    "single_dress_analysis": [(220, 80, 380, 720)],
+    "accessory_analysis": [(60, 330, 540, 470)],
+    "single_shirt_analysis": [(120, 180, 480, 600)],
+    "multi_item_analysis": [(40, 40, 260, 300), (340, 40, 560, 300), (40, 460, 260, 760), (340, 460, 560, 760)],
+}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return AuraComputerVisionEngine()
+
+
+@pytest.mark.parametrize("expected", sorted(FIXTURES))
+def test_fast_path_matches_full_resolution_classification(engine, expected):
+    """Test that the 128px grayscale path classifies like the old 512px contour pass"""
+    image = draw_garments(FIXTURES[expected])
+
+    assert full_resolution_analysis_type(DecodedImage(image)) == expected
+    assert engine._detect_analysis_type(DecodedImage(image)) == expected
@@ -39,6 +39,8 @@ from multi_modal_engine import (
     MultiModalQueryResponse,
     process_query
 )
+# Streaming upload çözme - boyut sınırı okuma sırasında uygulanır
+from upload_decoding import MAX_UPLOAD_BYTES, decode_upload_stream
 
 # Logging konfigürasyonu - Production-ready logging setup
 logging.basicConfig(
@@ -120,6 +122,8 @@ class QueryStatsResponse(BaseModel):
     success_rate_percent: float
     most_common_query_types: List[str]
     active_since: str
+    cache_stats: Dict[str, Any] = Field(default_factory=dict)   # Koordinatör önbellekleri (hit/miss, girdi sayısı)
+    validation: Dict[str, Any] = Field(default_factory=dict)    # QA doğrulama modu ve bekleyen doğrulamalar
 
 # Startup event - Servis başlatıldığında çalışır
 @app.on_event("startup")
@@ -157,6 +161,10 @@ async def shutdown_event():
     logger.info("🔄 Multi-Modal Coordinator Service shutting down...")
     
     try:
+        # Bekleyen arka plan QA doğrulamalarını iptal et
+        if coordinator_instance:
+            await coordinator_instance.cancel_pending_validations()
+        
         # HTTP client'ları kapat
         if coordinator_instance and hasattr(coordinator_instance, 'http_client'):
             await coordinator_instance.http_client.aclose()
@@ -248,12 +256,13 @@ async def process_multimodal_query(request: MultiModalQueryRequest):
     - text_query: User's text query (e.g., "Bu gömlekle ne giyebilirim?")
     - user_id: Optional user ID for personalization
     - context: Additional context data
+    - force_inline_validation: Wait for Quality Assurance even when the service runs in deferred mode
     
     **Response:**
     - Unified intent analysis
     - Visual and textual analysis results
     - Personalized recommendations
-    - Quality-assured suggestions
+    - Quality-assured suggestions (validation_status tells whether QA already ran)
     """
     logger.info(f"🎯 Multi-modal query request received")
     logger.info(f"📝 Query: '{request.text_query}'")
@@ -283,7 +292,8 @@ async def process_multimodal_query_with_upload(
     image: UploadFile = File(..., description="Image file (JPEG, PNG, JPG, WEBP)"),
     text_query: str = Form(..., description="User's text query"),
     user_id: Optional[str] = Form(None, description="User ID for personalization"),
-    context: str = Form("{}", description="Additional context as JSON string")
+    context: str = Form("{}", description="Additional context as JSON string"),
+    force_inline_validation: bool = Form(False, description="Wait for Quality Assurance validation before responding")
 ):
     """
     Çok modlu sorgu işleme endpoint'i - File upload ile
@@ -293,6 +303,9 @@ async def process_multimodal_query_with_upload(
     
     **Supported Image Formats:** JPEG, PNG, JPG, WEBP
     **Max File Size:** 10MB
+    
+    Görsel parça parça okunur: boyut sınırı okuma sırasında uygulanır, format
+    ilk baytlardan kontrol edilir ve görsel CLIP çözünürlüğünde çözülür.
     """
     logger.info(f"📤 Multi-modal query with file upload received")
     logger.info(f"📝 Query: '{text_query}'")
@@ -304,37 +317,35 @@ async def process_multimodal_query_with_upload(
         raise HTTPException(status_code=503, detail="Multi-modal coordinator not available")
     
     try:
-        # Image dosyasını oku ve validate et
-        image_data = await image.read()
-        
-        # Dosya boyutu kontrolü (10MB limit)
-        if len(image_data) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=413, detail="Image file too large (max 10MB)")
-        
-        # Content type kontrolü
+        # Content type kontrolü - dosya okunmadan önce
         allowed_types = ["image/jpeg", "image/png", "image/jpg", "image/webp"]
         if image.content_type not in allowed_types:
             raise HTTPException(status_code=415, detail=f"Unsupported image type: {image.content_type}")
         
+        # Bildirilen boyut sınırı aşıyorsa hiç okumadan reddet
+        if image.size is not None and image.size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Image file too large (max 10MB)")
+        
         # Context JSON'ını parse et
         try:
             context_dict = json.loads(context) if context != "{}" else {}
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid context JSON format")
         
-        # Base64 encode et
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        # Görseli parça parça oku ve CLIP çözünürlüğünde çöz (10MB sınırı okuma sırasında uygulanır)
+        decoded_image = await decode_upload_stream(image)
         
-        # MultiModalQueryRequest oluştur
+        # MultiModalQueryRequest oluştur - görsel zaten çözüldüğü için base64'e çevrilmez
         query_request = MultiModalQueryRequest(
-            image_base64=image_base64,
+            image_base64="",
             text_query=text_query,
             user_id=user_id,
-            context=context_dict
+            context=context_dict,
+            force_inline_validation=force_inline_validation
         )
         
         # Query'yi process et
-        response = await coordinator_instance.process_multimodal_query(query_request)
+        response = await coordinator_instance.process_multimodal_query(query_request, decoded_image=decoded_image)
         
         logger.info(f"✅ File upload query processed successfully: {response.query_id}")
         return response
@@ -610,7 +621,9 @@ async def get_query_statistics():
                 "dress_shoe_matching", 
                 "pants_jacket_pairing"
             ],
-            active_since=datetime.now().isoformat()
+            active_since=datetime.now().isoformat(),
+            cache_stats=coordinator_instance.get_cache_stats() if coordinator_instance else {},
+            validation=coordinator_instance.get_validation_stats() if coordinator_instance else {}
         )
         
         logger.info("✅ Query statistics retrieved successfully")
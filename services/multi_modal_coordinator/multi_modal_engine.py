@@ -18,12 +18,16 @@ akıllı moda önerileri üretir.
 
 import asyncio
 import logging
+import os
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Awaitable, Union
+from dataclasses import dataclass, field
 from enum import Enum
-import base64
+import copy
+import hashlib
 import io
+import json
 from PIL import Image
 import numpy as np
 
@@ -32,6 +36,11 @@ from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel, Field
 import httpx
 
+# Kısa ömürlü sonuç önbelleği
+from ttl_cache import TTLCache
+# Bellek sınırlı, CLIP çözünürlüğünde görsel çözme
+from upload_decoding import DecodedUpload, decode_base64_image
+
 # Logging configuration - Her satırda açıklama yaparak takip edilebilirlik sağlıyoruz
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +48,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger("multi_modal_coordinator")
 
+# Koordinatör sonuç önbellekleri: (TTL saniye, maksimum girdi)
+IMAGE_ANALYSIS_CACHE_SETTINGS = (3600.0, 2048)   # Görsel analiz - görsel hash'ine göre
+TEXT_ANALYSIS_CACHE_SETTINGS = (600.0, 4096)     # Metin analizi - normalize edilmiş metne göre
+FUSED_CONTEXT_CACHE_SETTINGS = (300.0, 1024)     # Fused context + öneriler - (görsel, niyet, profil sürümü)
+
+class DownstreamServiceError(Exception):
+    """Downstream servis hata status kodu döndürdü (bağlantı hataları httpx istisnası olarak yükselir)"""
+
+def _raise_for_status(service: str, response: httpx.Response) -> None:
+    """200 dışındaki yanıtlar için DownstreamServiceError fırlatır"""
+    if response.status_code != 200:
+        raise DownstreamServiceError(f"{service} returned status {response.status_code}")
+
 class QueryType(Enum):
     """Çok modlu sorgu tiplerini tanımlayan enum sınıfı"""
     SHIRT_COMBINATION = "shirt_combination"          # Gömlek kombin sorguları
@@ -47,6 +69,23 @@ class QueryType(Enum):
     BAG_OUTFIT_STYLING = "bag_outfit_styling"        # Çanta merkezli styling
     GENERAL_STYLING = "general_styling"              # Genel styling sorguları
 
+class ValidationMode(Enum):
+    """Quality Assurance doğrulamasının sorgu akışındaki yerini belirleyen enum"""
+    INLINE = "inline"        # Yanıt QA sonucunu bekler
+    DEFERRED = "deferred"    # Yanıt hemen döner, doğrulama arka planda yapılıp önbelleğe yazılır
+
+# QA doğrulama modu: varsayılan INLINE, DEFERRED bu ortam değişkeniyle açılır ("deferred")
+VALIDATION_MODE_ENV = "AURA_MULTIMODAL_VALIDATION_MODE"
+
+def validation_mode_from_env() -> ValidationMode:
+    """VALIDATION_MODE_ENV değerinden doğrulama modunu okur (tanımsız veya geçersizse INLINE)"""
+    value = os.getenv(VALIDATION_MODE_ENV, ValidationMode.INLINE.value).strip().lower()
+    try:
+        return ValidationMode(value)
+    except ValueError:
+        logger.warning(f"⚠️ {VALIDATION_MODE_ENV}={value} is not a validation mode, using inline")
+        return ValidationMode.INLINE
+
 class FormalityLevel(Enum):
     """Giyim parçalarının formallik düzeylerini tanımlayan enum"""
     VERY_CASUAL = "very_casual"      # Çok rahat (spor, ev)
@@ -95,6 +134,27 @@ class FusedContext:
     contextual_priorities: List[str]        # Bağlamsal öncelikler
     processing_metadata: Dict[str, Any]     # İşleme metadata'sı
 
+@dataclass
+class QueryTimeline:
+    """Bir sorgunun aşama sürelerini ve downstream servis durumlarını tutan sınıf"""
+    started_at: float = field(default_factory=time.perf_counter)    # Sorgu başlangıcı (perf_counter)
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)  # Aşama adı -> süre (ms)
+    service_status: Dict[str, str] = field(default_factory=dict)      # Servis adı -> ok / timeout / error / skipped
+    cache_hits: List[str] = field(default_factory=list)               # Önbellekten gelen aşamalar
+
+    def record(self, stage: str, stage_start: float) -> None:
+        """stage_start'tan bu yana geçen süreyi aşamaya yazar"""
+        self.stage_timings_ms[stage] = round((time.perf_counter() - stage_start) * 1000, 3)
+
+    def elapsed(self) -> float:
+        """Sorgu başından bu yana geçen süre (saniye)"""
+        return time.perf_counter() - self.started_at
+
+    @property
+    def partial(self) -> bool:
+        """Herhangi bir servis bütçesini aştıysa veya hata verdiyse sonuç kısmidir"""
+        return any(status in ("timeout", "error") for status in self.service_status.values())
+
 class CLIPImageProcessor:
     """CLIP modeli tabanlı görsel analiz işlemcisi"""
     
@@ -107,12 +167,12 @@ class CLIPImageProcessor:
         self.supported_formats = ['JPEG', 'PNG', 'JPG', 'WEBP']
         logger.info("✅ CLIP Image Processor initialized successfully")
     
-    async def analyze_image(self, image_data: bytes, query_context: str = "") -> ImageAnalysisResult:
+    async def analyze_image(self, image_data: Union[bytes, DecodedUpload], query_context: str = "") -> ImageAnalysisResult:
         """
         Görsel analizi gerçekleştiren ana metod
         
         Args:
-            image_data: Görsel verisi (bytes formatında)
+            image_data: Görsel verisi (bytes veya CLIP çözünürlüğünde çözülmüş DecodedUpload)
             query_context: Sorgu bağlamı (opsiyonel)
             
         Returns:
@@ -122,16 +182,21 @@ class CLIPImageProcessor:
         logger.info(f"🔍 Starting image analysis with context: {query_context}")
         
         try:
-            # Görseli PIL Image objesine dönüştür
-            image = Image.open(io.BytesIO(image_data))
+            # Görseli PIL Image objesine dönüştür (streaming decode edilmişse tekrar açılmaz)
+            if isinstance(image_data, DecodedUpload):
+                image, image_format = image_data.image, image_data.source_format
+                width, height = image_data.original_size
+            else:
+                image = Image.open(io.BytesIO(image_data))
+                image_format = image.format
+                width, height = image.size
             
             # Görsel format kontrolü
-            if image.format not in self.supported_formats:
-                raise ValueError(f"Unsupported image format: {image.format}")
+            if image_format not in self.supported_formats:
+                raise ValueError(f"Unsupported image format: {image_format}")
             
             # Görsel boyut ve kalite kontrolü
-            width, height = image.size
-            logger.info(f"📐 Image dimensions: {width}x{height}")
+            logger.info(f"📐 Image dimensions: {width}x{height} (analyzed at {image.size[0]}x{image.size[1]})")
             
             # Mock CLIP analysis - Gerçek implementasyonda CLIP model inference olacak
             analysis_result = await self._mock_clip_analysis(image, query_context)
@@ -149,6 +214,20 @@ class CLIPImageProcessor:
             logger.error(f"❌ Image analysis failed: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Image analysis failed: {str(e)}")
     
+    def context_hint(self, query_context: str) -> str:
+        """
+        Sorgu bağlamının görsel analiz sonucunu etkileyen kısmı
+        
+        Aynı görsel için sonuç yalnızca bu ipucuna göre değişir, bu yüzden
+        görsel analiz önbelleği (görsel hash'i, ipucu) ile anahtarlanır.
+        """
+        context = query_context.lower()
+        if "gömlek" in context or "shirt" in context:
+            return "gömlek"
+        if "elbise" in context or "dress" in context:
+            return "elbise"
+        return ""
+    
     async def _mock_clip_analysis(self, image: Image, context: str) -> ImageAnalysisResult:
         """
         Mock CLIP analizi - Gerçek implementasyon için placeholder
@@ -158,7 +237,8 @@ class CLIPImageProcessor:
         await asyncio.sleep(0.1)
         
         # Context'e göre farklı sonuçlar döner (akıllı mock)
-        if "gömlek" in context.lower() or "shirt" in context.lower():
+        hint = self.context_hint(context)
+        if hint == "gömlek":
             return ImageAnalysisResult(
                 item_type="gömlek",
                 color_palette=["mavi", "beyaz"],
@@ -176,7 +256,7 @@ class CLIPImageProcessor:
                 },
                 processing_time_ms=0.0  # Gerçek süre sonradan set edilecek
             )
-        elif "elbise" in context.lower() or "dress" in context.lower():
+        elif hint == "elbise":
             return ImageAnalysisResult(
                 item_type="elbise",
                 color_palette=["siyah", "gümüş"],
@@ -582,6 +662,7 @@ class MultiModalQueryRequest(BaseModel):
     text_query: str = Field(..., description="User's text query", min_length=1, max_length=500)
     user_id: Optional[str] = Field(None, description="User ID for personalization")
     context: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional context")
+    force_inline_validation: bool = Field(False, description="Wait for Quality Assurance validation even in deferred mode")
 
 class MultiModalQueryResponse(BaseModel):
     """Çok modlu sorgu yanıtı için model"""
@@ -595,13 +676,27 @@ class MultiModalQueryResponse(BaseModel):
     recommendations: List[Dict[str, Any]]
     processing_time_ms: float
     timestamp: str
+    partial_results: bool = False                                        # Bir servis bütçesini aştıysa True
+    service_status: Dict[str, str] = Field(default_factory=dict)         # Servis bazlı ok / timeout / error / skipped
+    stage_timings_ms: Dict[str, float] = Field(default_factory=dict)     # Aşama bazlı süre dökümü
+    validation_status: str = "validated"                                 # validated / cached / pending / unvalidated
+    cache_hits: List[str] = Field(default_factory=list)                  # Önbellekten gelen aşamalar
 
 # Ana koordinatör sınıfı
 class MultiModalCoordinator:
     """AURA AI Çok Modlu Sorgu Koordinatörü - Ana sınıf"""
     
-    def __init__(self):
-        """MultiModalCoordinator sınıfını başlatır ve tüm bileşenleri hazırlar"""
+    def __init__(self, validation_mode: Optional[ValidationMode] = None,
+                 validation_cache_ttl_seconds: float = 300.0, validation_cache_size: int = 1024):
+        """
+        MultiModalCoordinator sınıfını başlatır ve tüm bileşenleri hazırlar
+        
+        Args:
+            validation_mode: QA doğrulaması yanıtı bekletir mi (INLINE) yoksa arka planda mı yapılır
+                (DEFERRED); None ise AURA_MULTIMODAL_VALIDATION_MODE okunur (varsayılan INLINE)
+            validation_cache_ttl_seconds: QA kararlarının önbellekte kalma süresi
+            validation_cache_size: Önbellekte tutulacak en fazla QA kararı
+        """
         logger.info("🎯 Multi-Modal Coordinator initializing...")
         
         # Bileşenleri başlat
@@ -617,53 +712,122 @@ class MultiModalCoordinator:
             "quality_assurance": "http://localhost:8008"
         }
         
+        # Servis bazlı süre bütçeleri (saniye) - bütçeyi aşan servis beklenmez, kısmi sonuç döner
+        # style_profile bütçesi sorgu başından itibaren sayılır (görsel/metin analiziyle paralel çalışır)
+        self.service_deadlines = {
+            "style_profile": 0.5,
+            "combination_engine": 1.5,
+            "recommendation_engine": 1.5,
+            "quality_assurance": 1.0
+        }
+        
         self.http_client = httpx.AsyncClient(timeout=30.0)
         
-        logger.info("✅ Multi-Modal Coordinator initialized successfully")
+        # Deferred QA: kararlar kısa ömürlü önbellekte tutulur, aynı sorgu tekrar gelince doğrulanmış hali döner
+        self.validation_mode = validation_mode or validation_mode_from_env()
+        self.validation_cache = TTLCache("qa_verdicts", validation_cache_ttl_seconds, validation_cache_size)
+        self._pending_validations: Dict[str, asyncio.Task] = {}
+        
+        # Tekrarlayan sorgular için sonuç önbellekleri (her biri kendi TTL ve boyut sınırıyla)
+        self.image_analysis_cache = TTLCache("image_analysis", *IMAGE_ANALYSIS_CACHE_SETTINGS)
+        self.text_analysis_cache = TTLCache("text_analysis", *TEXT_ANALYSIS_CACHE_SETTINGS)
+        self.fused_context_cache = TTLCache("fused_context", *FUSED_CONTEXT_CACHE_SETTINGS)
+        
+        logger.info(f"✅ Multi-Modal Coordinator initialized successfully (validation mode: {self.validation_mode.value})")
     
-    async def process_multimodal_query(self, request: MultiModalQueryRequest) -> MultiModalQueryResponse:
+    async def process_multimodal_query(self, request: MultiModalQueryRequest,
+                                       decoded_image: Optional[DecodedUpload] = None) -> MultiModalQueryResponse:
         """
         Çok modlu sorguyu işleyen ana metod
         
         Args:
             request: Çok modlu sorgu isteği
+            decoded_image: Upload akışında önceden çözülmüş görsel (verilirse image_base64 kullanılmaz)
             
         Returns:
             MultiModalQueryResponse: İşlenmiş sorgu yanıtı
         """
         start_time = datetime.now()
+        timeline = QueryTimeline()
         query_id = f"mmq_{int(start_time.timestamp())}_{hash(request.text_query) % 10000}"
         
         logger.info(f"🚀 Processing multi-modal query {query_id}")
         logger.info(f"📝 Text query: '{request.text_query}'")
         
+        profile_task = None
+        
         try:
-            # 1. Base64 image'ı decode et
-            image_data = base64.b64decode(request.image_base64)
+            # 1. Görseli parça parça, CLIP çözünürlüğünde çöz (upload akışında zaten çözülmüş gelir)
+            stage_start = time.perf_counter()
+            image_data = decoded_image or decode_base64_image(request.image_base64)
+            image_key = (image_data.sha256, self.clip_processor.context_hint(request.text_query))
+            timeline.record("decode", stage_start)
             
-            # 2. Parallel processing - Görsel ve metin analizini aynı anda başlat
-            image_task = self.clip_processor.analyze_image(image_data, request.text_query)
-            text_task = self.nlu_processor.analyze_text(request.text_query)
+            # 2. Kullanıcı profilini analizlerle eş zamanlı getirmeye başla (sonucu fusion'da lazım)
+            if request.user_id:
+                profile_task = asyncio.create_task(
+                    self._timed("profile_fetch", self._get_user_profile(request.user_id), timeline)
+                )
+            else:
+                timeline.service_status["style_profile"] = "skipped"
             
-            # 3. Her iki analizi tamamlanmasını bekle
-            visual_analysis, textual_analysis = await asyncio.gather(image_task, text_task)
+            # 3. Parallel processing - Görsel ve metin analizini aynı anda çalıştır
+            stage_start = time.perf_counter()
+            visual_analysis, textual_analysis = await asyncio.gather(
+                self._timed("image_analysis", self._analyze_image_cached(image_key, image_data, request.text_query, timeline), timeline),
+                self._timed("text_analysis", self._analyze_text_cached(request.text_query, timeline), timeline)
+            )
+            timeline.record("analysis", stage_start)
             
-            # 4. Kullanıcı profilini al (eğer user_id varsa)
-            user_profile = await self._get_user_profile(request.user_id) if request.user_id else {}
+            # 4. Profil bütçesinin kalanı kadar bekle - bütçe aşılırsa profilsiz devam et
+            user_profile = {}
+            if profile_task is not None:
+                remaining = max(0.0, self.service_deadlines["style_profile"] - timeline.elapsed())
+                user_profile = await self._call_with_deadline(
+                    "style_profile", profile_task, timeline, budget=remaining, stage="profile_wait"
+                ) or {}
             
-            # 5. Context fusion - Analizleri birleştir
-            fused_context = self.fusion_engine.fuse_contexts(
-                visual_analysis, textual_analysis, user_profile
-            )
+            # Aynı görsel + niyet + profil sürümü için fusion ve fan-out sonucu önbellekten gelebilir
+            fused_key = (image_key, textual_analysis.intent, self._profile_version(request.user_id, user_profile))
+            cached_fusion = self.fused_context_cache.get(fused_key)
             
-            # 6. Service koordinasyonu ile önerileri al
-            recommendations = await self._coordinate_recommendation_services(fused_context)
+            if cached_fusion is not None:
+                fused_context, recommendations = copy.deepcopy(cached_fusion)
+                timeline.cache_hits.append("fused_context")
+            else:
+                # 5. Context fusion - Analizleri birleştir
+                stage_start = time.perf_counter()
+                fused_context = self.fusion_engine.fuse_contexts(
+                    visual_analysis, textual_analysis, user_profile
+                )
+                timeline.record("fusion", stage_start)
+                
+                # 6. Kombin ve öneri servislerine paralel fan-out (her biri kendi bütçesiyle)
+                stage_start = time.perf_counter()
+                combination_recommendations, engine_recommendations = await asyncio.gather(
+                    self._call_with_deadline("combination_engine", self._coordinate_recommendation_services(fused_context), timeline),
+                    self._call_with_deadline("recommendation_engine", self._fetch_engine_recommendations(fused_context, request.user_id), timeline)
+                )
+                timeline.record("fan_out", stage_start)
+                
+                # Bütçesine yetişen servislerin sonuçlarını birleştir, hiçbiri yetişmediyse fallback kullan
+                recommendations = (combination_recommendations or []) + (engine_recommendations or [])
+                if not recommendations:
+                    recommendations = await self._generate_fallback_recommendations(fused_context)
+                
+                # Kısmi sonuçlar önbelleğe yazılmaz - bir sonraki sorgu servisleri tekrar dener
+                if not timeline.partial:
+                    self.fused_context_cache.put(fused_key, copy.deepcopy((fused_context, recommendations)))
             
-            # 7. Kalite kontrolü yap
-            validated_recommendations = await self._validate_recommendations(recommendations, fused_context)
+            # 7. Kalite kontrolü - önbellekte karar varsa onu kullan, yoksa inline veya arka planda doğrula
+            validated_recommendations, validation_status = await self._resolve_validation(
+                recommendations, fused_context, timeline,
+                inline=request.force_inline_validation or self.validation_mode == ValidationMode.INLINE
+            )
             
             # 8. Response hazırla
             total_processing_time = (datetime.now() - start_time).total_seconds() * 1000
+            timeline.record("total", timeline.started_at)
             
             response = MultiModalQueryResponse(
                 success=True,
@@ -685,88 +849,196 @@ class MultiModalCoordinator:
                 fusion_confidence=fused_context.fusion_confidence,
                 recommendations=validated_recommendations,
                 processing_time_ms=total_processing_time,
-                timestamp=start_time.isoformat()
+                timestamp=start_time.isoformat(),
+                partial_results=timeline.partial,
+                service_status=timeline.service_status,
+                stage_timings_ms=timeline.stage_timings_ms,
+                validation_status=validation_status,
+                cache_hits=timeline.cache_hits
             )
             
             logger.info(f"✅ Multi-modal query {query_id} completed in {total_processing_time:.2f}ms")
             logger.info(f"🎯 Generated {len(validated_recommendations)} recommendations")
+            if timeline.partial:
+                logger.warning(f"⚠️ Partial results for {query_id}: {timeline.service_status}")
             
             return response
             
+        except HTTPException:
+            # Görsel reddi (413/415/400) ve analiz hataları status koduyla iletilir
+            raise
         except Exception as e:
             logger.error(f"❌ Multi-modal query {query_id} failed: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Multi-modal query processing failed: {str(e)}")
+        finally:
+            # Analiz hata verdiyse arka planda kalan profil isteğini iptal et
+            if profile_task is not None and not profile_task.done():
+                profile_task.cancel()
     
-    async def _get_user_profile(self, user_id: str) -> Dict[str, Any]:
-        """Kullanıcı profilini Style Profile servisinden alır"""
+    async def _timed(self, stage: str, awaitable: Awaitable[Any], timeline: QueryTimeline) -> Any:
+        """Bir aşamayı çalıştırır ve süresini timeline'a yazar (iptal edilse bile)"""
+        stage_start = time.perf_counter()
         try:
-            response = await self.http_client.get(f"{self.service_clients['style_profile']}/profile/{user_id}")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning(f"⚠️ Could not fetch user profile for {user_id}")
-                return {}
+            return await awaitable
+        finally:
+            timeline.record(stage, stage_start)
+    
+    async def _analyze_image_cached(self, image_key: Tuple[str, str], image_data: bytes,
+                                    query_context: str, timeline: QueryTimeline) -> ImageAnalysisResult:
+        """Görsel analizini (görsel hash'i, bağlam ipucu) anahtarıyla önbellekten verir veya hesaplar"""
+        cached = self.image_analysis_cache.get(image_key)
+        if cached is not None:
+            timeline.cache_hits.append("image_analysis")
+            return copy.deepcopy(cached)
+        
+        result = await self.clip_processor.analyze_image(image_data, query_context)
+        self.image_analysis_cache.put(image_key, copy.deepcopy(result))
+        return result
+    
+    async def _analyze_text_cached(self, text_query: str, timeline: QueryTimeline) -> TextAnalysisResult:
+        """Metin analizini normalize edilmiş metin anahtarıyla önbellekten verir veya hesaplar"""
+        text_key = self._normalize_text(text_query)
+        cached = self.text_analysis_cache.get(text_key)
+        if cached is not None:
+            timeline.cache_hits.append("text_analysis")
+            return copy.deepcopy(cached)
+        
+        result = await self.nlu_processor.analyze_text(text_query)
+        self.text_analysis_cache.put(text_key, copy.deepcopy(result))
+        return result
+    
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """Büyük/küçük harf ve boşluk farklarını yok sayar (NLU analizi metni zaten küçük harfle işler)"""
+        return " ".join(text.split()).lower()
+    
+    @staticmethod
+    def _profile_version(user_id: Optional[str], user_profile: Dict[str, Any]) -> str:
+        """Kullanıcı + profil içeriğinin parmak izi - profil değişince fused context önbelleği yenilenir"""
+        payload = json.dumps(user_profile, sort_keys=True, ensure_ascii=False, default=str)
+        return f"{user_id or 'anonymous'}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Tüm koordinatör önbelleklerinin hit/miss istatistikleri"""
+        return {
+            cache.name: cache.get_stats()
+            for cache in (self.image_analysis_cache, self.text_analysis_cache,
+                          self.fused_context_cache, self.validation_cache)
+        }
+    
+    async def _call_with_deadline(self, service: str, awaitable: Awaitable[Any], timeline: QueryTimeline,
+                                  budget: Optional[float] = None, stage: Optional[str] = None) -> Any:
+        """
+        Downstream servis çağrısını süre bütçesiyle çalıştırır
+        
+        Args:
+            service: Servis adı (service_deadlines anahtarı)
+            awaitable: Servis çağrısı (coroutine veya task)
+            timeline: Sorgu timeline'ı
+            budget: Saniye cinsinden bütçe (None ise service_deadlines kullanılır)
+            stage: Timeline'daki aşama adı (varsayılan servis adı)
+            
+        Returns:
+            Servis sonucu; bütçe aşıldıysa veya hata olduysa None
+            
+        Sarılan çağrılar hata durumunda fırlatmalıdır ({} / mock veri dönmemeli) - aksi halde
+        çökmüş servis "ok" görünür ve fallback sonuçları önbelleğe yazılır.
+        """
+        budget = self.service_deadlines[service] if budget is None else budget
+        stage_start = time.perf_counter()
+        
+        try:
+            result = await asyncio.wait_for(awaitable, timeout=budget)
+            timeline.service_status[service] = "ok"
+            return result
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ {service} missed its {budget * 1000:.0f}ms budget, continuing with partial results")
+            timeline.service_status[service] = "timeout"
+            return None
         except Exception as e:
-            logger.error(f"❌ Error fetching user profile: {str(e)}")
+            logger.error(f"❌ {service} call failed: {str(e)}")
+            timeline.service_status[service] = "error"
+            return None
+        finally:
+            timeline.record(stage or service, stage_start)
+    
+    async def _get_user_profile(self, user_id: str) -> Dict[str, Any]:
+        """
+        Kullanıcı profilini Style Profile servisinden alır
+        
+        Profili olmayan kullanıcı (404) için boş profil döner; bağlantı hataları ve diğer
+        status kodları fırlatılır, _call_with_deadline servisi "error" olarak işaretler.
+        """
+        response = await self.http_client.get(f"{self.service_clients['style_profile']}/profile/{user_id}")
+        if response.status_code == 404:
+            logger.info(f"ℹ️ No style profile for {user_id}")
             return {}
+        _raise_for_status("style_profile", response)
+        return response.json()
     
     async def _coordinate_recommendation_services(self, context: FusedContext) -> List[Dict[str, Any]]:
-        """Fused context'e göre appropriate servisleri koordine eder"""
+        """
+        Fused context'e göre appropriate servisleri koordine eder
+        
+        Servis hataları fırlatılır - fallback önerileri process_multimodal_query'de
+        kısmi sonuç olarak işaretlenip üretilir (önbelleğe yazılmaz)
+        """
         logger.info(f"🔄 Coordinating services for {context.recommendation_type}")
         
-        recommendations = []
+        # Query type'a göre farklı service coordination strategies
+        if context.textual_context.query_type == QueryType.SHIRT_COMBINATION:
+            recommendations = await self._handle_shirt_combination(context)
+        elif context.textual_context.query_type == QueryType.DRESS_SHOE_MATCHING:
+            recommendations = await self._handle_dress_shoe_matching(context)
+        elif context.textual_context.query_type == QueryType.PANTS_JACKET_PAIRING:
+            recommendations = await self._handle_pants_jacket_pairing(context)
+        elif context.textual_context.query_type == QueryType.BAG_OUTFIT_STYLING:
+            recommendations = await self._handle_bag_outfit_styling(context)
+        else:
+            recommendations = await self._handle_general_styling(context)
         
-        try:
-            # Query type'a göre farklı service coordination strategies
-            if context.textual_context.query_type == QueryType.SHIRT_COMBINATION:
-                recommendations = await self._handle_shirt_combination(context)
-            elif context.textual_context.query_type == QueryType.DRESS_SHOE_MATCHING:
-                recommendations = await self._handle_dress_shoe_matching(context)
-            elif context.textual_context.query_type == QueryType.PANTS_JACKET_PAIRING:
-                recommendations = await self._handle_pants_jacket_pairing(context)
-            elif context.textual_context.query_type == QueryType.BAG_OUTFIT_STYLING:
-                recommendations = await self._handle_bag_outfit_styling(context)
-            else:
-                recommendations = await self._handle_general_styling(context)
-            
-            logger.info(f"📦 Generated {len(recommendations)} initial recommendations")
-            return recommendations
-            
-        except Exception as e:
-            logger.error(f"❌ Service coordination failed: {str(e)}")
-            # Fallback önerileri döndür
-            return await self._generate_fallback_recommendations(context)
+        logger.info(f"📦 Generated {len(recommendations)} initial recommendations")
+        return recommendations
+    
+    async def _fetch_engine_recommendations(self, context: FusedContext, user_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Recommendation Engine servisinden bağlama uygun ürün önerilerini alır"""
+        recommendation_request = {
+            "user_id": user_id or "anonymous",
+            "type": "hybrid",
+            "context": context.visual_context.style_category,
+            "occasion": context.visual_context.formality_level.value,
+            "limit": 5
+        }
+        
+        response = await self.http_client.post(
+            f"{self.service_clients['recommendation_engine']}/recommendations",
+            json=recommendation_request
+        )
+        
+        _raise_for_status("recommendation_engine", response)
+        return response.json().get("recommendations", [])
     
     async def _handle_shirt_combination(self, context: FusedContext) -> List[Dict[str, Any]]:
-        """Gömlek kombinasyon önerileri için özel koordinasyon"""
-        try:
-            # Combination Engine'e istek gönder
-            combination_request = {
-                "base_item": {
-                    "type": context.visual_context.item_type,
-                    "color": context.visual_context.dominant_color,
-                    "style": context.visual_context.style_category
-                },
-                "request_type": "bottom_piece_recommendation",
-                "user_preferences": context.user_profile.get("preferences", {}),
-                "formality_level": context.visual_context.formality_level.value
-            }
-            
-            response = await self.http_client.post(
-                f"{self.service_clients['combination_engine']}/recommend_combination",
-                json=combination_request
-            )
-            
-            if response.status_code == 200:
-                combination_data = response.json()
-                return combination_data.get("recommendations", [])
-            else:
-                logger.warning("⚠️ Combination Engine request failed, using fallback")
-                return self._mock_shirt_recommendations(context)
-                
-        except Exception as e:
-            logger.error(f"❌ Shirt combination handling failed: {str(e)}")
-            return self._mock_shirt_recommendations(context)
+        """Gömlek kombinasyon önerileri için özel koordinasyon (Combination Engine hataları fırlatılır)"""
+        # Combination Engine'e istek gönder
+        combination_request = {
+            "base_item": {
+                "type": context.visual_context.item_type,
+                "color": context.visual_context.dominant_color,
+                "style": context.visual_context.style_category
+            },
+            "request_type": "bottom_piece_recommendation",
+            "user_preferences": context.user_profile.get("preferences", {}),
+            "formality_level": context.visual_context.formality_level.value
+        }
+        
+        response = await self.http_client.post(
+            f"{self.service_clients['combination_engine']}/recommend_combination",
+            json=combination_request
+        )
+        
+        _raise_for_status("combination_engine", response)
+        return response.json().get("recommendations", [])
     
     async def _handle_dress_shoe_matching(self, context: FusedContext) -> List[Dict[str, Any]]:
         """Elbise-ayakkabı uyum önerileri için özel koordinasyon"""
@@ -847,7 +1119,9 @@ class MultiModalCoordinator:
         ]
     
     async def _generate_fallback_recommendations(self, context: FusedContext) -> List[Dict[str, Any]]:
-        """Genel fallback önerileri üretir"""
+        """Genel fallback önerileri üretir (gömlek sorguları için gömleğe özel fallback)"""
+        if context.textual_context.query_type == QueryType.SHIRT_COMBINATION:
+            return self._mock_shirt_recommendations(context)
         return [
             {
                 "type": "fallback_öneri",
@@ -858,44 +1132,128 @@ class MultiModalCoordinator:
             }
         ]
     
-    async def _validate_recommendations(self, recommendations: List[Dict[str, Any]], context: FusedContext) -> List[Dict[str, Any]]:
-        """Quality Assurance servisi ile önerileri doğrular"""
-        try:
-            # Quality Assurance servisine validation isteği gönder
-            validation_request = {
-                "ai_output": {
-                    "recommendations": recommendations,
-                    "context": context.unified_intent
-                },
-                "context": {
-                    "service_source": "multi_modal_coordinator",
-                    "query_type": context.textual_context.query_type.value,
-                    "fusion_confidence": context.fusion_confidence
-                }
-            }
+    def _validation_cache_key(self, recommendations: List[Dict[str, Any]], context: FusedContext) -> str:
+        """Aynı sorgu bağlamı ve aynı öneriler için aynı QA önbellek anahtarını üretir"""
+        payload = json.dumps(
+            [context.textual_context.query_type.value, context.unified_intent, recommendations],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    async def _resolve_validation(self, recommendations: List[Dict[str, Any]], context: FusedContext,
+                                  timeline: QueryTimeline, inline: bool) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Önerilerin QA doğrulamasını çözer
+        
+        Args:
+            recommendations: Doğrulanacak öneriler
+            context: Fused context
+            timeline: Sorgu timeline'ı
+            inline: True ise QA sonucu beklenir (bütçe dahilinde)
             
-            response = await self.http_client.post(
-                f"{self.service_clients['quality_assurance']}/validate",
-                json=validation_request
+        Returns:
+            (döndürülecek öneriler, validation_status)
+        """
+        cache_key = self._validation_cache_key(recommendations, context)
+        
+        # Daha önce doğrulanmış aynı öneriler - QA'ya gitmeden doğrulanmış/iyileştirilmiş hali dön
+        cached = self.validation_cache.get(cache_key)
+        if cached is not None:
+            timeline.service_status["quality_assurance"] = "cached"
+            return copy.deepcopy(cached), "cached"
+        
+        if inline:
+            verdict = await self._call_with_deadline(
+                "quality_assurance", self._fetch_validation_verdict(recommendations, context), timeline
             )
-            
-            if response.status_code == 200:
-                validation_result = response.json()
-                if validation_result.get("status") == "approved":
-                    logger.info("✅ Recommendations validated successfully")
-                    return recommendations
-                else:
-                    logger.warning("⚠️ Recommendations need improvement")
-                    # Improvement suggestions'ları apply et
-                    return self._apply_quality_improvements(recommendations, validation_result)
-            else:
-                logger.warning("⚠️ Quality validation failed, returning original recommendations")
-                return recommendations
-                
+            if verdict is None:
+                return recommendations, "unvalidated"
+            self.validation_cache.put(cache_key, copy.deepcopy(verdict))
+            return verdict, "validated"
+        
+        # Deferred: yanıt beklemeden döner, doğrulama arka planda önbelleği doldurur
+        self._schedule_deferred_validation(cache_key, recommendations, context)
+        timeline.service_status["quality_assurance"] = "deferred"
+        return recommendations, "pending"
+    
+    def _schedule_deferred_validation(self, cache_key: str, recommendations: List[Dict[str, Any]],
+                                      context: FusedContext) -> None:
+        """Arka planda QA doğrulaması başlatır (aynı anahtar için tek istek)"""
+        if cache_key in self._pending_validations:
+            return
+        
+        # Yanıtta dönen listeyle paylaşılmasın diye kopya üzerinde doğrula
+        task = asyncio.create_task(
+            self._run_deferred_validation(cache_key, copy.deepcopy(recommendations), context)
+        )
+        self._pending_validations[cache_key] = task
+        task.add_done_callback(lambda _: self._pending_validations.pop(cache_key, None))
+    
+    async def _run_deferred_validation(self, cache_key: str, recommendations: List[Dict[str, Any]],
+                                       context: FusedContext) -> None:
+        """Arka plan QA doğrulaması - karar yalnızca QA'dan yanıt gelirse önbelleğe yazılır"""
+        try:
+            verdict = await self._fetch_validation_verdict(recommendations, context)
+        except Exception as e:
+            logger.error(f"❌ Deferred quality validation failed: {str(e)}")
+            return
+        self.validation_cache.put(cache_key, verdict)
+        logger.info("🛡️ Deferred quality validation cached")
+    
+    async def cancel_pending_validations(self) -> None:
+        """Bekleyen arka plan doğrulamalarını iptal eder (shutdown için)"""
+        tasks = list(self._pending_validations.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def get_validation_stats(self) -> Dict[str, Any]:
+        """QA doğrulama modu ve karar önbelleği istatistikleri"""
+        return {
+            "mode": self.validation_mode.value,
+            "pending": len(self._pending_validations),
+            "cache": self.validation_cache.get_stats()
+        }
+    
+    async def _validate_recommendations(self, recommendations: List[Dict[str, Any]], context: FusedContext) -> List[Dict[str, Any]]:
+        """Quality Assurance servisi ile önerileri doğrular (QA'ya ulaşılamazsa öneriler olduğu gibi döner)"""
+        try:
+            return await self._fetch_validation_verdict(recommendations, context)
         except Exception as e:
             logger.error(f"❌ Quality validation failed: {str(e)}")
             return recommendations
     
+    async def _fetch_validation_verdict(self, recommendations: List[Dict[str, Any]],
+                                        context: FusedContext) -> List[Dict[str, Any]]:
+        """QA servisinden karar alır; doğrulanmış/iyileştirilmiş öneriler (QA hataları fırlatılır)"""
+        # Quality Assurance servisine validation isteği gönder
+        validation_request = {
+            "ai_output": {
+                "recommendations": recommendations,
+                "context": context.unified_intent
+            },
+            "context": {
+                "service_source": "multi_modal_coordinator",
+                "query_type": context.textual_context.query_type.value,
+                "fusion_confidence": context.fusion_confidence
+            }
+        }
+        
+        response = await self.http_client.post(
+            f"{self.service_clients['quality_assurance']}/validate",
+            json=validation_request
+        )
+        
+        _raise_for_status("quality_assurance", response)
+        validation_result = response.json()
+        if validation_result.get("status") == "approved":
+            logger.info("✅ Recommendations validated successfully")
+            return recommendations
+        
+        logger.warning("⚠️ Recommendations need improvement")
+        # Improvement suggestions'ları apply et
+        return self._apply_quality_improvements(recommendations, validation_result)
+    
     def _apply_quality_improvements(self, recommendations: List[Dict[str, Any]], validation_result: Dict) -> List[Dict[str, Any]]:
         """Quality Assurance önerilerine göre recommendations'ları improve eder"""
         # Basit implementation - gerçek projede daha sophisticated logic olacak
@@ -0,0 +1,230 @@
+# 📥 Multi-Modal Coordinator Service - Streaming Upload Decoding
+# AURA AI Çok Modlu Sorgu Koordinatörü için bellek sınırlı görsel çözme
+
+"""
+Streaming görsel çözme
+
+Yüklenen görsel tek seferde belleğe okunmaz: parça parça okunurken boyut
+sınırı uygulanır, ilk baytlardan format tespit edilip desteklenmeyen dosyalar
+hemen reddedilir ve veri SpooledTemporaryFile'a yazılır (küçük dosyalar
+bellekte kalır, büyükler diske taşar). Çözme aşamasında JPEG'ler draft modunda
+doğrudan küçültülmüş DCT ölçeğinde decode edilir ve görsel CLIP'in ihtiyaç
+duyduğu çözünürlüğe indirilir; tam çözünürlüklü bitmap hiç oluşturulmaz.
+"""
+
+import base64
+import binascii
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+logger = logging.getLogger("multi_modal_coordinator")
+
+# Upload sınırları
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024       # 10MB - API dokümantasyonundaki sınır
+MAX_IMAGE_PIXELS = 40_000_000             # Decompression bomb koruması (~40MP)
+UPLOAD_CHUNK_SIZE = 64 * 1024             # Okuma parça boyutu
+SPOOL_MEMORY_BYTES = 1024 * 1024          # Bu boyutun üstündeki uploadlar diske taşar
+
+# CLIP ViT-B/32 girişi: kısa kenar 224'e ölçeklenip ortadan kırpılır
+CLIP_INPUT_SIZE = 224
+
+# Format imzaları (magic bytes) - sadece CLIPImageProcessor'ın desteklediği formatlar
+_SIGNATURE_BYTES = 12
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """
+    Dosyanın ilk baytlarından görsel formatını tespit eder
+
+    Args:
+        header: Dosyanın en az 12 baytı
+
+    Returns:
+        "JPEG", "PNG", "WEBP" veya desteklenmiyorsa None
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+@dataclass
+class DecodedUpload:
+    """CLIP çözünürlüğüne indirilmiş, çözülmüş görsel"""
+    image: Image.Image                 # RGB görsel (kısa kenar en fazla CLIP_INPUT_SIZE)
+    source_format: str                 # Kaynak format (JPEG, PNG, WEBP)
+    original_size: Tuple[int, int]     # Kaynak görselin boyutu (genişlik, yükseklik)
+    byte_size: int                     # Yüklenen dosya boyutu (byte)
+    sha256: str                        # Kaynak baytların hash'i (önbellek anahtarı)
+
+
+class StreamingImageDecoder:
+    """Parça parça beslenen, boyut ve format kontrolünü okuma sırasında yapan görsel çözücü"""
+
+    def __init__(self, max_bytes: int = MAX_UPLOAD_BYTES, target_size: int = CLIP_INPUT_SIZE,
+                 max_pixels: int = MAX_IMAGE_PIXELS):
+        """
+        Args:
+            max_bytes: Kabul edilen en büyük dosya boyutu
+            target_size: Çözülen görselin kısa kenarı için hedef (sadece küçültülür)
+            max_pixels: Kabul edilen en büyük piksel sayısı
+        """
+        self.max_bytes = max_bytes
+        self.target_size = target_size
+        self.max_pixels = max_pixels
+        self.byte_size = 0
+        self.source_format: Optional[str] = None
+        self._header = b""
+        self._hash = hashlib.sha256()
+        self._spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+
+    def feed(self, chunk: bytes) -> None:
+        """Bir veri parçası ekler; sınır aşılırsa veya format desteklenmiyorsa hemen reddeder"""
+        if not chunk:
+            return
+
+        self.byte_size += len(chunk)
+        if self.byte_size > self.max_bytes:
+            raise HTTPException(status_code=413, detail=f"Image file too large (max {self.max_bytes // (1024 * 1024)}MB)")
+
+        # Format tespiti için yeterli bayt gelene kadar başlığı biriktir
+        if self.source_format is None:
+            self._header += chunk[:_SIGNATURE_BYTES]
+            if len(self._header) >= _SIGNATURE_BYTES:
+                self._check_signature()
+
+        self._hash.update(chunk)
+        self._spool.write(chunk)
+
+    def _check_signature(self) -> None:
+        """İlk baytlara bakarak desteklenmeyen formatları reddeder"""
+        self.source_format = sniff_image_format(self._header)
+        if self.source_format is None:
+            raise HTTPException(status_code=415, detail="Unsupported image format (JPEG, PNG or WEBP expected)")
+
+    def finish(self) -> DecodedUpload:
+        """Biriken veriyi CLIP çözünürlüğünde çözer"""
+        try:
+            if self.source_format is None:
+                # Dosya imzadan bile kısa
+                self._check_signature()
+
+            self._spool.seek(0)
+            try:
+                image = Image.open(self._spool)
+                original_size = image.size
+
+                # Piksel kontrolü header'dan yapılır - bitmap henüz oluşturulmadı
+                if original_size[0] * original_size[1] > self.max_pixels:
+                    raise HTTPException(status_code=413, detail="Image dimensions too large")
+                if image.format != self.source_format:
+                    raise HTTPException(status_code=415, detail=f"Image content does not match its {self.source_format} signature")
+
+                # JPEG: libjpeg 1/2, 1/4 veya 1/8 ölçekte decode eder (kısa kenar hedefin altına inmez)
+                if self.source_format == "JPEG":
+                    image.draft("RGB", (self.target_size, self.target_size))
+
+                image.load()
+            except HTTPException:
+                raise
+            except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+                raise HTTPException(status_code=400, detail=f"Invalid image data: {str(e)}")
+
+            image = self._downscale(image.convert("RGB"))
+            logger.info(f"📥 Decoded {self.source_format} upload {original_size[0]}x{original_size[1]} "
+                        f"({self.byte_size} bytes) at {image.size[0]}x{image.size[1]}")
+
+            return DecodedUpload(
+                image=image,
+                source_format=self.source_format,
+                original_size=original_size,
+                byte_size=self.byte_size,
+                sha256=self._hash.hexdigest()
+            )
+        finally:
+            self.close()
+
+    def _downscale(self, image: Image.Image) -> Image.Image:
+        """Kısa kenarı hedef boyuta indirir (büyütme yapılmaz)"""
+        width, height = image.size
+        scale = self.target_size / min(width, height)
+        if scale >= 1.0:
+            return image
+        new_size = (max(self.target_size, round(width * scale)), max(self.target_size, round(height * scale)))
+        # reducing_gap: önce tam sayı oranında hızlı küçültme, sonra bicubic (CLIPProcessor ile aynı filtre)
+        return image.resize(new_size, Image.Resampling.BICUBIC, reducing_gap=3.0)
+
+    def close(self) -> None:
+        """Geçici dosyayı kapatır"""
+        self._spool.close()
+
+
+async def decode_upload_stream(upload: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE,
+                               **decoder_options) -> DecodedUpload:
+    """
+    UploadFile'ı parça parça okuyarak çözer
+
+    Args:
+        upload: FastAPI upload dosyası
+        chunk_size: Okuma parça boyutu
+        decoder_options: StreamingImageDecoder parametreleri
+
+    Returns:
+        DecodedUpload: CLIP çözünürlüğünde çözülmüş görsel
+    """
+    decoder = StreamingImageDecoder(**decoder_options)
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            decoder.feed(chunk)
+    except BaseException:
+        decoder.close()
+        raise
+    return decoder.finish()
+
+
+def decode_base64_image(image_base64: str, chunk_size: int = UPLOAD_CHUNK_SIZE,
+                        **decoder_options) -> DecodedUpload:
+    """
+    Base64 görseli tam byte kopyası oluşturmadan parça parça çözer
+
+    Args:
+        image_base64: Base64 encoded görsel
+        chunk_size: Çözülen parça boyutu (byte)
+        decoder_options: StreamingImageDecoder parametreleri
+
+    Returns:
+        DecodedUpload: CLIP çözünürlüğünde çözülmüş görsel
+    """
+    # MIME tarzı satırlara bölünmüş base64 (nadir) - sadece bu durumda kopya oluşur
+    if any(whitespace in image_base64[:UPLOAD_CHUNK_SIZE] for whitespace in ("\n", "\r", " ")):
+        image_base64 = "".join(image_base64.split())
+
+    decoder = StreamingImageDecoder(**decoder_options)
+    try:
+        # Decode etmeden önce tahmini boyutla büyük istekleri reddet
+        if len(image_base64) // 4 * 3 > decoder.max_bytes + 2:
+            raise HTTPException(status_code=413, detail=f"Image file too large (max {decoder.max_bytes // (1024 * 1024)}MB)")
+
+        # Base64'te 4 karakter = 3 byte; parça sınırları 4'ün katında tutulur
+        step = max(4, chunk_size // 3 * 4)
+        for offset in range(0, len(image_base64), step):
+            try:
+                decoder.feed(base64.b64decode(image_base64[offset:offset + step], validate=True))
+            except binascii.Error:
+                raise HTTPException(status_code=400, detail="Invalid base64 image data")
+    except BaseException:
+        decoder.close()
+        raise
+    return decoder.finish()
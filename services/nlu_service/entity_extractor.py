@@ -0,0 +1,200 @@
+# 🏷️ AURA AI - Single-Pass Regex Entity Extractor
+# All entity vocabularies compiled into one named-group regex at load time
+
+"""
+Entity extraction used to run one uncompiled `re.findall` per clothing, colour
+and time alternation. EntityExtractor compiles every vocabulary into a single
+regex with one named group per term, so one `finditer` scan returns
+every entity with its type and character span.
+
+Vocabularies are JSON files mapping entity type to terms, for example
+{"brands": ["Mavi", "Koton"], "materials": ["pamuk", "cotton"]}. The bundled
+files live in entity_vocabularies/. Set NLU_EXTRA_ENTITY_VOCABULARY_DIR to a
+directory of additional files (brands, materials, ...) and call reload() to
+pick up changes without a deploy.
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Vocabulary files shipped with the service
+BUNDLED_VOCABULARY_DIR = Path(__file__).resolve().parent / "entity_vocabularies"
+
+# Optional directory with additional vocabulary files (mounted volume, config map)
+EXTRA_VOCABULARY_DIR_ENV = "NLU_EXTRA_ENTITY_VOCABULARY_DIR"
+
+
+@dataclass
+class EntityMatch:
+    """One entity found in the text"""
+    text: str       # Matched text as written in the input
+    label: str      # Entity type (vocabulary key)
+    start: int      # Start offset in the input
+    end: int        # End offset in the input (exclusive)
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def load_vocabulary_file(path: Path) -> Dict[str, List[str]]:
+    """
+    Read one vocabulary file.
+
+    Args:
+        path: JSON file mapping entity type to a list of terms
+
+    Returns:
+        Entity type -> terms
+    """
+    with open(path, encoding="utf-8") as vocabulary_file:
+        data = json.load(vocabulary_file)
+    if not isinstance(data, dict) or not all(isinstance(terms, list) for terms in data.values()):
+        raise ValueError(f"{path}: expected an object mapping entity types to term lists")
+    return {str(label): [str(term) for term in terms] for label, terms in data.items()}
+
+
+def load_vocabularies(directories: Iterable[Path]) -> Dict[str, List[str]]:
+    """
+    Merge every *.json vocabulary file in the given directories.
+    Terms for the same entity type are concatenated in file order.
+    """
+    vocabularies: Dict[str, List[str]] = {}
+    for directory in directories:
+        for path in sorted(Path(directory).glob("*.json")):
+            for label, terms in load_vocabulary_file(path).items():
+                vocabularies.setdefault(label, []).extend(terms)
+    return vocabularies
+
+
+def vocabulary_directories() -> List[Path]:
+    """Bundled vocabulary directory plus the optional extra directory from the environment"""
+    directories = [BUNDLED_VOCABULARY_DIR]
+    extra_directory = os.getenv(EXTRA_VOCABULARY_DIR_ENV)
+    if extra_directory:
+        if Path(extra_directory).is_dir():
+            directories.append(Path(extra_directory))
+        else:
+            logger.warning(f"⚠️ {EXTRA_VOCABULARY_DIR_ENV}={extra_directory} is not a directory, ignored")
+    return directories
+
+
+def compile_entity_pattern(vocabularies: Dict[str, List[str]]) -> Tuple[Optional[Pattern[str]], List[str]]:
+    """
+    Compile all vocabularies into one case-insensitive whole-word regex.
+
+    Every term becomes its own named group, and the terms of all types are
+    escaped and sorted longest-first together, so a multi-word term wins
+    over its prefix even when the prefix belongs to another type
+    ("Mavi Jeans" as a brand over "mavi" as a colour). A term listed under
+    several types is assigned to the first one.
+
+    Returns:
+        Compiled pattern (None if there are no terms) and the entity type of each term group
+    """
+    seen_terms = set()
+    labelled_terms = []
+    for label, terms in vocabularies.items():
+        for term in terms:
+            key = term.strip().casefold()
+            if key and key not in seen_terms:
+                seen_terms.add(key)
+                labelled_terms.append((term.strip(), label))
+
+    if not labelled_terms:
+        return None, []
+    labelled_terms.sort(key=lambda labelled_term: len(labelled_term[0]), reverse=True)
+    # Group names must be identifiers; the label is recovered from the group index
+    alternation = "|".join(f"(?P<t{index}>{re.escape(term)})" for index, (term, _) in enumerate(labelled_terms))
+    group_labels = [label for _, label in labelled_terms]
+    return re.compile(r"\b(?:" + alternation + r")\b", re.IGNORECASE), group_labels
+
+
+class EntityExtractor:
+    """Single-pass entity extractor over compiled vocabularies"""
+
+    def __init__(self, vocabularies: Dict[str, List[str]], directories: Optional[List[Path]] = None):
+        """
+        Args:
+            vocabularies: Entity type -> terms
+            directories: Vocabulary directories the terms came from (enables reload)
+        """
+        self.directories = directories
+        self._set_vocabularies(vocabularies)
+
+    @classmethod
+    def from_files(cls, directories: Optional[Iterable[Path]] = None) -> "EntityExtractor":
+        """
+        Build an extractor from vocabulary files.
+
+        Args:
+            directories: Directories with *.json vocabularies (default: bundled + environment)
+        """
+        directories = list(directories) if directories is not None else vocabulary_directories()
+        extractor = cls(load_vocabularies(directories), directories=directories)
+        logger.info(f"🏷️ Entity vocabularies loaded: {extractor.term_counts()}")
+        return extractor
+
+    def _set_vocabularies(self, vocabularies: Dict[str, List[str]]) -> None:
+        """Compile the vocabularies and swap them in (single assignment, safe for concurrent readers)"""
+        self._compiled = (list(vocabularies), *compile_entity_pattern(vocabularies))
+        self.vocabularies = vocabularies
+
+    def term_counts(self) -> Dict[str, int]:
+        """Entity type -> number of loaded terms"""
+        return {label: len(terms) for label, terms in self.vocabularies.items()}
+
+    def reload(self) -> Dict[str, int]:
+        """
+        Re-read the vocabulary files and recompile the pattern.
+
+        Returns:
+            Entity type -> number of terms now loaded
+        """
+        if self.directories is None:
+            raise ValueError("Extractor was not built from vocabulary files")
+        self._set_vocabularies(load_vocabularies(self.directories))
+        logger.info(f"🏷️ Entity vocabularies reloaded: {self.term_counts()}")
+        return self.term_counts()
+
+    @property
+    def labels(self) -> List[str]:
+        """Entity types known to the extractor"""
+        return list(self._compiled[0])
+
+    def extract(self, text: str) -> List[EntityMatch]:
+        """
+        Find every entity in one scan.
+
+        Args:
+            text: Input text (matching is case-insensitive)
+
+        Returns:
+            Non-overlapping entities in text order
+        """
+        _, pattern, group_labels = self._compiled
+        if pattern is None:
+            return []
+        return [
+            EntityMatch(text=match.group(), label=group_labels[int(match.lastgroup[1:])],
+                        start=match.start(), end=match.end())
+            for match in pattern.finditer(text)
+        ]
+
+    def extract_grouped(self, text: str) -> Dict[str, List[str]]:
+        """Matched texts per entity type (every known type present, possibly empty)"""
+        grouped: Dict[str, List[str]] = {label: [] for label in self.labels}
+        for entity in self.extract(text):
+            grouped[entity.label].append(entity.text)
+        return grouped
+
+    def labels_present(self, text: str) -> Dict[str, bool]:
+        """Whether each entity type occurs in the text"""
+        found = {entity.label for entity in self.extract(text)}
+        return {label: label in found for label in self.labels}
@@ -10,7 +10,9 @@ import json
 import numpy as np
 import asyncio
 import requests
-import re
+
+from entity_extractor import EntityExtractor
+from keyword_matcher import KeywordMatcher
 
 # Import the new prompt engineering NLU module
 try:
@@ -23,6 +25,18 @@ except ImportError as e:
     logger = logging.getLogger(__name__)
     logger.warning(f"⚠️ Prompt Engineering NLU modülü yüklenemedi: {e}")
 
+# XLM-R tabanlı transformer analizörü (batch analiz için; torch/transformers gerektirir)
+try:
+    from nlu_analyzer import AdvancedNLUAnalyzer, DEFAULT_BATCH_BUCKET_SIZE
+    NLU_ANALYZER_AVAILABLE = True
+except ImportError as e:
+    NLU_ANALYZER_AVAILABLE = False
+    DEFAULT_BATCH_BUCKET_SIZE = 32
+    logger.warning(f"⚠️ XLM-R NLU analizörü yüklenemedi: {e}")
+
+# Tek batch isteğinde kabul edilen en fazla metin sayısı
+MAX_BATCH_TEXTS = 1000
+
 # Phase 6 Advanced NLP dependencies (will be installed)
 try:
     # import torch  # PyTorch for transformer models
@@ -65,9 +79,10 @@ async def startup_event():
         except Exception as e:
             logger.error(f"❌ Prompt Engineering NLU başlatılamadı: {e}")
     
-    # Initialize transformer NLU (if available in future)
+    # Initialize transformer NLU (XLM-R, sentence transformer, sentiment)
     try:
-        # advanced_nlu = AdvancedNLUAnalyzer()  # Will be enabled when transformers are installed
+        if NLU_ANALYZER_AVAILABLE:
+            advanced_nlu = AdvancedNLUAnalyzer()
         logger.info("✅ NLU Service tamamen hazır!")
     except Exception as e:
         logger.warning(f"⚠️ Advanced NLU başlatılamadı: {e}")
@@ -91,6 +106,14 @@ class PromptEngineeringNLURequest(BaseModel):
     enable_fashion_reasoning: bool = Field(default=True, description="Moda domain mantığını etkinleştir")
     return_explanations: bool = Field(default=True, description="Analiz açıklamalarını döndür")
 
+class BatchNLURequest(BaseModel):
+    """
+    Çok sayıda metin için toplu NLU analiz isteği (ürün yorumları, sohbet kayıtları).
+    Metinler uzunluklarına göre gruplanır; sonuçlar giriş sırasıyla döner.
+    """
+    texts: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_TEXTS, description="Analiz edilecek metinler")
+    bucket_size: int = Field(default=DEFAULT_BATCH_BUCKET_SIZE, ge=1, le=128, description="Bir inference batch'indeki en fazla metin sayısı")
+
 class Phase6NLURequest(BaseModel):
     """
     PHASE 6 Enhanced: Advanced NLU request with transformer capabilities.
@@ -273,6 +296,13 @@ class SimulatedSentenceTransformer:
         self.model_name = "all-MiniLM-L6-v2"  # Target model
         self.embedding_dim = 384  # Sentence-transformer embedding dimension
         
+        # Fashion-related terms compiled once; each text is scanned in a single pass
+        self.fashion_terms = [
+            "style", "fashion", "outfit", "clothing", "dress", "shirt", "pants", "skirt",
+            "elegant", "casual", "formal", "trendy", "chic", "sophisticated", "modern"
+        ]
+        self.fashion_term_matcher = KeywordMatcher({"fashion": self.fashion_terms})
+        
     def compute_similarity(self, text1: str, text2: str) -> float:
         """Compute semantic similarity between texts"""
         # Simulate semantic similarity calculation
@@ -298,11 +328,7 @@ class SimulatedSentenceTransformer:
     
     def _count_fashion_terms(self, text: str) -> int:
         """Count fashion-related terms in text"""
-        fashion_terms = [
-            "style", "fashion", "outfit", "clothing", "dress", "shirt", "pants", "skirt",
-            "elegant", "casual", "formal", "trendy", "chic", "sophisticated", "modern"
-        ]
-        return sum(1 for term in fashion_terms if term in text.lower())
+        return self.fashion_term_matcher.count(text.lower())["fashion"]
 
 # PHASE 6: Advanced NLU System
 class Phase6AdvancedNLUSystem:
@@ -330,6 +356,13 @@ class Phase6AdvancedNLUSystem:
             "size", "material", "price", "trend"
         ]
         
+        # Contextual marker vocabularies compiled into one pattern (one scan per text)
+        self.context_marker_extractor = EntityExtractor({
+            "temporal_context": ["today", "tomorrow", "weekend", "evening"],
+            "personal_context": ["my", "i", "me", "personal"],
+            "situational_context": ["work", "party", "meeting", "date"]
+        })
+        
         logger.info("✅ Phase 6 Advanced NLU System initialized successfully")
         logger.info(f"   Transformer Models: BERT + RoBERTa + Sentence-Transformers")
         logger.info(f"   Fashion Domain: {len(self.fashion_intents)} intents, {len(self.fashion_entities)} entity types")
@@ -556,11 +589,7 @@ class Phase6AdvancedNLUSystem:
             "complexity_level": np.random.choice(["simple", "moderate", "complex"]),
             "domain_relevance": round(np.random.uniform(0.80, 0.96), 3),
             "user_intent_clarity": round(np.random.uniform(0.75, 0.92), 3),
-            "contextual_markers": {
-                "temporal_context": bool(re.search(r'\b(today|tomorrow|weekend|evening)\b', text.lower())),
-                "personal_context": bool(re.search(r'\b(my|i|me|personal)\b', text.lower())),
-                "situational_context": bool(re.search(r'\b(work|party|meeting|date)\b', text.lower()))
-            }
+            "contextual_markers": self.context_marker_extractor.labels_present(text)
         }
     
     def _extract_style_preferences(self, text: str) -> Dict[str, Any]:
@@ -750,6 +779,50 @@ async def understand_text_legacy_compatible(text: str, language: str = "en"):
         logger.error(f"Error in legacy-compatible analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Text understanding error: {str(e)}")
 
+@app.post("/analyze_batch")
+async def analyze_batch(request: BatchNLURequest):
+    """
+    📦 Toplu NLU analizi: yüzlerce metni tek istekte analiz eder.
+    
+    Metinler token uzunluğuna göre sıralanıp gruplara bölünür; XLM-R, sentence
+    transformer ve sentiment modeli her grup için bir kez çalışır. Transformer
+    analizörü yoksa metinler prompt kalıplarıyla analiz edilir.
+    """
+    logger.info(f"📦 Batch NLU analizi: {len(request.texts)} metin")
+    start_time = datetime.now()
+    loop = asyncio.get_running_loop()
+    
+    try:
+        if advanced_nlu is not None:
+            # Model inference event loop'u bloklamasın
+            results = await loop.run_in_executor(
+                None, advanced_nlu.batch_analysis, request.texts, request.bucket_size
+            )
+            analysis_method = "transformer_batch"
+        elif PROMPT_ENGINEERING_AVAILABLE and prompt_nlu is not None:
+            results = await loop.run_in_executor(
+                None, lambda: [prompt_nlu.analyze_with_prompt_patterns(text) for text in request.texts]
+            )
+            analysis_method = "prompt_patterns"
+        else:
+            raise HTTPException(status_code=503, detail="No NLU analyzer available for batch analysis")
+        
+        processing_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"✅ Batch NLU analizi tamamlandı: {len(results)} metin, {processing_time:.2f}s")
+        
+        return {
+            "results": results,
+            "count": len(results),
+            "analysis_method": analysis_method,
+            "processing_time": processing_time
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Batch NLU analizi hatası: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch analysis error: {str(e)}")
+
 @app.post("/analyze_with_prompt_patterns")
 async def analyze_with_prompt_patterns(request: PromptEngineeringNLURequest):
     """
@@ -964,6 +1037,24 @@ def get_prompt_patterns_info():
         }
     }
 
+@app.post("/reload_entity_vocabularies")
+def reload_entity_vocabularies():
+    """
+    Entity sözlüklerini (entity_vocabularies/*.json ve NLU_EXTRA_ENTITY_VOCABULARY_DIR)
+    yeniden yükler; yeni markalar ve materyaller deploy gerekmeden devreye girer.
+    """
+    if not PROMPT_ENGINEERING_AVAILABLE or prompt_nlu is None:
+        raise HTTPException(status_code=503, detail="Prompt Engineering NLU sistemi mevcut değil")
+    
+    try:
+        term_counts = prompt_nlu.entity_extractor.reload()
+    except (OSError, ValueError) as e:
+        # Hatalı dosyada mevcut sözlükler kullanılmaya devam eder
+        logger.error(f"❌ Entity sözlükleri yüklenemedi: {e}")
+        raise HTTPException(status_code=400, detail=f"Entity vocabulary error: {str(e)}")
+    
+    return {"status": "reloaded", "entity_types": term_counts}
+
 @app.get("/transformer_models_status")
 def get_transformer_models_status():
     """
@@ -994,6 +1085,10 @@ def get_transformer_models_status():
                 "accuracy": "92%+ similarity matching"
             }
         },
+        "nlu_cache": {
+            "enabled": advanced_nlu is not None,
+            "caches": advanced_nlu.get_cache_stats() if advanced_nlu is not None else {}
+        },
         "prompt_engineering_status": {
             "available": PROMPT_ENGINEERING_AVAILABLE,
             "patterns_count": 5,
@@ -1008,6 +1103,8 @@ def get_transformer_models_status():
             "fashion_entity_extraction": "POST /extract_fashion_entities",
             "prompt_patterns_info": "GET /prompt_patterns_info",
             "legacy_compatibility": "POST /understand_text",
+            "batch_analysis": "POST /analyze_batch",
+            "entity_vocabulary_reload": "POST /reload_entity_vocabularies",
             "transformer_status": "GET /transformer_models_status"
         },
         "flow_engineering": {
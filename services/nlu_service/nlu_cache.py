@@ -0,0 +1,165 @@
+# 🗃️ AURA AI - NLU Embedding and Analysis Cache
+# Normalised-text LRU/TTL cache with memory accounting
+
+"""
+Short repeated queries ("what should I wear to work", "iş için ne giyebilirim")
+make up a large share of NLU traffic. This module provides the cache key
+normalisation and a size-bounded cache so identical queries are encoded once.
+
+Entries expire after a TTL and the least recently used entry is evicted when
+either the entry limit or the byte budget is exceeded. Batch analysis runs in
+executor threads, so every operation is guarded by a lock.
+"""
+
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+# Letters that only occur in Turkish among the supported languages (tr, en, es, fr, de)
+TURKISH_SPECIFIC_CHARS = frozenset("çğıöşüÇĞİÖŞÜ")
+
+# Turkish casing: dotted İ lowers to i, dotless I lowers to ı
+TURKISH_LOWER_MAP = str.maketrans({"İ": "i", "I": "ı"})
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise text for use as a cache key.
+
+    Applies NFC composition, Unicode casefolding and whitespace collapsing.
+    Plain casefold maps "İ" to "i" plus a combining dot and "I" to "i", which is
+    wrong for Turkish; texts containing Turkish letters use Turkish casing instead.
+
+    Args:
+        text: Raw input text
+
+    Returns:
+        Normalised text
+    """
+    text = unicodedata.normalize("NFC", text)
+    if any(char in TURKISH_SPECIFIC_CHARS for char in text):
+        text = text.translate(TURKISH_LOWER_MAP)
+    else:
+        text = text.replace("İ", "i")
+    return " ".join(text.casefold().split())
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate memory footprint of a cached value in bytes.
+
+    Args:
+        value: numpy array, nested dict/list of JSON-like values, or scalar
+
+    Returns:
+        Estimated size in bytes
+    """
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + (0 if value.base is None else value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class NLUCache:
+    """LRU cache bounded by TTL, entry count and estimated memory"""
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int, max_bytes: int,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name: Cache name shown in statistics
+            ttl_seconds: How long an entry stays valid
+            max_entries: Maximum number of entries
+            max_bytes: Memory budget for stored values (estimated)
+            clock: Time source (replaceable in tests)
+        """
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+
+        # Statistics counters
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, size, value = entry
+            if expires_at <= self._clock():
+                # Expired entries are dropped when read
+                del self._entries[key]
+                self.current_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries beyond the limits"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+
+            self._entries[key] = (self._clock() + self.ttl_seconds, size, value)
+            self.current_bytes += size
+
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_bytes": self.current_bytes,
+                "max_memory_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions
+            }
@@ -6,9 +6,11 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import json
-import re
 from datetime import datetime
 
+from entity_extractor import EntityExtractor
+from keyword_matcher import KeywordMatcher
+
 # Configure detailed logging for prompt engineering analysis
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -85,9 +87,19 @@ class AdvancedPromptNLU:
         # Entity extraction prompt kalıpları
         self.entity_patterns = self._initialize_entity_patterns()
         
+        # Entity sözlükleri (entity_vocabularies/*.json) tek regex'te derlenir
+        self.entity_extractor = EntityExtractor.from_files()
+        
         # Fashion domain bilgi tabanı
         self.fashion_knowledge = self._initialize_fashion_knowledge()
         
+        # Intent ve bağlam anahtar kelimeleri - tek Aho-Corasick otomatında derlenir
+        self.intent_keywords, self.context_keywords = self._initialize_keyword_lists()
+        self.keyword_matcher = KeywordMatcher({
+            **{("intent", intent_type): keywords for intent_type, keywords in self.intent_keywords.items()},
+            **{("context", context_type): keywords for context_type, keywords in self.context_keywords.items()}
+        })
+        
         logger.info("✅ Prompt Engineering NLU hazır!")
     
     def _initialize_intent_patterns(self) -> Dict[IntentType, PromptPattern]:
@@ -366,6 +378,26 @@ class AdvancedPromptNLU:
             }
         }
     
+    def _initialize_keyword_lists(self) -> Tuple[Dict[IntentType, List[str]], Dict[ContextType, List[str]]]:
+        """Intent ve bağlam skorlaması için anahtar kelime listeleri (TR + EN, küçük harf)"""
+        
+        intent_keywords = {
+            IntentType.OUTFIT_RECOMMENDATION: ["ne giyebilirim", "kıyafet öner", "öneri", "recommend", "suggest", "what to wear"],
+            IntentType.STYLE_COMBINATION: ["kombinle", "uyar mı", "kombine", "match", "goes with", "coordinate"],
+            IntentType.OCCASION_DRESSING: ["etkinlik", "toplantı", "parti", "iş", "work", "meeting", "event", "party"]
+        }
+        
+        context_keywords = {
+            ContextType.WORK_OFFICE: ["iş", "ofis", "toplantı", "work", "office", "meeting", "professional"],
+            ContextType.CASUAL_DAILY: ["günlük", "rahat", "casual", "daily", "everyday", "comfortable"]
+        }
+        
+        return intent_keywords, context_keywords
+    
+    def count_keywords(self, text: str) -> Dict[Any, int]:
+        """Tek geçişte tüm intent ve bağlam kategorileri için anahtar kelime sayıları"""
+        return self.keyword_matcher.count(text.lower())
+    
     def analyze_with_prompt_patterns(self, user_text: str, analysis_context: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Prompt kalıpları kullanarak kapsamlı NLU analizi yap
@@ -381,11 +413,14 @@ class AdvancedPromptNLU:
         logger.info(f"🔍 Prompt pattern analizi başlıyor: '{user_text[:50]}...'")
         
         try:
+            # Metin bir kez taranır; intent ve bağlam aynı sayıları kullanır
+            keyword_counts = self.count_keywords(user_text)
+            
             # ADIM 1: Intent Classification (Amaç Belirleme)
-            intent_result = self._classify_intent_with_patterns(user_text)
+            intent_result = self._classify_intent_with_patterns(user_text, keyword_counts)
             
             # ADIM 2: Context Analysis (Bağlam Analizi)
-            context_result = self._analyze_context_with_patterns(user_text)
+            context_result = self._analyze_context_with_patterns(user_text, keyword_counts)
             
             # ADIM 3: Entity Extraction (Öğe Çıkarımı)
             entity_result = self._extract_entities_with_patterns(user_text)
@@ -405,11 +440,12 @@ class AdvancedPromptNLU:
             logger.error(f"❌ Prompt pattern analizi hatası: {e}")
             return self._generate_fallback_response(user_text, str(e))
     
-    def _classify_intent_with_patterns(self, text: str) -> Dict[str, Any]:
+    def _classify_intent_with_patterns(self, text: str,
+                                       keyword_counts: Optional[Dict[Any, int]] = None) -> Dict[str, Any]:
         """Intent classification using prompt patterns"""
         
-        # Text preprocessing
-        text_lower = text.lower()
+        # Keyword hits for every category from a single pass over the text
+        keyword_counts = keyword_counts if keyword_counts is not None else self.count_keywords(text)
         
         # Intent scoring based on keyword presence and context
         intent_scores = {}
@@ -418,17 +454,9 @@ class AdvancedPromptNLU:
             score = 0.0
             
             # Keyword-based scoring (fallback implementation)
-            if intent_type == IntentType.OUTFIT_RECOMMENDATION:
-                keywords = ["ne giyebilirim", "kıyafet öner", "öneri", "recommend", "suggest", "what to wear"]
-                score = sum(1 for keyword in keywords if keyword in text_lower) / len(keywords)
-                
-            elif intent_type == IntentType.STYLE_COMBINATION:
-                keywords = ["kombinle", "uyar mı", "kombine", "match", "goes with", "coordinate"]
-                score = sum(1 for keyword in keywords if keyword in text_lower) / len(keywords)
-                
-            elif intent_type == IntentType.OCCASION_DRESSING:
-                keywords = ["etkinlik", "toplantı", "parti", "iş", "work", "meeting", "event", "party"]
-                score = sum(1 for keyword in keywords if keyword in text_lower) / len(keywords)
+            keywords = self.intent_keywords.get(intent_type)
+            if keywords:
+                score = keyword_counts[("intent", intent_type)] / len(keywords)
             
             intent_scores[intent_type.value] = score
         
@@ -443,23 +471,20 @@ class AdvancedPromptNLU:
             "method": "prompt_pattern_classification"
         }
     
-    def _analyze_context_with_patterns(self, text: str) -> Dict[str, Any]:
+    def _analyze_context_with_patterns(self, text: str,
+                                       keyword_counts: Optional[Dict[Any, int]] = None) -> Dict[str, Any]:
         """Context analysis using prompt patterns"""
         
-        text_lower = text.lower()
+        keyword_counts = keyword_counts if keyword_counts is not None else self.count_keywords(text)
         context_scores = {}
         
         # Context detection based on keywords and patterns
         for context_type, pattern in self.context_patterns.items():
             score = 0.0
             
-            if context_type == ContextType.WORK_OFFICE:
-                keywords = ["iş", "ofis", "toplantı", "work", "office", "meeting", "professional"]
-                score = sum(1 for keyword in keywords if keyword in text_lower) / len(keywords)
-                
-            elif context_type == ContextType.CASUAL_DAILY:
-                keywords = ["günlük", "rahat", "casual", "daily", "everyday", "comfortable"]
-                score = sum(1 for keyword in keywords if keyword in text_lower) / len(keywords)
+            keywords = self.context_keywords.get(context_type)
+            if keywords:
+                score = keyword_counts[("context", context_type)] / len(keywords)
         
             context_scores[context_type.value] = score
         
@@ -477,7 +502,7 @@ class AdvancedPromptNLU:
     def _extract_entities_with_patterns(self, text: str) -> Dict[str, Any]:
         """Entity extraction using prompt patterns"""
         
-        # Simple regex-based entity extraction (can be enhanced with NER models)
+        # Regex-based entity extraction (can be enhanced with NER models)
         entities = {
             "clothing_items": [],
             "colors": [],
@@ -485,48 +510,17 @@ class AdvancedPromptNLU:
             "time_references": [],
             "brands": []
         }
+        for label in self.entity_extractor.labels:
+            entities.setdefault(label, [])
         
-        # Clothing items detection
-        clothing_patterns = [
-            r'\b(gömlek|shirt|blouse)\b',
-            r'\b(pantolon|pants|trousers|jeans)\b', 
-            r'\b(elbise|dress)\b',
-            r'\b(ceket|jacket|blazer)\b',
-            r'\b(ayakkabı|shoes|heels|sneakers)\b'
-        ]
-        
-        for pattern in clothing_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            entities["clothing_items"].extend(matches)
-        
-        # Color detection
-        color_patterns = [
-            r'\b(siyah|black|kara)\b',
-            r'\b(beyaz|white)\b',
-            r'\b(mavi|blue)\b',
-            r'\b(kırmızı|red)\b',
-            r'\b(yeşil|green)\b',
-            r'\b(sarı|yellow)\b'
-        ]
-        
-        for pattern in color_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            entities["colors"].extend(matches)
-        
-        # Time and occasion detection
-        time_patterns = [
-            r'\b(sabah|morning)\b',
-            r'\b(akşam|evening)\b',
-            r'\b(bugün|today)\b',
-            r'\b(yarın|tomorrow)\b'
-        ]
-        
-        for pattern in time_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            entities["time_references"].extend(matches)
+        # Single scan with the combined pattern: clothing, colors, times, brands, ...
+        entity_matches = self.entity_extractor.extract(text)
+        for match in entity_matches:
+            entities[match.label].append(match.text)
         
         return {
             "entities": entities,
+            "entity_spans": [match.to_dict() for match in entity_matches],
             "method": "prompt_pattern_extraction",
             "confidence": 0.7
         }
@@ -0,0 +1,57 @@
+# Unit tests for the single-pass regex entity extractor
+
+import json
+
+# Import the extractor under test
+from entity_extractor import BUNDLED_VOCABULARY_DIR, EntityExtractor
+
+
+def test_extract_returns_every_entity_with_span_in_text_order():
+    """Test that one scan finds all entity types, case-insensitively and on whole words"""
+    extractor = EntityExtractor({
+        "clothing_items": ["gömlek", "shirt", "t-shirt"],
+        "colors": ["siyah", "black"],
+        "time_references": ["yarın", "tomorrow"],
+    })
+    text = "Yarın SİYAH gömlek mi, black t-shirt mi? shirtless olmaz"
+
+    entities = [(entity.text, entity.label, entity.start, entity.end) for entity in extractor.extract(text)]
+
+    assert entities == [
+        ("Yarın", "time_references", 0, 5),
+        ("SİYAH", "colors", 6, 11),
+        ("gömlek", "clothing_items", 12, 18),
+        ("black", "colors", 23, 28),
+        ("t-shirt", "clothing_items", 29, 36),
+    ]
+    assert text[6:11] == "SİYAH"
+
+
+def test_vocabularies_load_from_files_and_reload(tmp_path):
+    """Test that extra vocabulary files are merged with the bundled ones and picked up on reload"""
+    (tmp_path / "brands.json").write_text(json.dumps({"brands": ["Koton"]}), encoding="utf-8")
+    extractor = EntityExtractor.from_files([BUNDLED_VOCABULARY_DIR, tmp_path])
+
+    assert extractor.extract_grouped("Koton mavi elbise")["brands"] == ["Koton"]
+    assert "materials" not in extractor.labels
+
+    (tmp_path / "materials.json").write_text(json.dumps({"materials": ["keten", "linen"]}), encoding="utf-8")
+    term_counts = extractor.reload()
+
+    assert term_counts["materials"] == 2
+    grouped = extractor.extract_grouped("keten gömlek")
+    assert grouped["materials"] == ["keten"]
+    assert grouped["clothing_items"] == ["gömlek"]
+
+
+def test_longer_term_of_a_later_type_wins_over_its_prefix():
+    """Test that a brand starting with a colour word is matched whole, not as the colour"""
+    extractor = EntityExtractor({
+        "colors": ["mavi", "siyah"],
+        "clothing_items": ["ceket"],
+        "brands": ["Mavi Jeans", "Koton"],
+    })
+
+    entities = [(entity.text, entity.label) for entity in extractor.extract("Mavi Jeans ceket, mavi gömlek")]
+
+    assert entities == [("Mavi Jeans", "brands"), ("ceket", "clothing_items"), ("mavi", "colors")]